@@ -0,0 +1,172 @@
+"""Per-tool admission control and load shedding for MCP tool calls.
+
+Each tool gets a fixed number of execution slots and a bounded wait queue.
+When every slot is busy, calls wait in priority order — calls predicted to
+be served from cache ahead of calls that will go to the network — and when
+the queue is also full the call is rejected immediately with a recoverable
+``SERVER_OVERLOADED`` error instead of piling up on the event loop.
+
+The cheapness prediction is only evaluated when a call actually has to
+wait, so the uncontended path costs nothing beyond a counter update.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import structlog
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from procontext.config import AdmissionSettings
+
+log = structlog.get_logger()
+
+# Heap priorities — lower is served first.
+_CHEAP = 0
+_EXPENSIVE = 1
+
+IN_FLIGHT = REGISTRY.gauge(
+    "procontext_admission_in_flight", "Tool calls currently executing.", ("tool",)
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "procontext_admission_queue_depth", "Tool calls waiting for an execution slot.", ("tool",)
+)
+QUEUED_TOTAL = REGISTRY.counter(
+    "procontext_admission_queued_total",
+    "Tool calls that had to wait for a slot, by predicted cost.",
+    ("tool", "priority"),
+)
+REJECTED_TOTAL = REGISTRY.counter(
+    "procontext_admission_rejected_total",
+    "Tool calls rejected because the tool's wait queue was full.",
+    ("tool",),
+)
+
+
+class _ToolGate:
+    """Slots plus a bounded priority wait queue for one tool."""
+
+    def __init__(self, tool: str, max_concurrent: int, max_queued: int) -> None:
+        self._tool = tool
+        self._max_concurrent = max_concurrent
+        self._max_queued = max_queued
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, is_cheap: Callable[[], Awaitable[bool]]) -> None:
+        if self._try_take_slot():
+            return
+        self._reject_if_full()
+
+        cheap = await is_cheap()
+        # The prediction awaited — a slot may have freed up or the queue filled.
+        if self._try_take_slot():
+            return
+        self._reject_if_full()
+
+        priority = _CHEAP if cheap else _EXPENSIVE
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        QUEUED_TOTAL.inc(tool=self._tool, priority="cheap" if cheap else "expensive")
+        self._update_queue_depth()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled — pass it on.
+                self.release()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._update_queue_depth()
+            raise
+
+    def release(self) -> None:
+        """Hand the slot to the highest-priority waiter, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # slot ownership transfers; _active unchanged
+                self._update_queue_depth()
+                return
+        self._update_queue_depth()
+        self._active -= 1
+        IN_FLIGHT.dec(tool=self._tool)
+
+    def _try_take_slot(self) -> bool:
+        if self._active >= self._max_concurrent or self._waiters:
+            return False
+        self._active += 1
+        IN_FLIGHT.inc(tool=self._tool)
+        return True
+
+    def _reject_if_full(self) -> None:
+        if len(self._waiters) < self._max_queued:
+            return
+        REJECTED_TOTAL.inc(tool=self._tool)
+        log.warning(
+            "admission_rejected",
+            tool=self._tool,
+            in_flight=self._active,
+            queued=len(self._waiters),
+        )
+        raise ProContextError(
+            code=ErrorCode.SERVER_OVERLOADED,
+            message=f"Server is at capacity for {self._tool} calls",
+            suggestion="Retry after a short delay.",
+            recoverable=True,
+        )
+
+    def _update_queue_depth(self) -> None:
+        QUEUE_DEPTH.set(len(self._waiters), tool=self._tool)
+
+
+class AdmissionController:
+    """Admits tool calls subject to per-tool concurrency and queue limits."""
+
+    def __init__(self, settings: AdmissionSettings) -> None:
+        self._settings = settings
+        self._gates: dict[str, _ToolGate] = {}
+
+    @asynccontextmanager
+    async def admit(
+        self, tool: str, is_cheap: Callable[[], Awaitable[bool]]
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot for *tool* for the duration of the block.
+
+        Raises:
+            ProContextError: ``SERVER_OVERLOADED`` when the tool's wait queue
+                is full. The caller should retry after a short delay.
+        """
+        gate = self._gate(tool)
+        await gate.acquire(is_cheap)
+        try:
+            yield
+        finally:
+            gate.release()
+
+    def _gate(self, tool: str) -> _ToolGate:
+        gate = self._gates.get(tool)
+        if gate is None:
+            max_concurrent = self._settings.tool_max_concurrent.get(
+                tool, self._settings.max_concurrent
+            )
+            gate = _ToolGate(tool, max_concurrent, self._settings.max_queued)
+            self._gates[tool] = gate
+        return gate
+
+
+async def always_cheap() -> bool:
+    """Cheapness predictor for tools that never touch the network."""
+    return True
@@ -30,6 +30,7 @@ CREATE TABLE IF NOT EXISTS page_cache (
     url                TEXT NOT NULL UNIQUE,
     content            TEXT NOT NULL,
     outline           TEXT NOT NULL DEFAULT '',
+    outline_index      BLOB NOT NULL DEFAULT x'',
     discovered_domains TEXT NOT NULL DEFAULT '',
     fetched_at         TEXT NOT NULL,
     expires_at         TEXT NOT NULL,
@@ -39,6 +40,11 @@ CREATE TABLE IF NOT EXISTS page_cache (
 
 _CREATE_PAGE_INDEX = "CREATE INDEX IF NOT EXISTS idx_page_expires ON page_cache(expires_at)"
 
+# Columns added after the first release, created on databases that predate them.
+_ADDED_PAGE_COLUMNS = {
+    "outline_index": "BLOB NOT NULL DEFAULT x''",
+}
+
 _CREATE_METADATA_TABLE = """
 CREATE TABLE IF NOT EXISTS server_metadata (
     key   TEXT PRIMARY KEY,
@@ -58,10 +64,18 @@ class Cache:
         await self._db.execute("PRAGMA journal_mode = WAL")
         await self._db.execute("PRAGMA foreign_keys = ON")
         await self._db.execute(_CREATE_PAGE_TABLE)
+        await self._add_missing_page_columns()
         await self._db.execute(_CREATE_PAGE_INDEX)
         await self._db.execute(_CREATE_METADATA_TABLE)
         await self._db.commit()
 
+    async def _add_missing_page_columns(self) -> None:
+        cursor = await self._db.execute("PRAGMA table_info(page_cache)")
+        existing = {row[1] for row in await cursor.fetchall()}
+        for name, definition in _ADDED_PAGE_COLUMNS.items():
+            if name not in existing:
+                await self._db.execute(f"ALTER TABLE page_cache ADD COLUMN {name} {definition}")
+
     # ------------------------------------------------------------------
     # Page cache
     # ------------------------------------------------------------------
@@ -71,7 +85,8 @@ class Cache:
         try:
             cursor = await self._db.execute(
                 "SELECT url_hash, url, content, outline, discovered_domains, "
-                "fetched_at, expires_at, last_checked_at FROM page_cache WHERE url_hash = ?",
+                "fetched_at, expires_at, last_checked_at, outline_index "
+                "FROM page_cache WHERE url_hash = ?",
                 (url_hash,),
             )
             row = await cursor.fetchone()
@@ -88,6 +103,7 @@ class Cache:
                 url=row[1],
                 content=row[2],
                 outline=row[3],
+                outline_index=bytes(row[8]),
                 discovered_domains=frozenset(row[4].split()),
                 fetched_at=fetched_at,
                 expires_at=expires_at,
@@ -98,6 +114,22 @@ class Cache:
             log.warning("cache_read_error", key=f"page:{url_hash}", exc_info=True)
             return None
 
+    async def has_page(self, url_hash: str) -> bool:
+        """Return True if any entry, fresh or stale, exists for *url_hash*.
+
+        Cheaper than ``get_page`` — no content is read. Returns ``False`` on
+        read failure.
+        """
+        try:
+            cursor = await self._db.execute(
+                "SELECT 1 FROM page_cache WHERE url_hash = ?",
+                (url_hash,),
+            )
+            return await cursor.fetchone() is not None
+        except aiosqlite.Error:
+            log.warning("cache_read_error", key=f"page:{url_hash}", exc_info=True)
+            return False
+
     async def set_page(
         self,
         url: str,
@@ -106,22 +138,28 @@ class Cache:
         outline: str,
         ttl_hours: int,
         *,
+        outline_index: bytes = b"",
         discovered_domains: frozenset[str] = frozenset(),
     ) -> None:
-        """Write a page entry. Non-fatal on failure."""
+        """Write a page entry. Non-fatal on failure.
+
+        *outline_index* is the serialized ``OutlineIndex`` of *outline*; when
+        empty, readers rebuild it from the outline string.
+        """
         try:
             now = datetime.now(UTC)
             expires_at = now + timedelta(hours=ttl_hours)
             await self._db.execute(
                 "INSERT OR REPLACE INTO page_cache "
-                "(url_hash, url, content, outline, discovered_domains, "
+                "(url_hash, url, content, outline, outline_index, discovered_domains, "
                 "fetched_at, expires_at, last_checked_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 (
                     url_hash,
                     url,
                     content,
                     outline,
+                    outline_index,
                     " ".join(sorted(discovered_domains)),
                     now.isoformat(),
                     expires_at.isoformat(),
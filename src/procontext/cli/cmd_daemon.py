@@ -0,0 +1,34 @@
+"""CLI command: procontext daemon — run the shared stdio daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+
+import structlog
+
+from procontext.cli.cmd_serve import ensure_registry
+from procontext.daemon.server import serve_daemon
+from procontext.mcp.server import mcp
+
+if TYPE_CHECKING:
+    from procontext.config import Settings
+
+log = structlog.get_logger()
+
+
+def run_daemon(settings: Settings) -> None:
+    """Ensure the registry is present and serve stdio sessions over the daemon socket.
+
+    Normally started on demand by the stdio bridge when ``server.daemon_enabled``
+    is set; it can also be run directly (e.g. under a process supervisor).
+    """
+    if not asyncio.run(ensure_registry(settings)):
+        log.critical(
+            "registry_not_initialised",
+            hint="Run 'procontext setup' to download the registry.",
+        )
+        sys.exit(1)
+
+    asyncio.run(serve_daemon(mcp, settings))
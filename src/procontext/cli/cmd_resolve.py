@@ -0,0 +1,119 @@
+"""CLI command: procontext resolve — resolve a project's dependencies offline.
+
+Reads requirements.txt, pyproject.toml, package.json or a lockfile and
+resolves every dependency against the local registry in one batch, as the
+resolve_libraries tool does. No server, cache or network is involved.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from procontext.config import registry_paths
+from procontext.manifests import find_manifests, manifest_language, read_dependencies
+from procontext.models.tools import LibraryResolution, ResolveLibrariesOutput
+from procontext.registry import load_registry_snapshot
+from procontext.resolver import resolve_libraries, sort_by_language
+
+if TYPE_CHECKING:
+    from procontext.config import Settings
+    from procontext.models.registry import RegistryIndexes
+
+
+def _manifest_paths(paths: list[str]) -> list[Path]:
+    """Expand directories to the manifests they contain; files are taken as given."""
+    manifests: list[Path] = []
+    for raw in paths or ["."]:
+        path = Path(raw)
+        if path.is_dir():
+            manifests.extend(find_manifests(path))
+        elif path.is_file():
+            manifests.append(path)
+        else:
+            raise ValueError(f"No such file or directory: {raw}")
+    return manifests
+
+
+def _resolve_manifest(
+    path: Path, indexes: RegistryIndexes, settings: Settings, language: str | None
+) -> ResolveLibrariesOutput:
+    dependencies = read_dependencies(path)
+    language = language.strip().lower() if language else manifest_language(path)
+    all_matches = resolve_libraries(
+        dependencies,
+        indexes,
+        fuzzy_score_cutoff=settings.resolver.fuzzy_score_cutoff,
+        fuzzy_max_results=settings.resolver.fuzzy_max_results,
+    )
+    results = [
+        LibraryResolution(query=query, matches=sort_by_language(matches, language))
+        for query, matches in zip(dependencies, all_matches, strict=True)
+    ]
+    return ResolveLibrariesOutput(
+        results=results,
+        unresolved=[result.query for result in results if not result.matches],
+    )
+
+
+def _print_text(path: Path, output: ResolveLibrariesOutput) -> None:
+    resolved = len(output.results) - len(output.unresolved)
+    print(f"{path} ({resolved}/{len(output.results)} resolved)")  # noqa: T201
+    width = max((len(result.query) for result in output.results), default=0)
+    for result in output.results:
+        if not result.matches:
+            print(f"  {result.query:<{width}}  -")  # noqa: T201
+            continue
+        best = result.matches[0]
+        fuzzy = f" (fuzzy, {best.relevance:.2f})" if best.matched_via == "fuzzy" else ""
+        print(f"  {result.query:<{width}}  {best.library_id}{fuzzy}  {best.index_url}")  # noqa: T201
+
+
+def run_resolve(
+    settings: Settings,
+    paths: list[str],
+    *,
+    language: str | None = None,
+    as_json: bool = False,
+) -> None:
+    """Resolve the dependencies of the given manifests (or those in the current directory)."""
+    try:
+        manifests = _manifest_paths(paths)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)  # noqa: T201
+        sys.exit(1)
+    if not manifests:
+        print(  # noqa: T201
+            "No manifest found. Pass a requirements.txt, pyproject.toml, package.json "
+            "or lockfile, or a directory containing one.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    registry = load_registry_snapshot(*registry_paths(settings))
+    if registry is None:
+        print(  # noqa: T201
+            "Registry not found or invalid. Run 'procontext setup' first.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    indexes = registry.indexes
+
+    reports: list[tuple[Path, ResolveLibrariesOutput]] = []
+    for path in manifests:
+        try:
+            reports.append((path, _resolve_manifest(path, indexes, settings, language)))
+        except (OSError, ValueError) as exc:
+            print(f"Could not read {path}: {exc}", file=sys.stderr)  # noqa: T201
+            sys.exit(1)
+
+    if as_json:
+        payload = [
+            {"manifest": str(path), **output.model_dump(mode="json")} for path, output in reports
+        ]
+        print(json.dumps(payload, indent=2))  # noqa: T201
+        return
+    for path, output in reports:
+        _print_text(path, output)
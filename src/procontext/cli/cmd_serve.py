@@ -10,7 +10,7 @@ import structlog
 
 from procontext.config import registry_paths
 from procontext.mcp.server import mcp
-from procontext.registry import load_registry
+from procontext.registry import load_registry_snapshot
 from procontext.transport import run_http_server
 
 if TYPE_CHECKING:
@@ -19,10 +19,11 @@ if TYPE_CHECKING:
 log = structlog.get_logger()
 
 
-async def _ensure_registry(settings: Settings) -> bool:
+async def ensure_registry(settings: Settings) -> bool:
     """Check registry availability, attempt auto-setup if needed. Returns True if ready."""
     registry_path, registry_state_path = registry_paths(settings)
-    if load_registry(local_registry_path=registry_path, local_state_path=registry_state_path):
+    # Also writes the registry snapshot the server then starts from, if missing.
+    if load_registry_snapshot(registry_path, registry_state_path) is not None:
         return True
 
     log.info("registry_not_found_attempting_auto_setup")
@@ -32,15 +33,12 @@ async def _ensure_registry(settings: Settings) -> bool:
     from procontext.cli.cmd_setup import attempt_registry_setup
 
     await attempt_registry_setup(settings)
-    return (
-        load_registry(local_registry_path=registry_path, local_state_path=registry_state_path)
-        is not None
-    )
+    return load_registry_snapshot(registry_path, registry_state_path) is not None
 
 
 def run_server(settings: Settings) -> None:
     """Ensure the registry is present and launch the MCP server."""
-    if not asyncio.run(_ensure_registry(settings)):
+    if not asyncio.run(ensure_registry(settings)):
         log.critical(
             "registry_not_initialised",
             hint=(
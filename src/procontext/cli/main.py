@@ -10,6 +10,7 @@ from pydantic import ValidationError
 
 from procontext.config import Settings
 from procontext.logging_config import setup_logging
+from procontext.unix_socket import unix_sockets_supported
 
 
 def main() -> None:
@@ -29,6 +30,25 @@ def main() -> None:
     db_sub = db_parser.add_subparsers(dest="db_command")
     db_sub.required = True
     db_sub.add_parser("recreate", help="Delete and recreate the cache database")
+    sub.add_parser("daemon", help="Run the shared stdio daemon (Unix-like systems only)")
+    resolve_parser = sub.add_parser(
+        "resolve", help="Resolve a project's dependencies to documentation sources"
+    )
+    resolve_parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="PATH",
+        help=(
+            "requirements.txt, pyproject.toml, package.json, uv.lock, poetry.lock, "
+            "package-lock.json or Pipfile.lock, or a directory to search for manifests "
+            "(default: the current directory)"
+        ),
+    )
+    resolve_parser.add_argument(
+        "--language",
+        help="Language hint for every manifest (default: inferred from the file)",
+    )
+    resolve_parser.add_argument("--json", action="store_true", help="Print results as JSON")
 
     args = parser.parse_args()
 
@@ -56,7 +76,25 @@ def main() -> None:
             from procontext.cli.cmd_db import run_db_recreate
 
             asyncio.run(run_db_recreate(settings))
+    elif args.command == "resolve":
+        from procontext.cli.cmd_resolve import run_resolve
+
+        run_resolve(settings, args.paths, language=args.language, as_json=args.json)
+    elif args.command == "daemon":
+        if not unix_sockets_supported():
+            print("The daemon requires Unix domain sockets.", file=sys.stderr)  # noqa: T201
+            sys.exit(1)
+        from procontext.cli.cmd_daemon import run_daemon
+
+        run_daemon(settings)
     else:
+        # The bridge proxies this session to a shared warm daemon and only
+        # falls through to in-process serving when none is reachable.
+        if settings.server.transport == "stdio" and settings.server.daemon_enabled:
+            from procontext.daemon.bridge import run_bridge
+
+            if run_bridge(settings):
+                return
         from procontext.cli.cmd_serve import run_server
 
         run_server(settings)
@@ -0,0 +1,223 @@
+"""Response compression for the HTTP transport.
+
+Streamable HTTP returns tool results as ``text/event-stream`` bodies, which
+general-purpose compression middleware (including Starlette's
+``GZipMiddleware``) skips because it cannot compress a stream without
+buffering it. This middleware compresses event streams chunk by chunk and
+sync-flushes the encoder after every chunk, so each SSE event reaches the
+client as soon as it is sent — nothing is ever held back.
+
+Other responses are compressed only when their body reaches a minimum size;
+a response streamed in several chunks is compressed incrementally, also with
+a flush per chunk.
+
+Brotli is used when the optional ``brotli`` package is installed (the
+``procontext[brotli]`` extra) and the client accepts it; otherwise gzip.
+"""
+
+from __future__ import annotations
+
+import importlib
+import zlib
+from typing import TYPE_CHECKING, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    """Import *name* if it is installed.
+
+    Imported by name so that type checking does not require the package.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+brotli = _optional_module("brotli")  # the procontext[brotli] extra
+
+# Cheap levels: on a documentation page the larger levels buy a few percent
+# of size for several times the CPU, which shows up directly in latency.
+_GZIP_LEVEL = 4
+_BROTLI_QUALITY = 4
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self) -> None:
+        self._obj = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self) -> None:
+        assert brotli is not None
+        self._obj = brotli.Compressor(quality=_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick ``br`` or ``gzip`` from an ``Accept-Encoding`` header, or None.
+
+    Honours q-values (``q=0`` refuses a coding) and the ``*`` wildcard. Among
+    acceptable codings, the higher q-value wins and brotli breaks ties.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    wildcard = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best: str | None = None
+    best_q = 0.0
+    for coding in candidates:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses for clients that accept it."""
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingSend(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSend:
+    """Wraps ``send`` for one response, deciding on compression per response."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._encoder: _Encoder | None = None
+        self._passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if "content-encoding" in headers:
+                self._passthrough = True
+                await self._send(message)
+                return
+            self._start = message
+            if headers.get("content-type", "").startswith("text/event-stream"):
+                # Never delay an event stream: send headers now and compress each event.
+                await self._begin_compressed_stream()
+            return
+
+        if message_type != "http.response.body" or self._passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self._encoder is None and not more_body:
+            # Whole body in one message: compress only if it is worth it.
+            if len(body) < self._minimum_size:
+                self._passthrough = True
+                await self._flush_start()
+                await self._send(message)
+                return
+            encoder = self._new_encoder()
+            compressed = encoder.compress(body) + encoder.finish()
+            start = self._take_start()
+            headers = MutableHeaders(raw=start["headers"])
+            self._mark_encoded(headers)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        if self._encoder is None:
+            await self._begin_compressed_stream()
+        assert self._encoder is not None
+        chunk = self._encoder.compress(body)
+        chunk += self._encoder.flush() if more_body else self._encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _begin_compressed_stream(self) -> None:
+        self._encoder = self._new_encoder()
+        start = self._take_start()
+        headers = MutableHeaders(raw=start["headers"])
+        self._mark_encoded(headers)
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self._send(start)
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+
+    def _new_encoder(self) -> _Encoder:
+        return _BrotliEncoder() if self._encoding == "br" else _GzipEncoder()
+
+    def _take_start(self) -> Message:
+        assert self._start is not None
+        start = {**self._start, "headers": list(self._start["headers"])}
+        self._start = None
+        return start
+
+    async def _flush_start(self) -> None:
+        if self._start is not None:
+            await self._send(self._take_start())
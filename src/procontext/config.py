@@ -11,10 +11,10 @@ The config file is optional — all fields have sensible defaults.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
 import platformdirs
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -22,6 +22,8 @@ from pydantic_settings import (
     YamlConfigSettingsSource,
 )
 
+from procontext import __version__
+
 _DEFAULT_DATA_DIR = platformdirs.user_data_dir("procontext")
 # Cache path default is intentionally independent from data_dir overrides.
 _DEFAULT_DB_PATH = str(Path(platformdirs.user_data_dir("procontext")) / "cache.db")
@@ -46,12 +48,50 @@ class ServerSettings(BaseModel):
     port: int = 8080
     auth_enabled: bool = False
     auth_key: str = ""
+    # stdio only — proxy each session to a shared local daemon instead of
+    # starting a cold server per client process.
+    daemon_enabled: bool = False
+    daemon_autostart: bool = True
+    daemon_socket_path: str = ""
+    daemon_idle_timeout_seconds: int = 900
+    # HTTP only — listen on a Unix domain socket instead of host/port. Access
+    # is controlled by the socket file's permissions (unix_socket_mode).
+    unix_socket_path: str = ""
+    unix_socket_mode: int = 0o600
+
+    # HTTP only — per-client limits on POST requests. Clients are identified by
+    # verified bearer key (rate_limit_key="auth_key", which needs auth_enabled
+    # and otherwise falls back to address) or by remote address. 0 disables
+    # each mechanism.
+    rate_limit_per_second: float = 0.0
+    rate_limit_burst: int = 20
+    rate_limit_key: Literal["auth_key", "remote_address"] = "remote_address"
+    fair_max_in_flight: int = 0
+    fair_max_queued_per_client: int = 16
+
+    # HTTP only — gzip/brotli response compression for clients that send
+    # Accept-Encoding. Event streams are compressed per event, never buffered.
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+
+    @field_validator("unix_socket_mode", mode="before")
+    @classmethod
+    def _parse_octal_mode(cls, value: Any) -> Any:
+        # "0660" from YAML strings or env vars means octal, as it does for chmod.
+        if isinstance(value, str):
+            return int(value, 8)
+        return value
 
 
 class RegistrySettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
     metadata_url: str = "https://procontexthq.github.io/registry_metadata.json"
-    poll_interval_hours: int = 24
+    # Copies of the metadata document on other hosts, raced with metadata_url
+    # (see registry/mirrors.py). Each must describe the same registry.
+    mirror_metadata_urls: list[str] = []
+    # Fractions of an hour are allowed: unchanged metadata is a conditional
+    # request answered with a bodyless 304.
+    poll_interval_hours: float = 24
 
 
 class CacheSettings(BaseModel):
@@ -75,6 +115,45 @@ class ResolverSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
     fuzzy_score_cutoff: int = 70
     fuzzy_max_results: int = 5
+    # Rendered resolve_library outputs kept per (query, language, registry
+    # version); 0 disables.
+    result_cache_entries: int = 1024
+
+
+class SearchSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    # search_page cursors kept for pagination and repeat queries; 0 disables.
+    cursor_cache_entries: int = 64
+    # Upper bound on page text and matched lines held by cursors, in characters.
+    cursor_cache_max_chars: int = 64_000_000
+    # mode="regex" searches run in killable worker processes and fail with
+    # INVALID_INPUT after this many seconds. 0 runs them in-process, unbounded.
+    regex_timeout_seconds: float = 2.0
+    regex_workers: int = 2
+    # Budget for matches plus context lines in one search_page response; 0 disables.
+    context_max_chars: int = 20_000
+
+
+class ExecutorSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    # Where CPU-bound page processing runs once its input reaches min_chars:
+    # "thread" or "process" pools, or "inline" on the event loop as before.
+    kind: Literal["inline", "thread", "process"] = "thread"
+    max_workers: int = 4
+    min_chars: int = 256_000
+    # Event-loop lag sampling period for the lag histogram metric; 0 disables.
+    loop_lag_interval_seconds: float = 0.25
+
+
+class AdmissionSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    enabled: bool = True
+    # Concurrent executions allowed per tool; tool_max_concurrent overrides by tool name.
+    # At least 1: with no slots, every call would wait forever.
+    max_concurrent: int = Field(default=16, ge=1)
+    tool_max_concurrent: dict[str, Annotated[int, Field(ge=1)]] = {}
+    # Calls allowed to wait per tool once all slots are busy; beyond this, reject.
+    max_queued: int = 64
 
 
 class LoggingSettings(BaseModel):
@@ -98,6 +177,9 @@ class Settings(BaseSettings):
     cache: CacheSettings = CacheSettings()
     fetcher: FetcherSettings = FetcherSettings()
     resolver: ResolverSettings = ResolverSettings()
+    search: SearchSettings = SearchSettings()
+    executor: ExecutorSettings = ExecutorSettings()
+    admission: AdmissionSettings = AdmissionSettings()
     logging: LoggingSettings = LoggingSettings()
 
     @classmethod
@@ -125,3 +207,14 @@ def registry_paths(settings: Settings) -> tuple[Path, Path]:
         registry_dir / "known-libraries.json",
         registry_dir / "registry-state.json",
     )
+
+
+def daemon_socket_path(settings: Settings) -> Path:
+    """Return the Unix domain socket path of the shared stdio daemon.
+
+    The default path embeds the package version so that an upgraded client
+    never attaches to a daemon still running the previous release.
+    """
+    if settings.server.daemon_socket_path:
+        return Path(settings.server.daemon_socket_path).expanduser()
+    return Path(settings.data_dir) / f"daemon-{__version__}.sock"
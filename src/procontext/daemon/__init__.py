@@ -0,0 +1,7 @@
+"""Shared stdio daemon: one warm server process for every local stdio session.
+
+``server`` runs the long-lived daemon behind a Unix domain socket; ``bridge``
+is the thin stdio proxy that each MCP client process runs instead of a full
+server. The bridge module deliberately avoids importing the MCP SDK so that
+per-session startup stays cheap.
+"""
@@ -0,0 +1,113 @@
+"""Stdio-to-daemon bridge run by each MCP client process.
+
+The bridge connects this process's stdin/stdout to the shared daemon socket
+and copies bytes in both directions until either side closes. It never parses
+JSON-RPC — framing is handled end to end by the client and the daemon.
+
+Imports are kept to the standard library and structlog: the whole point of
+the bridge is that a new agent session does not pay for loading the MCP SDK,
+validating the registry, or opening the cache.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import structlog
+
+from procontext.config import daemon_socket_path
+from procontext.unix_socket import connect_unix_socket, unix_sockets_supported
+
+if TYPE_CHECKING:
+    from procontext.config import Settings
+
+log = structlog.get_logger()
+
+_DAEMON_START_TIMEOUT_SECONDS = 10.0
+_CONNECT_RETRY_INTERVAL_SECONDS = 0.05
+_CHUNK_SIZE = 64 * 1024
+
+
+def run_bridge(settings: Settings) -> bool:
+    """Proxy this process's stdio session to the shared daemon.
+
+    Returns False without touching stdin/stdout when no daemon could be
+    reached (and, if enabled, none could be started); the caller then serves
+    the session in-process. Returns True once a proxied session has ended.
+    """
+    if not unix_sockets_supported():
+        log.info("daemon_unsupported_platform", platform=sys.platform)
+        return False
+
+    socket_path = daemon_socket_path(settings)
+    sock = connect_unix_socket(socket_path)
+    if sock is None and settings.server.daemon_autostart:
+        _spawn_daemon(Path(settings.data_dir))
+        sock = _wait_for_daemon(socket_path)
+    if sock is None:
+        log.info("daemon_unavailable_serving_in_process", path=str(socket_path))
+        return False
+
+    log.info("daemon_bridge_connected", path=str(socket_path))
+    with sock:
+        _pump(sock)
+    return True
+
+
+def _spawn_daemon(data_dir: Path) -> None:
+    """Start a detached daemon that outlives this client process."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with (data_dir / "daemon.log").open("ab") as daemon_log:
+        subprocess.Popen(
+            [sys.executable, "-m", "procontext.cli.main", "daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=daemon_log,
+            start_new_session=True,
+        )
+    log.info("daemon_spawned", log_path=str(data_dir / "daemon.log"))
+
+
+def _wait_for_daemon(socket_path: Path) -> socket.socket | None:
+    deadline = time.monotonic() + _DAEMON_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        sock = connect_unix_socket(socket_path)
+        if sock is not None:
+            return sock
+        time.sleep(_CONNECT_RETRY_INTERVAL_SECONDS)
+    log.warning("daemon_start_timed_out", path=str(socket_path))
+    return None
+
+
+def _pump(sock: socket.socket) -> None:
+    """Copy stdin → socket on a helper thread and socket → stdout on this one."""
+    stdin_fd = sys.stdin.fileno()
+    stdout = sys.stdout.buffer
+
+    def _upstream() -> None:
+        try:
+            while chunk := os.read(stdin_fd, _CHUNK_SIZE):
+                sock.sendall(chunk)
+        except OSError:
+            log.debug("daemon_bridge_upstream_closed", exc_info=True)
+        finally:
+            # Half-close so the daemon sees EOF and ends the session cleanly.
+            with suppress(OSError):
+                sock.shutdown(socket.SHUT_WR)
+
+    threading.Thread(target=_upstream, name="procontext-bridge-stdin", daemon=True).start()
+
+    try:
+        while chunk := sock.recv(_CHUNK_SIZE):
+            stdout.write(chunk)
+            stdout.flush()
+    except OSError:
+        log.warning("daemon_bridge_connection_lost", exc_info=True)
@@ -0,0 +1,176 @@
+"""Long-lived daemon serving MCP sessions over a Unix domain socket.
+
+Each accepted connection carries one MCP session framed exactly like the
+stdio transport (newline-delimited JSON-RPC). All sessions share a single
+``AppState``, so the registry indexes, SQLite connection, HTTP pool, and
+background schedulers are built once per daemon rather than once per agent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import os
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+import anyio
+import mcp.types as types
+import structlog
+from mcp.shared.message import SessionMessage
+from pydantic import ValidationError
+
+from procontext.config import daemon_socket_path
+from procontext.mcp.lifespan import open_app_state, share_app_state
+from procontext.unix_socket import bind_unix_socket
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+    from mcp.server.fastmcp import FastMCP
+
+    from procontext.config import Settings
+
+log = structlog.get_logger()
+
+# Largest single JSON-RPC line accepted from a client.
+_MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class _IdleMonitor:
+    """Tracks open connections and reports when the daemon has been idle too long."""
+
+    def __init__(self, timeout_seconds: int) -> None:
+        self._timeout_seconds = timeout_seconds
+        self._active = 0
+        self._changed = asyncio.Event()
+
+    def opened(self) -> None:
+        self._active += 1
+        self._changed.set()
+
+    def closed(self) -> None:
+        self._active -= 1
+        self._changed.set()
+
+    async def wait_until_idle(self) -> None:
+        """Return once no connection has been open for the configured timeout.
+
+        A timeout of 0 disables idle shutdown; the daemon then runs until killed.
+        """
+        while True:
+            self._changed.clear()
+            if self._active or self._timeout_seconds <= 0:
+                await self._changed.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._changed.wait(), self._timeout_seconds)
+            except TimeoutError:
+                return
+
+
+async def serve_daemon(server: FastMCP, settings: Settings) -> None:
+    """Serve MCP sessions on the daemon socket until idle or cancelled.
+
+    Returns immediately if another daemon already owns the socket path.
+    """
+    socket_path = daemon_socket_path(settings)
+    lock_fd = _acquire_daemon_lock(socket_path)
+    if lock_fd is None:
+        log.info("daemon_already_running", path=str(socket_path))
+        return
+
+    try:
+        sock = bind_unix_socket(socket_path, mode=0o600)
+        async with open_app_state(settings, long_running=True) as state:
+            share_app_state(server, state)
+            idle = _IdleMonitor(settings.server.daemon_idle_timeout_seconds)
+
+            async def _on_connect(
+                reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+            ) -> None:
+                idle.opened()
+                try:
+                    await _serve_connection(server, reader, writer)
+                finally:
+                    idle.closed()
+
+            listener = await asyncio.start_unix_server(
+                _on_connect, sock=sock, limit=_MAX_MESSAGE_BYTES
+            )
+            log.info("daemon_listening", path=str(socket_path))
+            async with listener:
+                await idle.wait_until_idle()
+            log.info("daemon_idle_shutdown", path=str(socket_path))
+    finally:
+        with suppress(FileNotFoundError):
+            socket_path.unlink()
+        os.close(lock_fd)
+
+
+async def _serve_connection(
+    server: FastMCP,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Run one MCP session over an accepted socket connection."""
+    read_stream_writer: MemoryObjectSendStream[SessionMessage | Exception]
+    read_stream: MemoryObjectReceiveStream[SessionMessage | Exception]
+    write_stream: MemoryObjectSendStream[SessionMessage]
+    write_stream_reader: MemoryObjectReceiveStream[SessionMessage]
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader() -> None:
+        async with read_stream_writer:
+            while line := await reader.readline():
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except ValidationError as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def socket_writer() -> None:
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                payload = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                writer.write(payload.encode("utf-8") + b"\n")
+                await writer.drain()
+
+    mcp_server = server._mcp_server  # pyright: ignore[reportPrivateUsage]
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(socket_reader)
+            tg.start_soon(socket_writer)
+            await mcp_server.run(
+                read_stream,
+                write_stream,
+                mcp_server.create_initialization_options(),
+            )
+            tg.cancel_scope.cancel()
+    except* (ConnectionError, ValueError):
+        # ValueError: a client line exceeded _MAX_MESSAGE_BYTES.
+        log.warning("daemon_connection_error", exc_info=True)
+    finally:
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+def _acquire_daemon_lock(socket_path: Path) -> int | None:
+    """Take an exclusive lock guarding *socket_path*; None if another daemon holds it.
+
+    The lock is released by the kernel when the daemon exits, so a crashed
+    daemon never blocks its successor.
+    """
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = socket_path.with_name(socket_path.name + ".lock")
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
@@ -8,7 +8,9 @@ class ErrorCode(StrEnum):
     PAGE_FETCH_FAILED = "PAGE_FETCH_FAILED"
     TOO_MANY_REDIRECTS = "TOO_MANY_REDIRECTS"
     URL_NOT_ALLOWED = "URL_NOT_ALLOWED"
+    SECTION_NOT_FOUND = "SECTION_NOT_FOUND"
     INVALID_INPUT = "INVALID_INPUT"
+    SERVER_OVERLOADED = "SERVER_OVERLOADED"
 
 
 class ProContextError(Exception):
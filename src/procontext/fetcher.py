@@ -20,6 +20,8 @@ from procontext.config import FetcherSettings
 from procontext.errors import ErrorCode, ProContextError
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from procontext.models.registry import RegistryEntry
     from procontext.state import AppState
 
@@ -67,9 +69,17 @@ def build_allowlist(
     Extracts base domains from all ``llms_txt_url`` fields, then merges any
     manually specified ``extra_domains``.
     """
+    return allowlist_from_urls((entry.llms_txt_url for entry in entries), extra_domains)
+
+
+def allowlist_from_urls(
+    urls: Iterable[str],
+    extra_domains: list[str] | None = None,
+) -> frozenset[str]:
+    """Build the SSRF domain allowlist from ``llms_txt_url`` values and optional extra domains."""
     base_domains: set[str] = set()
-    for entry in entries:
-        hostname = urlparse(entry.llms_txt_url).hostname or ""
+    for url in urls:
+        hostname = urlparse(url).hostname or ""
         if hostname:
             base_domains.add(_base_domain(hostname))
     for domain in extra_domains or []:
@@ -102,7 +112,14 @@ def expand_allowlist_from_content(
     regardless of expansion configuration. Only mutates ``state.allowlist`` when
     ``settings.fetcher.allowlist_expansion == "discovered"``.
     """
-    discovered_domains = extract_base_domains_from_content(content)
+    return expand_allowlist(extract_base_domains_from_content(content), state)
+
+
+def expand_allowlist(discovered_domains: frozenset[str], state: AppState) -> frozenset[str]:
+    """Add *discovered_domains* to the live allowlist if expansion is enabled.
+
+    Returns *discovered_domains* unchanged, for cache persistence.
+    """
     if state.settings.fetcher.allowlist_expansion == "discovered":
         new_domains = discovered_domains - state.allowlist
         if new_domains:
@@ -0,0 +1,217 @@
+"""Precomputed fuzzy-matching index over the registry's terms.
+
+Built once per registry version. ``FuzzyIndex.extract`` returns the same
+results as ``rapidfuzz.process.extract`` with ``fuzz.ratio`` over every term,
+but only scores terms that could reach the cutoff.
+
+``fuzz.ratio`` is ``200 * LCS / (len(a) + len(b))``, and the longest common
+subsequence of two strings can be no longer than the characters they share
+(counted with multiplicity). A term therefore needs both a length close to
+the query's and enough shared characters. Terms are stored sorted by length,
+so the first test selects a contiguous window; the second is counted for the
+whole window at once with one bitmask per (character, occurrence) pair,
+summed bit-sliced with Python's big-int operations. Typically a few hundred
+of 100,000 terms survive to be scored.
+"""
+
+from __future__ import annotations
+
+import heapq
+import marshal
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Any
+
+from rapidfuzz import fuzz, process
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+
+class FuzzyIndex:
+    __slots__ = ("_length_starts", "_library_ids", "_postings", "_ranks", "_terms")
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        library_ids: Sequence[str],
+        *,
+        previous: FuzzyIndex | None = None,
+    ) -> None:
+        """Index the corpus of *terms*, ``library_ids[i]`` being the library of ``terms[i]``.
+
+        Reuses the postings of *previous* for lengths whose terms are unchanged.
+        """
+        # Positions are ordered by term length, then by corpus order.
+        order = sorted(range(len(terms)), key=lambda i: len(terms[i]))
+        self._terms = [terms[i] for i in order]
+        self._library_ids = [library_ids[i] for i in order]
+        self._ranks = array("I", order)  # Corpus position, to break score ties as rapidfuzz does
+        lengths = [len(term) for term in self._terms]
+        max_length = lengths[-1] if lengths else 0
+        # _length_starts[n] is the first position of a term of length >= n.
+        self._length_starts = [bisect_left(lengths, n) for n in range(max_length + 2)]
+        self._postings = []
+        for n in range(max_length + 1):
+            length_terms = self._terms[self._length_starts[n] : self._length_starts[n + 1]]
+            if previous is not None and previous._terms_of_length(n) == length_terms:
+                self._postings.append(previous._postings[n])
+            else:
+                self._postings.append(_build_postings(length_terms))
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _terms_of_length(self, length: int) -> list[str] | None:
+        if length >= len(self._postings):
+            return None
+        return self._terms[self._length_starts[length] : self._length_starts[length + 1]]
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> FuzzyIndex:
+        """Load an index serialized by ``to_bytes``.
+
+        Raises ``ValueError`` if *data* is malformed.
+        """
+        try:
+            state = marshal.loads(data)
+        except (EOFError, TypeError, ValueError) as exc:
+            raise ValueError("malformed fuzzy index") from exc
+        return cls.from_state(state)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index with ``marshal``, so only the same Python can load it."""
+        return marshal.dumps(self.to_state())
+
+    @classmethod
+    def from_state(cls, state: Any) -> FuzzyIndex:
+        """Rebuild an index from a ``to_state`` tuple.
+
+        Raises ``ValueError`` if *state* is malformed.
+        """
+        try:
+            terms, library_ids, ranks, length_starts, postings = state
+            index = cls.__new__(cls)
+            index._ranks = array("I")
+            index._ranks.frombytes(ranks)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("malformed fuzzy index") from exc
+        index._terms, index._library_ids = terms, library_ids
+        index._length_starts, index._postings = length_starts, postings
+        return index
+
+    def to_state(self) -> tuple[Any, ...]:
+        """Return the index as a tuple of ``marshal``-able values.
+
+        It shares the index's term and library ID strings, so marshalling it
+        together with other structures holding them stores each string once.
+        """
+        return (
+            self._terms,
+            self._library_ids,
+            self._ranks.tobytes(),
+            self._length_starts,
+            self._postings,
+        )
+
+    def extract(
+        self, query: str, *, limit: int, score_cutoff: float
+    ) -> list[tuple[str, float, str]]:
+        """Return up to *limit* ``(term, score, library_id)`` best matches for *query*.
+
+        Sorted by score descending, ties in corpus order — the same terms
+        ``process.extract(query, terms, scorer=fuzz.ratio, ...)`` returns.
+        """
+        candidates = self._candidates(query, score_cutoff)
+        results = process.extract(
+            query,
+            [self._terms[pos] for pos in candidates],
+            scorer=fuzz.ratio,
+            limit=None,
+            score_cutoff=score_cutoff,
+        )
+        ranked = heapq.nsmallest(
+            limit,
+            ((score, candidates[idx]) for _, score, idx in results),
+            key=lambda hit: (-hit[0], self._ranks[hit[1]]),
+        )
+        return [(self._terms[pos], score, self._library_ids[pos]) for score, pos in ranked]
+
+    def _candidates(self, query: str, score_cutoff: float) -> list[int]:
+        """Return the positions of terms that could score at least *score_cutoff*."""
+        if score_cutoff <= 0:
+            return list(range(len(self._terms)))
+        query_length = len(query)
+        query_tokens = list(_tokens(query))
+        candidates: list[int] = []
+        for length, postings in enumerate(self._postings):
+            if 200 * min(query_length, length) < score_cutoff * (query_length + length):
+                continue
+            first = self._length_starts[length]
+            # counters[j] holds bit j of each term's count of shared characters.
+            counters: list[int] = []
+            for token in query_tokens:
+                bits = postings.get(token, 0)
+                for j, counter in enumerate(counters):
+                    counters[j], bits = counter ^ bits, counter & bits
+                    if not bits:
+                        break
+                if bits:
+                    counters.append(bits)
+            needed = -(-score_cutoff * (query_length + length) // 200)
+            hits = _at_least(
+                counters, int(needed), (1 << (self._length_starts[length + 1] - first)) - 1
+            )
+            candidates.extend(first + offset for offset in _set_bits(hits))
+        return candidates
+
+
+def _tokens(term: str) -> Iterator[tuple[str, int]]:
+    """Yield ``(char, k)`` for the k-th occurrence of each character in *term*."""
+    for char, count in Counter(term).items():
+        for k in range(count):
+            yield char, k
+
+
+def _build_postings(terms: list[str]) -> dict[tuple[str, int], int]:
+    """Return a bitmask of positions in *terms* for each ``(char, k)`` token."""
+    positions: defaultdict[tuple[str, int], list[int]] = defaultdict(list)
+    for pos, term in enumerate(terms):
+        seen: dict[str, int] = {}
+        for char in term:
+            k = seen[char] = seen.get(char, -1) + 1
+            positions[char, k].append(pos)
+    postings: dict[tuple[str, int], int] = {}
+    for token, token_positions in positions.items():
+        # Set the digits of a binary numeral, lowest bit first, then parse it.
+        digits = bytearray(b"0") * (token_positions[-1] + 1)
+        for pos in token_positions:
+            digits[pos] = 49  # "1"
+        postings[token] = int(digits[::-1], 2)
+    return postings
+
+
+def _at_least(counters: list[int], threshold: int, full: int) -> int:
+    """Return the mask of lanes whose bit-sliced count is at least *threshold*."""
+    if threshold <= 0:
+        return full
+    if threshold >> len(counters):
+        return 0
+    greater, equal = 0, full
+    for j in range(len(counters) - 1, -1, -1):
+        if threshold >> j & 1:
+            equal &= counters[j]
+        else:
+            greater |= equal & counters[j]
+            equal &= ~counters[j]
+    return greater | equal
+
+
+def _set_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the set bits of *mask*, lowest first."""
+    bits = format(mask, "b")[::-1]
+    pos = bits.find("1")
+    while pos >= 0:
+        yield pos
+        pos = bits.find("1", pos + 1)
@@ -0,0 +1,56 @@
+"""A small in-process LRU cache with an optional weight budget.
+
+Entries are evicted least-recently-used first when either the entry count
+or the total weight exceeds its limit. Weight is whatever unit the caller
+chooses (characters held, for search cursors); a budget of 0 disables the
+weight limit. Not thread-safe — callers on the event loop need no locking.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+
+class LRUCache[K, V]:
+    def __init__(self, max_entries: int, *, max_weight: int = 0) -> None:
+        self._max_entries = max_entries
+        self._max_weight = max_weight
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def weight(self) -> int:
+        return self._weight
+
+    def get(self, key: K) -> V | None:
+        """Return the value for *key* and mark it most recently used, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: K, value: V, *, weight: int = 1) -> None:
+        """Insert or replace *key*, then evict until within both limits.
+
+        Re-putting an existing key is how a caller reports that an entry's
+        weight changed. An entry heavier than the whole budget is not kept.
+        """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._weight -= previous[1]
+        self._entries[key] = (value, weight)
+        self._weight += weight
+        while self._entries and (
+            len(self._entries) > self._max_entries
+            or (self._max_weight and self._weight > self._max_weight)
+        ):
+            _, (_, evicted_weight) = self._entries.popitem(last=False)
+            self._weight -= evicted_weight
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._weight = 0
@@ -0,0 +1,178 @@
+"""Dependency names from project manifests and lockfiles.
+
+Used by ``procontext resolve`` to turn a project's dependency files into
+resolve_libraries queries. Only package names are extracted — versions,
+extras and markers are irrelevant to resolution.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import tomllib
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+# Manifests declaring direct dependencies, looked for when a directory is given.
+# Lockfiles list the whole dependency tree and are only read when named.
+MANIFEST_NAMES = ("pyproject.toml", "requirements.txt", "package.json")
+
+_TOML_LOCKFILES = ("uv.lock", "poetry.lock")
+
+# A PEP 508 project name at the start of a requirement.
+_REQUIREMENT_NAME_RE = re.compile(r"^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)")
+
+_NPM_DEPENDENCY_KEYS = (
+    "dependencies",
+    "devDependencies",
+    "peerDependencies",
+    "optionalDependencies",
+)
+
+
+def find_manifests(directory: Path) -> list[Path]:
+    """Return the manifests present in *directory*, in ``MANIFEST_NAMES`` order."""
+    return [directory / name for name in MANIFEST_NAMES if (directory / name).is_file()]
+
+
+def manifest_language(path: Path) -> Literal["python", "javascript"]:
+    """Return the language of the packages a manifest declares."""
+    return "javascript" if path.name in ("package.json", "package-lock.json") else "python"
+
+
+def read_dependencies(path: Path) -> list[str]:
+    """Return the dependency names declared in *path*, deduplicated, in file order.
+
+    Raises ValueError for unsupported or malformed files.
+    """
+    name = path.name
+    text = path.read_text(encoding="utf-8")
+    try:
+        if name == "pyproject.toml":
+            names = _pyproject_dependencies(tomllib.loads(text))
+        elif name in _TOML_LOCKFILES:
+            names = _toml_lock_packages(tomllib.loads(text))
+        elif name == "package.json":
+            names = _package_json_dependencies(json.loads(text))
+        elif name == "package-lock.json":
+            names = _package_lock_packages(json.loads(text))
+        elif name == "Pipfile.lock":
+            data = json.loads(text)
+            names = [*_table(data, "default"), *_table(data, "develop")]
+        elif name.endswith(".txt"):
+            names = _requirements_dependencies(text)
+        else:
+            raise ValueError(f"Unsupported manifest: {name}")
+        # The parsers are generators: consume them here, where their errors are caught.
+        return _unique(names)
+    except (
+        tomllib.TOMLDecodeError,
+        json.JSONDecodeError,
+        AttributeError,
+        KeyError,
+        TypeError,
+    ) as exc:
+        raise ValueError(f"Malformed manifest {name}: {exc}") from exc
+
+
+def _requirement_name(requirement: str) -> str | None:
+    match = _REQUIREMENT_NAME_RE.match(requirement)
+    return match.group(1) if match else None
+
+
+def _requirements_dependencies(text: str) -> Iterator[str]:
+    for line in text.replace("\\\n", " ").splitlines():
+        line = re.sub(r"(^|\s)#.*", "", line).strip()
+        # Options (-r, -e, --index-url ...), URLs and local paths name no package.
+        if not line or line.startswith(("-", ".", "/")) or "://" in line.split("@")[0]:
+            continue
+        name = _requirement_name(line)
+        if name:
+            yield name
+
+
+def _pyproject_dependencies(data: dict) -> Iterator[str]:
+    project = _table(data, "project")
+    requirements = _strings(project, "dependencies")
+    optional = _table(project, "optional-dependencies")
+    for group in optional:
+        requirements.extend(_strings(optional, group))
+    groups = _table(data, "dependency-groups")
+    for group in groups:
+        # {include-group = "..."} entries reference another group.
+        requirements.extend(item for item in _list(groups, group) if isinstance(item, str))
+    for requirement in requirements:
+        name = _requirement_name(requirement)
+        if name:
+            yield name
+
+    poetry = _table(_table(data, "tool"), "poetry")
+    tables = [_table(poetry, "dependencies"), _table(poetry, "dev-dependencies")]
+    poetry_groups = _table(poetry, "group")
+    tables.extend(_table(_table(poetry_groups, group), "dependencies") for group in poetry_groups)
+    for table in tables:
+        yield from (name for name in table if name != "python")
+
+
+def _toml_lock_packages(data: dict) -> Iterator[str]:
+    for package in _list(data, "package"):
+        if not isinstance(package, dict):
+            raise TypeError(f"package entries must be tables, not {type(package).__name__}")
+        # uv lists the project itself (and workspace members) as editable or virtual.
+        source = _table(package, "source")
+        if "editable" in source or "virtual" in source:
+            continue
+        name = package.get("name")
+        if not isinstance(name, str):
+            raise TypeError("package entries must have a string name")
+        yield name
+
+
+def _package_json_dependencies(data: dict) -> Iterator[str]:
+    for key in _NPM_DEPENDENCY_KEYS:
+        yield from _table(data, key)
+
+
+def _package_lock_packages(data: dict) -> Iterator[str]:
+    if "packages" not in data:  # lockfileVersion 1
+        yield from _table(data, "dependencies")
+        return
+    packages = _table(data, "packages")
+    for key in packages:
+        if "node_modules/" in key and not _table(packages, key).get("link"):
+            yield key.rsplit("node_modules/", 1)[1]
+
+
+def _table(data: dict, key: str) -> dict:
+    value = data.get(key, {})
+    if not isinstance(value, dict):
+        raise TypeError(f"{key} must be a table, not {type(value).__name__}")
+    return value
+
+
+def _list(data: dict, key: str) -> list:
+    value = data.get(key, [])
+    if not isinstance(value, list):
+        raise TypeError(f"{key} must be a list, not {type(value).__name__}")
+    return value
+
+
+def _strings(data: dict, key: str) -> list[str]:
+    """Return a copy of the list of strings at *key*."""
+    value = _list(data, key)
+    if not all(isinstance(item, str) for item in value):
+        raise TypeError(f"{key} must be a list of strings")
+    return list(value)
+
+
+def _unique(names: Iterable[str]) -> list[str]:
+    seen: set[str] = set()
+    unique: list[str] = []
+    for name in names:
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            unique.append(name)
+    return unique
@@ -12,16 +12,23 @@ import aiosqlite
 import structlog
 
 from procontext import __version__
+from procontext.admission import AdmissionController
 from procontext.cache import Cache
 from procontext.config import Settings, registry_paths
 from procontext.fetcher import Fetcher, build_allowlist, build_http_client
-from procontext.registry import build_indexes, load_registry
+from procontext.offload import Offloader
+from procontext.regex_sandbox import RegexSandbox
+from procontext.registry import load_registry_snapshot
+from procontext.registry.mirrors import RegistryMirrors
+from procontext.resolver import build_resolve_cache
 from procontext.schedulers import (
     run_cache_cleanup_scheduler,
     run_cache_startup_cleanup,
+    run_event_loop_lag_monitor,
     run_registry_startup_check,
     run_registry_update_scheduler,
 )
+from procontext.search_cursor import build_cursor_cache
 from procontext.state import AppState
 
 if TYPE_CHECKING:
@@ -64,6 +71,46 @@ async def lifespan(server: FastMCP) -> AsyncGenerator[AppState, None]:
     """Create and tear down all shared resources for the server's lifetime."""
     settings = Settings()
 
+    async with open_app_state(settings, long_running=settings.server.transport == "http") as state:
+        # In stdio mode, install the stdout guard to prevent accidental writes
+        # that would corrupt the MCP JSON-RPC stream. This runs *after* the MCP
+        # transport has already captured sys.stdout.buffer for its own use.
+        original_stdout = sys.stdout
+        if settings.server.transport == "stdio":
+            sys.stdout = _StdoutGuard()  # type: ignore[assignment]
+        try:
+            yield state
+        finally:
+            sys.stdout = original_stdout
+
+
+def share_app_state(server: FastMCP, state: AppState) -> None:
+    """Make every subsequent MCP session on *server* reuse *state*.
+
+    The MCP SDK enters the server lifespan once per session. Long-lived
+    processes that serve many sessions (the HTTP transport and the stdio
+    daemon) build one warm ``AppState`` up front with ``open_app_state`` and
+    install it here, so sessions share the registry indexes, cache connection,
+    HTTP pool, and background schedulers instead of each building their own.
+    """
+
+    @asynccontextmanager
+    async def _reuse(_server: object) -> AsyncGenerator[AppState, None]:
+        yield state
+
+    server._mcp_server.lifespan = _reuse  # pyright: ignore[reportPrivateUsage]
+
+
+@asynccontextmanager
+async def open_app_state(
+    settings: Settings, *, long_running: bool
+) -> AsyncGenerator[AppState, None]:
+    """Build all shared resources, start background schedulers, and tear them down.
+
+    ``long_running`` selects the recurring registry/cache schedulers used by
+    processes that outlive a single client session; otherwise each check runs
+    once at startup.
+    """
     log.info(
         "server_starting",
         version=__version__,
@@ -73,28 +120,25 @@ async def lifespan(server: FastMCP) -> AsyncGenerator[AppState, None]:
     registry_path, registry_state_path = registry_paths(settings)
 
     # Registry availability is guaranteed by main() before the server starts.
-    registry = load_registry(
-        local_registry_path=registry_path,
-        local_state_path=registry_state_path,
-    )
+    registry = load_registry_snapshot(registry_path, registry_state_path)
     if registry is None:
         raise RuntimeError(
             "Registry unavailable at server startup — this should have been caught before "
             "the server started. This is a bug."
         )
 
-    entries, version = registry
     log.info(
         "registry_loaded",
         source="disk",
-        entries=len(entries),
-        version=version,
+        entries=len(registry.indexes.by_id),
+        version=registry.version,
         path=str(registry_path),
     )
-    indexes = build_indexes(entries)
 
     http_client = build_http_client(settings.fetcher)
-    allowlist = build_allowlist(entries, extra_domains=settings.fetcher.extra_allowed_domains)
+    allowlist = registry.domains | build_allowlist(
+        [], extra_domains=settings.fetcher.extra_allowed_domains
+    )
 
     db_path = Path(settings.cache.db_path).expanduser()
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -114,29 +158,34 @@ async def lifespan(server: FastMCP) -> AsyncGenerator[AppState, None]:
 
     state = AppState(
         settings=settings,
-        indexes=indexes,
-        registry_version=version,
+        indexes=registry.indexes,
+        registry_version=registry.version,
         registry_path=registry_path,
         registry_state_path=registry_state_path,
+        registry_mirrors=RegistryMirrors.from_settings(settings.registry),
         http_client=http_client,
         cache=cache,
         fetcher=fetcher,
         allowlist=allowlist,
+        admission=AdmissionController(settings.admission) if settings.admission.enabled else None,
+        search_cursors=build_cursor_cache(settings.search),
+        resolve_cache=build_resolve_cache(settings.resolver),
+        regex_sandbox=RegexSandbox(settings.search)
+        if settings.search.regex_timeout_seconds > 0
+        else None,
+        offloader=Offloader(settings.executor),
     )
 
-    # In stdio mode, install the stdout guard to prevent accidental writes
-    # that would corrupt the MCP JSON-RPC stream. This runs *after* the MCP
-    # transport has already captured sys.stdout.buffer for its own use.
-    original_stdout = sys.stdout
-    if settings.server.transport == "stdio":
-        sys.stdout = _StdoutGuard()  # type: ignore[assignment]
-
-    if settings.server.transport == "http":
+    if long_running:
         registry_update_task = asyncio.create_task(run_registry_update_scheduler(state))
         cache_cleanup_task = asyncio.create_task(run_cache_cleanup_scheduler(state))
     else:
         registry_update_task = asyncio.create_task(run_registry_startup_check(state))
         cache_cleanup_task = asyncio.create_task(run_cache_startup_cleanup(state))
+    lag_interval = settings.executor.loop_lag_interval_seconds
+    loop_lag_task = (
+        asyncio.create_task(run_event_loop_lag_monitor(lag_interval)) if lag_interval > 0 else None
+    )
 
     log.info(
         "server_started",
@@ -149,13 +198,19 @@ async def lifespan(server: FastMCP) -> AsyncGenerator[AppState, None]:
     try:
         yield state
     finally:
-        sys.stdout = original_stdout
         registry_update_task.cancel()
         cache_cleanup_task.cancel()
         with suppress(asyncio.CancelledError):
             await registry_update_task
         with suppress(asyncio.CancelledError):
             await cache_cleanup_task
+        if loop_lag_task is not None:
+            loop_lag_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await loop_lag_task
+        state.offloader.close()
+        if state.regex_sandbox is not None:
+            state.regex_sandbox.close()
         await http_client.aclose()
         await db.close()
         log.info("server_stopping")
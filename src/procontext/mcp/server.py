@@ -6,27 +6,47 @@ Startup, logging setup, and lifespan management live in their own modules.
 
 from __future__ import annotations
 
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Annotated, Literal
 
 import structlog
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
+from starlette.responses import Response
 
 import procontext.tools.read_outline as t_read_outline
 import procontext.tools.read_page as t_read_page
+import procontext.tools.read_section as t_read_section
+import procontext.tools.resolve_libraries as t_resolve_many
 import procontext.tools.resolve_library as t_resolve
 import procontext.tools.search_page as t_search_page
+import procontext.tools.search_registry as t_search_registry
 from procontext import __version__
+from procontext.admission import always_cheap
 from procontext.errors import ProContextError
 from procontext.mcp.lifespan import lifespan
+from procontext.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
 from procontext.models.tools import (
+    MAX_CONTEXT_LINES,
+    MAX_QUERIES,
+    MAX_RESOLVE_QUERIES,
+    MAX_SEARCH_RESULTS,
     ReadOutlineOutput,
     ReadPageOutput,
+    ReadSectionOutput,
+    ResolveLibrariesOutput,
     ResolveLibraryOutput,
     SearchPageOutput,
+    SearchRegistryOutput,
 )
+from procontext.tools._shared import is_page_cached
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from contextlib import AbstractAsyncContextManager
+
+    from starlette.requests import Request
+
     from procontext.state import AppState
 
 log = structlog.get_logger()
@@ -37,6 +57,21 @@ mcp = FastMCP("procontext", lifespan=lifespan)
 mcp._mcp_server.version = __version__  # pyright: ignore[reportPrivateUsage]
 
 
+def _admit(
+    state: AppState, tool: str, is_cheap: Callable[[], Awaitable[bool]]
+) -> AbstractAsyncContextManager[None]:
+    """Hold an admission slot for *tool*, or do nothing when admission is disabled."""
+    if state.admission is None:
+        return nullcontext()
+    return state.admission.admit(tool, is_cheap)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> Response:
+    """Prometheus scrape endpoint (HTTP transport only)."""
+    return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @mcp.tool()
 async def resolve_library(
     query: Annotated[
@@ -85,9 +120,9 @@ async def resolve_library(
     """
     state: AppState = ctx.request_context.lifespan_context
     try:
-        return ResolveLibraryOutput.model_validate(
-            await t_resolve.handle(query, state, language=language)
-        )
+        async with _admit(state, "resolve_library", always_cheap):
+            # The (possibly cached) model itself: FastMCP serialises it once.
+            return await t_resolve.resolve(query, state, language=language)
     except ProContextError as exc:
         log.warning("tool_error", tool="resolve_library", code=exc.code, message=exc.message)
         raise
@@ -96,6 +131,105 @@ async def resolve_library(
         raise
 
 
+@mcp.tool()
+async def resolve_libraries(
+    queries: Annotated[
+        list[str],
+        Field(
+            description=(
+                f"Up to {MAX_RESOLVE_QUERIES} library names, package specifiers "
+                "(e.g. 'httpx>=0.28'), or aliases — typically a project's dependencies."
+            )
+        ),
+    ],
+    ctx: Context,
+    language: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Optional language hint (e.g. 'python', 'javascript'). "
+                "Sorts matching-language packages to the top; does not filter results."
+            )
+        ),
+    ] = None,
+) -> ResolveLibrariesOutput:
+    """Resolve many library names in one call.
+
+    Use this instead of repeated resolve_library calls when starting on a project:
+    pass every dependency from requirements.txt, pyproject.toml or package.json
+    at once. Each query is matched exactly as resolve_library would match it.
+
+    Response:
+      results     — one entry per query, in input order, each with:
+        query     — the query as given
+        matches   — same shape as resolve_library's matches (may be empty)
+      unresolved  — queries with no match in the registry
+    """
+    state: AppState = ctx.request_context.lifespan_context
+    try:
+        async with _admit(state, "resolve_libraries", always_cheap):
+            return ResolveLibrariesOutput.model_validate(
+                await t_resolve_many.handle(queries, state, language=language)
+            )
+    except ProContextError as exc:
+        log.warning("tool_error", tool="resolve_libraries", code=exc.code, message=exc.message)
+        raise
+    except Exception:
+        log.error("tool_unexpected_error", tool="resolve_libraries", exc_info=True)
+        raise
+
+
+@mcp.tool()
+async def search_registry(
+    query: Annotated[
+        str,
+        Field(description="Keywords describing what the library does, e.g. 'http client retries'."),
+    ],
+    ctx: Context,
+    language: Annotated[
+        str | None,
+        Field(description="Only return libraries with a package for this language, e.g. 'python'."),
+    ] = None,
+    ecosystem: Annotated[
+        Literal["pypi", "npm", "conda", "jsr"] | None,
+        Field(description="Only return libraries with a package in this ecosystem."),
+    ] = None,
+    limit: Annotated[
+        int,
+        Field(description="Maximum number of matches to return.", ge=1, le=MAX_SEARCH_RESULTS),
+    ] = 10,
+) -> SearchRegistryOutput:
+    """Find libraries in the registry by what they do.
+
+    Use this when you know the task but not the library: keywords are matched
+    against library names, aliases, package names, descriptions, languages and
+    ecosystems, and ranked by BM25. To look up a library you can already name,
+    use resolve_library instead.
+
+    Response:
+      matches  — ranked list of results, sorted by relevance descending, in the
+                 same shape as resolve_library's matches with
+                 matched_via "keyword"; relevance is the score relative to the
+                 best score any library could get for the query
+
+    An empty matches list means no library mentions any of the keywords.
+    """
+    state: AppState = ctx.request_context.lifespan_context
+    try:
+        async with _admit(state, "search_registry", always_cheap):
+            return SearchRegistryOutput.model_validate(
+                await t_search_registry.handle(
+                    query, state, language=language, ecosystem=ecosystem, limit=limit
+                )
+            )
+    except ProContextError as exc:
+        log.warning("tool_error", tool="search_registry", code=exc.code, message=exc.message)
+        raise
+    except Exception:
+        log.error("tool_unexpected_error", tool="search_registry", exc_info=True)
+        raise
+
+
 @mcp.tool()
 async def read_page(
     url: Annotated[
@@ -118,8 +252,9 @@ async def read_page(
     resolve_library or a link found within a previously fetched page.
 
     Navigation: Use outline line numbers to identify the section you need,
-    then call again with offset=<line>. For pages with very large outlines,
-    use read_outline for paginated browsing.
+    then call read_section with that line number (or heading path) to read
+    exactly that section, or call again with offset=<line>. For pages with
+    very large outlines, use read_outline for paginated browsing.
 
     Response:
       url          — the URL of the fetched page
@@ -142,7 +277,10 @@ async def read_page(
     """
     state: AppState = ctx.request_context.lifespan_context
     try:
-        return ReadPageOutput.model_validate(await t_read_page.handle(url, offset, limit, state))
+        async with _admit(state, "read_page", lambda: is_page_cached(url, state)):
+            return ReadPageOutput.model_validate(
+                await t_read_page.handle(url, offset, limit, state)
+            )
     except ProContextError as exc:
         log.warning("tool_error", tool="read_page", code=exc.code, message=exc.message)
         raise
@@ -166,6 +304,15 @@ async def read_outline(
         int,
         Field(description="Maximum number of outline entries to return.", ge=1),
     ] = 1000,
+    section_sizes: Annotated[
+        bool,
+        Field(
+            description=(
+                "When true, follow each section heading with the section's size, "
+                "e.g. '42:## Usage [56 lines, ~1200 tokens]'."
+            )
+        ),
+    ] = False,
 ) -> ReadOutlineOutput:
     """Browse the full outline of a documentation page with pagination.
 
@@ -175,6 +322,8 @@ async def read_outline(
 
     Outline entries have empty fence pairs pre-stripped. Pagination uses
     entry indices (not line numbers) — pass next_offset to continue browsing.
+    Set section_sizes to see how long each section is before reading it with
+    read_section.
 
     Response:
       url           — the URL of the fetched page
@@ -190,9 +339,10 @@ async def read_outline(
     """
     state: AppState = ctx.request_context.lifespan_context
     try:
-        return ReadOutlineOutput.model_validate(
-            await t_read_outline.handle(url, offset, limit, state)
-        )
+        async with _admit(state, "read_outline", lambda: is_page_cached(url, state)):
+            return ReadOutlineOutput.model_validate(
+                await t_read_outline.handle(url, offset, limit, state, section_sizes=section_sizes)
+            )
     except ProContextError as exc:
         log.warning("tool_error", tool="read_outline", code=exc.code, message=exc.message)
         raise
@@ -201,6 +351,66 @@ async def read_outline(
         raise
 
 
+@mcp.tool()
+async def read_section(
+    url: Annotated[
+        str,
+        Field(description="Documentation page URL."),
+    ],
+    section: Annotated[
+        int | str,
+        Field(
+            description=(
+                "Heading path such as 'Usage > Streaming' (titles separated by '>', "
+                "case-insensitive, intermediate levels may be omitted; titles may "
+                "contain '>' themselves), or a line number: the innermost section "
+                "containing that line is returned."
+            )
+        ),
+    ],
+    ctx: Context,
+    limit: Annotated[
+        int,
+        Field(description="Maximum number of section lines to return.", ge=1),
+    ] = 500,
+) -> ReadSectionOutput:
+    """Read exactly one section of a documentation page.
+
+    A section is a heading and every line up to the next heading of the same
+    or a higher level. Use it after read_page or read_outline instead of
+    guessing an offset and limit: name the section by heading path or by the
+    heading's line number from the outline.
+
+    Response:
+      url           — the URL of the fetched page
+      section       — heading path of the section returned, e.g. 'Usage > Streaming'
+      heading       — the section's heading line, e.g. '## Streaming'
+      start_line    — line number of the heading
+      end_line      — last line of the section
+      approx_tokens — approximate size of the whole section in tokens
+      content       — the section lines, from the heading on, up to limit lines
+      has_more      — true if the section is longer than limit lines
+      next_offset   — read_page offset to continue the section; null if complete
+      content_hash  — truncated SHA-256 (12 hex chars); compare across calls
+                      to detect if the underlying page changed
+      cached        — true if served from cache
+      cached_at     — ISO timestamp of last fetch; null for fresh network responses
+      stale         — true if cache entry expired; background refresh triggered
+    """
+    state: AppState = ctx.request_context.lifespan_context
+    try:
+        async with _admit(state, "read_section", lambda: is_page_cached(url, state)):
+            return ReadSectionOutput.model_validate(
+                await t_read_section.handle(url, section, state, limit=limit)
+            )
+    except ProContextError as exc:
+        log.warning("tool_error", tool="read_section", code=exc.code, message=exc.message)
+        raise
+    except Exception:
+        log.error("tool_unexpected_error", tool="read_section", exc_info=True)
+        raise
+
+
 @mcp.tool()
 async def search_page(
     url: Annotated[
@@ -208,8 +418,14 @@ async def search_page(
         Field(description="URL of the page to search."),
     ],
     query: Annotated[
-        str,
-        Field(description="Search term or regex pattern."),
+        str | list[str],
+        Field(
+            description=(
+                f"Search term or regex pattern, or a list of up to {MAX_QUERIES} to "
+                "search for in one pass. With a list, each matching line is tagged with "
+                "the 1-based positions of the queries it matches."
+            )
+        ),
     ],
     ctx: Context,
     mode: Annotated[
@@ -242,6 +458,32 @@ async def search_page(
         int,
         Field(description="Maximum number of matching lines to return.", ge=1),
     ] = 20,
+    context_before: Annotated[
+        int,
+        Field(
+            description="Lines of context to show before each match, like grep -B.",
+            ge=0,
+            le=MAX_CONTEXT_LINES,
+        ),
+    ] = 0,
+    context_after: Annotated[
+        int,
+        Field(
+            description="Lines of context to show after each match, like grep -A.",
+            ge=0,
+            le=MAX_CONTEXT_LINES,
+        ),
+    ] = 0,
+    output_mode: Annotated[
+        Literal["matches", "count"],
+        Field(
+            description=(
+                "matches: return matching lines. count: return only the total and "
+                "per-section match counts for the whole page, ignoring offset and "
+                "max_results."
+            )
+        ),
+    ] = "matches",
 ) -> SearchPageOutput:
     """Search within a documentation page for lines matching a query.
 
@@ -250,14 +492,22 @@ async def search_page(
     sections, then call read_page with the appropriate offset to read content.
 
     Supports literal and regex search, smart case sensitivity, and word
-    boundary matching.
+    boundary matching. Set context_before/context_after to see the lines
+    around each match without a follow-up read_page call. Pass a list of
+    related queries to search for all of them in a single call. Use
+    output_mode='count' first on large pages to see which sections match.
 
     Response:
       url          — the URL that was searched
-      query        — the search query as provided
+      query        — the search query or queries as provided
       matches      — matching lines as 'line_number:content', one per line
+                     ('line_number:[1,3] content' with several queries);
+                     context lines as 'line_number-content', hunks split by '--'
       outline      — compacted outline trimmed to match range; empty on zero matches
+      section_counts — with output_mode='count', '<line>:<heading> (<count>)'
+                     per section with matches; empty otherwise
       total_lines  — total line count of the page
+      total_matches — total matching lines; null until the search reaches the end
       has_more     — true if more matches exist beyond the returned set
       next_offset  — line number to pass as offset to continue paginating
       content_hash — truncated SHA-256 (12 hex chars); compare across calls
@@ -267,18 +517,22 @@ async def search_page(
     """
     state: AppState = ctx.request_context.lifespan_context
     try:
-        return SearchPageOutput.model_validate(
-            await t_search_page.handle(
-                url,
-                query,
-                state,
-                mode=mode,
-                case_mode=case_mode,
-                whole_word=whole_word,
-                offset=offset,
-                max_results=max_results,
+        async with _admit(state, "search_page", lambda: is_page_cached(url, state)):
+            return SearchPageOutput.model_validate(
+                await t_search_page.handle(
+                    url,
+                    query,
+                    state,
+                    mode=mode,
+                    case_mode=case_mode,
+                    whole_word=whole_word,
+                    offset=offset,
+                    max_results=max_results,
+                    context_before=context_before,
+                    context_after=context_after,
+                    output_mode=output_mode,
+                )
             )
-        )
     except ProContextError as exc:
         log.warning("tool_error", tool="search_page", code=exc.code, message=exc.message)
         raise
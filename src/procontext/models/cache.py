@@ -12,6 +12,7 @@ class PageCacheEntry(BaseModel):
     url_hash: str  # SHA-256 of url (primary key)
     content: str  # Full page markdown
     outline: str  # Plain-text outline: "<line>:<original line>\n..."
+    outline_index: bytes = b""  # Serialized OutlineIndex of outline; empty if not stored
     discovered_domains: frozenset[str] = frozenset()  # Base domains found in content
     fetched_at: datetime
     expires_at: datetime
@@ -7,6 +7,16 @@ from pydantic import BaseModel, Field, field_validator
 
 from procontext.models.registry import LibraryMatch
 
+# Upper bound on search_page context_before/context_after.
+MAX_CONTEXT_LINES = 50
+# Upper bound on queries in one search_page call.
+MAX_QUERIES = 10
+
+# Maximum number of queries in one resolve_libraries call.
+MAX_RESOLVE_QUERIES = 500
+# Upper bound on search_registry results.
+MAX_SEARCH_RESULTS = 50
+
 
 class ResolveLibraryInput(BaseModel):
     query: str
@@ -41,6 +51,93 @@ class ResolveLibraryOutput(BaseModel):
     )
 
 
+class ResolveLibrariesInput(BaseModel):
+    queries: list[str]
+    language: str | None = None
+
+    @field_validator("queries")
+    @classmethod
+    def validate_queries(cls, v: list[str]) -> list[str]:
+        if not v:
+            raise ValueError("queries must not be empty")
+        if len(v) > MAX_RESOLVE_QUERIES:
+            raise ValueError(f"queries must not exceed {MAX_RESOLVE_QUERIES} entries")
+        queries = [q.strip() for q in v]
+        if not all(queries):
+            raise ValueError("query must not be empty")
+        if any(len(q) > 500 for q in queries):
+            raise ValueError("query must not exceed 500 characters")
+        return queries
+
+    @field_validator("language")
+    @classmethod
+    def validate_language(cls, v: str | None) -> str | None:
+        if v is None:
+            return None
+        v = v.strip().lower()
+        if not v:
+            return None
+        if len(v) > 50:
+            raise ValueError("language must not exceed 50 characters")
+        return v
+
+
+class LibraryResolution(BaseModel):
+    query: str = Field(description="The query as given.")
+    matches: list[LibraryMatch] = Field(
+        description="Ranked list of matching libraries, sorted by relevance descending."
+    )
+
+
+class ResolveLibrariesOutput(BaseModel):
+    results: list[LibraryResolution] = Field(description="One entry per query, in input order.")
+    unresolved: list[str] = Field(
+        description="Queries with no match in the registry, in input order."
+    )
+
+
+class SearchRegistryInput(BaseModel):
+    query: str
+    language: str | None = None
+    ecosystem: Literal["pypi", "npm", "conda", "jsr"] | None = None
+    limit: int = 10
+
+    @field_validator("query")
+    @classmethod
+    def validate_query(cls, v: str) -> str:
+        v = v.strip()
+        if not v:
+            raise ValueError("query must not be empty")
+        if len(v) > 500:
+            raise ValueError("query must not exceed 500 characters")
+        return v
+
+    @field_validator("language")
+    @classmethod
+    def validate_language(cls, v: str | None) -> str | None:
+        if v is None:
+            return None
+        v = v.strip().lower()
+        if not v:
+            return None
+        if len(v) > 50:
+            raise ValueError("language must not exceed 50 characters")
+        return v
+
+    @field_validator("limit")
+    @classmethod
+    def validate_limit(cls, v: int) -> int:
+        if not 1 <= v <= MAX_SEARCH_RESULTS:
+            raise ValueError(f"limit must be between 1 and {MAX_SEARCH_RESULTS}")
+        return v
+
+
+class SearchRegistryOutput(BaseModel):
+    matches: list[LibraryMatch] = Field(
+        description="Libraries matching the keywords, sorted by relevance descending."
+    )
+
+
 class ReadPageInput(BaseModel):
     url: str
     offset: int = 1
@@ -110,6 +207,7 @@ class ReadOutlineInput(BaseModel):
     url: str
     offset: int = 1
     limit: int = 1000
+    section_sizes: bool = False
 
     @field_validator("url")
     @classmethod
@@ -139,7 +237,10 @@ class ReadOutlineInput(BaseModel):
 class ReadOutlineOutput(BaseModel):
     url: str = Field(description="The URL of the fetched page.")
     outline: str = Field(
-        description="Paginated outline entries in '<line_number>:<original line>' format."
+        description=(
+            "Paginated outline entries in '<line_number>:<original line>' format. With "
+            "section_sizes, section headings end in ' [<n> lines, ~<t> tokens]'."
+        )
     )
     total_entries: int = Field(description="Total outline entries after stripping empty fences.")
     has_more: bool = Field(description="True if more entries exist beyond the current window.")
@@ -165,14 +266,90 @@ class ReadOutlineOutput(BaseModel):
     )
 
 
+class ReadSectionInput(BaseModel):
+    url: str
+    section: int | str
+    limit: int = 500
+
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v: str) -> str:
+        v = v.strip()
+        if len(v) > 2048:
+            raise ValueError("url must not exceed 2048 characters")
+        if not v.startswith(("http://", "https://")):
+            raise ValueError("url must use http or https scheme")
+        return v
+
+    @field_validator("section")
+    @classmethod
+    def validate_section(cls, v: int | str) -> int | str:
+        if isinstance(v, int):
+            if v < 1:
+                raise ValueError("section line number must be >= 1")
+            return v
+        v = v.strip()
+        if not v.strip(">").strip():
+            raise ValueError("section must not be empty")
+        if len(v) > 500:
+            raise ValueError("section must not exceed 500 characters")
+        return v
+
+    @field_validator("limit")
+    @classmethod
+    def validate_limit(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("limit must be >= 1")
+        return v
+
+
+class ReadSectionOutput(BaseModel):
+    url: str = Field(description="The URL of the fetched page.")
+    section: str = Field(
+        description="Heading path of the section returned, titles joined by ' > '."
+    )
+    heading: str = Field(description="The section's heading line, e.g. '## Usage'.")
+    start_line: int = Field(description="1-based line number of the section heading.")
+    end_line: int = Field(description="Last line of the section (inclusive).")
+    approx_tokens: int = Field(description="Approximate size of the whole section in tokens.")
+    content: str = Field(description="Section lines, from the heading on, up to limit lines.")
+    has_more: bool = Field(description="True if the section continues beyond the content.")
+    next_offset: int | None = Field(
+        description=(
+            "Line number to pass as read_page offset to read the rest of the section."
+            " Null if the whole section was returned."
+        )
+    )
+    content_hash: str = Field(
+        description=(
+            "Truncated SHA-256 of the page content (12 hex chars). "
+            "Compare across paginated calls to detect if the underlying page changed."
+        )
+    )
+    cached: bool = Field(description="True if served from cache.")
+    cached_at: datetime | None = Field(
+        description="When this page was last fetched. Null for fresh network fetches."
+    )
+    stale: bool = Field(
+        default=False,
+        description=(
+            "True if the cache entry has expired. A background refresh has been"
+            " triggered. Content is stale but usable."
+        ),
+    )
+
+
 class SearchPageInput(BaseModel):
     url: str
-    query: str
+    query: str | list[str]
     mode: Literal["literal", "regex"] = "literal"
     case_mode: Literal["smart", "insensitive", "sensitive"] = "smart"
     whole_word: bool = False
     offset: int = 1
     max_results: int = 20
+    context_before: int = 0
+    context_after: int = 0
+    output_mode: Literal["matches", "count"] = "matches"
 
     @field_validator("url")
     @classmethod
@@ -186,13 +363,19 @@ class SearchPageInput(BaseModel):
 
     @field_validator("query")
     @classmethod
-    def validate_query(cls, v: str) -> str:
-        v = v.strip()
-        if not v:
+    def validate_query(cls, v: str | list[str]) -> str | list[str]:
+        queries = [v] if isinstance(v, str) else v
+        if not queries:
+            raise ValueError("query list must not be empty")
+        if len(queries) > MAX_QUERIES:
+            raise ValueError(f"query list must not exceed {MAX_QUERIES} queries")
+        queries = [q.strip() for q in queries]
+        if not all(queries):
             raise ValueError("query must not be empty")
-        if len(v) > 200:
+        if any(len(q) > 200 for q in queries):
             raise ValueError("query must not exceed 200 characters")
-        return v
+        # A one-element list is an ordinary single-query search.
+        return queries[0] if len(queries) == 1 else queries
 
     @field_validator("offset")
     @classmethod
@@ -208,14 +391,25 @@ class SearchPageInput(BaseModel):
             raise ValueError("max_results must be >= 1")
         return v
 
+    @field_validator("context_before", "context_after")
+    @classmethod
+    def validate_context(cls, v: int) -> int:
+        if not 0 <= v <= MAX_CONTEXT_LINES:
+            raise ValueError(f"context_before and context_after must be 0-{MAX_CONTEXT_LINES}")
+        return v
+
 
 class SearchPageOutput(BaseModel):
     url: str = Field(description="The URL that was searched.")
-    query: str = Field(description="The search query as provided.")
+    query: str | list[str] = Field(description="The search query or queries as provided.")
     matches: str = Field(
         description=(
             "Matching lines formatted as '<line_number>:<content>', one per line. "
-            "Empty string when no matches found."
+            "With several queries, each line is tagged with the 1-based positions of "
+            "the queries it matches: '<line_number>:[1,3] <content>'. "
+            "With context_before/context_after, context lines are formatted "
+            "'<line_number>-<content>' and non-adjacent hunks are separated by a "
+            "'--' line. Empty string when no matches found."
         )
     )
     outline: str = Field(
@@ -223,7 +417,22 @@ class SearchPageOutput(BaseModel):
             "Compacted outline trimmed to match range. Empty string when no matches found."
         )
     )
+    section_counts: str = Field(
+        default="",
+        description=(
+            "With output_mode='count': matches per section as "
+            "'<heading_line>:<heading> (<count>)', one per section that has matches. "
+            "Empty string otherwise."
+        ),
+    )
     total_lines: int = Field(description="Total number of lines in the page.")
+    total_matches: int | None = Field(
+        default=None,
+        description=(
+            "Total number of matching lines in the page. Null until a search has "
+            "scanned to the end of the page."
+        ),
+    )
     has_more: bool = Field(description="True if more matches exist beyond the returned set.")
     next_offset: int | None = Field(
         description="Line number to pass as offset to continue paginating. Null if no more."
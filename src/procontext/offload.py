@@ -0,0 +1,75 @@
+"""Offloading of CPU-bound page processing from the event loop.
+
+Parsing outlines, extracting domains, hashing, splitting lines and scanning
+for matches are all synchronous. On a multi-megabyte page each of them
+holds the event loop for tens of milliseconds, stalling every other
+in-flight call. ``Offloader`` runs such work in an executor once the input
+reaches a size threshold; smaller inputs run inline, where an executor
+round-trip would cost more than it saves.
+
+Two entry points:
+
+- ``run`` always uses threads. Any callable works, including ones that close
+  over in-process state such as search cursors.
+- ``run_pure`` uses the process pool when ``executor.kind`` is ``process``.
+  It is for module-level functions whose arguments and result can be
+  pickled; in thread mode it behaves like ``run``.
+
+Threads keep the loop responsive even for pure-Python work: the interpreter
+switches back to the loop thread every few milliseconds. Hashing releases
+the GIL, so it also runs in parallel. A process pool adds true parallelism
+at the cost of pickling the page text on each call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from procontext.config import ExecutorSettings
+
+
+class Offloader:
+    """Runs work inline or in an executor depending on its size."""
+
+    def __init__(self, settings: ExecutorSettings | None = None) -> None:
+        # Without settings everything runs inline — the default for tests and tools.
+        self._min_chars = settings.min_chars if settings else 0
+        self._threads: Executor | None = None
+        self._processes: Executor | None = None
+        if settings is None or settings.kind == "inline":
+            return
+        self._threads = ThreadPoolExecutor(
+            max_workers=settings.max_workers, thread_name_prefix="procontext-offload"
+        )
+        if settings.kind == "process":
+            self._processes = ProcessPoolExecutor(
+                max_workers=settings.max_workers,
+                # spawn: a forked child would inherit the event loop and its threads.
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def run[*Ts, R](self, size: int, fn: Callable[[*Ts], R], *args: *Ts) -> R:
+        """Call ``fn(*args)``, in a worker thread when *size* reaches the threshold."""
+        return await self._submit(self._threads, size, fn, *args)
+
+    async def run_pure[*Ts, R](self, size: int, fn: Callable[[*Ts], R], *args: *Ts) -> R:
+        """Like ``run``, but in a worker process when the executor kind is ``process``."""
+        return await self._submit(self._processes or self._threads, size, fn, *args)
+
+    def close(self) -> None:
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit[*Ts, R](
+        self, executor: Executor | None, size: int, fn: Callable[[*Ts], R], *args: *Ts
+    ) -> R:
+        if executor is None or size < self._min_chars:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
@@ -5,14 +5,27 @@ entries, applies intelligent compaction for token-efficient responses, and
 formats entries back to the wire format.
 
 The raw outline is produced by ``parser.py`` and stored as-is in the cache.
-This module operates on that cached string at response time.
+``OutlineIndex`` is its parsed, fence-stripped form, built once at ingest and
+cached next to it, so tools can slice, trim and compact the outline without
+re-parsing the string on every call.
 """
 
 from __future__ import annotations
 
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from dataclasses import dataclass
+from itertools import compress
+from typing import TYPE_CHECKING
 
 from procontext.parser import _FENCE_RE, _HEADING_RE
+from procontext.search import LineReader, count_lines
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
 
 
 @dataclass(frozen=True)
@@ -38,17 +51,23 @@ def parse_outline_entries(outline_string: str) -> list[OutlineEntry]:
     split on the first ``:``, then classified as a heading or fence line with
     CommonMark-compliant fence state tracking.
     """
-    if not outline_string:
-        return []
+    return [entry for _, entry in _iter_entries(outline_string)]
 
-    entries: list[OutlineEntry] = []
+
+def _iter_entries(outline_string: str) -> Iterator[tuple[int, OutlineEntry]]:
+    """Yield ``(offset, entry)`` pairs, *offset* being where the entry's line starts."""
+    if not outline_string:
+        return
 
     # Fence state tracking (CommonMark rules)
     in_fence = False
     fence_char: str = ""
     fence_len: int = 0
+    next_offset = 0
 
     for raw_line in outline_string.split("\n"):
+        offset = next_offset
+        next_offset += len(raw_line) + 1
         if not raw_line:
             continue
 
@@ -72,57 +91,59 @@ def parse_outline_entries(outline_string: str) -> list[OutlineEntry]:
                 in_fence = True
                 fence_char = char
                 fence_len = length
-                entries.append(
+                yield (
+                    offset,
                     OutlineEntry(
                         line_number=line_number,
                         text=text,
                         depth=None,
                         is_fence=True,
                         in_fence=False,  # The opener itself is not "inside" the fence
-                    )
+                    ),
                 )
             elif char == fence_char and length >= fence_len:
                 # Closing the fence
                 in_fence = False
                 fence_char = ""
                 fence_len = 0
-                entries.append(
+                yield (
+                    offset,
                     OutlineEntry(
                         line_number=line_number,
                         text=text,
                         depth=None,
                         is_fence=True,
                         in_fence=False,  # The closer itself is not "inside" the fence
-                    )
+                    ),
                 )
             else:
                 # Fence-like line inside a fence that doesn't close it
                 # (different char or shorter length) — treat as heading check
                 depth = _extract_depth(text)
-                entries.append(
+                yield (
+                    offset,
                     OutlineEntry(
                         line_number=line_number,
                         text=text,
                         depth=depth,
                         is_fence=False,
                         in_fence=True,
-                    )
+                    ),
                 )
         else:
             # Heading line
             depth = _extract_depth(text)
-            entries.append(
+            yield (
+                offset,
                 OutlineEntry(
                     line_number=line_number,
                     text=text,
                     depth=depth,
                     is_fence=False,
                     in_fence=in_fence,
-                )
+                ),
             )
 
-    return entries
-
 
 def _extract_depth(text: str) -> int | None:
     """Extract heading depth (1-6) from a line, or None if not a heading."""
@@ -144,7 +165,12 @@ def strip_empty_fences(entries: list[OutlineEntry]) -> list[OutlineEntry]:
     blocks from structural headings.  Fence pairs with zero heading entries
     add no navigational value and are removed.
     """
-    # Identify indices to remove
+    remove = _empty_fence_indices(entries)
+    return [e for i, e in enumerate(entries) if i not in remove]
+
+
+def _empty_fence_indices(entries: list[OutlineEntry]) -> set[int]:
+    """Return the indices of empty fence pairs and everything between them."""
     remove: set[int] = set()
     opener_idx: int | None = None
 
@@ -158,17 +184,59 @@ def strip_empty_fences(entries: list[OutlineEntry]) -> list[OutlineEntry]:
                 has_headings = any(entries[j].depth is not None for j in range(opener_idx + 1, i))
                 if not has_headings:
                     # Mark opener, closer, and everything between for removal
-                    for j in range(opener_idx, i + 1):
-                        remove.add(j)
+                    remove.update(range(opener_idx, i + 1))
                 opener_idx = None
 
-    return [e for i, e in enumerate(entries) if i not in remove]
+    return remove
 
 
 # ---------------------------------------------------------------------------
 # Compaction
 # ---------------------------------------------------------------------------
 
+# An entry's kind packs its heading depth (0 for none) with its fence flags,
+# so one byte per entry is enough to count, compact and filter an outline.
+_FENCE = 0b01000
+_IN_FENCE = 0b10000
+_KINDS = _IN_FENCE | 0b111
+
+_FENCED_KINDS = frozenset({_FENCE, *range(_IN_FENCE, _IN_FENCE + 7)})
+
+# Kinds removed by each compaction stage, in order: H6, H5, fenced content
+# and fence markers, H4, H3.
+_COMPACTION_STAGES: tuple[frozenset[int], ...] = (
+    frozenset({6, _IN_FENCE | 6}),
+    frozenset({5, _IN_FENCE | 5}),
+    _FENCED_KINDS,
+    frozenset({4}),
+    frozenset({3}),
+)
+
+
+def _kind(entry: OutlineEntry) -> int:
+    kind = entry.depth or 0
+    if entry.is_fence:
+        kind |= _FENCE
+    if entry.in_fence:
+        kind |= _IN_FENCE
+    return kind
+
+
+def _compaction_kept_kinds(counts: Sequence[int], max_entries: int) -> frozenset[int] | None:
+    """Return the kinds that survive compaction, given per-kind entry *counts*.
+
+    The stage is chosen from the counts alone: each stage's resulting size is
+    the previous size minus the counts of the kinds it removes.
+    """
+    kept = frozenset(range(len(counts)))
+    remaining = sum(counts)
+    for removed in _COMPACTION_STAGES:
+        if remaining <= max_entries:
+            return kept
+        remaining -= sum(counts[k] for k in removed & kept)
+        kept -= removed
+    return kept if remaining <= max_entries else None
+
 
 def compact_outline(
     entries: list[OutlineEntry], max_entries: int = 50
@@ -188,35 +256,16 @@ def compact_outline(
     if len(entries) <= max_entries:
         return entries
 
-    result = entries
-
-    # Stage 1: Remove H6
-    result = [e for e in result if e.depth != 6]
-    if len(result) <= max_entries:
-        return result
-
-    # Stage 2: Remove H5
-    result = [e for e in result if e.depth != 5]
-    if len(result) <= max_entries:
-        return result
-
-    # Stage 3: Remove fenced content and fence markers
-    result = [e for e in result if not e.in_fence and not e.is_fence]
-    if len(result) <= max_entries:
-        return result
+    kinds = [_kind(e) for e in entries]
+    counts = [0] * (_KINDS + 1)
+    for kind, count in Counter(kinds).items():
+        counts[kind] = count
 
-    # Stage 4: Remove H4
-    result = [e for e in result if e.depth != 4]
-    if len(result) <= max_entries:
-        return result
-
-    # Stage 5: Remove H3
-    result = [e for e in result if e.depth != 3]
-    if len(result) <= max_entries:
-        return result
-
-    # Irreducible — only H1/H2 remain and still exceed max_entries
-    return None
+    kept = _compaction_kept_kinds(counts, max_entries)
+    if kept is None:
+        # Irreducible — only H1/H2 remain and still exceed max_entries
+        return None
+    return [e for e, kind in zip(entries, kinds, strict=True) if kind in kept]
 
 
 # ---------------------------------------------------------------------------
@@ -227,8 +276,17 @@ def compact_outline(
 def trim_outline_to_range(
     entries: list[OutlineEntry], first_line: int, last_line: int
 ) -> list[OutlineEntry]:
-    """Filter entries to those within the given line range (inclusive)."""
-    return [e for e in entries if first_line <= e.line_number <= last_line]
+    """Filter entries to those within the given line range (inclusive).
+
+    *entries* must be in line order, as parsed; the range is found by bisection.
+    """
+    start = bisect_left(entries, first_line, key=_line_number)
+    end = bisect_right(entries, last_line, lo=start, key=_line_number)
+    return entries[start:end]
+
+
+def _line_number(entry: OutlineEntry) -> int:
+    return entry.line_number
 
 
 # ---------------------------------------------------------------------------
@@ -245,7 +303,7 @@ def format_outline(entries: list[OutlineEntry]) -> str:
 
 
 def build_compaction_note(
-    entries: list[OutlineEntry],
+    entries: Iterable[OutlineEntry],
     total_entries: int,
     *,
     match_range: tuple[int, int] | None = None,
@@ -276,3 +334,252 @@ def build_compaction_note(
         f"[Compacted: showing {depth_desc} headings{range_desc}. "
         f"Use read_outline for full outline ({total_entries} entries).]"
     )
+
+
+# ---------------------------------------------------------------------------
+# Array-backed outline
+# ---------------------------------------------------------------------------
+
+# Serialized layout (little-endian): header, per-kind counts, then the line
+# number, line offset, section end line and section size of every entry as
+# parallel arrays, then one kind byte per entry.
+_INDEX_HEADER = struct.Struct("<4sII")
+_INDEX_MAGIC = b"POX2"
+_BIG_ENDIAN = sys.byteorder == "big"
+
+# ``bytes.translate`` table selecting headings outside fences.
+_HEADING_MASK = bytes(1 <= kind <= 6 for kind in range(256))
+
+
+class OutlineIndex:
+    """Parsed, fence-stripped outline held as parallel arrays.
+
+    Entry *i* is the raw outline line starting at ``offsets[i]``, at page line
+    ``line_numbers[i]``, whose kind byte packs its heading depth and fence
+    flags. Per-kind counts let ``compact`` choose its stage without a scan,
+    ``trim`` bisects the line numbers, and ``slice`` copies only the arrays;
+    ``OutlineEntry`` objects and wire text are produced for the entries
+    actually returned.
+
+    Headings outside fences also carry their section — the lines up to the
+    next heading of the same or a higher level — as its last line
+    (``section_ends``) and its size in characters (``section_chars``); other
+    entries hold 0 in both.
+
+    Built once per fetched page with ``build`` and cached via ``to_bytes``.
+    """
+
+    __slots__ = (
+        "_counts",
+        "_kinds",
+        "_line_numbers",
+        "_offsets",
+        "_section_chars",
+        "_section_ends",
+        "raw",
+    )
+
+    def __init__(
+        self,
+        raw: str,
+        line_numbers: array[int],
+        offsets: array[int],
+        section_ends: array[int],
+        section_chars: array[int],
+        kinds: bytes,
+        counts: Sequence[int] | None = None,
+    ) -> None:
+        self.raw = raw
+        self._line_numbers = line_numbers
+        self._offsets = offsets
+        self._section_ends = section_ends
+        self._section_chars = section_chars
+        self._kinds = kinds
+        self._counts = counts
+
+    @classmethod
+    def build(cls, raw: str, content: str) -> OutlineIndex:
+        """Parse the raw outline of *content*, strip empty fences and size sections."""
+        pairs = list(_iter_entries(raw))
+        remove = _empty_fence_indices([entry for _, entry in pairs])
+        kept = [pair for i, pair in enumerate(pairs) if i not in remove]
+        kinds = bytes(_kind(entry) for _, entry in kept)
+        line_numbers = array("I", (entry.line_number for _, entry in kept))
+        section_ends, section_chars = _size_sections(line_numbers, kinds, content)
+        return cls(
+            raw,
+            line_numbers,
+            array("I", (offset for offset, _ in kept)),
+            section_ends,
+            section_chars,
+            kinds,
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: str, data: bytes) -> OutlineIndex:
+        """Load an index serialized by ``to_bytes`` for the outline *raw*.
+
+        Raises ``ValueError`` if *data* is malformed or belongs to another outline.
+        """
+        if len(data) < _INDEX_HEADER.size:
+            raise ValueError("outline index too short")
+        magic, raw_length, size = _INDEX_HEADER.unpack_from(data)
+        if magic != _INDEX_MAGIC or raw_length != len(raw):
+            raise ValueError("outline index does not match outline")
+
+        arrays = [array("I") for _ in range(5)]
+        start = _INDEX_HEADER.size
+        for arr, length in zip(arrays, (_KINDS + 1, size, size, size, size), strict=True):
+            end = start + length * arr.itemsize
+            arr.frombytes(data[start:end])  # ValueError on a partial item
+            if len(arr) != length:
+                raise ValueError("outline index is truncated")
+            if _BIG_ENDIAN:
+                arr.byteswap()
+            start = end
+        kinds = data[start:]
+        if len(kinds) != size:
+            raise ValueError("outline index is truncated")
+        counts, line_numbers, offsets, section_ends, section_chars = arrays
+        return cls(raw, line_numbers, offsets, section_ends, section_chars, kinds, counts)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index; the raw outline itself is stored separately."""
+        parts = [_INDEX_HEADER.pack(_INDEX_MAGIC, len(self.raw), len(self))]
+        for arr in (array("I", self.counts), *self._arrays()):
+            if _BIG_ENDIAN:
+                arr = array("I", arr)
+                arr.byteswap()
+            parts.append(arr.tobytes())
+        parts.append(self._kinds)
+        return b"".join(parts)
+
+    @property
+    def counts(self) -> Sequence[int]:
+        """Number of entries of each kind."""
+        if self._counts is None:
+            counts = [0] * (_KINDS + 1)
+            for kind, count in Counter(self._kinds).items():
+                counts[kind] = count
+            self._counts = counts
+        return self._counts
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def __iter__(self) -> Iterator[OutlineEntry]:
+        return map(self._entry, range(len(self)))
+
+    def slice(self, start: int, stop: int) -> OutlineIndex:
+        """Return entries ``start:stop`` (0-based, by entry position)."""
+        return self._derive([arr[start:stop] for arr in self._arrays()], self._kinds[start:stop])
+
+    def trim(self, first_line: int, last_line: int) -> OutlineIndex:
+        """Return the entries within the given page line range (inclusive)."""
+        start = bisect_left(self._line_numbers, first_line)
+        end = bisect_right(self._line_numbers, last_line, lo=start)
+        return self.slice(start, end)
+
+    def compact(self, max_entries: int = 50) -> OutlineIndex | None:
+        """Return the entries ``compact_outline`` would keep, or ``None``."""
+        if len(self) <= max_entries:
+            return self
+        kept = _compaction_kept_kinds(self.counts, max_entries)
+        if kept is None:
+            return None
+        selectors = self._kinds.translate(bytes(kind in kept for kind in range(256)))
+        return self._derive(
+            [array("I", compress(arr, selectors)) for arr in self._arrays()],
+            bytes(compress(self._kinds, selectors)),
+        )
+
+    def headings(self) -> list[OutlineEntry]:
+        """Return the heading entries outside fences (see ``section_headings``)."""
+        return [self._entry(i) for i in self._heading_positions()]
+
+    def sections(self) -> list[tuple[OutlineEntry, int, int]]:
+        """Return ``(heading, end_line, chars)`` for every section, in page order."""
+        return [
+            (self._entry(i), self._section_ends[i], self._section_chars[i])
+            for i in self._heading_positions()
+        ]
+
+    def format(self, *, section_sizes: bool = False) -> str:
+        """Return the entries in the wire format, like ``format_outline``.
+
+        With *section_sizes*, each section heading is followed by its size,
+        e.g. ``42:## Usage [56 lines, ~1200 tokens]``.
+        """
+        lines = map(self._raw_line, self._offsets)
+        if not section_sizes:
+            return "\n".join(lines)
+        return "\n".join(
+            f"{line} [{end - start + 1} lines, ~{approx_tokens(chars)} tokens]" if end else line
+            for line, start, end, chars in zip(
+                lines, self._line_numbers, self._section_ends, self._section_chars, strict=True
+            )
+        )
+
+    def _arrays(self) -> tuple[array[int], ...]:
+        return self._line_numbers, self._offsets, self._section_ends, self._section_chars
+
+    def _derive(self, arrays: list[array[int]], kinds: bytes) -> OutlineIndex:
+        """Return an index over a subset of the entries, given as ``_arrays()`` order."""
+        line_numbers, offsets, section_ends, section_chars = arrays
+        return OutlineIndex(self.raw, line_numbers, offsets, section_ends, section_chars, kinds)
+
+    def _heading_positions(self) -> Iterator[int]:
+        return compress(range(len(self)), self._kinds.translate(_HEADING_MASK))
+
+    def _raw_line(self, offset: int) -> str:
+        end = self.raw.find("\n", offset)
+        return self.raw[offset:] if end == -1 else self.raw[offset:end]
+
+    def _entry(self, i: int) -> OutlineEntry:
+        line = self._raw_line(self._offsets[i])
+        kind = self._kinds[i]
+        return OutlineEntry(
+            line_number=self._line_numbers[i],
+            text=line[line.index(":") + 1 :],
+            depth=(kind & 0b111) or None,
+            is_fence=bool(kind & _FENCE),
+            in_fence=bool(kind & _IN_FENCE),
+        )
+
+
+# Rough size of a token in English prose and code, for section size hints.
+_CHARS_PER_TOKEN = 4
+
+
+def approx_tokens(chars: int) -> int:
+    """Estimate the number of tokens in *chars* characters of text."""
+    return -(-chars // _CHARS_PER_TOKEN)
+
+
+def _size_sections(
+    line_numbers: array[int], kinds: bytes, content: str
+) -> tuple[array[int], array[int]]:
+    """Return each entry's section end line and section size in characters.
+
+    A section runs from its heading to the line before the next heading of the
+    same or a higher level (outside fences), or to the end of the page.
+    """
+    section_ends = array("I", bytes(4 * len(kinds)))
+    section_chars = array("I", section_ends)
+    reader = LineReader(content)
+    open_sections: list[tuple[int, int, int]] = []  # (depth, entry index, start offset)
+
+    def close(until_depth: int, end_line: int, end_offset: int) -> None:
+        while open_sections and open_sections[-1][0] >= until_depth:
+            _, i, start = open_sections.pop()
+            section_ends[i] = end_line
+            section_chars[i] = end_offset - start
+
+    for i in compress(range(len(kinds)), kinds.translate(_HEADING_MASK)):
+        line_number = line_numbers[i]
+        start = reader.start_of(line_number)
+        start = len(content) if start is None else start
+        close(kinds[i], line_number - 1, start)
+        open_sections.append((kinds[i], i, start))
+    close(1, count_lines(content), len(content))
+    return section_ends, section_chars
@@ -1,14 +1,20 @@
 """Page outline parser for documentation pages.
 
-Single-pass algorithm that extracts H1–H6 headings and fenced code block
-boundaries from Markdown content. Outputs a plain-text outline with
-1-based line numbers for agent navigation via the ``read_page`` tool.
+Extracts H1–H6 headings and fenced code block boundaries from Markdown
+content. Outputs a plain-text outline with 1-based line numbers for agent
+navigation via the ``read_page`` tool.
 
 Emitted lines:
 - Heading lines (H1–H6), including those inside fenced code blocks and those
   prefixed with a blockquote marker (``> ``).
 - Fence opener and closer lines (`` ``` `` / ``~~~``), so the agent can tell
   which headings belong to code block content vs. structural page sections.
+
+Headings and fences are a small fraction of a page, so rather than testing
+every line, the whole buffer is searched for the characters they must
+contain, and only the lines holding one are classified — by the same
+per-line rules. Pages with line separators other than ``\n``/``\r\n`` take
+the line-by-line path.
 """
 
 from __future__ import annotations
@@ -24,6 +30,17 @@ _FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
 # prefix handles blockquote headings (``> ## Section``).
 _HEADING_RE = re.compile(r"(?:>\s*)?(#{1,6}) .+")
 
+# Every heading contains "#" and every fence "```" or "~~~", so only lines
+# containing one of these need classifying — found at str.find speed.
+_MARKERS = ("#", "```", "~~~")
+
+# Below this many characters per candidate line (e.g. code with a comment on
+# every other line), classifying every line is cheaper than skipping.
+_CHARS_PER_CANDIDATE = 200
+
+# Line separators ``str.splitlines()`` honours besides \n and \r.
+_OTHER_SEPARATORS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
 
 def parse_outline(content: str) -> str:
     """Extract a plain-text structural map from Markdown content.
@@ -40,6 +57,55 @@ def parse_outline(content: str) -> str:
     # which would prevent the heading regex from matching line 1.
     content = content.removeprefix("\ufeff")
 
+    if any(sep in content for sep in _OTHER_SEPARATORS) or (
+        "\r" in content and content.count("\r") != content.count("\r\n")
+    ):
+        return _parse_outline_lines(content)
+
+    starts = _candidate_line_starts(content)
+    if starts is None:
+        return _parse_outline_lines(content)
+
+    lines: list[str] = []
+    lineno = 1
+    prev_start = 0
+
+    for start in starts:
+        lineno += content.count("\n", prev_start, start)
+        prev_start = start
+        end = content.find("\n", start)
+        line = (content[start:] if end < 0 else content[start:end]).removesuffix("\r")
+        if _FENCE_RE.match(line) or _HEADING_RE.match(line.strip()):
+            lines.append(f"{lineno}:{line}")
+
+    return "\n".join(lines)
+
+
+def _candidate_line_starts(content: str) -> list[int] | None:
+    """Return the sorted start offsets of lines containing any ``_MARKERS``.
+
+    Returns None once candidates are too dense for skipping to pay off.
+    """
+    limit = len(content) // _CHARS_PER_CANDIDATE
+    starts: set[int] = set()
+    for marker in _MARKERS:
+        # A single-character probe runs at memchr speed; most pages have no "~".
+        if marker[0] not in content:
+            continue
+        pos = content.find(marker)
+        while pos >= 0:
+            starts.add(content.rfind("\n", 0, pos) + 1)
+            if len(starts) > limit:
+                return None
+            end = content.find("\n", pos)
+            if end < 0:
+                break
+            pos = content.find(marker, end + 1)
+    return sorted(starts)
+
+
+def _parse_outline_lines(content: str) -> str:
+    """Line-by-line ``parse_outline`` for any line separators ``splitlines`` knows."""
     lines: list[str] = []
 
     for lineno, line in enumerate(content.splitlines(), start=1):
@@ -19,6 +19,8 @@ class CacheProtocol(Protocol):
 
     async def get_page(self, url_hash: str) -> PageCacheEntry | None: ...
 
+    async def has_page(self, url_hash: str) -> bool: ...
+
     async def set_page(
         self,
         url: str,
@@ -27,6 +29,7 @@ class CacheProtocol(Protocol):
         outline: str,
         ttl_hours: int,
         *,
+        outline_index: bytes = b"",
         discovered_domains: frozenset[str] = frozenset(),
     ) -> None: ...
 
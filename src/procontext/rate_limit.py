@@ -0,0 +1,260 @@
+"""Per-client rate limiting and fair queuing for the HTTP transport.
+
+Two independent mechanisms, both keyed by a client identity (the verified
+bearer key or the remote address):
+
+- A token bucket per client caps each client's sustained request rate while
+  allowing short bursts. An empty bucket yields ``429`` with ``Retry-After``.
+- A fair scheduler caps requests in flight across all clients. When it is
+  saturated, requests wait in per-client queues that are served round-robin,
+  so a client with a deep backlog cannot delay another client's next request
+  by more than one turn. A full per-client queue also yields ``429``.
+
+Only ``POST`` requests are subject to either mechanism: the long-lived
+``GET`` SSE stream and session ``DELETE`` carry no tool work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING
+
+import structlog
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+from procontext.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+    from procontext.config import ServerSettings
+
+log = structlog.get_logger()
+
+# Bucket table size that triggers pruning of idle clients.
+_MAX_TRACKED_CLIENTS = 10_000
+
+# Set in the ASGI scope by MCPSecurityMiddleware once the bearer key is verified.
+AUTHENTICATED_SCOPE_KEY = "procontext.authenticated"
+
+RATE_LIMITED_TOTAL = REGISTRY.counter(
+    "procontext_rate_limited_total",
+    "HTTP requests rejected with 429, by reason (rate or queue).",
+    ("reason",),
+)
+FAIR_QUEUE_DEPTH = REGISTRY.gauge(
+    "procontext_fair_queue_depth", "HTTP requests waiting in per-client fair queues."
+)
+
+
+class TokenBucket:
+    """Classic token bucket: *rate* tokens per second, holding at most *burst*."""
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def try_take(self, now: float) -> float:
+        """Take one token. Return 0 on success, else seconds until one is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimiter:
+    """Token buckets for the clients seen most recently, at most *max_clients*."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        max_clients: int = _MAX_TRACKED_CLIENTS,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._max_clients = max_clients
+        # Least recently seen first.
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def check(self, client: str) -> float:
+        """Consume one request for *client*; return 0 or the seconds to wait."""
+        now = self._clock()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self._max_clients:
+                self._prune(now)
+            bucket = self._buckets[client] = TokenBucket(self._rate, self._burst, now)
+        else:
+            self._buckets.move_to_end(client)
+        return bucket.try_take(now)
+
+    def _prune(self, now: float) -> None:
+        # A full bucket is indistinguishable from a new one, so it can be dropped.
+        for client in [c for c, b in self._buckets.items() if b.is_full(now)]:
+            del self._buckets[client]
+        # Still too many clients mid-burst: forget the least recently seen, which
+        # resets their budget rather than letting the table grow without bound.
+        while len(self._buckets) >= self._max_clients:
+            self._buckets.popitem(last=False)
+
+
+class FairScheduler:
+    """Global in-flight cap with round-robin service across per-client queues."""
+
+    def __init__(self, max_in_flight: int, max_queued_per_client: int) -> None:
+        self._max_in_flight = max_in_flight
+        self._max_queued_per_client = max_queued_per_client
+        self._in_flight = 0
+        self._queued = 0
+        # Insertion order is the round-robin order; a served client moves to the back.
+        self._queues: OrderedDict[str, deque[asyncio.Future[None]]] = OrderedDict()
+
+    async def acquire(self, client: str) -> bool:
+        """Wait for a slot; return False without waiting if *client*'s queue is full."""
+        if self._in_flight < self._max_in_flight and not self._queues:
+            self._in_flight += 1
+            return True
+
+        queue = self._queues.get(client)
+        if queue is not None and len(queue) >= self._max_queued_per_client:
+            return False
+        if queue is None:
+            if self._max_queued_per_client <= 0:
+                return False
+            queue = self._queues[client] = deque()
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        self._set_queued(self._queued + 1)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled — pass it on.
+                self.release()
+            elif future in queue:
+                queue.remove(future)
+                self._set_queued(self._queued - 1)
+                if not queue and self._queues.get(client) is queue:
+                    del self._queues[client]
+            raise
+        return True
+
+    def release(self) -> None:
+        """Hand the slot to the next client in round-robin order, or free it."""
+        while self._queues:
+            client, queue = self._queues.popitem(last=False)
+            future = queue.popleft()
+            self._set_queued(self._queued - 1)
+            if queue:
+                self._queues[client] = queue
+            if not future.done():
+                future.set_result(None)  # slot ownership transfers; in-flight unchanged
+                return
+        self._in_flight -= 1
+
+    def _set_queued(self, value: int) -> None:
+        self._queued = value
+        FAIR_QUEUE_DEPTH.set(value)
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware applying per-client rate limits and fair queuing.
+
+    Installed inside ``MCPSecurityMiddleware`` so unauthenticated requests are
+    rejected before they consume anyone's budget. Requests are keyed by bearer
+    key only when ``auth_enabled`` and the middleware has verified it; an
+    unverified ``Authorization`` header would let a client pick its own bucket.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        settings: ServerSettings,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.app = app
+        self.key_by_auth = settings.rate_limit_key == "auth_key" and settings.auth_enabled
+        if settings.rate_limit_key == "auth_key" and not settings.auth_enabled:
+            log.warning("rate_limit_key_ignored", reason="auth_disabled", key="remote_address")
+        self.limiter = (
+            RateLimiter(settings.rate_limit_per_second, settings.rate_limit_burst, clock=clock)
+            if settings.rate_limit_per_second > 0
+            else None
+        )
+        self.scheduler = (
+            FairScheduler(settings.fair_max_in_flight, settings.fair_max_queued_per_client)
+            if settings.fair_max_in_flight > 0
+            else None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        client = self._client_key(scope)
+
+        if self.limiter is not None:
+            retry_after = self.limiter.check(client)
+            if retry_after > 0:
+                await _too_many_requests("rate", math.ceil(retry_after))(scope, receive, send)
+                return
+
+        if self.scheduler is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.scheduler.acquire(client):
+            await _too_many_requests("queue", 1)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.scheduler.release()
+
+    def _client_key(self, scope: Scope) -> str:
+        if self.key_by_auth and scope.get(AUTHENTICATED_SCOPE_KEY):
+            auth_header = Headers(scope=scope).get("authorization", "")
+            if auth_header:
+                # Never keep raw credentials in memory longer than the request.
+                return "key:" + hashlib.sha256(auth_header.encode()).hexdigest()[:16]
+        client = scope.get("client")
+        # Unix socket connections have no peer address.
+        return "addr:" + (client[0] if client and client[0] else "local")
+
+
+def _too_many_requests(reason: str, retry_after: int) -> Response:
+    RATE_LIMITED_TOTAL.inc(reason=reason)
+    log.debug("http_rate_limited", reason=reason, retry_after=retry_after)
+    return Response(
+        "Too Many Requests",
+        status_code=429,
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -0,0 +1,253 @@
+"""Time-limited execution of agent-supplied regex searches.
+
+Python's ``re`` engine cannot be interrupted: a catastrophic-backtracking
+pattern holds the GIL until it finishes, which on a large page can be
+minutes — long enough to freeze every other client. Regex-mode searches
+therefore run in worker processes that are killed when they exceed the time
+budget. A killed worker is replaced on the next search.
+
+Each worker keeps its own search cursors (see ``search_cursor``), so
+paginating a regex search stays cheap. A search is always routed to the same
+worker for a given cursor key, and the page text is only sent when that
+worker does not already hold a cursor for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import re
+from contextlib import suppress
+from typing import TYPE_CHECKING, cast
+
+import structlog
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.lru import LRUCache
+from procontext.search_cursor import SearchCursor
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+    from procontext.config import SearchSettings
+    from procontext.search import SearchResult
+    from procontext.search_cursor import SearchCursorKey
+
+log = structlog.get_logger()
+
+# (result, total_lines, total_matches), or None when the worker needs the page text.
+# The result is a SearchResult for "page" requests and a dict for "sections".
+_Reply = tuple[object, int, int | None] | None
+
+
+class RegexSandbox:
+    """A small pool of killable worker processes for regex searches."""
+
+    def __init__(self, settings: SearchSettings) -> None:
+        self._timeout = settings.regex_timeout_seconds
+        self._workers = [
+            _Worker(settings.cursor_cache_entries, settings.cursor_cache_max_chars)
+            for _ in range(max(settings.regex_workers, 1))
+        ]
+        self._reapers: set[asyncio.Task[None]] = set()
+
+    async def page(
+        self,
+        key: SearchCursorKey,
+        content: str,
+        matcher: re.Pattern[str] | None,
+        *,
+        offset: int,
+        max_results: int,
+        per_query: Sequence[re.Pattern[str]] = (),
+    ) -> tuple[SearchResult, int, int | None]:
+        """Return ``(result, total_lines, total_matches)`` as ``SearchCursor`` would.
+
+        Raises:
+            ProContextError: ``INVALID_INPUT`` when the search exceeds the time
+                budget or kills its worker.
+        """
+        result, total_lines, total_matches = await self._request(
+            key, content, matcher, per_query, "page", (offset, max_results)
+        )
+        return cast("SearchResult", result), total_lines, total_matches
+
+    async def section_counts(
+        self,
+        key: SearchCursorKey,
+        content: str,
+        matcher: re.Pattern[str] | None,
+        heading_lines: list[int],
+        per_query: Sequence[re.Pattern[str]] = (),
+    ) -> tuple[dict[int, int], int, int | None]:
+        """Return ``(counts, total_lines, total_matches)`` as ``SearchCursor`` would.
+
+        Raises:
+            ProContextError: as for ``page``.
+        """
+        counts, total_lines, total_matches = await self._request(
+            key, content, matcher, per_query, "sections", (heading_lines,)
+        )
+        return cast("dict[int, int]", counts), total_lines, total_matches
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.stop()
+
+    async def _request(
+        self,
+        key: SearchCursorKey,
+        content: str,
+        matcher: re.Pattern[str] | None,
+        per_query: Sequence[re.Pattern[str]],
+        op: str,
+        args: tuple[object, ...],
+    ) -> tuple[object, int, int | None]:
+        worker = self._workers[hash(key) % len(self._workers)]
+        # Queries scanned separately (see search_multi) send no combined pattern.
+        patterns = [None if m is None else (m.pattern, m.flags) for m in (matcher, *per_query)]
+        request = (key, None, patterns, op, args)
+        pattern = matcher.pattern if matcher is not None else "|".join(m.pattern for m in per_query)
+        async with worker.lock:
+            reply = await self._call(worker, request, pattern)
+            if reply is None:
+                reply = await self._call(worker, (key, content, *request[2:]), pattern)
+        assert reply is not None
+        return reply
+
+    async def _call(self, worker: _Worker, request: tuple[object, ...], pattern: str) -> _Reply:
+        loop = asyncio.get_running_loop()
+        conn = await loop.run_in_executor(None, worker.connection)
+        # Shielded so that, on cancellation, the executor call can still be
+        # awaited before its pipe is closed.
+        pending: asyncio.Future[object] | None = None
+        try:
+            pending = loop.run_in_executor(None, conn.send, request)
+            await asyncio.shield(pending)
+            pending = loop.run_in_executor(None, conn.poll, self._timeout)
+            finished = await asyncio.shield(pending)
+            if finished:
+                return conn.recv()
+        except asyncio.CancelledError:
+            # The reply would be read by the next caller — discard the worker.
+            self._discard(worker, pending)
+            raise
+        except (EOFError, OSError) as exc:
+            self._discard(worker)
+            log.warning("regex_worker_failed", error=str(exc))
+            raise ProContextError(
+                code=ErrorCode.INVALID_INPUT,
+                message="Regex search failed in its worker process",
+                suggestion="Simplify the pattern or use mode='literal'.",
+                recoverable=False,
+            ) from exc
+
+        self._discard(worker)
+        log.warning("regex_search_timeout", pattern=pattern, timeout=self._timeout)
+        raise ProContextError(
+            code=ErrorCode.INVALID_INPUT,
+            message=f"Regex search exceeded the {self._timeout:g}s time budget",
+            suggestion=(
+                "Simplify the pattern — avoid nested or adjacent quantifiers over the "
+                "same characters, such as (a+)+ or (\\w|\\d)* — or use mode='literal'."
+            ),
+            recoverable=False,
+        )
+
+    def _discard(self, worker: _Worker, pending: asyncio.Future[object] | None = None) -> None:
+        """Detach the worker's process now and reap it in the background.
+
+        The next search starts a fresh worker immediately; the killed one is
+        joined in the executor, and its pipe is closed only after ``pending``
+        (an executor call still using it) has returned.
+        """
+        process, conn = worker.detach()
+        task = asyncio.create_task(_reap(process, conn, pending))
+        self._reapers.add(task)
+        task.add_done_callback(self._reapers.discard)
+
+
+class _Worker:
+    def __init__(self, cursor_entries: int, cursor_max_chars: int) -> None:
+        self.lock = asyncio.Lock()
+        self._cursor_entries = cursor_entries
+        self._cursor_max_chars = cursor_max_chars
+        self._process: BaseProcess | None = None
+        self._conn: Connection | None = None
+
+    def connection(self) -> Connection:
+        """Return the pipe to a live worker, starting one if needed (blocking)."""
+        if self._conn is not None and self._process is not None and self._process.is_alive():
+            return self._conn
+        self.stop()
+        # spawn: a forked child would inherit the event loop and its threads.
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self._cursor_entries, self._cursor_max_chars),
+            name="procontext-regex",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        return parent_conn
+
+    def detach(self) -> tuple[BaseProcess | None, Connection | None]:
+        """Forget the current process and pipe, returning them for reaping."""
+        process, conn = self._process, self._conn
+        self._process = self._conn = None
+        return process, conn
+
+    def stop(self) -> None:
+        """Kill the process and close its pipe (blocking)."""
+        process, conn = self.detach()
+        _kill(process)
+        if conn is not None:
+            conn.close()
+
+
+def _kill(process: BaseProcess | None) -> None:
+    if process is not None:
+        process.kill()
+        process.join(timeout=1)
+
+
+async def _reap(
+    process: BaseProcess | None,
+    conn: Connection | None,
+    pending: asyncio.Future[object] | None,
+) -> None:
+    await asyncio.get_running_loop().run_in_executor(None, _kill, process)
+    if pending is not None:
+        # A dead worker ends the poll (EOF) or send (broken pipe) promptly.
+        with suppress(Exception):
+            await pending
+    if conn is not None:
+        conn.close()
+
+
+def _worker_main(conn: Connection, cursor_entries: int, cursor_max_chars: int) -> None:
+    # Every worker keeps at least the cursor it is paging through.
+    cursors: LRUCache[SearchCursorKey, SearchCursor] = LRUCache(
+        max(cursor_entries, 1), max_weight=cursor_max_chars
+    )
+    while True:
+        try:
+            key, content, patterns, op, args = conn.recv()
+        except EOFError:
+            return
+        cursor = cursors.get(key)
+        if cursor is None:
+            if content is None:
+                conn.send(None)
+                continue
+            combined, *per_query = patterns
+            matcher = None if combined is None else re.compile(*combined)
+            cursor = SearchCursor(content, matcher, [re.compile(*p) for p in per_query])
+        result = cursor.page(*args) if op == "page" else cursor.section_counts(*args)
+        cursors.put(key, cursor, weight=cursor.weight)
+        conn.send((result, cursor.total_lines, cursor.total_matches))
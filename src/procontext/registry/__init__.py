@@ -8,7 +8,7 @@ from procontext.fetcher import build_allowlist, build_http_client
 
 from . import storage as registry_storage
 from . import update as registry_update
-from .local import build_indexes, load_registry
+from .local import build_indexes, load_registry, load_registry_snapshot
 from .storage import registry_check_is_due, save_registry_to_disk
 from .update import (
     REGISTRY_INITIAL_BACKOFF_SECONDS,
@@ -32,6 +32,7 @@ __all__ = [
     "check_for_registry_update",
     "fetch_registry_for_setup",
     "load_registry",
+    "load_registry_snapshot",
     "registry_check_is_due",
     "save_registry_to_disk",
 ]
@@ -62,6 +63,7 @@ async def fetch_registry_for_setup(settings: Settings) -> bool:
         return await registry_update.fetch_registry_for_setup(
             http_client=http_client,
             metadata_url=settings.registry.metadata_url,
+            mirror_metadata_urls=settings.registry.mirror_metadata_urls,
             registry_path=registry_path,
             registry_state_path=registry_state_path,
             save_registry_to_disk_fn=save_registry_to_disk,
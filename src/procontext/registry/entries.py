@@ -0,0 +1,131 @@
+"""Compact in-memory store of the registry's entries.
+
+A validated ``RegistryEntry`` with its ``PackageEntry`` models costs about
+1.8 KB of Python objects, and even as a tuple of strings an entry costs
+~1 KB. The server only ever reads the few entries a match returns, so
+``CompactEntries`` holds each entry as a record tuple packed with
+``marshal`` — ~400 bytes — and unpacks it into a model on lookup, without
+keeping the model.
+"""
+
+from __future__ import annotations
+
+import marshal
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from procontext.models.registry import RegistryEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+# (ecosystem, languages, package_names, readme_url, repo_url)
+PackageRecord = tuple[str, tuple[str, ...], tuple[str, ...], str | None, str | None]
+# (id, name, description, packages, aliases, llms_txt_url)
+EntryRecord = tuple[str, str, str, tuple[PackageRecord, ...], tuple[str, ...], str]
+
+
+class CompactEntries(Mapping[str, RegistryEntry]):
+    """Registry entries by library ID, each unpacked from its record on lookup."""
+
+    __slots__ = ("_blobs",)
+
+    def __init__(self, blobs: dict[str, bytes]) -> None:
+        self._blobs = blobs
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[RegistryEntry]) -> CompactEntries:
+        """Store *entries*; a later entry with the same ID replaces an earlier one."""
+        return cls({entry.id: pack(to_record(entry)) for entry in entries})
+
+    @property
+    def blobs(self) -> dict[str, bytes]:
+        """The packed records by library ID, for serialization. Do not modify."""
+        return self._blobs
+
+    def __getitem__(self, library_id: str) -> RegistryEntry:
+        return to_entry(marshal.loads(self._blobs[library_id]))
+
+    def __contains__(self, library_id: object) -> bool:
+        return library_id in self._blobs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blobs)
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+def pack(record: EntryRecord) -> bytes:
+    """Pack *record* for ``CompactEntries``."""
+    return marshal.dumps(record)
+
+
+def to_record(entry: RegistryEntry) -> EntryRecord:
+    """Return the record of a validated entry."""
+    return (
+        entry.id,
+        entry.name,
+        entry.description,
+        tuple(
+            (
+                package.ecosystem,
+                tuple(package.languages),
+                tuple(package.package_names),
+                package.readme_url,
+                package.repo_url,
+            )
+            for package in entry.packages
+        ),
+        tuple(entry.aliases),
+        entry.llms_txt_url,
+    )
+
+
+def record_from_json(raw: dict[str, Any]) -> EntryRecord:
+    """Return the record of a registry JSON element known to be a valid entry."""
+    return (
+        raw["id"],
+        raw["name"],
+        raw.get("description", ""),
+        tuple(
+            (
+                package["ecosystem"],
+                tuple(package.get("languages", ())),
+                tuple(package["package_names"]),
+                package.get("readme_url"),
+                package.get("repo_url"),
+            )
+            for package in raw.get("packages", ())
+        ),
+        tuple(raw.get("aliases", ())),
+        raw["llms_txt_url"],
+    )
+
+
+def to_entry(record: EntryRecord) -> RegistryEntry:
+    """Build the ``RegistryEntry`` of *record*.
+
+    Validating is cheaper than ``model_construct``, which runs in Python, and
+    guards against a damaged snapshot.
+    """
+    library_id, name, description, packages, aliases, llms_txt_url = record
+    return RegistryEntry.model_validate(
+        {
+            "id": library_id,
+            "name": name,
+            "description": description,
+            "packages": [
+                {
+                    "ecosystem": ecosystem,
+                    "languages": languages,
+                    "package_names": package_names,
+                    "readme_url": readme_url,
+                    "repo_url": repo_url,
+                }
+                for ecosystem, languages, package_names, readme_url, repo_url in packages
+            ],
+            "aliases": aliases,
+            "llms_txt_url": llms_txt_url,
+        }
+    )
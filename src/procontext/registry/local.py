@@ -1,18 +1,35 @@
-"""Local registry loading and in-memory index construction."""
+"""Local registry loading, snapshot loading and in-memory index construction."""
 
 from __future__ import annotations
 
 import hashlib
 import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from procontext.fetcher import build_allowlist
+from procontext.fuzzy import FuzzyIndex
+from procontext.keyword_index import KeywordIndex
 from procontext.models.registry import RegistryEntry, RegistryIndexes
+from procontext.registry.entries import CompactEntries, pack, record_from_json, to_record
+from procontext.registry.snapshot import (
+    RegistrySnapshot,
+    SnapshotKey,
+    encode_snapshot,
+    load_snapshot,
+    snapshot_key,
+    snapshot_path,
+)
+from procontext.registry.storage import write_registry_snapshot
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
     from pathlib import Path
 
+    from procontext.keyword_index import KeywordDocument
+    from procontext.registry.entries import EntryRecord
+
 log = structlog.get_logger()
 
 
@@ -24,6 +41,52 @@ def load_registry(
     return _load_local_registry_pair(local_registry_path, local_state_path)
 
 
+def load_registry_snapshot(
+    local_registry_path: Path | None = None,
+    local_state_path: Path | None = None,
+) -> RegistrySnapshot | None:
+    """Load the registry ready to serve, from its snapshot when one is current.
+
+    Otherwise falls back to ``load_registry`` and ``build_snapshot``, and
+    writes the snapshot so the next start can skip both.
+    """
+    if local_registry_path is None or local_state_path is None:
+        return None
+
+    path = snapshot_path(local_state_path)
+    key: SnapshotKey | None = None
+    try:
+        key = snapshot_key(_read_state(local_state_path)[1], local_registry_path)
+        return load_snapshot(path, key)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        log.debug("registry_snapshot_unusable", path=str(path), reason=str(exc))
+
+    registry = _load_local_registry_pair(local_registry_path, local_state_path)
+    if registry is None:
+        return None
+    snapshot = build_snapshot(*registry)
+
+    try:
+        # Only persist it if the pair it was built from is still on disk.
+        if key is not None and key == snapshot_key(
+            _read_state(local_state_path)[1], local_registry_path
+        ):
+            write_registry_snapshot(path, encode_snapshot(snapshot, key))
+            log.info("registry_snapshot_written", path=str(path))
+    except (OSError, ValueError, KeyError, TypeError):
+        log.warning("registry_snapshot_write_failed", path=str(path), exc_info=True)
+    return snapshot
+
+
+def build_snapshot(entries: list[RegistryEntry], version: str) -> RegistrySnapshot:
+    """Build the indexes and registry allowlist domains for *entries*."""
+    return RegistrySnapshot(
+        version=version,
+        indexes=build_indexes(entries),
+        domains=build_allowlist(entries),
+    )
+
+
 def _load_local_registry_pair(
     local_registry_path: Path | None,
     local_state_path: Path | None,
@@ -46,13 +109,7 @@ def _load_local_registry_pair(
         raw_entries = json.loads(registry_bytes.decode("utf-8"))
         entries = [RegistryEntry(**entry) for entry in raw_entries]
 
-        state_data = json.loads(local_state_path.read_text(encoding="utf-8"))
-        version = state_data["version"]
-        expected_checksum = state_data["checksum"]
-        if not isinstance(version, str) or not version:
-            raise ValueError("registry-state.json 'version' must be a non-empty string")
-        if not isinstance(expected_checksum, str) or not expected_checksum.startswith("sha256:"):
-            raise ValueError("registry-state.json 'checksum' must be 'sha256:<hex>'")
+        version, expected_checksum = _read_state(local_state_path)
 
         actual_checksum = _sha256_prefixed(registry_bytes)
         if actual_checksum != expected_checksum:
@@ -76,33 +133,113 @@ def _load_local_registry_pair(
         return None
 
 
+def _read_state(local_state_path: Path) -> tuple[str, str]:
+    """Return the ``(version, checksum)`` recorded in registry-state.json."""
+    state_data = json.loads(local_state_path.read_text(encoding="utf-8"))
+    version = state_data["version"]
+    checksum = state_data["checksum"]
+    if not isinstance(version, str) or not version:
+        raise ValueError("registry-state.json 'version' must be a non-empty string")
+    if not isinstance(checksum, str) or not checksum.startswith("sha256:"):
+        raise ValueError("registry-state.json 'checksum' must be 'sha256:<hex>'")
+    return version, checksum
+
+
 def build_indexes(entries: list[RegistryEntry]) -> RegistryIndexes:
     """Build in-memory indexes from a list of registry entries."""
+    records = [to_record(entry) for entry in entries]
+    return _indexes_from_records(records, {record[0]: pack(record) for record in records})
+
+
+def patch_indexes(
+    previous: RegistryIndexes,
+    raw_entries: Sequence[dict[str, Any]],
+    changed: Mapping[str, RegistryEntry],
+) -> RegistryIndexes:
+    """Build the indexes for *raw_entries* by patching *previous*.
+
+    *changed* holds the validated entries that differ from the registry
+    *previous* was built from; every other element of *raw_entries* must be
+    an entry of that registry, and is neither revalidated nor re-indexed by
+    the fuzzy index. The keyword index is rebuilt: its scores depend on the
+    whole corpus. *previous* is left untouched: in-flight requests keep
+    reading it until the new indexes are swapped in.
+
+    Produces the same indexes as ``build_indexes`` on the validated entries.
+    """
+    previous_blobs = previous.by_id.blobs if isinstance(previous.by_id, CompactEntries) else {}
+    records: list[EntryRecord] = []
+    blobs: dict[str, bytes] = {}
+    for raw in raw_entries:
+        library_id = raw["id"]
+        entry = changed.get(library_id)
+        if entry is not None:
+            record = to_record(entry)
+            blobs[library_id] = pack(record)
+        else:
+            record = record_from_json(raw)
+            # Unchanged: share the packed record
+            blobs[library_id] = previous_blobs.get(library_id) or pack(record)
+        records.append(record)
+    return _indexes_from_records(records, blobs, previous_fuzzy=previous.fuzzy)
+
+
+def _indexes_from_records(
+    records: list[EntryRecord],
+    blobs: dict[str, bytes],
+    *,
+    previous_fuzzy: FuzzyIndex | None = None,
+) -> RegistryIndexes:
+    """Build the indexes of *records*; *blobs* holds them packed, by library ID.
+
+    Every index refers to an entry by its record's ``id`` object and to a
+    package name or alias by one lowercase string, so each is stored once.
+    """
     by_package: dict[str, str] = {}
-    by_id: dict[str, RegistryEntry] = {}
     by_alias: dict[str, str] = {}
-    fuzzy_corpus: list[tuple[str, str]] = []
-
-    for entry in entries:
-        by_id[entry.id] = entry
-        fuzzy_corpus.append((entry.id, entry.id))
-
-        for pkg_entry in entry.packages:
-            for name in pkg_entry.package_names:
-                by_package[name.lower()] = entry.id
-                fuzzy_corpus.append((name.lower(), entry.id))
-
-        for alias in entry.aliases:
-            by_alias[alias.lower()] = entry.id
-            fuzzy_corpus.append((alias.lower(), entry.id))
+    # The fuzzy corpus, as parallel lists of terms and their library IDs.
+    terms: list[str] = []
+    term_ids: list[str] = []
+    keyword_documents: list[KeywordDocument] = []
+
+    for library_id, name, description, packages, aliases, _ in records:
+        package_names = [package_name for package in packages for package_name in package[2]]
+        terms.append(library_id)
+        term_ids.append(library_id)
+        for package_name in package_names:
+            term = _lowercase(package_name)
+            by_package[term] = library_id
+            terms.append(term)
+            term_ids.append(library_id)
+        for alias in aliases:
+            term = _lowercase(alias)
+            by_alias[term] = library_id
+            terms.append(term)
+            term_ids.append(library_id)
+        keyword_documents.append(
+            (
+                library_id,
+                [library_id, name, *aliases, *package_names],
+                description,
+                [language for package in packages for language in package[1]],
+                [package[0] for package in packages],
+            )
+        )
 
     return RegistryIndexes(
         by_package=by_package,
-        by_id=by_id,
+        by_id=CompactEntries(blobs),
         by_alias=by_alias,
-        fuzzy_corpus=fuzzy_corpus,
+        fuzzy=FuzzyIndex(terms, term_ids, previous=previous_fuzzy),
+        keywords=KeywordIndex(keyword_documents),
     )
 
 
+def _lowercase(name: str) -> str:
+    """Return *name* lowercased, as the same object if it already is."""
+    lowered = name.lower()
+    return name if lowered == name else lowered
+
+
 def _sha256_prefixed(payload: bytes) -> str:
     return "sha256:" + hashlib.sha256(payload).hexdigest()
@@ -0,0 +1,103 @@
+"""Latency-ranked registry metadata mirrors.
+
+``registry.metadata_url`` may be backed by mirrors — further copies of the
+metadata document, each with a download URL for the same registry. A check
+asks the mirrors in rank order and races them: the next one is started when
+the one before it fails or has not answered within its hedge delay, and the
+first usable answer wins. Ranking comes from the latencies and failures of
+earlier checks, so a slow or unreachable host stops delaying updates after
+the first check that finds out.
+
+The registry download is verified against the winning metadata's checksum,
+so it may come from any mirror advertising that checksum.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from procontext.config import RegistrySettings
+
+# Weight of the newest sample in a mirror's latency average.
+_LATENCY_SMOOTHING = 0.3
+# Hedge delay: this multiple of a mirror's average latency, within the bounds.
+_HEDGE_LATENCY_FACTOR = 3.0
+_MIN_HEDGE_SECONDS = 0.25
+_MAX_HEDGE_SECONDS = 2.0
+# Hedge delay of a mirror that has not answered yet.
+_UNMEASURED_HEDGE_SECONDS = 1.0
+
+
+@dataclass
+class _MirrorHealth:
+    position: int
+    latency: float | None = None
+    failures: int = 0
+
+
+class RegistryMirrors:
+    """Registry metadata URLs ranked by observed latency, failing ones last."""
+
+    def __init__(self, urls: Iterable[str]) -> None:
+        self._health: dict[str, _MirrorHealth] = {}
+        for url in urls:
+            self._health.setdefault(url, _MirrorHealth(position=len(self._health)))
+        if not self._health:
+            raise ValueError("at least one registry metadata URL is required")
+
+    @classmethod
+    def from_settings(cls, settings: RegistrySettings) -> RegistryMirrors:
+        return cls([settings.metadata_url, *settings.mirror_metadata_urls])
+
+    def __len__(self) -> int:
+        return len(self._health)
+
+    @property
+    def primary(self) -> str:
+        """The first configured URL: ``registry.metadata_url``."""
+        return next(iter(self._health))
+
+    def ranked(self) -> list[str]:
+        """Return the URLs to try, best first.
+
+        Mirrors that failed last time come last, fewest consecutive failures
+        first; the rest by average latency, unmeasured ones after measured
+        ones. Ties keep the configured order.
+        """
+
+        def rank(url: str) -> tuple[int, float, int]:
+            health = self._health[url]
+            latency = math.inf if health.latency is None else health.latency
+            return health.failures, latency, health.position
+
+        return sorted(self._health, key=rank)
+
+    def hedge_delay(self, url: str) -> float:
+        """Seconds to wait for *url* before also asking the next mirror."""
+        latency = self._health[url].latency
+        if latency is None:
+            return _UNMEASURED_HEDGE_SECONDS
+        return min(max(latency * _HEDGE_LATENCY_FACTOR, _MIN_HEDGE_SECONDS), _MAX_HEDGE_SECONDS)
+
+    def record_success(self, url: str, seconds: float) -> None:
+        health = self._health[url]
+        health.failures = 0
+        health.latency = (
+            seconds
+            if health.latency is None
+            else health.latency + _LATENCY_SMOOTHING * (seconds - health.latency)
+        )
+
+    def record_abandoned(self, url: str, seconds: float) -> None:
+        """*url* lost a race after *seconds* without answering: it takes at least that long."""
+        health = self._health[url]
+        if health.latency is None or health.latency < seconds:
+            health.latency = seconds
+
+    def record_failure(self, url: str) -> None:
+        self._health[url].failures += 1
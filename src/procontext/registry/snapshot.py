@@ -0,0 +1,113 @@
+"""Binary snapshot of the validated registry and its prebuilt indexes.
+
+known-libraries.json stays the source of truth. The snapshot is derived from
+it and written next to registry-state.json whenever the registry is saved, so
+that startup can skip hashing, parsing and validating the JSON and rebuilding
+the indexes: loading is one file read and two ``marshal`` loads, and each
+entry stays a packed record until a match returns it (see
+``registry/entries.py``).
+
+A snapshot is keyed by the checksum recorded in registry-state.json and the
+size and mtime of known-libraries.json. When the key no longer matches — or
+the snapshot was written by another Python version, whose ``marshal`` format
+may differ — it is ignored and rebuilt from the JSON.
+"""
+
+from __future__ import annotations
+
+import marshal
+import struct
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from procontext.fuzzy import FuzzyIndex
+from procontext.keyword_index import KeywordIndex
+from procontext.models.registry import RegistryIndexes
+from procontext.registry.entries import CompactEntries
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SNAPSHOT_FILENAME = "registry-snapshot.bin"
+
+_HEADER = f"procontext-registry-snapshot 3 {sys.implementation.cache_tag}\n".encode()
+_KEY_LENGTH = struct.Struct("<I")
+
+# (registry checksum, known-libraries.json size, known-libraries.json mtime_ns)
+SnapshotKey = tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Everything the server derives from the registry, ready to serve."""
+
+    version: str
+    indexes: RegistryIndexes
+    # Base domains of the entries' llms_txt_url hosts — the registry's part
+    # of the SSRF allowlist.
+    domains: frozenset[str]
+
+
+def snapshot_path(state_path: Path) -> Path:
+    """Return the snapshot location for the registry-state.json at *state_path*."""
+    return state_path.with_name(SNAPSHOT_FILENAME)
+
+
+def snapshot_key(checksum: str, registry_path: Path) -> SnapshotKey:
+    """Return the key a snapshot of the registry at *registry_path* is stored under."""
+    stat = registry_path.stat()
+    return checksum, stat.st_size, stat.st_mtime_ns
+
+
+def encode_snapshot(snapshot: RegistrySnapshot, key: SnapshotKey) -> bytes:
+    """Serialize *snapshot* under *key* for ``load_snapshot``."""
+    indexes = snapshot.indexes
+    by_id = indexes.by_id
+    if not isinstance(by_id, CompactEntries):
+        by_id = CompactEntries.from_entries(by_id.values())
+    body = (
+        snapshot.version,
+        by_id.blobs,
+        indexes.by_package,
+        indexes.by_alias,
+        # States rather than bytes: one dumps() stores each shared string once.
+        indexes.fuzzy.to_state(),
+        indexes.keywords.to_state(),
+        sorted(snapshot.domains),
+    )
+    key_bytes = marshal.dumps(key)
+    return _HEADER + _KEY_LENGTH.pack(len(key_bytes)) + key_bytes + marshal.dumps(body)
+
+
+def load_snapshot(path: Path, key: SnapshotKey) -> RegistrySnapshot:
+    """Load the snapshot at *path* if it was stored under *key*.
+
+    Raises ``OSError`` if the file cannot be read and ``ValueError`` if it is
+    malformed, stale, or was written by another Python version.
+    """
+    data = memoryview(path.read_bytes())
+    if data[: len(_HEADER)] != _HEADER:
+        raise ValueError("not a registry snapshot for this Python version")
+    try:
+        start = len(_HEADER) + _KEY_LENGTH.size
+        (key_length,) = _KEY_LENGTH.unpack_from(data, len(_HEADER))
+        if marshal.loads(data[start : start + key_length]) != key:
+            raise ValueError("registry snapshot is stale")
+        # One loads() over the whole body: marshal.load() on a file is several times slower.
+        body = marshal.loads(data[start + key_length :])
+        version, blobs, by_package, by_alias, fuzzy, keywords, domains = body
+    except (EOFError, TypeError, struct.error) as exc:
+        raise ValueError("malformed registry snapshot") from exc
+
+    return RegistrySnapshot(
+        version=version,
+        indexes=RegistryIndexes(
+            by_package=by_package,
+            by_id=CompactEntries(blobs),
+            by_alias=by_alias,
+            fuzzy=FuzzyIndex.from_state(fuzzy),
+            keywords=KeywordIndex.from_state(keywords),
+        ),
+        domains=frozenset(domains),
+    )
@@ -6,29 +6,75 @@ import json
 import os
 import sys
 from contextlib import suppress
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
 import structlog
 
+from procontext.registry.snapshot import encode_snapshot, snapshot_key, snapshot_path
+
 if TYPE_CHECKING:
     from collections.abc import Callable
     from pathlib import Path
 
+    from procontext.registry.snapshot import RegistrySnapshot
+
 log = structlog.get_logger()
 
 
+@dataclass(frozen=True)
+class MetadataValidators:
+    """HTTP cache validators of a registry metadata response.
+
+    Stored in registry-state.json next to the version that response
+    advertised and sent back as ``If-None-Match``/``If-Modified-Since``, so an
+    unchanged metadata document costs a bodyless 304.
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+    # The metadata URL that sent them — with mirrors, only that host can
+    # answer 304. None means registry.metadata_url.
+    url: str | None = None
+
+    def request_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
 def save_registry_to_disk(
     *,
-    registry_bytes: bytes,
+    registry_bytes: bytes | None = None,
+    registry_file: Path | None = None,
     version: str,
     checksum: str,
     registry_path: Path,
     state_path: Path,
+    snapshot: RegistrySnapshot | None = None,
+    metadata_validators: MetadataValidators | None = None,
     write_bytes_fsync_fn: Callable[[Path, bytes], None] | None = None,
     fsync_directory_fn: Callable[[Path], None] | None = None,
 ) -> None:
-    """Persist the local registry pair with atomic replace semantics."""
+    """Persist the local registry pair with atomic replace semantics.
+
+    The registry comes either as *registry_bytes* or as *registry_file*, a
+    file already holding them — a streamed download — which must be on the
+    same filesystem as *registry_path*; it is fsynced and renamed into place
+    rather than copied.
+
+    When *snapshot* is given it is written next to the state file afterwards,
+    keyed to the new pair. Failing to write it is logged, not raised — the next
+    startup rebuilds it from the pair. *metadata_validators* are those of the
+    metadata response that advertised this version (see ``MetadataValidators``).
+    Blocking: background updates call this from a worker thread.
+    """
+    if (registry_bytes is None) == (registry_file is None):
+        raise ValueError("Pass exactly one of registry_bytes and registry_file")
     write_bytes_fsync = write_bytes_fsync_fn or _write_bytes_fsync
     fsync_directory = fsync_directory_fn or _fsync_directory
 
@@ -41,14 +87,18 @@ def save_registry_to_disk(
         "checksum": checksum,
         "updated_at": now,
         "last_checked_at": now,
+        **_validator_fields(metadata_validators),
     }
     state_bytes = json.dumps(state_payload).encode("utf-8")
 
-    registry_tmp = registry_path.with_suffix(registry_path.suffix + ".tmp")
+    registry_tmp = registry_file or registry_path.with_suffix(registry_path.suffix + ".tmp")
     state_tmp = state_path.with_suffix(state_path.suffix + ".tmp")
 
     try:
-        write_bytes_fsync(registry_tmp, registry_bytes)
+        if registry_bytes is not None:
+            write_bytes_fsync(registry_tmp, registry_bytes)
+        else:
+            _fsync_file(registry_tmp)
         write_bytes_fsync(state_tmp, state_bytes)
 
         os.replace(registry_tmp, registry_path)
@@ -59,6 +109,34 @@ def save_registry_to_disk(
             with suppress(OSError):
                 tmp_path.unlink(missing_ok=True)
 
+    if snapshot is not None:
+        try:
+            write_registry_snapshot(
+                snapshot_path(state_path),
+                encode_snapshot(snapshot, snapshot_key(checksum, registry_path)),
+                write_bytes_fsync_fn=write_bytes_fsync,
+            )
+        except OSError:
+            log.warning("registry_snapshot_write_failed", exc_info=True)
+
+
+def write_registry_snapshot(
+    path: Path,
+    data: bytes,
+    *,
+    write_bytes_fsync_fn: Callable[[Path, bytes], None] | None = None,
+) -> None:
+    """Atomically replace the registry snapshot at *path* with *data*."""
+    write_bytes_fsync = write_bytes_fsync_fn or _write_bytes_fsync
+    # Per-process temp name: servers starting together may all rebuild it.
+    snapshot_tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    try:
+        write_bytes_fsync(snapshot_tmp, data)
+        os.replace(snapshot_tmp, path)
+    finally:
+        with suppress(OSError):
+            snapshot_tmp.unlink(missing_ok=True)
+
 
 def registry_check_is_due(state_path: Path | None, poll_interval_hours: float) -> bool:
     """Return True if poll_interval_hours have elapsed since the last metadata check."""
@@ -76,16 +154,50 @@ def registry_check_is_due(state_path: Path | None, poll_interval_hours: float) -
         return True
 
 
+def read_metadata_validators(state_path: Path | None, version: str | None) -> MetadataValidators:
+    """Return the metadata validators stored for *version* in registry-state.json.
+
+    Empty if the state file records another version — e.g. another server
+    sharing the data directory has since updated it — since a 304 for those
+    validators would say nothing about *version*.
+    """
+    if state_path is None or version is None:
+        return MetadataValidators()
+    try:
+        state_data = json.loads(state_path.read_text(encoding="utf-8"))
+        if state_data.get("version") != version:
+            return MetadataValidators()
+        etag = state_data.get("metadata_etag")
+        last_modified = state_data.get("metadata_last_modified")
+        url = state_data.get("metadata_url")
+        return MetadataValidators(
+            etag=etag if isinstance(etag, str) else None,
+            last_modified=last_modified if isinstance(last_modified, str) else None,
+            url=url if isinstance(url, str) else None,
+        )
+    except (OSError, ValueError, AttributeError):
+        log.debug("registry_metadata_validators_unreadable", path=str(state_path), exc_info=True)
+        return MetadataValidators()
+
+
 def write_last_checked_at(
     state_path: Path,
     *,
+    metadata_validators: MetadataValidators | None = None,
     write_bytes_fsync_fn: Callable[[Path, bytes], None] | None = None,
 ) -> None:
-    """Update last_checked_at in registry-state.json without touching other fields."""
+    """Update last_checked_at in registry-state.json without touching other fields.
+
+    *metadata_validators*, when given, replace the stored ones.
+    """
     write_bytes_fsync = write_bytes_fsync_fn or _write_bytes_fsync
     try:
         state_data = json.loads(state_path.read_text(encoding="utf-8"))
         state_data["last_checked_at"] = datetime.now(tz=UTC).isoformat().replace("+00:00", "Z")
+        if metadata_validators is not None:
+            for key in ("metadata_etag", "metadata_last_modified", "metadata_url"):
+                state_data.pop(key, None)
+            state_data.update(_validator_fields(metadata_validators))
         state_bytes = json.dumps(state_data).encode("utf-8")
         state_tmp = state_path.with_suffix(state_path.suffix + ".tmp")
         try:
@@ -98,6 +210,17 @@ def write_last_checked_at(
         log.debug("registry_state_last_checked_at_update_failed", exc_info=True)
 
 
+def _validator_fields(validators: MetadataValidators | None) -> dict[str, str]:
+    fields: dict[str, str] = {}
+    if validators is not None and validators.etag is not None:
+        fields["metadata_etag"] = validators.etag
+    if validators is not None and validators.last_modified is not None:
+        fields["metadata_last_modified"] = validators.last_modified
+    if fields and validators is not None and validators.url is not None:
+        fields["metadata_url"] = validators.url
+    return fields
+
+
 def _write_bytes_fsync(path: Path, data: bytes) -> None:
     with path.open("wb") as file_obj:
         file_obj.write(data)
@@ -105,6 +228,11 @@ def _write_bytes_fsync(path: Path, data: bytes) -> None:
         os.fsync(file_obj.fileno())
 
 
+def _fsync_file(path: Path) -> None:
+    with path.open("rb+") as file_obj:
+        os.fsync(file_obj.fileno())
+
+
 def _fsync_directory(path: Path) -> None:
     if sys.platform == "win32":
         return
@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Literal
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal
+from urllib.parse import urljoin
 
 import httpx
 import structlog
 
+from procontext.fetcher import allowlist_from_urls
 from procontext.models.registry import RegistryEntry, RegistryIndexes
-from procontext.registry.local import _sha256_prefixed
+from procontext.registry.delta import apply_delta, is_touched, iter_json_array
+from procontext.registry.local import (
+    _read_state,
+    _sha256_prefixed,
+    build_snapshot,
+    patch_indexes,
+)
+from procontext.registry.mirrors import RegistryMirrors
+from procontext.registry.snapshot import RegistrySnapshot
+from procontext.registry.storage import MetadataValidators, read_metadata_validators
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
-    from pathlib import Path
+    from collections.abc import Callable, Sequence
 
     from procontext.state import AppState
 
@@ -28,31 +48,188 @@ RegistryUpdateOutcome = Literal["success", "transient_failure", "semantic_failur
 
 
 @dataclass
-class _NewRegistryData:
-    """Validated registry download ready to be applied or persisted."""
+class _RegistryMetadata:
+    """Validated registry metadata document."""
 
-    registry_bytes: bytes
     version: str
     checksum: str
-    entries: list[RegistryEntry]
+    download_url: str
+    # from_version → URL of a delta patch from that version to this one
+    deltas: dict[str, str]
+    validators: MetadataValidators = MetadataValidators()
+    # The metadata URL (registry.metadata_url or a mirror) that served it
+    metadata_url: str = ""
+
+
+@dataclass
+class _RegistryDownload:
+    """Registry payload streamed to a temp file, checksum verified."""
+
+    path: Path
+    size: int
+    version: str
+    checksum: str
+    metadata_validators: MetadataValidators = MetadataValidators()
 
 
 _REGISTRY_TIMEOUT = httpx.Timeout(300.0, connect=5.0)
+_DOWNLOAD_CHUNK_BYTES = 256 * 1024
 
 
 async def _download_registry_if_newer(
     http_client: httpx.AsyncClient,
     *,
     metadata_url: str,
+    mirror_metadata_urls: Sequence[str] = (),
     current_version: str | None,
+    download_dir: Path | None,
     metadata_timeout: float | httpx.Timeout = _REGISTRY_TIMEOUT,
     registry_timeout: float | httpx.Timeout = _REGISTRY_TIMEOUT,
-) -> _NewRegistryData | RegistryUpdateOutcome:
+) -> _RegistryDownload | RegistryUpdateOutcome:
     """Fetch registry metadata and download the full payload if the version changed."""
-    metadata_response = await _safe_get(http_client, metadata_url, timeout=metadata_timeout)
+    mirrors = RegistryMirrors([metadata_url, *mirror_metadata_urls])
+    metadata = await _race_metadata(
+        http_client, mirrors, timeout=metadata_timeout, current_version=current_version
+    )
+    if isinstance(metadata, str):
+        return metadata
+    if metadata.version == current_version:
+        log.info("registry_up_to_date", version=metadata.version)
+        return "success"
+    return await _download_registry_from_mirrors(
+        http_client,
+        metadata,
+        mirrors,
+        download_dir=download_dir,
+        metadata_timeout=metadata_timeout,
+        timeout=registry_timeout,
+    )
+
+
+async def _race_metadata(
+    http_client: httpx.AsyncClient,
+    mirrors: RegistryMirrors,
+    *,
+    timeout: float | httpx.Timeout,
+    validators: MetadataValidators | None = None,
+    current_version: str | None = None,
+) -> _RegistryMetadata | RegistryUpdateOutcome:
+    """Fetch the registry metadata from the best of *mirrors* that answers.
+
+    Mirrors are asked in rank order; the next one is started as soon as one
+    fails or has not answered within its hedge delay. Metadata newer than
+    *current_version*, or any answer from the primary, wins and cancels the
+    rest. A mirror may lag behind the primary, so its metadata for an older
+    version is rejected, and its "nothing newer" — metadata for the current
+    version, or a 304 to *validators* — is only kept as a fallback while the
+    other mirrors are asked. If no mirror answers, the result is
+    ``"transient_failure"`` when any failure was transient, so the scheduler
+    retries soon.
+    """
+    ranked = mirrors.ranked()
+    waiting = iter(ranked)
+    pending: dict[asyncio.Task[_RegistryMetadata | RegistryUpdateOutcome], str] = {}
+    failures: list[RegistryUpdateOutcome] = []
+    not_newer: _RegistryMetadata | Literal["success"] | None = None
+
+    async def fetch(url: str) -> _RegistryMetadata | RegistryUpdateOutcome:
+        started = time.monotonic()
+        try:
+            result = await _fetch_metadata(
+                http_client,
+                url,
+                timeout=timeout,
+                # Only the host that issued the validators can answer 304 to them.
+                validators=validators
+                if validators is not None and (validators.url or mirrors.primary) == url
+                else None,
+            )
+        except asyncio.CancelledError:
+            mirrors.record_abandoned(url, time.monotonic() - started)
+            raise
+        if isinstance(result, _RegistryMetadata) or result == "success":
+            mirrors.record_success(url, time.monotonic() - started)
+        else:
+            mirrors.record_failure(url)
+        return result
+
+    def start_next() -> float | None:
+        """Start the next mirror; return its hedge delay, or None if none are left."""
+        url = next(waiting, None)
+        if url is None:
+            return None
+        pending[asyncio.create_task(fetch(url))] = url
+        return mirrors.hedge_delay(url)
+
+    hedge = start_next()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending, timeout=hedge, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in sorted(done, key=lambda task: ranked.index(pending[task])):
+                url = pending.pop(task)
+                result = task.result()
+                if result != "success" and isinstance(result, str):
+                    failures.append(result)
+                    continue
+                newer = isinstance(result, _RegistryMetadata) and (
+                    not current_version
+                    or _version_key(result.version) > _version_key(current_version)
+                )
+                if newer or url == mirrors.primary:
+                    if url != mirrors.primary:
+                        log.info("registry_metadata_from_mirror", url=url)
+                    return result
+                if isinstance(result, _RegistryMetadata) and result.version != current_version:
+                    log.warning(
+                        "registry_metadata_stale",
+                        url=url,
+                        version=result.version,
+                        current_version=current_version,
+                    )
+                    failures.append("transient_failure")
+                elif not_newer is None:
+                    not_newer = result
+            # Nothing decisive yet: a mirror failed, lags or is slow, ask the next one.
+            hedge = start_next()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    if not_newer is not None:
+        return not_newer
+    return "transient_failure" if "transient_failure" in failures else "semantic_failure"
+
+
+def _version_key(version: str) -> tuple[str | int, ...]:
+    """Sort key ordering registry versions such as ``2026-02-26`` or ``v10`` naturally."""
+    parts = re.split(r"(\d+)", version)
+    # re.split alternates text and digit runs, so keys compare position by position.
+    return tuple(int(part) if i % 2 else part for i, part in enumerate(parts))
+
+
+async def _fetch_metadata(
+    http_client: httpx.AsyncClient,
+    metadata_url: str,
+    *,
+    timeout: float | httpx.Timeout,
+    validators: MetadataValidators | None = None,
+) -> _RegistryMetadata | RegistryUpdateOutcome:
+    """Fetch and validate the registry metadata document.
+
+    With *validators*, the request is conditional and a 304 — the metadata,
+    and so the registry, have not changed — returns ``"success"``.
+    """
+    headers = validators.request_headers() if validators is not None else {}
+    metadata_response = await _safe_get(http_client, metadata_url, timeout=timeout, headers=headers)
     if metadata_response is None:
         return "transient_failure"
 
+    if metadata_response.status_code == 304 and headers:
+        log.info("registry_up_to_date", not_modified=True)
+        return "success"
+
     if not metadata_response.is_success:
         return _classify_http_failure(
             url=metadata_url,
@@ -75,47 +252,171 @@ async def _download_registry_if_newer(
         log.warning("registry_update_semantic_failure", reason="invalid_metadata", exc_info=True)
         return "semantic_failure"
 
-    if remote_version == current_version:
-        log.info("registry_up_to_date", version=remote_version)
-        return "success"
+    return _RegistryMetadata(
+        version=remote_version,
+        checksum=expected_checksum,
+        download_url=urljoin(metadata_url, download_url),
+        deltas=_parse_deltas(metadata.get("deltas"), base_url=metadata_url),
+        validators=MetadataValidators(
+            etag=metadata_response.headers.get("etag"),
+            last_modified=metadata_response.headers.get("last-modified"),
+            url=metadata_url,
+        ),
+        metadata_url=metadata_url,
+    )
 
-    registry_response = await _safe_get(http_client, download_url, timeout=registry_timeout)
-    if registry_response is None:
-        return "transient_failure"
 
-    if not registry_response.is_success:
-        return _classify_http_failure(
-            url=download_url,
-            status_code=registry_response.status_code,
-            context="registry_download",
+def _parse_deltas(raw: Any, *, base_url: str) -> dict[str, str]:
+    """Map each advertised delta's from_version to its URL, relative URLs resolved.
+
+    Deltas are optional: malformed ones are ignored and a full download is used.
+    """
+    if raw is None:
+        return {}
+    deltas: dict[str, str] = {}
+    for item in raw if isinstance(raw, list) else [raw]:
+        match item:
+            case {"from_version": str(from_version), "url": str(url)} if from_version and url:
+                deltas[from_version] = urljoin(base_url, url)
+            case _:
+                log.warning("registry_delta_ignored", reason="invalid_metadata", delta=repr(item))
+    return deltas
+
+
+async def _download_registry_from_mirrors(
+    http_client: httpx.AsyncClient,
+    metadata: _RegistryMetadata,
+    mirrors: RegistryMirrors,
+    *,
+    download_dir: Path | None,
+    metadata_timeout: float | httpx.Timeout,
+    timeout: float | httpx.Timeout,
+) -> _RegistryDownload | RegistryUpdateOutcome:
+    """Download the registry *metadata* advertises, from another mirror if that fails.
+
+    Any mirror whose metadata advertises the same checksum serves the same
+    bytes, so the fallbacks are tried in rank order and checked against it.
+    """
+    download = await _download_registry(
+        http_client, metadata, download_dir=download_dir, timeout=timeout
+    )
+    if not isinstance(download, str):
+        return download
+    mirrors.record_failure(metadata.metadata_url)
+    failures = [download]
+    for url in mirrors.ranked():
+        if url == metadata.metadata_url:
+            continue
+        other = await _fetch_metadata(http_client, url, timeout=metadata_timeout)
+        if isinstance(other, str) or other.checksum != metadata.checksum:
+            continue
+        log.info("registry_download_from_mirror", url=other.download_url)
+        download = await _download_registry(
+            http_client,
+            replace(metadata, download_url=other.download_url),
+            download_dir=download_dir,
+            timeout=timeout,
         )
+        if not isinstance(download, str):
+            return download
+        mirrors.record_failure(url)
+        failures.append(download)
+    return "transient_failure" if "transient_failure" in failures else "semantic_failure"
+
+
+async def _download_registry(
+    http_client: httpx.AsyncClient,
+    metadata: _RegistryMetadata,
+    *,
+    download_dir: Path | None,
+    timeout: float | httpx.Timeout,
+) -> _RegistryDownload | RegistryUpdateOutcome:
+    """Download the full registry payload advertised by *metadata*.
+
+    The payload is streamed into a temp file in *download_dir* (the system
+    temp directory when None) and hashed as it arrives, so it is never held
+    in memory. The caller owns the returned file.
+    """
+    if download_dir is not None:
+        download_dir.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(prefix="known-libraries.", suffix=".download", dir=download_dir)
+    download_path = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as file_obj:
+            result = await _stream_to_file(
+                http_client, metadata.download_url, file_obj, timeout=timeout
+            )
+        if not isinstance(result, str) and result[0] != metadata.checksum:
+            log.warning(
+                "registry_checksum_mismatch",
+                expected=metadata.checksum,
+                actual=result[0],
+            )
+            result = "semantic_failure"
+    except BaseException:
+        _discard(download_path)
+        raise
+    if isinstance(result, str):
+        _discard(download_path)
+        return result
 
-    actual_checksum = _sha256_prefixed(registry_response.content)
-    if actual_checksum != expected_checksum:
+    return _RegistryDownload(
+        path=download_path,
+        size=result[1],
+        version=metadata.version,
+        checksum=metadata.checksum,
+        metadata_validators=metadata.validators,
+    )
+
+
+async def _stream_to_file(
+    http_client: httpx.AsyncClient,
+    url: str,
+    file_obj: BinaryIO,
+    *,
+    timeout: float | httpx.Timeout,
+) -> tuple[str, int] | RegistryUpdateOutcome:
+    """Write the body at *url* to *file_obj*; return its prefixed SHA-256 and size."""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with http_client.stream("GET", url, timeout=timeout) as response:
+            if not response.is_success:
+                return _classify_http_failure(
+                    url=url,
+                    status_code=response.status_code,
+                    context="registry_download",
+                )
+            async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_BYTES):
+                digest.update(chunk)
+                file_obj.write(chunk)
+                size += len(chunk)
+    except httpx.HTTPError:
         log.warning(
-            "registry_checksum_mismatch",
-            expected=expected_checksum,
-            actual=actual_checksum,
+            "registry_update_transient_failure",
+            reason="network_error",
+            url=url,
+            exc_info=True,
         )
-        return "semantic_failure"
+        return "transient_failure"
+    return "sha256:" + digest.hexdigest(), size
+
 
+def _read_registry(download: _RegistryDownload) -> list[RegistryEntry] | None:
+    """Parse and validate a downloaded registry; None if it does not match the schema.
+
+    Blocking — runs in a worker thread during background updates.
+    """
     try:
-        raw_entries = registry_response.json()
-        new_entries = [RegistryEntry(**entry) for entry in raw_entries]
+        text = download.path.read_bytes().decode("utf-8")
+        return [RegistryEntry(**entry) for entry, _, _ in iter_json_array(text)]
     except Exception:
         log.warning(
             "registry_update_semantic_failure",
             reason="invalid_registry_schema",
             exc_info=True,
         )
-        return "semantic_failure"
-
-    return _NewRegistryData(
-        registry_bytes=registry_response.content,
-        version=remote_version,
-        checksum=expected_checksum,
-        entries=new_entries,
-    )
+        return None
 
 
 async def check_for_registry_update(
@@ -124,57 +425,259 @@ async def check_for_registry_update(
     build_indexes_fn: Callable[[list[RegistryEntry]], RegistryIndexes],
     build_allowlist_fn: Callable[..., frozenset[str]],
     save_registry_to_disk_fn: Callable[..., None],
-    write_last_checked_at_fn: Callable[[Path], None],
+    write_last_checked_at_fn: Callable[..., None],
     metadata_timeout: float | httpx.Timeout = _REGISTRY_TIMEOUT,
     registry_timeout: float | httpx.Timeout = _REGISTRY_TIMEOUT,
 ) -> RegistryUpdateOutcome:
-    """Check remote metadata and apply a registry update when available."""
+    """Check remote metadata and apply a registry update when available.
+
+    A delta patch from the local version is used when the metadata advertises
+    one, and the full registry is downloaded otherwise or if the delta cannot
+    be applied. Only the network I/O runs on the event loop. Parsing, validation, index
+    building and persistence run through ``state.offloader``; the new
+    indexes, allowlist and version are then swapped in together.
+    """
     if state.http_client is None:
         return "semantic_failure"
+    if state.registry_mirrors is None:
+        state.registry_mirrors = RegistryMirrors.from_settings(state.settings.registry)
+    mirrors = state.registry_mirrors
 
-    result = await _download_registry_if_newer(
+    metadata = await _race_metadata(
         state.http_client,
-        metadata_url=state.settings.registry.metadata_url,
+        mirrors,
+        timeout=metadata_timeout,
+        validators=read_metadata_validators(state.registry_state_path, state.registry_version),
         current_version=state.registry_version,
-        metadata_timeout=metadata_timeout,
-        registry_timeout=registry_timeout,
     )
-
-    if isinstance(result, str):
-        if result == "success" and state.registry_state_path is not None:
+    if isinstance(metadata, str):
+        if metadata == "success" and state.registry_state_path is not None:
             write_last_checked_at_fn(state.registry_state_path)
-        return result
+        return metadata
+    if metadata.version == state.registry_version:
+        log.info("registry_up_to_date", version=metadata.version)
+        if state.registry_state_path is not None:
+            write_last_checked_at_fn(
+                state.registry_state_path, metadata_validators=metadata.validators
+            )
+        return "success"
 
-    new_indexes = build_indexes_fn(result.entries)
-    new_allowlist = build_allowlist_fn(
-        result.entries,
-        extra_domains=state.settings.fetcher.extra_allowed_domains,
-    )
+    extra_domains = state.settings.fetcher.extra_allowed_domains
 
-    state.indexes, state.allowlist, state.registry_version = (
-        new_indexes,
-        new_allowlist,
-        result.version,
+    delta_url = metadata.deltas.get(state.registry_version or "")
+    if delta_url is not None:
+        outcome = await _apply_delta_update(
+            state,
+            metadata,
+            delta_url,
+            save_registry_to_disk_fn=save_registry_to_disk_fn,
+            timeout=registry_timeout,
+        )
+        if outcome is not None:
+            return outcome
+        log.info("registry_delta_fallback", version=metadata.version)
+
+    download = await _download_registry_from_mirrors(
+        state.http_client,
+        metadata,
+        mirrors,
+        download_dir=state.registry_path.parent if state.registry_path is not None else None,
+        metadata_timeout=metadata_timeout,
+        timeout=registry_timeout,
     )
+    if isinstance(download, str):
+        return download
+
+    def prepare() -> tuple[int, RegistrySnapshot, frozenset[str]] | None:
+        entries = _read_registry(download)
+        if entries is None:
+            return None
+        snapshot = RegistrySnapshot(
+            version=download.version,
+            indexes=build_indexes_fn(entries),
+            domains=build_allowlist_fn(entries),
+        )
+        return len(entries), snapshot, build_allowlist_fn(entries, extra_domains=extra_domains)
 
-    if state.registry_path is not None and state.registry_state_path is not None:
-        try:
-            save_registry_to_disk_fn(
-                registry_bytes=result.registry_bytes,
-                version=result.version,
-                checksum=result.checksum,
+    try:
+        prepared = await state.offloader.run(download.size, prepare)
+        if prepared is None:
+            return "semantic_failure"
+        entry_count, snapshot, new_allowlist = prepared
+
+        state.indexes, state.allowlist, state.registry_version = (
+            snapshot.indexes,
+            new_allowlist,
+            download.version,
+        )
+        # Keys carry the registry version, so old entries could never hit again.
+        if state.resolve_cache is not None:
+            state.resolve_cache.clear()
+
+        if state.registry_path is not None and state.registry_state_path is not None:
+            persist = partial(
+                save_registry_to_disk_fn,
+                registry_file=download.path,
+                version=download.version,
+                checksum=download.checksum,
                 registry_path=state.registry_path,
                 state_path=state.registry_state_path,
+                snapshot=snapshot,
+                metadata_validators=metadata.validators,
+            )
+            try:
+                await state.offloader.run(download.size, persist)
+            except Exception as exc:
+                log.warning(
+                    "registry_persist_failed",
+                    version=download.version,
+                    error=str(exc),
+                    exc_info=True,
+                )
+    finally:
+        # Renamed into place when persisted; otherwise no longer needed.
+        _discard(download.path)
+
+    log.info("registry_updated", version=download.version, entries=entry_count)
+    return "success"
+
+
+async def _apply_delta_update(
+    state: AppState,
+    metadata: _RegistryMetadata,
+    delta_url: str,
+    *,
+    save_registry_to_disk_fn: Callable[..., None],
+    timeout: float | httpx.Timeout,
+) -> RegistryUpdateOutcome | None:
+    """Update the registry by patching the local copy with the delta at *delta_url*.
+
+    Returns None — after logging why — when the delta cannot be used and the
+    full registry should be downloaded instead: the delta is unavailable or
+    malformed, the local registry is not the version it patches, or the
+    patched file does not match the metadata checksum.
+    """
+    registry_path, state_path = state.registry_path, state.registry_state_path
+    from_version, previous = state.registry_version, state.indexes
+    if state.http_client is None or registry_path is None or state_path is None:
+        return None
+
+    response = await _safe_get(state.http_client, delta_url, timeout=timeout)
+    if response is None or not response.is_success:
+        log.info(
+            "registry_delta_unusable",
+            reason="unavailable",
+            url=delta_url,
+            status_code=response.status_code if response is not None else None,
+        )
+        return None
+    delta_body = response.content
+    extra_domains = state.settings.fetcher.extra_allowed_domains
+
+    def prepare() -> tuple[bytes, RegistrySnapshot, frozenset[str], int] | str:
+        try:
+            old_bytes = registry_path.read_bytes()
+            base_version, base_checksum = _read_state(state_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return "base_unreadable"
+        if base_version != from_version or _sha256_prefixed(old_bytes) != base_checksum:
+            return "base_mismatch"
+
+        try:
+            new_text, written = apply_delta(
+                old_bytes.decode("utf-8"),
+                json.loads(delta_body),
+                from_version=base_version,
+                to_version=metadata.version,
             )
-        except Exception as exc:
+        except ValueError:
+            return "invalid_delta"
+        new_bytes = new_text.encode("utf-8")
+        if _sha256_prefixed(new_bytes) != metadata.checksum:
+            return "checksum_mismatch"
+
+        # new_text is now the published registry, byte for byte. Elements no
+        # edit touched were copied from the local registry, validated when it
+        # was loaded; only the rest need validating.
+        raw_entries: list[dict[str, Any]] = []
+        changed: dict[str, RegistryEntry] = {}
+        try:
+            for raw, start, end in iter_json_array(new_text):
+                raw_entries.append(raw)
+                if is_touched(start, end, written):
+                    entry = RegistryEntry(**raw)
+                    changed[entry.id] = entry
+        except Exception:
             log.warning(
-                "registry_persist_failed",
-                version=result.version,
-                error=str(exc),
+                "registry_update_semantic_failure",
+                reason="invalid_registry_schema",
                 exc_info=True,
             )
+            return "semantic_failure"
+
+        library_ids = {raw["id"] for raw in raw_entries}
+        if len(library_ids) != len(raw_entries):
+            return "duplicate_ids"
+        if any(i not in changed and i not in previous.by_id for i in library_ids):
+            return "base_mismatch"
+
+        domains = allowlist_from_urls(raw["llms_txt_url"] for raw in raw_entries)
+        snapshot = RegistrySnapshot(
+            version=metadata.version,
+            indexes=patch_indexes(previous, raw_entries, changed),
+            domains=domains,
+        )
+        allowlist = domains | allowlist_from_urls([], extra_domains)
+        return new_bytes, snapshot, allowlist, len(changed)
+
+    try:
+        size = registry_path.stat().st_size
+    except OSError:
+        size = 0
+    prepared = await state.offloader.run(size, prepare)
+    if prepared == "semantic_failure":
+        return "semantic_failure"
+    if isinstance(prepared, str):
+        log.info("registry_delta_unusable", reason=prepared, url=delta_url)
+        return None
+    new_bytes, snapshot, new_allowlist, changed_count = prepared
+
+    state.indexes, state.allowlist, state.registry_version = (
+        snapshot.indexes,
+        new_allowlist,
+        metadata.version,
+    )
+    if state.resolve_cache is not None:
+        state.resolve_cache.clear()
+
+    persist = partial(
+        save_registry_to_disk_fn,
+        registry_bytes=new_bytes,
+        version=metadata.version,
+        checksum=metadata.checksum,
+        registry_path=registry_path,
+        state_path=state_path,
+        snapshot=snapshot,
+        metadata_validators=metadata.validators,
+    )
+    try:
+        await state.offloader.run(len(new_bytes), persist)
+    except Exception as exc:
+        log.warning(
+            "registry_persist_failed",
+            version=metadata.version,
+            error=str(exc),
+            exc_info=True,
+        )
 
-    log.info("registry_updated", version=result.version, entries=len(result.entries))
+    log.info(
+        "registry_updated",
+        version=metadata.version,
+        entries=len(snapshot.indexes.by_id),
+        delta_from=from_version,
+        delta_bytes=len(delta_body),
+        changed=changed_count,
+    )
     return "success"
 
 
@@ -182,33 +685,44 @@ async def fetch_registry_for_setup(
     *,
     http_client: httpx.AsyncClient,
     metadata_url: str,
+    mirror_metadata_urls: Sequence[str] = (),
     registry_path: Path,
     registry_state_path: Path,
     save_registry_to_disk_fn: Callable[..., None],
 ) -> bool:
     """Fetch and persist the registry for initial bootstrap."""
-    result = await _download_registry_if_newer(
+    download = await _download_registry_if_newer(
         http_client,
         metadata_url=metadata_url,
+        mirror_metadata_urls=mirror_metadata_urls,
         current_version=None,
+        download_dir=registry_path.parent,
     )
 
-    if isinstance(result, str):
-        return result == "success"
+    if isinstance(download, str):
+        return download == "success"
 
     try:
-        save_registry_to_disk_fn(
-            registry_bytes=result.registry_bytes,
-            version=result.version,
-            checksum=result.checksum,
-            registry_path=registry_path,
-            state_path=registry_state_path,
-        )
-    except Exception:
-        log.warning("registry_setup_persist_failed", exc_info=True)
-        return False
+        entries = _read_registry(download)
+        if entries is None:
+            return False
+        try:
+            save_registry_to_disk_fn(
+                registry_file=download.path,
+                version=download.version,
+                checksum=download.checksum,
+                registry_path=registry_path,
+                state_path=registry_state_path,
+                snapshot=build_snapshot(entries, download.version),
+                metadata_validators=download.metadata_validators,
+            )
+        except Exception:
+            log.warning("registry_setup_persist_failed", exc_info=True)
+            return False
+    finally:
+        _discard(download.path)
 
-    log.info("registry_setup_complete", version=result.version, entries=len(result.entries))
+    log.info("registry_setup_complete", version=download.version, entries=len(entries))
     return True
 
 
@@ -217,9 +731,10 @@ async def _safe_get(
     url: str,
     *,
     timeout: float | httpx.Timeout,
+    headers: dict[str, str] | None = None,
 ) -> httpx.Response | None:
     try:
-        return await http_client.get(url, timeout=timeout)
+        return await http_client.get(url, timeout=timeout, headers=headers)
     except httpx.HTTPError:
         log.warning(
             "registry_update_transient_failure",
@@ -230,6 +745,11 @@ async def _safe_get(
         return None
 
 
+def _discard(path: Path) -> None:
+    with suppress(OSError):
+        path.unlink(missing_ok=True)
+
+
 def _classify_http_failure(*, url: str, status_code: int, context: str) -> RegistryUpdateOutcome:
     if status_code >= 500 or status_code in {408, 429}:
         log.warning(
@@ -9,13 +9,28 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING, Literal
 
-from rapidfuzz import fuzz, process
-
+from procontext.lru import LRUCache
 from procontext.models.registry import LibraryMatch
+from procontext.models.tools import ResolveLibraryOutput
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from procontext.config import ResolverSettings
+    from procontext.fuzzy import FuzzyIndex
     from procontext.models.registry import RegistryEntry, RegistryIndexes
 
+# resolve_library outputs by (normalised query, language, registry version).
+ResolveCacheKey = tuple[str, str | None, str]
+ResolveCache = LRUCache[ResolveCacheKey, ResolveLibraryOutput]
+
+
+def build_resolve_cache(settings: ResolverSettings) -> ResolveCache | None:
+    """Return the resolve output LRU configured by *settings*, or None when disabled."""
+    if settings.result_cache_entries <= 0:
+        return None
+    return LRUCache(settings.result_cache_entries)
+
 
 def normalise_query(raw: str) -> str:
     """Normalise a raw query string for resolution.
@@ -49,7 +64,92 @@ def resolve_library(
     normalised = normalise_query(query)
     if not normalised:
         return []
+    return _resolve_normalised(
+        normalised,
+        indexes,
+        fuzzy_score_cutoff=fuzzy_score_cutoff,
+        fuzzy_max_results=fuzzy_max_results,
+    )
+
+
+def resolve_libraries(
+    queries: Iterable[str],
+    indexes: RegistryIndexes,
+    *,
+    fuzzy_score_cutoff: int = 70,
+    fuzzy_max_results: int = 5,
+) -> list[list[LibraryMatch]]:
+    """Resolve each query as ``resolve_library`` would, in input order.
+
+    Queries that normalise to the same string (``"httpx"``, ``"httpx>=0.28"``)
+    are resolved once and share their result list.
+    """
+    resolved: dict[str, list[LibraryMatch]] = {"": []}
+    results: list[list[LibraryMatch]] = []
+    for query in queries:
+        normalised = normalise_query(query)
+        matches = resolved.get(normalised)
+        if matches is None:
+            matches = resolved[normalised] = _resolve_normalised(
+                normalised,
+                indexes,
+                fuzzy_score_cutoff=fuzzy_score_cutoff,
+                fuzzy_max_results=fuzzy_max_results,
+            )
+        results.append(matches)
+    return results
+
+
+def search_registry(
+    query: str,
+    indexes: RegistryIndexes,
+    *,
+    limit: int = 10,
+    language: str | None = None,
+    ecosystem: str | None = None,
+) -> list[LibraryMatch]:
+    """Search the registry's names and descriptions by keyword.
+
+    Returns up to *limit* matches ranked by BM25 relevance, only entries with
+    a package group in *language* and *ecosystem* when those are given.
+    """
+    return [
+        _match_from_entry(indexes.by_id[library_id], matched_via="keyword", relevance=relevance)
+        for library_id, relevance in indexes.keywords.search(
+            query, limit=limit, language=language, ecosystem=ecosystem
+        )
+    ]
+
+
+def sort_by_language(matches: list[LibraryMatch], language: str) -> list[LibraryMatch]:
+    """Sort matches and their package entries by language preference.
 
+    Within each match, package entries whose ``languages`` contain the
+    requested language are moved to the front.  Matches that have at least
+    one matching package entry are sorted before those that don't.  Relative
+    order is preserved within each group (stable sort).
+    """
+    sorted_matches: list[LibraryMatch] = []
+    for match in matches:
+        has_lang = [p for p in match.packages if language in p.languages]
+        no_lang = [p for p in match.packages if language not in p.languages]
+        sorted_matches.append(match.model_copy(update={"packages": has_lang + no_lang}))
+
+    def _has_language(m: LibraryMatch) -> bool:
+        return any(language in p.languages for p in m.packages)
+
+    # Stable sort: matches with the language come first
+    return sorted(sorted_matches, key=lambda m: not _has_language(m))
+
+
+def _resolve_normalised(
+    normalised: str,
+    indexes: RegistryIndexes,
+    *,
+    fuzzy_score_cutoff: int,
+    fuzzy_max_results: int,
+) -> list[LibraryMatch]:
+    """Run steps 1-5 for an already normalised, non-empty query."""
     # Step 1: Exact package name match
     library_id = indexes.by_package.get(normalised)
     if library_id is not None:
@@ -70,7 +170,7 @@ def resolve_library(
     # Step 4: Fuzzy match
     matches = _fuzzy_search(
         normalised,
-        indexes.fuzzy_corpus,
+        indexes.fuzzy,
         indexes.by_id,
         limit=fuzzy_max_results,
         score_cutoff=fuzzy_score_cutoff,
@@ -85,7 +185,7 @@ def resolve_library(
 def _match_from_entry(
     entry: RegistryEntry,
     *,
-    matched_via: Literal["package_name", "library_id", "alias", "fuzzy"],
+    matched_via: Literal["package_name", "library_id", "alias", "fuzzy", "keyword"],
     relevance: float,
 ) -> LibraryMatch:
     """Build a LibraryMatch from a RegistryEntry."""
@@ -102,30 +202,22 @@ def _match_from_entry(
 
 def _fuzzy_search(
     query: str,
-    corpus: list[tuple[str, str]],
-    by_id: dict[str, RegistryEntry],
+    fuzzy: FuzzyIndex,
+    by_id: Mapping[str, RegistryEntry],
     limit: int = 5,
     score_cutoff: int = 70,
 ) -> list[LibraryMatch]:
-    """Fuzzy match against the corpus using Levenshtein distance.
+    """Fuzzy match against the registry's terms using Levenshtein distance.
 
     Deduplicates by library_id (one result per library).
     Returns matches sorted by relevance descending.
     """
-    terms = [term for term, _ in corpus]
-    results = process.extract(
-        query,
-        terms,
-        scorer=fuzz.ratio,
-        limit=limit,
-        score_cutoff=score_cutoff,
-    )
+    results = fuzzy.extract(query, limit=limit, score_cutoff=score_cutoff)
 
     seen: set[str] = set()
     matches: list[LibraryMatch] = []
 
-    for _term, score, idx in results:
-        _, library_id = corpus[idx]
+    for _term, score, library_id in results:
         if library_id in seen:
             continue
         seen.add(library_id)
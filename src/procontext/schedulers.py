@@ -1,13 +1,15 @@
-"""Background scheduler coroutines for registry updates and cache cleanup."""
+"""Background scheduler coroutines for registry updates, cache cleanup and loop monitoring."""
 
 from __future__ import annotations
 
 import random
+import time
 from typing import TYPE_CHECKING
 
 import anyio
 import structlog
 
+from procontext.metrics import REGISTRY
 from procontext.registry import (
     REGISTRY_INITIAL_BACKOFF_SECONDS,
     REGISTRY_MAX_BACKOFF_SECONDS,
@@ -21,6 +23,12 @@ if TYPE_CHECKING:
 
 log = structlog.get_logger()
 
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "procontext_event_loop_lag_seconds",
+    "How late the event loop woke a periodic timer; time the loop was blocked.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
 
 def _jittered_delay(base_seconds: int) -> float:
     return base_seconds * random.uniform(0.8, 1.2)
@@ -105,3 +113,11 @@ async def run_registry_update_scheduler(state: AppState) -> None:
         consecutive_transient_failures = 0
         backoff_seconds = REGISTRY_INITIAL_BACKOFF_SECONDS
         await anyio.sleep(poll_interval_seconds)
+
+
+async def run_event_loop_lag_monitor(interval_seconds: float) -> None:
+    """Record how late each periodic wake-up runs — time other work held the loop."""
+    while True:
+        started = time.perf_counter()
+        await anyio.sleep(interval_seconds)
+        EVENT_LOOP_LAG.observe(max(0.0, time.perf_counter() - started - interval_seconds))
@@ -1,14 +1,49 @@
 """In-memory line search for documentation pages.
 
 Pure functions — no I/O, no AppState, no cache. Content is passed in as a
-string, split into lines, and scanned with ``re.search()``.
+string and searched as a whole buffer: the pattern (or, for literal queries,
+``str.find``) locates the next candidate position, which is mapped to its
+line — by counting newlines for ``\\n``/``\\r\\n`` pages, or by bisecting a
+precomputed line-offset array for any other separators — and the line is
+confirmed with the same per-line ``re.search()`` that defines a match.
+Scanning then resumes at the next line, so each matching line is reported once.
+
+Results are identical to testing every line of ``content.splitlines()`` with
+``matcher.search(line)``. Patterns whose meaning depends on what surrounds a
+line — anchors, lookarounds, ``\\B`` — are evaluated line by line instead.
 """
 
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Literal
+from functools import cache
+from itertools import accumulate
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+# Every separator recognised by str.splitlines(). A line never contains one.
+_LINE_SEPARATORS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+# Constructs that see past the edges of a line, so a buffer match need not
+# correspond to a per-line match (or vice versa). Matched textually and
+# conservatively: an escaped occurrence merely costs the fast path.
+_EDGE_SENSITIVE = re.compile(r"[$^]|\\[ABZz]|\(\?[=!<>(]|[*+?}]\+")
+
+# Block size for skipping to a starting line by counting newlines.
+_SKIP_BLOCK_CHARS = 1 << 16
+
+# Below this many lines, walking newline by newline beats counting a block.
+_WALK_LINES = 128
+
+# One "(?:...)" or "(?i:...)" alternative of a multi-query pattern, and its "|".
+_SCOPED_ALTERNATIVE = re.compile(r"\(\?(i?):((?:\\.|[^\\()|\[])*)\)(?:\||\Z)")
+
+# Characters re.escape() backslash-escapes; anything else unescaped is literal.
+_REGEX_SPECIAL = frozenset(".^$*+?{}[]()|\\")
 
 
 @dataclass(frozen=True)
@@ -17,6 +52,16 @@ class LineMatch:
 
     line_number: int  # 1-based
     content: str
+    # 1-based positions of the queries that matched, for multi-query searches.
+    queries: tuple[int, ...] = ()
+
+
+def format_match(match: LineMatch) -> str:
+    """Format *match* as ``'<line_number>:<content>'``, tagged ``[i,j] `` when multi-query."""
+    if not match.queries:
+        return f"{match.line_number}:{match.content}"
+    tags = ",".join(map(str, match.queries))
+    return f"{match.line_number}:[{tags}] {match.content}"
 
 
 @dataclass(frozen=True)
@@ -62,7 +107,7 @@ def search_lines(
     offset: int = 1,
     max_results: int = 20,
 ) -> SearchResult:
-    """Scan *content* line-by-line and return matching lines.
+    """Return matching lines of *content*, paginated.
 
     Args:
         content: Full page text (may be empty).
@@ -72,32 +117,306 @@ def search_lines(
 
     Returns:
         A ``SearchResult`` with matches, has_more flag, and next_offset.
+        Scanning stops at the first match beyond the page, which is only
+        used to set ``has_more``.
+    """
+    return page_of(iter_matches(content, matcher, offset=offset), max_results)
+
+
+def page_of(matches: Iterable[LineMatch], max_results: int) -> SearchResult:
+    """Return the first *max_results* of *matches* as ``search_lines`` would.
+
+    Consumes one match beyond the page, if there is one, to set ``has_more``.
     """
-    lines = content.splitlines()
-    matches: list[LineMatch] = []
-
-    for idx, line in enumerate(lines, start=1):
-        if idx < offset:
-            continue
-        if matcher.search(line):
-            matches.append(LineMatch(line_number=idx, content=line))
-            if len(matches) == max_results:
-                # Check if there are more matches beyond this point
-                for remaining_idx in range(idx + 1, len(lines) + 1):
-                    if matcher.search(lines[remaining_idx - 1]):
-                        return SearchResult(
-                            matches=matches,
-                            has_more=True,
-                            next_offset=idx + 1,
-                        )
-                return SearchResult(
-                    matches=matches,
-                    has_more=False,
-                    next_offset=None,
-                )
+    page: list[LineMatch] = []
+    for match in matches:
+        if len(page) == max_results:
+            return SearchResult(
+                matches=page,
+                has_more=True,
+                next_offset=page[-1].line_number + 1,
+            )
+        page.append(match)
 
     return SearchResult(
-        matches=matches,
+        matches=page,
         has_more=False,
         next_offset=None,
     )
+
+
+def count_lines(content: str) -> int:
+    """Return ``len(content.splitlines())`` without building the list when possible."""
+    if _newline_cursor(content) is None:
+        return len(content.splitlines())
+    return content.count("\n") + (0 if not content or content.endswith("\n") else 1)
+
+
+def iter_matches(
+    content: str,
+    matcher: re.Pattern[str],
+    *,
+    offset: int = 1,
+) -> Iterator[LineMatch]:
+    """Yield matching lines of *content* in order, starting at line *offset*.
+
+    Lazy: work stops as soon as the caller stops iterating.
+    """
+    find, verified = _candidate_finder(content, matcher)
+    if find is None:
+        yield from _iter_matches_per_line(content, matcher, offset)
+        return
+
+    lines = _newline_cursor(content) or _LineIndex(content)
+    pos = lines.start_of(max(offset, 1) - 1)
+    while pos is not None:
+        start = find(pos)
+        if start < 0:
+            return
+        located = lines.locate(start)
+        if located is None:
+            return
+        line_idx, line, pos = located
+        if verified or matcher.search(line):
+            yield LineMatch(line_number=line_idx + 1, content=line)
+
+
+class LineReader:
+    """Reads 1-based line ranges of a buffer, in increasing order of line."""
+
+    def __init__(self, content: str) -> None:
+        self._lines = _newline_cursor(content) or _LineIndex(content)
+
+    def read(self, first: int, last: int) -> list[str]:
+        """Return lines *first*..*last* (inclusive), cut short at the end of the buffer."""
+        texts: list[str] = []
+        pos = self._lines.start_of(first - 1)
+        while pos is not None and len(texts) <= last - first:
+            located = self._lines.locate(pos)
+            if located is None:
+                break
+            _, text, pos = located
+            texts.append(text)
+        return texts
+
+    def start_of(self, line_number: int) -> int | None:
+        """Return the offset where line *line_number* starts, or None past the end."""
+        return self._lines.start_of(line_number - 1)
+
+
+class _LineIndex:
+    """Line start offsets of a buffer, bisected to map a position to its line.
+
+    Handles every separator ``str.splitlines()`` recognises. ``locate()`` must
+    be called with non-decreasing positions.
+    """
+
+    def __init__(self, content: str) -> None:
+        self._lines = content.splitlines(keepends=True)
+        # _starts[i] is the offset of line i; _starts[-1] is len(content).
+        self._starts = [0, *accumulate(map(len, self._lines))]
+        self._lo = 0
+
+    def start_of(self, line_idx: int) -> int | None:
+        return self._starts[line_idx] if line_idx < len(self._lines) else None
+
+    def locate(self, pos: int) -> tuple[int, str, int | None] | None:
+        """Return ``(line_idx, line_text, next_line_start)`` for *pos*, or None past the end.
+
+        ``next_line_start`` is None on the last line.
+        """
+        line_idx = bisect_right(self._starts, pos, lo=self._lo) - 1
+        if line_idx >= len(self._lines):
+            return None
+        self._lo = line_idx
+        line = self._lines[line_idx]
+        if line.endswith("\r\n"):
+            line = line[:-2]
+        elif line and line[-1] in _LINE_SEPARATORS:
+            line = line[:-1]
+        next_idx = line_idx + 1
+        return line_idx, line, self._starts[next_idx] if next_idx < len(self._lines) else None
+
+
+class _NewlineCursor:
+    """Same interface as ``_LineIndex`` for buffers separated by ``\\n`` or ``\\r\\n``.
+
+    Counts newlines between successive positions instead of precomputing
+    every line start — ``str.count``/``str.find`` scan at memchr speed, and
+    a search that stops early never touches the rest of the page.
+    """
+
+    def __init__(self, content: str, *, crlf: bool) -> None:
+        self._content = content
+        self._crlf = crlf
+        self._line_idx = 0
+        self._line_start = 0
+
+    def start_of(self, line_idx: int) -> int | None:
+        content = self._content
+        # Resume from the current line when moving forward.
+        if line_idx >= self._line_idx:
+            pos, remaining = self._line_start, line_idx - self._line_idx
+        else:
+            pos, remaining = 0, line_idx
+        # Skip whole blocks by counting, then walk the last few lines.
+        while remaining > _WALK_LINES:
+            block_end = pos + _SKIP_BLOCK_CHARS
+            in_block = content.count("\n", pos, block_end)
+            if in_block >= remaining or block_end >= len(content):
+                break
+            remaining -= in_block
+            pos = block_end
+        for _ in range(remaining):
+            pos = content.find("\n", pos) + 1
+            if not pos:
+                return None
+        if pos >= len(content):
+            return None
+        self._line_idx = line_idx
+        self._line_start = pos
+        return pos
+
+    def locate(self, pos: int) -> tuple[int, str, int | None] | None:
+        content = self._content
+        newlines = content.count("\n", self._line_start, pos)
+        if newlines:
+            self._line_idx += newlines
+            self._line_start = content.rfind("\n", self._line_start, pos) + 1
+        if self._line_start >= len(content):
+            return None
+        end = content.find("\n", pos)
+        if end < 0:
+            return self._line_idx, content[self._line_start :], None
+        text_end = end - 1 if self._crlf and content[end - 1] == "\r" else end
+        return self._line_idx, content[self._line_start : text_end], end + 1
+
+
+def _newline_cursor(content: str) -> _NewlineCursor | None:
+    """Return a cursor if every line ends in ``\\n`` or ``\\r\\n``, else None."""
+    if any(sep in content for sep in _LINE_SEPARATORS if sep not in "\r\n"):
+        return None
+    if "\r" not in content:
+        return _NewlineCursor(content, crlf=False)
+    if content.count("\r") == content.count("\r\n"):
+        return _NewlineCursor(content, crlf=True)
+    return None  # a bare \r is a line break of its own
+
+
+def _candidate_finder(
+    content: str, matcher: re.Pattern[str]
+) -> tuple[Callable[[int], int] | None, bool]:
+    """Choose how to locate candidate match positions in the whole buffer.
+
+    Returns ``(find, verified)``: ``find(pos)`` gives the offset of the next
+    candidate at or after *pos* (-1 when none remain), and ``verified`` says
+    whether a candidate is already known to be a per-line match. ``find`` is
+    None when the pattern must be evaluated line by line.
+    """
+    literals = _as_literals(matcher)
+    if literals is not None:
+        lowered = cache(content.lower)
+        finders = [
+            _literal_finder(content, lit, ignorecase, lowered) for lit, ignorecase in literals
+        ]
+        if all(finders):
+            found = [f for f in finders if f is not None]
+            return (found[0] if len(found) == 1 else _merged_finder(found)), True
+
+    if _EDGE_SENSITIVE.search(matcher.pattern):
+        return None, False
+
+    def find(pos: int) -> int:
+        match = matcher.search(content, pos)
+        return match.start() if match else -1
+
+    # A buffer match may run across a line separator, so confirm per line.
+    return find, False
+
+
+def _literal_finder(
+    content: str, literal: str, ignorecase: bool, lowered: Callable[[], str]
+) -> Callable[[int], int] | None:
+    """Return a ``str.find``-based finder for *literal*, or None if none is exact."""
+    if _LINE_SEPARATORS.intersection(literal):
+        return None
+    if not ignorecase:
+        return lambda pos: content.find(literal, pos)
+    # ASCII lowercasing preserves offsets and agrees with IGNORECASE; full
+    # Unicode case folding does neither (e.g. "ß", KELVIN SIGN).
+    if content.isascii() and literal.isascii():
+        haystack = lowered()
+        needle = literal.lower()
+        return lambda pos: haystack.find(needle, pos)
+    return None
+
+
+def _merged_finder(finders: list[Callable[[int], int]]) -> Callable[[int], int]:
+    """Combine literal finders into one that yields the earliest candidate of any.
+
+    Each finder's next hit is remembered and only searched again once the scan
+    has passed it, so every literal is scanned through the buffer once.
+    """
+    pending = [-2] * len(finders)  # -2: not searched yet; -1: no more hits
+
+    def find(pos: int) -> int:
+        best = -1
+        for idx, finder in enumerate(finders):
+            hit = pending[idx]
+            if hit != -1 and hit < pos:
+                hit = pending[idx] = finder(pos)
+            if hit >= 0 and (best < 0 or hit < best):
+                best = hit
+        return best
+
+    return find
+
+
+def _as_literals(matcher: re.Pattern[str]) -> list[tuple[str, bool]] | None:
+    """Return ``(text, ignorecase)`` for each literal *matcher* is an alternation of.
+
+    Recognises a single ``re.escape()``-style pattern, and the scoped
+    alternations ``(?:lit)|(?i:lit)|...`` built for multi-query searches.
+    """
+    pattern = matcher.pattern
+    literal = _as_literal(pattern)
+    if literal is not None:
+        return [(literal, bool(matcher.flags & re.IGNORECASE))]
+    if matcher.flags & re.IGNORECASE or not pattern.endswith(")"):
+        return None
+    literals: list[tuple[str, bool]] = []
+    pos = 0
+    while pos < len(pattern):
+        alternative = _SCOPED_ALTERNATIVE.match(pattern, pos)
+        if alternative is None or (literal := _as_literal(alternative[2])) is None:
+            return None
+        literals.append((literal, alternative[1] == "i"))
+        pos = alternative.end()
+    return literals
+
+
+def _as_literal(pattern: str) -> str | None:
+    """Return the text matched by a ``re.escape()``-style *pattern*, or None."""
+    chars: list[str] = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            if char.isalnum():
+                return None  # \d, \b, \1, ... are not literal characters
+            chars.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in _REGEX_SPECIAL:
+            return None
+        else:
+            chars.append(char)
+    return None if escaped else "".join(chars)
+
+
+def _iter_matches_per_line(
+    content: str, matcher: re.Pattern[str], offset: int
+) -> Iterator[LineMatch]:
+    for idx, line in enumerate(content.splitlines(), start=1):
+        if idx >= offset and matcher.search(line):
+            yield LineMatch(line_number=idx, content=line)
@@ -0,0 +1,66 @@
+"""Context lines around search matches, merged into hunks like ``grep -C``.
+
+Each match is shown with up to *before* lines above and *after* lines below
+it. Windows that overlap or touch merge into one hunk; hunks are separated by
+a ``--`` line. Match lines are written ``<line_number>:<content>`` and context
+lines ``<line_number>-<content>``, so a caller can tell them apart. Match
+lines of a multi-query search carry their query tags (see ``format_match``).
+
+Output is capped by a character budget. Matches are added whole — a match
+together with the context it brings in — and the first match that would
+overflow the budget ends the output, so the caller can paginate from there.
+The first match is always included.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from procontext.search import LineReader, format_match
+
+if TYPE_CHECKING:
+    from procontext.search import LineMatch
+
+HUNK_SEPARATOR = "--"
+
+
+def format_hunks(
+    content: str,
+    matches: list[LineMatch],
+    *,
+    before: int,
+    after: int,
+    max_chars: int,
+) -> tuple[str, int]:
+    """Return ``(text, included)``: the hunks and how many of *matches* they cover.
+
+    Args:
+        content: Full page text the matches were found in.
+        matches: Matches in increasing line order, as returned by a search.
+        before: Context lines to show above each match.
+        after: Context lines to show below each match.
+        max_chars: Output budget in characters; 0 disables it.
+    """
+    by_line = {m.line_number: m for m in matches}
+    reader = LineReader(content)
+    out: list[str] = []
+    used = 0
+    shown_through = 0  # last line number already written
+
+    for included, match in enumerate(matches):
+        first = max(match.line_number - before, shown_through + 1, 1)
+        last = match.line_number + after
+        texts = reader.read(first, last) if last >= first else []
+        chunk = [HUNK_SEPARATOR] if out and texts and first > shown_through + 1 else []
+        for number, text in enumerate(texts, start=first):
+            line_match = by_line.get(number)
+            chunk.append(format_match(line_match) if line_match else f"{number}-{text}")
+
+        size = sum(len(line) + 1 for line in chunk)
+        if out and max_chars and used + size > max_chars:
+            return "\n".join(out), included
+        out.extend(chunk)
+        used += size
+        shown_through = max(shown_through, first + len(texts) - 1)
+
+    return "\n".join(out), len(matches)
@@ -0,0 +1,126 @@
+"""Resumable search cursors for paginated ``search_page`` calls.
+
+A cursor holds one query's matches over one version of a page, materialised
+lazily from ``iter_matches`` as far as pages have been requested. Cursors
+live in an LRU keyed by content hash and query parameters, so requesting the
+next page — or repeating a query — resumes from where the last call stopped
+instead of recompiling the pattern and rescanning from line 1.
+
+Once a cursor has seen every match it drops its reference to the page text
+and can report the total match count for free.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+from procontext.lru import LRUCache
+from procontext.search import SearchResult, count_lines
+from procontext.search_multi import iter_tagged_matches
+from procontext.search_sections import count_by_section
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Iterator, Sequence
+
+    from procontext.config import SearchSettings
+    from procontext.search import LineMatch
+
+# (content_hash, query or queries, mode, case_mode, whole_word)
+SearchCursorKey = tuple[str, str | tuple[str, ...], str, str, bool]
+SearchCursorCache = LRUCache[SearchCursorKey, "SearchCursor"]
+
+
+class SearchCursor:
+    """Matches of one query over one page, found incrementally and kept.
+
+    For a multi-query search, *per_query* holds each query's own matcher (see
+    ``search_multi``) and every match is tagged with the queries it matches;
+    *matcher* is ``None`` when the queries are scanned separately.
+    """
+
+    def __init__(
+        self,
+        content: str,
+        matcher: re.Pattern[str] | None,
+        per_query: Sequence[re.Pattern[str]] = (),
+    ) -> None:
+        self.total_lines = count_lines(content)
+        self._content_chars = len(content)
+        self._iterator: Iterator[LineMatch] | None = iter_tagged_matches(
+            content, matcher, per_query
+        )
+        self._matches: list[LineMatch] = []
+        self._line_numbers: list[int] = []
+        self._match_chars = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_matches(self) -> int | None:
+        """Number of matching lines in the page, once the scan has finished."""
+        return None if self._iterator is not None else len(self._matches)
+
+    @property
+    def weight(self) -> int:
+        """Approximate characters held: matched lines, plus the page while scanning."""
+        held_content = self._content_chars if self._iterator is not None else 0
+        return held_content + self._match_chars
+
+    def page(self, offset: int, max_results: int) -> SearchResult:
+        """Return the same result ``search_lines`` would for *offset*/*max_results*.
+
+        Safe to call from several threads; calls on one cursor are serialised.
+        """
+        with self._lock:
+            return self._page(offset, max_results)
+
+    def section_counts(self, heading_lines: list[int]) -> dict[int, int]:
+        """Scan to the end of the page and count matches per section.
+
+        See ``search_sections.count_by_section`` for how lines are attributed.
+        """
+        with self._lock:
+            while self._iterator is not None:
+                self._advance()
+            return count_by_section(self._line_numbers, heading_lines)
+
+    def _page(self, offset: int, max_results: int) -> SearchResult:
+        while self._iterator is not None and (
+            not self._line_numbers or self._line_numbers[-1] < offset
+        ):
+            self._advance()
+        start = bisect_left(self._line_numbers, offset)
+        # One match past the page decides has_more.
+        while self._iterator is not None and len(self._matches) <= start + max_results:
+            self._advance()
+
+        matches = self._matches[start : start + max_results]
+        if len(self._matches) > start + max_results:
+            return SearchResult(
+                matches=matches,
+                has_more=True,
+                next_offset=matches[-1].line_number + 1,
+            )
+        return SearchResult(matches=matches, has_more=False, next_offset=None)
+
+    def _advance(self) -> None:
+        assert self._iterator is not None
+        match = next(self._iterator, None)
+        if match is None:
+            self._iterator = None  # releases the page text
+            return
+        self._matches.append(match)
+        self._line_numbers.append(match.line_number)
+        self._match_chars += len(match.content)
+
+
+def build_cursor_cache(settings: SearchSettings) -> SearchCursorCache | None:
+    """Return the cursor LRU configured by *settings*, or None when disabled."""
+    if settings.cursor_cache_entries <= 0:
+        return None
+    return LRUCache(
+        settings.cursor_cache_entries,
+        max_weight=settings.cursor_cache_max_chars,
+    )
@@ -0,0 +1,113 @@
+"""Several search queries answered by one scan of a page.
+
+The queries are compiled into a single alternation, so the page is scanned
+once for lines matching any of them — each query keeps its own case
+sensitivity through a scoped inline flag. Matching lines are then tagged
+with the (1-based) positions of the queries they match, by testing each
+query's own pattern against the matched line only.
+
+Regex queries that cannot share an alternation — a numbered backreference
+after another query's groups, a group name used twice, a global inline
+flag — are instead scanned one at a time, and their hits merged by line.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import replace
+from itertools import groupby, repeat
+from typing import TYPE_CHECKING, Literal
+
+from procontext.search import LineMatch, build_matcher, iter_matches
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+# "\1" or "(?(1)...)": resolved by group number, which an alternation shifts.
+# Matched textually and conservatively, like search._EDGE_SENSITIVE.
+_NUMBERED_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+# "(?i)" and friends: only allowed at the start of the whole pattern.
+_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def build_multi_matcher(
+    queries: Sequence[str],
+    *,
+    mode: Literal["literal", "regex"] = "literal",
+    case_mode: Literal["smart", "insensitive", "sensitive"] = "smart",
+    whole_word: bool = False,
+) -> tuple[re.Pattern[str] | None, list[re.Pattern[str]]]:
+    """Return ``(combined, per_query)`` matchers for *queries*.
+
+    ``combined`` matches a line when any query does; ``per_query`` holds each
+    query's matcher, as ``build_matcher`` would compile it, for tagging.
+    ``combined`` is ``None`` when the queries must be scanned separately.
+
+    Raises ``re.error`` for invalid regex patterns, like ``build_matcher``.
+    """
+    per_query = [
+        build_matcher(q, mode=mode, case_mode=case_mode, whole_word=whole_word) for q in queries
+    ]
+    if not _can_alternate(per_query):
+        return None, per_query
+    alternatives = [
+        f"(?i:{m.pattern})" if m.flags & re.IGNORECASE else f"(?:{m.pattern})" for m in per_query
+    ]
+    return re.compile("|".join(alternatives)), per_query
+
+
+def iter_tagged_matches(
+    content: str,
+    combined: re.Pattern[str] | None,
+    per_query: Sequence[re.Pattern[str]] = (),
+    *,
+    offset: int = 1,
+) -> Iterator[LineMatch]:
+    """Yield matching lines of *content* from line *offset*, as ``iter_matches`` does.
+
+    With *per_query*, each match is tagged with the queries it matches. A
+    ``None`` *combined* (see ``build_multi_matcher``) scans each query in turn.
+    """
+    if combined is None:
+        return _merge_scans(content, per_query, offset)
+    matches = iter_matches(content, combined, offset=offset)
+    return tag_matches(matches, per_query) if per_query else matches
+
+
+def tag_matches(
+    matches: Iterable[LineMatch], per_query: Sequence[re.Pattern[str]]
+) -> Iterator[LineMatch]:
+    """Yield *matches* with ``queries`` set to the positions of the queries they match."""
+    for match in matches:
+        tags = tuple(i for i, m in enumerate(per_query, start=1) if m.search(match.content))
+        yield replace(match, queries=tags)
+
+
+def _can_alternate(per_query: Sequence[re.Pattern[str]]) -> bool:
+    names: set[str] = set()
+    groups = 0
+    for matcher in per_query:
+        if _GLOBAL_FLAGS.search(matcher.pattern) or not names.isdisjoint(matcher.groupindex):
+            return False
+        if groups and _NUMBERED_BACKREFERENCE.search(matcher.pattern):
+            return False
+        names.update(matcher.groupindex)
+        groups += matcher.groups
+    return True
+
+
+def _merge_scans(
+    content: str, per_query: Sequence[re.Pattern[str]], offset: int
+) -> Iterator[LineMatch]:
+    scans = [
+        zip(iter_matches(content, matcher, offset=offset), repeat(i), strict=False)
+        for i, matcher in enumerate(per_query, start=1)
+    ]
+    # merge() is stable, so a line's hits arrive in query order.
+    hits = heapq.merge(*scans, key=lambda hit: hit[0].line_number)
+    for _, line_hits in groupby(hits, key=lambda hit: hit[0].line_number):
+        line = list(line_hits)
+        match = line[0][0]
+        yield LineMatch(match.line_number, match.content, tuple(i for _, i in line))
@@ -0,0 +1,53 @@
+"""Per-section match counts for ``search_page`` count mode.
+
+Attributes each matching line to the nearest heading at or above it, using
+the page's cached outline, so an agent can see where matches cluster without
+paging through them. Matches above the first heading are counted under line 0.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from procontext.outline import OutlineEntry
+
+# Label for matches above the first heading.
+_PREAMBLE = "(before first heading)"
+
+
+def count_by_section(line_numbers: Iterable[int], heading_lines: Sequence[int]) -> dict[int, int]:
+    """Map each section's heading line to the number of *line_numbers* in it.
+
+    *heading_lines* must be sorted. Sections without matches are omitted;
+    matches above the first heading are counted under 0.
+    """
+    counts: dict[int, int] = {}
+    for line_number in line_numbers:
+        idx = bisect_right(heading_lines, line_number) - 1
+        section = heading_lines[idx] if idx >= 0 else 0
+        counts[section] = counts.get(section, 0) + 1
+    return counts
+
+
+def section_headings(entries: list[OutlineEntry]) -> list[OutlineEntry]:
+    """Return the heading entries of an outline, skipping fences and their contents."""
+    return [e for e in entries if e.depth is not None and not e.is_fence and not e.in_fence]
+
+
+def format_section_counts(counts: dict[int, int], headings: list[OutlineEntry]) -> str:
+    """Format *counts* as ``'<line_number>:<heading> (<count>)'`` lines in page order.
+
+    The preamble, if it has matches, is reported at line 1.
+    """
+    text_by_line = {e.line_number: e.text for e in headings}
+    lines: list[str] = []
+    for section in sorted(counts):
+        if section == 0:
+            lines.append(f"1:{_PREAMBLE} ({counts[section]})")
+        else:
+            lines.append(f"{section}:{text_by_line[section]} ({counts[section]})")
+    return "\n".join(lines)
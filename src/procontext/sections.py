@@ -0,0 +1,165 @@
+"""Section tree of a page, for reading one section by heading path or line.
+
+A section is a heading outside fenced code and the lines up to the next
+heading of the same or a higher level. Sections nest: a heading's path is the
+titles of its enclosing sections followed by its own, e.g.
+``("API Reference", "Streaming", "Callbacks")``. Section extents and sizes are
+computed at ingest and stored with the outline (see ``OutlineIndex``); this
+module adds the paths and resolves an agent's section selector.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING
+
+from procontext.outline import approx_tokens
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from procontext.outline import OutlineIndex
+
+# Separator between heading titles in a section path.
+PATH_SEPARATOR = " > "
+
+# Leading blockquote marker and heading hashes, and an optional closing run of
+# hashes (``## Usage ##``).
+_HEADING_PREFIX_RE = re.compile(r"^(?:>\s*)?#{1,6}\s+")
+_CLOSING_HASHES_RE = re.compile(r"\s+#+$")
+
+
+@dataclass(frozen=True)
+class Section:
+    """One heading's section of a page."""
+
+    line_number: int  # 1-based line of the heading
+    end_line: int  # Last line of the section (inclusive)
+    depth: int  # 1 for H1 … 6 for H6
+    heading: str  # Original heading line, e.g. "## Usage"
+    path: tuple[str, ...]  # Titles from the outermost section down to this one
+    chars: int  # Size of the section text in characters
+
+    @property
+    def line_count(self) -> int:
+        return self.end_line - self.line_number + 1
+
+    @property
+    def approx_tokens(self) -> int:
+        return approx_tokens(self.chars)
+
+
+def heading_title(heading: str) -> str:
+    """Return the title of a heading line: ``"## Usage ##"`` → ``"Usage"``."""
+    title = _HEADING_PREFIX_RE.sub("", heading.strip(), count=1)
+    return _CLOSING_HASHES_RE.sub("", title)
+
+
+def build_sections(outline: OutlineIndex) -> list[Section]:
+    """Return the page's sections in page order, with their heading paths."""
+    sections: list[Section] = []
+    ancestors: list[tuple[int, str]] = []  # (depth, title) of enclosing sections
+    for entry, end_line, chars in outline.sections():
+        assert entry.depth is not None
+        while ancestors and ancestors[-1][0] >= entry.depth:
+            ancestors.pop()
+        ancestors.append((entry.depth, heading_title(entry.text)))
+        sections.append(
+            Section(
+                line_number=entry.line_number,
+                end_line=end_line,
+                depth=entry.depth,
+                heading=entry.text,
+                path=tuple(title for _, title in ancestors),
+                chars=chars,
+            )
+        )
+    return sections
+
+
+def find_section(sections: list[Section], selector: int | str) -> Section | None:
+    """Return the section *selector* names, or ``None`` if there is none.
+
+    An int selects the innermost section containing that line. A string is a
+    heading path, titles separated by ``>`` (``PATH_SEPARATOR`` in paths this
+    module renders); matching ignores case, runs of whitespace and heading
+    markers (``"## Usage"`` matches ``Usage``). The last title must be the
+    section's own, and the others must name enclosing sections in order,
+    though levels may be skipped: ``"Reference > Callbacks"`` finds
+    ``Reference > Streaming > Callbacks``. Titles may themselves contain
+    ``>`` — ``"API > Result<T, E>"`` finds the heading ``Result<T, E>``.
+    The first matching section in page order wins.
+    """
+    if isinstance(selector, int):
+        return _section_at(sections, selector)
+
+    # Every ">" may separate titles or belong to one, so each run of pieces
+    # between two of them is a candidate title.
+    pieces = selector.split(">")
+
+    @cache
+    def title(start: int, end: int) -> str:
+        return _normalize(heading_title(">".join(pieces[start:end])))
+
+    # Titles the selector can end with, to rule most sections out at once.
+    endings = {title(start, len(pieces)) for start in range(len(pieces))}
+    for section in sections:
+        if _normalize(section.path[-1]) not in endings:
+            continue
+        path = [_normalize(t) for t in section.path]
+        if _path_matches(title, len(pieces), path):
+            return section
+    return None
+
+
+def _path_matches(title: Callable[[int, int], str], count: int, path: list[str]) -> bool:
+    """Whether the selector's *count* pieces group into titles naming *path*.
+
+    ``title(i, j)`` is pieces ``i`` to ``j`` joined back into one title. The
+    last group must be the section's own title and the others must match
+    enclosing sections in order, each at the first ancestor it can.
+    """
+    ancestors = path[:-1]
+    longest = max(map(len, ancestors), default=0)
+    failed: set[tuple[int, int]] = set()
+
+    def rest_matches(start: int, ancestor: int) -> bool:
+        if (start, ancestor) in failed:
+            return False
+        if title(start, count) == path[-1]:
+            return True
+        for end in range(start + 1, count):
+            wanted = title(start, end)
+            if len(wanted) > longest:
+                break  # Joining more pieces only lengthens the title
+            found = next(
+                (k for k in range(ancestor, len(ancestors)) if ancestors[k] == wanted), None
+            )
+            if found is not None and rest_matches(end, found + 1):
+                return True
+        failed.add((start, ancestor))
+        return False
+
+    return rest_matches(0, 0)
+
+
+def _section_at(sections: list[Section], line_number: int) -> Section | None:
+    # Sections nest, so walking back from the last one starting at or above
+    # the line, the first that reaches it is the innermost.
+    idx = bisect_right(sections, line_number, key=lambda s: s.line_number)
+    for i in range(idx - 1, -1, -1):
+        if sections[i].end_line >= line_number:
+            return sections[i]
+    return None
+
+
+def _normalize(title: str) -> str:
+    return " ".join(title.split()).casefold()
+
+
+def _is_subsequence(needle: list[str], haystack: list[str]) -> bool:
+    remaining = iter(haystack)
+    return all(title in remaining for title in needle)
@@ -9,14 +9,21 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from procontext.offload import Offloader
+
 if TYPE_CHECKING:
     from pathlib import Path
 
     import httpx
 
+    from procontext.admission import AdmissionController
     from procontext.config import Settings
     from procontext.models.registry import RegistryIndexes
     from procontext.protocols import CacheProtocol, FetcherProtocol
+    from procontext.regex_sandbox import RegexSandbox
+    from procontext.registry.mirrors import RegistryMirrors
+    from procontext.resolver import ResolveCache
+    from procontext.search_cursor import SearchCursorCache
 
 
 @dataclass
@@ -28,8 +35,14 @@ class AppState:
     registry_version: str = ""
     registry_path: Path | None = None
     registry_state_path: Path | None = None
+    registry_mirrors: RegistryMirrors | None = None
     http_client: httpx.AsyncClient | None = None
     cache: CacheProtocol | None = None
     fetcher: FetcherProtocol | None = None
     allowlist: frozenset[str] = field(default_factory=frozenset)
+    admission: AdmissionController | None = None
+    search_cursors: SearchCursorCache | None = None
+    resolve_cache: ResolveCache | None = None
+    regex_sandbox: RegexSandbox | None = None
+    offloader: Offloader = field(default_factory=Offloader)
     _refreshing: set[str] = field(default_factory=set)
@@ -18,10 +18,16 @@ from urllib.parse import urlparse, urlunparse
 import structlog
 
 from procontext.errors import ErrorCode, ProContextError
-from procontext.fetcher import expand_allowlist_from_content, is_url_allowed
+from procontext.fetcher import (
+    expand_allowlist,
+    extract_base_domains_from_content,
+    is_url_allowed,
+)
+from procontext.outline import OutlineIndex
 from procontext.parser import parse_outline
 
 if TYPE_CHECKING:
+    from procontext.models.cache import PageCacheEntry
     from procontext.state import AppState
 
 log = structlog.get_logger()
@@ -36,7 +42,7 @@ class FetchResult:
 
     url: str
     content: str
-    outline: str
+    outline: OutlineIndex
     content_hash: str
     cached: bool
     cached_at: datetime | None
@@ -48,6 +54,30 @@ def _content_hash(content: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:12]
 
 
+async def _hash_offloaded(content: str, state: AppState) -> str:
+    """``_content_hash`` off the event loop for large content."""
+    return await state.offloader.run_pure(len(content), _content_hash, content)
+
+
+def _process_page(content: str) -> tuple[OutlineIndex, frozenset[str], str]:
+    """CPU-bound processing of freshly fetched content: outline, domains, hash."""
+    return (
+        OutlineIndex.build(parse_outline(content), content),
+        extract_base_domains_from_content(content),
+        _content_hash(content),
+    )
+
+
+async def _cached_outline(entry: PageCacheEntry, state: AppState) -> OutlineIndex:
+    """Load the cached outline index, rebuilding it for entries stored without one."""
+    try:
+        return OutlineIndex.from_bytes(entry.outline, entry.outline_index)
+    except ValueError:
+        return await state.offloader.run_pure(
+            len(entry.content), OutlineIndex.build, entry.outline, entry.content
+        )
+
+
 async def fetch_or_cached_page(url: str, state: AppState) -> FetchResult:
     """Cache-check → network fetch → cache-write for a single page URL.
 
@@ -92,8 +122,8 @@ async def fetch_or_cached_page(url: str, state: AppState) -> FetchResult:
         return FetchResult(
             url=cached_entry.url,
             content=cached_entry.content,
-            outline=cached_entry.outline,
-            content_hash=_content_hash(cached_entry.content),
+            outline=await _cached_outline(cached_entry, state),
+            content_hash=await _hash_offloaded(cached_entry.content, state),
             cached=True,
             cached_at=cached_entry.fetched_at,
             stale=False,
@@ -110,8 +140,8 @@ async def fetch_or_cached_page(url: str, state: AppState) -> FetchResult:
         return FetchResult(
             url=cached_entry.url,
             content=cached_entry.content,
-            outline=cached_entry.outline,
-            content_hash=_content_hash(cached_entry.content),
+            outline=await _cached_outline(cached_entry, state),
+            content_hash=await _hash_offloaded(cached_entry.content, state),
             cached=True,
             cached_at=cached_entry.fetched_at,
             stale=True,
@@ -121,6 +151,17 @@ async def fetch_or_cached_page(url: str, state: AppState) -> FetchResult:
     return await _fetch_and_cache(url, url_hash, state)
 
 
+async def is_page_cached(url: str, state: AppState) -> bool:
+    """Return True if *url* would be served from cache without a network fetch.
+
+    Stale entries count: they are returned immediately and refreshed in the
+    background.
+    """
+    if state.cache is None:
+        return False
+    return await state.cache.has_page(hashlib.sha256(url.encode()).hexdigest())
+
+
 # ------------------------------------------------------------------
 # Internal helpers
 # ------------------------------------------------------------------
@@ -177,15 +218,15 @@ async def _background_refresh(
             return
 
         content = await _fetch_with_md_probe(url, state)
-        outline = parse_outline(content)
-
-        discovered_domains = expand_allowlist_from_content(content, state)
+        outline, domains, _ = await state.offloader.run_pure(len(content), _process_page, content)
+        discovered_domains = expand_allowlist(domains, state)
 
         await state.cache.set_page(
             url=url,
             url_hash=url_hash,
             content=content,
-            outline=outline,
+            outline=outline.raw,
+            outline_index=outline.to_bytes(),
             ttl_hours=state.settings.cache.ttl_hours,
             discovered_domains=discovered_domains,
         )
@@ -204,17 +245,20 @@ async def _fetch_and_cache(url: str, url_hash: str, state: AppState) -> FetchRes
     assert state.cache is not None
 
     content = await _fetch_with_md_probe(url, state)
-    outline = parse_outline(content)
+    outline, domains, content_hash = await state.offloader.run_pure(
+        len(content), _process_page, content
+    )
 
     log.info("fetch_complete", url=url, content_length=len(content))
 
-    discovered_domains = expand_allowlist_from_content(content, state)
+    discovered_domains = expand_allowlist(domains, state)
 
     await state.cache.set_page(
         url=url,
         url_hash=url_hash,
         content=content,
-        outline=outline,
+        outline=outline.raw,
+        outline_index=outline.to_bytes(),
         ttl_hours=state.settings.cache.ttl_hours,
         discovered_domains=discovered_domains,
     )
@@ -223,7 +267,7 @@ async def _fetch_and_cache(url: str, url_hash: str, state: AppState) -> FetchRes
         url=url,
         content=content,
         outline=outline,
-        content_hash=_content_hash(content),
+        content_hash=content_hash,
         cached=False,
         cached_at=None,
         stale=False,
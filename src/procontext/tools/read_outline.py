@@ -1,7 +1,7 @@
 """Tool handler for read_outline.
 
-Validates input, delegates fetching to the shared helper, strips empty fences,
-paginates outline entries by entry index, and returns the formatted result.
+Validates input, delegates fetching to the shared helper, paginates the
+fence-stripped outline entries by entry index, and returns the formatted result.
 """
 
 from __future__ import annotations
@@ -12,11 +12,11 @@ import structlog
 
 from procontext.errors import ErrorCode, ProContextError
 from procontext.models.tools import ReadOutlineInput, ReadOutlineOutput
-from procontext.outline import format_outline, parse_outline_entries, strip_empty_fences
 from procontext.tools._shared import fetch_or_cached_page
 
 if TYPE_CHECKING:
     from procontext.state import AppState
+    from procontext.tools._shared import FetchResult
 
 
 async def handle(
@@ -24,6 +24,8 @@ async def handle(
     offset: int,
     limit: int,
     state: AppState,
+    *,
+    section_sizes: bool = False,
 ) -> dict:
     """Handle a read_outline tool call."""
     log = structlog.get_logger().bind(tool="read_outline", url=url)
@@ -31,7 +33,9 @@ async def handle(
 
     # Validate input
     try:
-        validated = ReadOutlineInput(url=url, offset=offset, limit=limit)
+        validated = ReadOutlineInput(
+            url=url, offset=offset, limit=limit, section_sizes=section_sizes
+        )
     except ValueError as exc:
         raise ProContextError(
             code=ErrorCode.INVALID_INPUT,
@@ -43,23 +47,24 @@ async def handle(
         ) from exc
 
     result = await fetch_or_cached_page(validated.url, state)
+    return _render(result, validated.offset, validated.limit, validated.section_sizes)
 
-    # Parse and strip empty fences (no compaction for read_outline)
-    entries = parse_outline_entries(result.outline)
-    entries = strip_empty_fences(entries)
-    total_entries = len(entries)
+
+def _render(result: FetchResult, offset: int, limit: int, section_sizes: bool) -> dict:
+    """Paginate the outline into the output dict (no compaction for read_outline)."""
+    total_entries = len(result.outline)
 
     # Paginate by entry index (1-based offset)
-    start = validated.offset - 1
-    end = start + validated.limit
-    page = entries[start:end]
+    start = offset - 1
+    end = start + limit
+    page = result.outline.slice(start, end)
 
     has_more = end < total_entries
     next_offset = end + 1 if has_more else None
 
     output = ReadOutlineOutput(
         url=result.url,
-        outline=format_outline(page),
+        outline=page.format(section_sizes=section_sizes),
         total_entries=total_entries,
         has_more=has_more,
         next_offset=next_offset,
@@ -12,19 +12,15 @@ import structlog
 
 from procontext.errors import ErrorCode, ProContextError
 from procontext.models.tools import ReadPageInput, ReadPageOutput
-from procontext.outline import (
-    build_compaction_note,
-    compact_outline,
-    format_outline,
-    parse_outline_entries,
-    strip_empty_fences,
-)
+from procontext.outline import build_compaction_note
 from procontext.tools._shared import fetch_or_cached_page
 
 if TYPE_CHECKING:
     from datetime import datetime
 
+    from procontext.outline import OutlineIndex
     from procontext.state import AppState
+    from procontext.tools._shared import FetchResult
 
 
 async def handle(
@@ -50,15 +46,20 @@ async def handle(
 
     result = await fetch_or_cached_page(validated.url, state)
 
-    # Compact the outline
-    compacted_outline = _compact_page_outline(result.outline)
+    # Outline compaction and line windowing scale with page size.
+    return await state.offloader.run_pure(
+        len(result.content), _render, result, validated.offset, validated.limit
+    )
+
 
+def _render(result: FetchResult, offset: int, limit: int) -> dict:
+    """Compact the outline and window the content into the output dict."""
     return _build_output(
         url=result.url,
         content=result.content,
-        outline=compacted_outline,
-        offset=validated.offset,
-        limit=validated.limit,
+        outline=_compact_page_outline(result.outline),
+        offset=offset,
+        limit=limit,
         content_hash=result.content_hash,
         cached=result.cached,
         cached_at=result.cached_at,
@@ -66,23 +67,21 @@ async def handle(
     )
 
 
-def _compact_page_outline(raw_outline: str) -> str:
-    """Parse, strip empty fences, and compact an outline for read_page output."""
-    entries = parse_outline_entries(raw_outline)
-    entries = strip_empty_fences(entries)
-    total_entries = len(entries)
+def _compact_page_outline(outline: OutlineIndex) -> str:
+    """Compact the (already fence-stripped) outline for read_page output."""
+    total_entries = len(outline)
 
     if total_entries <= 50:
-        return format_outline(entries)
+        return outline.format()
 
-    compacted = compact_outline(entries)
+    compacted = outline.compact()
     if compacted is None:
         return (
             f"[Outline too large ({total_entries} entries). Use read_outline for paginated access.]"
         )
 
     note = build_compaction_note(compacted, total_entries)
-    return note + "\n" + format_outline(compacted)
+    return note + "\n" + compacted.format()
 
 
 def _build_output(
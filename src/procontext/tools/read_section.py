@@ -0,0 +1,94 @@
+"""Tool handler for read_section.
+
+Validates input, delegates fetching to the shared helper, resolves the
+requested section from the page's section tree, and returns its lines —
+exactly the section, so the agent need not guess an offset and limit.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.models.tools import ReadSectionInput, ReadSectionOutput
+from procontext.search import LineReader
+from procontext.sections import PATH_SEPARATOR, build_sections, find_section
+from procontext.tools._shared import fetch_or_cached_page
+
+if TYPE_CHECKING:
+    from procontext.state import AppState
+    from procontext.tools._shared import FetchResult
+
+
+async def handle(
+    url: str,
+    section: int | str,
+    state: AppState,
+    *,
+    limit: int = 500,
+) -> dict:
+    """Handle a read_section tool call."""
+    log = structlog.get_logger().bind(tool="read_section", url=url, section=section)
+    log.info("handler_called")
+
+    # Validate input
+    try:
+        validated = ReadSectionInput(url=url, section=section, limit=limit)
+    except ValueError as exc:
+        raise ProContextError(
+            code=ErrorCode.INVALID_INPUT,
+            message=str(exc),
+            suggestion=(
+                "Provide a valid URL (http/https, max 2048 chars), a section heading path "
+                "or line number >= 1, and limit >= 1."
+            ),
+            recoverable=False,
+        ) from exc
+
+    result = await fetch_or_cached_page(validated.url, state)
+
+    # Resolving the section and reading its lines scale with page size.
+    output = await state.offloader.run_pure(
+        len(result.content), _render, result, validated.section, validated.limit
+    )
+    if output is None:
+        raise ProContextError(
+            code=ErrorCode.SECTION_NOT_FOUND,
+            message=f"No section matches {validated.section!r} in {validated.url}",
+            suggestion=(
+                "Use read_outline to list the page's headings, then pass a heading path "
+                "(e.g. 'Usage > Streaming') or the line number of a heading."
+            ),
+            recoverable=False,
+        )
+    return output
+
+
+def _render(result: FetchResult, selector: int | str, limit: int) -> dict | None:
+    """Find the section and read its lines, or return None if there is no such section."""
+    section = find_section(build_sections(result.outline), selector)
+    if section is None:
+        return None
+
+    last = min(section.end_line, section.line_number + limit - 1)
+    lines = LineReader(result.content).read(section.line_number, last)
+    has_more = last < section.end_line
+
+    output = ReadSectionOutput(
+        url=result.url,
+        section=PATH_SEPARATOR.join(section.path),
+        heading=section.heading,
+        start_line=section.line_number,
+        end_line=section.end_line,
+        approx_tokens=section.approx_tokens,
+        content="\n".join(lines),
+        has_more=has_more,
+        next_offset=last + 1 if has_more else None,
+        content_hash=result.content_hash,
+        cached=result.cached,
+        cached_at=result.cached_at,
+        stale=result.stale,
+    )
+    return output.model_dump(mode="json")
@@ -0,0 +1,68 @@
+"""Tool handler for resolve_libraries.
+
+Resolves a whole list of queries — typically a project's dependencies — in
+one call instead of one resolve_library round trip per package. No MCP or
+FastMCP imports — server.py handles the MCP wiring.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.models.tools import (
+    MAX_RESOLVE_QUERIES,
+    LibraryResolution,
+    ResolveLibrariesInput,
+    ResolveLibrariesOutput,
+)
+from procontext.resolver import resolve_libraries, sort_by_language
+
+if TYPE_CHECKING:
+    from procontext.state import AppState
+
+
+async def handle(
+    queries: list[str],
+    state: AppState,
+    *,
+    language: str | None = None,
+) -> dict:
+    """Handle a resolve_libraries tool call."""
+    log = structlog.get_logger().bind(tool="resolve_libraries", query_count=len(queries))
+    log.info("handler_called")
+
+    # Validate input
+    try:
+        validated = ResolveLibrariesInput(queries=queries, language=language)
+    except ValueError as exc:
+        raise ProContextError(
+            code=ErrorCode.INVALID_INPUT,
+            message=str(exc),
+            suggestion=(
+                f"Provide 1-{MAX_RESOLVE_QUERIES} non-empty library names, package names, "
+                "or aliases (max 500 chars each)."
+            ),
+            recoverable=False,
+        ) from exc
+
+    all_matches = resolve_libraries(
+        validated.queries,
+        state.indexes,
+        fuzzy_score_cutoff=state.settings.resolver.fuzzy_score_cutoff,
+        fuzzy_max_results=state.settings.resolver.fuzzy_max_results,
+    )
+
+    results: list[LibraryResolution] = []
+    for query, matches in zip(validated.queries, all_matches, strict=True):
+        if validated.language:
+            matches = sort_by_language(matches, validated.language)
+        results.append(LibraryResolution(query=query, matches=matches))
+    unresolved = [result.query for result in results if not result.matches]
+
+    log.info("resolve_complete", resolved=len(results) - len(unresolved))
+
+    output = ResolveLibrariesOutput(results=results, unresolved=unresolved)
+    return output.model_dump(mode="json")
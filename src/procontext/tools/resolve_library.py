@@ -13,10 +13,9 @@ import structlog
 
 from procontext.errors import ErrorCode, ProContextError
 from procontext.models.tools import ResolveLibraryInput, ResolveLibraryOutput
-from procontext.resolver import resolve_library
+from procontext.resolver import normalise_query, resolve_library, sort_by_language
 
 if TYPE_CHECKING:
-    from procontext.models.registry import LibraryMatch
     from procontext.state import AppState
 
 
@@ -27,6 +26,21 @@ async def handle(
     language: str | None = None,
 ) -> dict:
     """Handle a resolve_library tool call."""
+    output = await resolve(query, state, language=language)
+    return output.model_dump(mode="json")
+
+
+async def resolve(
+    query: str,
+    state: AppState,
+    *,
+    language: str | None = None,
+) -> ResolveLibraryOutput:
+    """Return the resolve_library output model, as ``handle`` would dump it.
+
+    The server returns this model to FastMCP as is, so a cache hit builds no
+    ``LibraryMatch`` models. Callers must not modify it: it may be shared.
+    """
     log = structlog.get_logger().bind(tool="resolve_library", query=query)
     log.info("handler_called")
 
@@ -41,6 +55,17 @@ async def handle(
             recoverable=False,
         ) from exc
 
+    # Outputs depend only on the normalised query, the language and the
+    # registry, so repeat calls skip matching and model building.
+    normalised = normalise_query(validated.query)
+    cache_key = (normalised, validated.language, state.registry_version)
+    cache = state.resolve_cache
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            log.info("resolve_complete", match_count=len(cached.matches), cached=True)
+            return cached
+
     matches = resolve_library(
         validated.query,
         state.indexes,
@@ -49,30 +74,11 @@ async def handle(
     )
 
     if validated.language:
-        matches = _sort_by_language(matches, validated.language)
+        matches = sort_by_language(matches, validated.language)
 
-    log.info("resolve_complete", match_count=len(matches))
+    log.info("resolve_complete", match_count=len(matches), cached=False)
 
     output = ResolveLibraryOutput(matches=matches)
-    return output.model_dump(mode="json")
-
-
-def _sort_by_language(matches: list[LibraryMatch], language: str) -> list[LibraryMatch]:
-    """Sort matches and their package entries by language preference.
-
-    Within each match, package entries whose ``languages`` contain the
-    requested language are moved to the front.  Matches that have at least
-    one matching package entry are sorted before those that don't.  Relative
-    order is preserved within each group (stable sort).
-    """
-    sorted_matches: list[LibraryMatch] = []
-    for match in matches:
-        has_lang = [p for p in match.packages if language in p.languages]
-        no_lang = [p for p in match.packages if language not in p.languages]
-        sorted_matches.append(match.model_copy(update={"packages": has_lang + no_lang}))
-
-    def _has_language(m: LibraryMatch) -> bool:
-        return any(language in p.languages for p in m.packages)
-
-    # Stable sort: matches with the language come first
-    return sorted(sorted_matches, key=lambda m: not _has_language(m))
+    if cache is not None:
+        cache.put(cache_key, output)
+    return output
@@ -2,35 +2,46 @@
 
 Validates input, fetches page content via the shared helper, compiles the
 search matcher, runs the line scan, and returns matches with pagination.
+When search cursors are enabled, the scan resumes from a cursor cached for
+the same page content and query, so later pages skip the work already done.
+With context lines requested, matches are rendered as merged hunks within
+the configured response budget, which may end the page early.
 """
 
 from __future__ import annotations
 
 import re
+from functools import partial
 from typing import TYPE_CHECKING
 
 import structlog
 
 from procontext.errors import ErrorCode, ProContextError
 from procontext.models.tools import SearchPageInput, SearchPageOutput
-from procontext.outline import (
-    build_compaction_note,
-    compact_outline,
-    format_outline,
-    parse_outline_entries,
-    strip_empty_fences,
-    trim_outline_to_range,
+from procontext.outline import build_compaction_note
+from procontext.search import (
+    SearchResult,
+    build_matcher,
+    count_lines,
+    format_match,
+    page_of,
 )
-from procontext.search import build_matcher, search_lines
+from procontext.search_context import format_hunks
+from procontext.search_cursor import SearchCursor
+from procontext.search_multi import build_multi_matcher, iter_tagged_matches
+from procontext.search_sections import count_by_section, format_section_counts
 from procontext.tools._shared import fetch_or_cached_page
 
 if TYPE_CHECKING:
+    from procontext.outline import OutlineIndex
+    from procontext.search_cursor import SearchCursorCache, SearchCursorKey
     from procontext.state import AppState
+    from procontext.tools._shared import FetchResult
 
 
 async def handle(
     url: str,
-    query: str,
+    query: str | list[str],
     state: AppState,
     *,
     mode: str = "literal",
@@ -38,6 +49,9 @@ async def handle(
     whole_word: bool = False,
     offset: int = 1,
     max_results: int = 20,
+    context_before: int = 0,
+    context_after: int = 0,
+    output_mode: str = "matches",
 ) -> dict:
     """Handle a search_page tool call."""
     log = structlog.get_logger().bind(tool="search_page", url=url, query=query)
@@ -53,47 +67,39 @@ async def handle(
             whole_word=whole_word,
             offset=offset,
             max_results=max_results,
+            context_before=context_before,
+            context_after=context_after,
+            output_mode=output_mode,  # type: ignore[arg-type]
         )
     except ValueError as exc:
         raise ProContextError(
             code=ErrorCode.INVALID_INPUT,
             message=str(exc),
-            suggestion="Check url, query, mode, case_mode, offset, and max_results values.",
+            suggestion=(
+                "Check url, query, mode, case_mode, offset, max_results, "
+                "context_before, context_after, and output_mode values."
+            ),
             recoverable=False,
         ) from exc
 
     # Fetch (or retrieve from cache) the page content
     result = await fetch_or_cached_page(validated.url, state)
 
-    # Compile the search pattern
-    try:
-        matcher = build_matcher(
-            validated.query,
-            mode=validated.mode,
-            case_mode=validated.case_mode,
-            whole_word=validated.whole_word,
-        )
-    except re.error as exc:
-        raise ProContextError(
-            code=ErrorCode.INVALID_INPUT,
-            message=f"Invalid regex pattern: {exc}",
-            suggestion="Check your regex syntax or use mode='literal' for plain text search.",
-            recoverable=False,
-        ) from exc
+    if validated.output_mode == "count":
+        return await _count_output(validated, result, state)
 
-    # Run the search
-    search_result = search_lines(
-        result.content,
-        matcher,
-        offset=validated.offset,
-        max_results=validated.max_results,
+    search_result, total_lines, total_matches = await _run_search(
+        validated, result.content, result.content_hash, state
     )
 
-    total_lines = len(result.content.splitlines())
-
     # Format matches as "line_number:content" string
+    if validated.context_before or validated.context_after:
+        matches_str, search_result = await _with_context(
+            validated, result.content, search_result, state
+        )
+    else:
+        matches_str = "\n".join(format_match(m) for m in search_result.matches)
     raw_matches = search_result.matches
-    matches_str = "\n".join(f"{m.line_number}:{m.content}" for m in raw_matches)
 
     # Build compacted outline trimmed to match range
     first_line = raw_matches[0].line_number if raw_matches else None
@@ -106,6 +112,7 @@ async def handle(
         outline=outline,
         matches=matches_str,
         total_lines=total_lines,
+        total_matches=total_matches,
         has_more=search_result.has_more,
         next_offset=search_result.next_offset,
         content_hash=result.content_hash,
@@ -115,31 +122,230 @@ async def handle(
     return output.model_dump(mode="json")
 
 
-def _compact_search_outline(raw_outline: str, first_line: int | None, last_line: int | None) -> str:
+async def _run_search(
+    validated: SearchPageInput, content: str, content_hash: str, state: AppState
+) -> tuple[SearchResult, int, int | None]:
+    """Return ``(result, total_lines, total_matches)`` for the requested page."""
+    matcher, per_query = _compile(validated)
+    key = _cursor_key(validated, content_hash)
+
+    # Agent-supplied regexes may backtrack catastrophically; run them killably.
+    if validated.mode == "regex" and state.regex_sandbox is not None:
+        return await state.regex_sandbox.page(
+            key,
+            content,
+            matcher,
+            offset=validated.offset,
+            max_results=validated.max_results,
+            per_query=per_query,
+        )
+
+    cursors = state.search_cursors
+    if cursors is None:
+        search_result, total_lines = await state.offloader.run(
+            len(content),
+            _search_uncached,
+            content,
+            matcher,
+            per_query,
+            validated.offset,
+            validated.max_results,
+        )
+        # Only a search that started at line 1 and ran out has seen every match.
+        complete = validated.offset == 1 and not search_result.has_more
+        total_matches = len(search_result.matches) if complete else None
+        return search_result, total_lines, total_matches
+
+    cursor = await _cursor(cursors, key, content, matcher, per_query, state)
+    search_result = await state.offloader.run(
+        len(content), cursor.page, validated.offset, validated.max_results
+    )
+    # Re-put so the LRU sees the cursor's current weight.
+    cursors.put(key, cursor, weight=cursor.weight)
+    return search_result, cursor.total_lines, cursor.total_matches
+
+
+async def _count_output(validated: SearchPageInput, result: FetchResult, state: AppState) -> dict:
+    """Build the count-mode response: totals and per-section counts, no match lines."""
+    headings = result.outline.headings()
+    counts, total_lines, total_matches = await _run_count(
+        validated, result.content, result.content_hash, [h.line_number for h in headings], state
+    )
+    output = SearchPageOutput(
+        url=result.url,
+        query=validated.query,
+        outline="",
+        matches="",
+        section_counts=format_section_counts(counts, headings),
+        total_lines=total_lines,
+        total_matches=total_matches,
+        has_more=False,
+        next_offset=None,
+        content_hash=result.content_hash,
+        cached=result.cached,
+        cached_at=result.cached_at,
+    )
+    return output.model_dump(mode="json")
+
+
+async def _run_count(
+    validated: SearchPageInput,
+    content: str,
+    content_hash: str,
+    heading_lines: list[int],
+    state: AppState,
+) -> tuple[dict[int, int], int, int | None]:
+    """Return ``(section_counts, total_lines, total_matches)`` over the whole page."""
+    matcher, per_query = _compile(validated)
+    key = _cursor_key(validated, content_hash)
+
+    # The cursor is shared with match pages, so it is built with per-query tagging.
+    if validated.mode == "regex" and state.regex_sandbox is not None:
+        return await state.regex_sandbox.section_counts(
+            key, content, matcher, heading_lines, per_query=per_query
+        )
+
+    cursors = state.search_cursors
+    if cursors is None:
+        counts, total_lines = await state.offloader.run(
+            len(content), _count_uncached, content, matcher, per_query, heading_lines
+        )
+        return counts, total_lines, sum(counts.values())
+
+    cursor = await _cursor(cursors, key, content, matcher, per_query, state)
+    counts = await state.offloader.run(len(content), cursor.section_counts, heading_lines)
+    cursors.put(key, cursor, weight=cursor.weight)
+    return counts, cursor.total_lines, cursor.total_matches
+
+
+async def _cursor(
+    cursors: SearchCursorCache,
+    key: SearchCursorKey,
+    content: str,
+    matcher: re.Pattern[str] | None,
+    per_query: list[re.Pattern[str]],
+    state: AppState,
+) -> SearchCursor:
+    cursor = cursors.get(key)
+    if cursor is None:
+        # Construction counts the page's lines, so it is offloaded with the scan.
+        cursor = await state.offloader.run(len(content), SearchCursor, content, matcher, per_query)
+    return cursor
+
+
+def _cursor_key(validated: SearchPageInput, content_hash: str) -> SearchCursorKey:
+    query = validated.query
+    return (
+        content_hash,
+        query if isinstance(query, str) else tuple(query),
+        validated.mode,
+        validated.case_mode,
+        validated.whole_word,
+    )
+
+
+async def _with_context(
+    validated: SearchPageInput, content: str, search_result: SearchResult, state: AppState
+) -> tuple[str, SearchResult]:
+    """Render matches as context hunks, ending the page early if over budget."""
+    matches = search_result.matches
+    text, included = await state.offloader.run(
+        len(content),
+        partial(
+            format_hunks,
+            before=validated.context_before,
+            after=validated.context_after,
+            max_chars=state.settings.search.context_max_chars,
+        ),
+        content,
+        matches,
+    )
+    if included == len(matches):
+        return text, search_result
+    kept = matches[:included]
+    return text, SearchResult(matches=kept, has_more=True, next_offset=kept[-1].line_number + 1)
+
+
+def _search_uncached(
+    content: str,
+    matcher: re.Pattern[str] | None,
+    per_query: list[re.Pattern[str]],
+    offset: int,
+    max_results: int,
+) -> tuple[SearchResult, int]:
+    matches = iter_tagged_matches(content, matcher, per_query, offset=offset)
+    return page_of(matches, max_results), count_lines(content)
+
+
+def _count_uncached(
+    content: str,
+    matcher: re.Pattern[str] | None,
+    per_query: list[re.Pattern[str]],
+    heading_lines: list[int],
+) -> tuple[dict[int, int], int]:
+    # Counts need no tags, so only separately scanned queries pass per_query.
+    matches = iter_tagged_matches(content, matcher, per_query if matcher is None else ())
+    line_numbers = (m.line_number for m in matches)
+    return count_by_section(line_numbers, heading_lines), count_lines(content)
+
+
+def _compile(
+    validated: SearchPageInput,
+) -> tuple[re.Pattern[str] | None, list[re.Pattern[str]]]:
+    """Return the page matcher, plus each query's own matcher for a multi-query search.
+
+    The page matcher is ``None`` when the queries must be scanned separately.
+    """
+    query = validated.query
+    try:
+        if isinstance(query, str):
+            matcher = build_matcher(
+                query,
+                mode=validated.mode,
+                case_mode=validated.case_mode,
+                whole_word=validated.whole_word,
+            )
+            return matcher, []
+        return build_multi_matcher(
+            query,
+            mode=validated.mode,
+            case_mode=validated.case_mode,
+            whole_word=validated.whole_word,
+        )
+    except re.error as exc:
+        raise ProContextError(
+            code=ErrorCode.INVALID_INPUT,
+            message=f"Invalid regex pattern: {exc}",
+            suggestion="Check your regex syntax or use mode='literal' for plain text search.",
+            recoverable=False,
+        ) from exc
+
+
+def _compact_search_outline(
+    outline: OutlineIndex, first_line: int | None, last_line: int | None
+) -> str:
     """Trim and compact only oversized outlines for search_page output."""
     if first_line is None or last_line is None:
         return ""
 
-    entries = parse_outline_entries(raw_outline)
-    entries = strip_empty_fences(entries)
-    total_entries = len(entries)
+    total_entries = len(outline)
 
     # Small outlines fit inline already — preserve the full structure instead of
     # trimming to the match span, which can drop useful parent headings.
     if total_entries <= 50:
-        return format_outline(entries)
+        return outline.format()
 
     # Trim to match range
-    trimmed = trim_outline_to_range(entries, first_line, last_line)
+    trimmed = outline.trim(first_line, last_line)
 
     if len(trimmed) <= 50:
-        return format_outline(trimmed)
+        return trimmed.format()
 
-    compacted = compact_outline(trimmed)
+    compacted = trimmed.compact()
     if compacted is None:
         return (
             f"[Outline too large ({total_entries} entries). Use read_outline for paginated access.]"
         )
 
     note = build_compaction_note(compacted, total_entries, match_range=(first_line, last_line))
-    return note + "\n" + format_outline(compacted)
+    return note + "\n" + compacted.format()
@@ -0,0 +1,63 @@
+"""Tool handler for search_registry.
+
+Finds libraries by what they do rather than by name: a keyword search over
+the registry's names, descriptions, languages and ecosystems. No MCP or
+FastMCP imports — server.py handles the MCP wiring.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.models.tools import MAX_SEARCH_RESULTS, SearchRegistryInput, SearchRegistryOutput
+from procontext.resolver import search_registry
+
+if TYPE_CHECKING:
+    from procontext.state import AppState
+
+
+async def handle(
+    query: str,
+    state: AppState,
+    *,
+    language: str | None = None,
+    ecosystem: str | None = None,
+    limit: int = 10,
+) -> dict:
+    """Handle a search_registry tool call."""
+    log = structlog.get_logger().bind(tool="search_registry", query=query)
+    log.info("handler_called")
+
+    # Validate input
+    try:
+        validated = SearchRegistryInput(
+            query=query,
+            language=language,
+            ecosystem=ecosystem,  # type: ignore[arg-type]
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise ProContextError(
+            code=ErrorCode.INVALID_INPUT,
+            message=str(exc),
+            suggestion=(
+                "Provide non-empty keywords (max 500 chars), an ecosystem of pypi, npm, "
+                f"conda or jsr, and a limit between 1 and {MAX_SEARCH_RESULTS}."
+            ),
+            recoverable=False,
+        ) from exc
+
+    matches = search_registry(
+        validated.query,
+        state.indexes,
+        limit=validated.limit,
+        language=validated.language,
+        ecosystem=validated.ecosystem,
+    )
+
+    log.info("search_registry_complete", match_count=len(matches))
+
+    return SearchRegistryOutput(matches=matches).model_dump(mode="json")
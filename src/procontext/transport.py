@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import ipaddress
 import secrets
+import sys
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
@@ -12,8 +15,16 @@ import uvicorn
 from starlette.datastructures import Headers
 from starlette.responses import Response
 
+from procontext.compression import CompressionMiddleware
+from procontext.mcp.lifespan import open_app_state, share_app_state
+from procontext.rate_limit import AUTHENTICATED_SCOPE_KEY, RateLimitMiddleware
+from procontext.unix_socket import bind_unix_socket, unix_sockets_supported
+
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from mcp.server.fastmcp import FastMCP
+    from starlette.applications import Starlette
     from starlette.types import ASGIApp, Receive, Scope, Send
 
     from procontext.config import Settings
@@ -56,6 +67,7 @@ class MCPSecurityMiddleware:
                 if not auth_header.startswith("Bearer ") or auth_header[7:] != self.auth_key:
                     await Response("Unauthorized", status_code=401)(scope, receive, send)
                     return
+                scope[AUTHENTICATED_SCOPE_KEY] = True
 
             # 2. Origin validation — prevents DNS rebinding attacks
             origin = headers.get("origin", "")
@@ -108,16 +120,89 @@ def run_http_server(mcp: FastMCP, settings: Settings) -> None:
     if not settings.server.auth_enabled:
         http_log.warning("http_auth_disabled")
 
+    if settings.server.unix_socket_path:
+        _allow_portless_loopback_hosts(mcp)
+
     http_app = mcp.streamable_http_app()
+    _share_state_across_sessions(mcp, http_app, settings)
+    if settings.server.compression_enabled:
+        http_app.add_middleware(
+            CompressionMiddleware, minimum_size=settings.server.compression_min_bytes
+        )
+    app: ASGIApp = http_app
+    if settings.server.rate_limit_per_second > 0 or settings.server.fair_max_in_flight > 0:
+        app = RateLimitMiddleware(app, settings=settings.server)
     secured_app = MCPSecurityMiddleware(
-        http_app,
+        app,
         auth_enabled=settings.server.auth_enabled,
         auth_key=auth_key,
     )
 
+    if settings.server.unix_socket_path:
+        _run_on_unix_socket(secured_app, settings)
+        return
+
     uvicorn.run(
         secured_app,
         host=settings.server.host,
         port=settings.server.port,
         log_config=None,  # Disable uvicorn's default logging; structlog handles it
     )
+
+
+def _allow_portless_loopback_hosts(mcp: FastMCP) -> None:
+    """Accept ``Host: localhost`` without a port, as sent by Unix socket clients.
+
+    The SDK's DNS rebinding protection only allows ``host:port`` forms, but a
+    client of a filesystem socket (``curl --unix-socket``, httpx ``uds=``) has no
+    port to send. Rebinding is not a concern there: browsers cannot reach it.
+    """
+    security = mcp.settings.transport_security
+    if security is None:
+        return
+    mcp.settings.transport_security = security.model_copy(
+        update={"allowed_hosts": [*security.allowed_hosts, "localhost", "127.0.0.1"]}
+    )
+
+
+def _run_on_unix_socket(app: ASGIApp, settings: Settings) -> None:
+    """Serve *app* on the configured Unix domain socket.
+
+    The socket is bound here rather than via uvicorn's ``uds=`` option, which
+    chmods the socket to 0o666 after binding; handing uvicorn the descriptor
+    keeps the configured ``unix_socket_mode`` as the only access control.
+    """
+    socket_path = Path(settings.server.unix_socket_path).expanduser()
+    if not unix_sockets_supported():
+        log.critical("http_unix_socket_unsupported", platform=sys.platform)
+        sys.exit(1)
+    try:
+        sock = bind_unix_socket(socket_path, mode=settings.server.unix_socket_mode)
+    except OSError as exc:
+        log.critical("http_unix_socket_bind_failed", path=str(socket_path), error=str(exc))
+        sys.exit(1)
+    log.info(
+        "http_unix_socket_listening",
+        path=str(socket_path),
+        mode=oct(settings.server.unix_socket_mode),
+    )
+    try:
+        uvicorn.run(app, fd=sock.fileno(), log_config=None)
+    finally:
+        sock.close()
+        with suppress(FileNotFoundError):
+            socket_path.unlink()
+
+
+def _share_state_across_sessions(mcp: FastMCP, http_app: Starlette, settings: Settings) -> None:
+    """Build one warm AppState for the app's lifetime and reuse it in every session."""
+    session_manager_lifespan = http_app.router.lifespan_context
+
+    @asynccontextmanager
+    async def _lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with open_app_state(settings, long_running=True) as state:
+            share_app_state(mcp, state)
+            async with session_manager_lifespan(app):
+                yield
+
+    http_app.router.lifespan_context = _lifespan
@@ -0,0 +1,73 @@
+"""Unix domain socket helpers shared by the stdio daemon and the HTTP transport."""
+
+from __future__ import annotations
+
+import errno
+import os
+import socket
+import stat
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def unix_sockets_supported() -> bool:
+    """Return True when the platform can serve over Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+
+
+def connect_unix_socket(path: Path) -> socket.socket | None:
+    """Connect to the listening socket at *path*, or return None if nobody is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def bind_unix_socket(path: Path, *, mode: int, backlog: int = 128) -> socket.socket:
+    """Bind and listen on a Unix domain socket at *path* with permissions *mode*.
+
+    Access control is delegated to the filesystem: the socket file is created
+    under a restrictive umask and then chmod-ed to *mode*, so there is no
+    window in which it is reachable by other users.
+
+    A leftover socket file from a crashed process is replaced. A socket that
+    still has a live listener, or a path that is not a socket at all, is never
+    touched — ``OSError`` is raised instead.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _remove_stale_socket(path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        previous_umask = os.umask(0o777 & ~mode)
+        try:
+            sock.bind(str(path))
+        finally:
+            os.umask(previous_umask)
+        os.chmod(path, mode)
+        sock.listen(backlog)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _remove_stale_socket(path: Path) -> None:
+    try:
+        st = path.lstat()
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise OSError(errno.EEXIST, "Refusing to replace a non-socket file", str(path))
+    live = connect_unix_socket(path)
+    if live is not None:
+        live.close()
+        raise OSError(errno.EADDRINUSE, "Socket is already in use", str(path))
+    path.unlink()
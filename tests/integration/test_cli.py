@@ -6,6 +6,7 @@ argument parsing, exit codes, and output.
 
 from __future__ import annotations
 
+import json
 import subprocess
 import sys
 from typing import TYPE_CHECKING
@@ -49,6 +50,11 @@ class TestHelpOutput:
         result = _run_cli(["db", "--help"], subprocess_env)
         assert result.returncode == 0
 
+    def test_resolve_help(self, subprocess_env: dict[str, str]) -> None:
+        result = _run_cli(["resolve", "--help"], subprocess_env)
+        assert result.returncode == 0
+        assert "--json" in result.stdout
+
 
 class TestDoctorCommand:
     """End-to-end doctor command tests."""
@@ -130,6 +136,56 @@ class TestSetupCommand:
         assert "procontext doctor --fix" in result.stderr
 
 
+class TestResolveCommand:
+    def test_resolves_requirements_file(
+        self, tmp_path: Path, subprocess_env: dict[str, str]
+    ) -> None:
+        manifest = tmp_path / "requirements.txt"
+        manifest.write_text("requests>=2.31\nlangchain-openai\nxyzzy-nonexistent\n")
+
+        result = _run_cli(["resolve", str(manifest)], subprocess_env)
+        assert result.returncode == 0
+        lines = result.stdout.splitlines()
+        assert "(2/3 resolved)" in lines[0]
+        assert "https://python.langchain.com/llms.txt" in next(
+            line for line in lines if "langchain-openai" in line
+        )
+
+    def test_json_output_per_manifest(self, tmp_path: Path, subprocess_env: dict[str, str]) -> None:
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "app"\ndependencies = ["requests", "langchain-core"]\n'
+        )
+        (tmp_path / "package.json").write_text('{"dependencies": {"left-pad": "^1"}}')
+
+        result = _run_cli(["resolve", "--json", str(tmp_path)], subprocess_env)
+        assert result.returncode == 0
+        payload = json.loads(result.stdout)
+        assert [report["manifest"].rsplit("/", 1)[-1] for report in payload] == [
+            "pyproject.toml",
+            "package.json",
+        ]
+        assert [r["matches"][0]["library_id"] for r in payload[0]["results"]] == [
+            "requests",
+            "langchain",
+        ]
+        assert payload[1]["unresolved"] == ["left-pad"]
+
+    def test_missing_path_exits_1(self, tmp_path: Path, subprocess_env: dict[str, str]) -> None:
+        result = _run_cli(["resolve", str(tmp_path / "nope.txt")], subprocess_env)
+        assert result.returncode == 1
+        assert "No such file or directory" in result.stderr
+
+    def test_without_registry_exits_1(self, tmp_path: Path, subprocess_env: dict[str, str]) -> None:
+        manifest = tmp_path / "requirements.txt"
+        manifest.write_text("requests\n")
+        empty_data = tmp_path / "empty_data"
+        empty_data.mkdir()
+        env = {**subprocess_env, "PROCONTEXT__DATA_DIR": str(empty_data)}
+        result = _run_cli(["resolve", str(manifest)], env)
+        assert result.returncode == 1
+        assert "procontext setup" in result.stderr
+
+
 class TestLegacyEntrypoint:
     """The old mcp.startup module still works as a shim."""
 
@@ -0,0 +1,144 @@
+"""Integration tests for the shared stdio daemon and the stdio bridge."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from procontext.unix_socket import unix_sockets_supported
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(
+    not unix_sockets_supported(), reason="daemon requires Unix domain sockets"
+)
+
+_INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-11-25",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "0"},
+    },
+}
+_INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+_RESOLVE = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/call",
+    "params": {"name": "resolve_library", "arguments": {"query": "requests"}},
+}
+
+
+def _run_session(env: dict[str, str]) -> dict:
+    """Run one stdio session and return the resolve_library response."""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "procontext.cli.main"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    assert proc.stdin is not None
+    assert proc.stdout is not None
+    for message in (_INITIALIZE, _INITIALIZED, _RESOLVE):
+        proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+    response: dict = {}
+    while line := proc.stdout.readline():
+        decoded = json.loads(line)
+        if decoded.get("id") == 2:
+            response = decoded
+            break
+    proc.stdin.close()
+    proc.wait(timeout=10)
+    proc.stdout.close()
+    return response
+
+
+def _wait_for_socket(path: Path, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        assert time.monotonic() < deadline, f"daemon socket never appeared at {path}"
+        time.sleep(0.05)
+
+
+@pytest.fixture()
+def daemon_env(subprocess_env: dict[str, str], tmp_path: Path) -> dict[str, str]:
+    return {
+        **subprocess_env,
+        "PROCONTEXT__SERVER__DAEMON_ENABLED": "true",
+        "PROCONTEXT__SERVER__DAEMON_SOCKET_PATH": str(tmp_path / "d.sock"),
+        "PROCONTEXT__SERVER__DAEMON_IDLE_TIMEOUT_SECONDS": "2",
+    }
+
+
+def test_sessions_are_proxied_to_running_daemon(daemon_env: dict[str, str], tmp_path: Path) -> None:
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "procontext.cli.main", "daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=daemon_env,
+    )
+    try:
+        _wait_for_socket(tmp_path / "d.sock")
+        env = {**daemon_env, "PROCONTEXT__SERVER__DAEMON_AUTOSTART": "false"}
+        for _ in range(2):
+            response = _run_session(env)
+            content = response["result"]["structuredContent"]
+            assert content["matches"][0]["library_id"] == "requests"
+        # Both sessions were served by the daemon, which is still running.
+        assert daemon.poll() is None
+    finally:
+        daemon.terminate()
+        daemon.wait(timeout=10)
+
+
+def test_daemon_exits_after_idle_timeout(daemon_env: dict[str, str], tmp_path: Path) -> None:
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "procontext.cli.main", "daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=daemon_env,
+    )
+    try:
+        assert daemon.wait(timeout=15) == 0
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+    assert not (tmp_path / "d.sock").exists()
+
+
+def test_bridge_autostarts_daemon(daemon_env: dict[str, str], tmp_path: Path) -> None:
+    response = _run_session(daemon_env)
+
+    assert response["result"]["structuredContent"]["matches"][0]["library_id"] == "requests"
+    assert (tmp_path / "d.sock").exists()
+    # The autostarted daemon shuts itself down once idle.
+    deadline = time.monotonic() + 15
+    while (tmp_path / "d.sock").exists():
+        assert time.monotonic() < deadline, "autostarted daemon did not exit when idle"
+        time.sleep(0.1)
+
+
+def test_falls_back_to_in_process_when_daemon_unavailable(
+    daemon_env: dict[str, str], tmp_path: Path
+) -> None:
+    env = {**daemon_env, "PROCONTEXT__SERVER__DAEMON_AUTOSTART": "false"}
+
+    response = _run_session(env)
+
+    assert response["result"]["structuredContent"]["matches"][0]["library_id"] == "requests"
+    assert not (tmp_path / "d.sock").exists()
@@ -11,6 +11,8 @@ from contextlib import closing
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
+from procontext.models.tools import MAX_QUERIES
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -163,13 +165,31 @@ def test_initialize_and_tools_list_contract(subprocess_env: dict[str, str]) -> N
     assert read_page_schema["properties"]["limit"]["type"] == "integer"
 
     # Each tool must advertise its outputSchema.
-    for tool_name in ("resolve_library", "read_page"):
+    resolve_many_schema = tools_by_name["resolve_libraries"]["inputSchema"]
+    assert "queries" in resolve_many_schema["required"]
+    assert resolve_many_schema["properties"]["queries"]["type"] == "array"
+
+    search_registry_schema = tools_by_name["search_registry"]["inputSchema"]
+    assert search_registry_schema["required"] == ["query"]
+    assert search_registry_schema["properties"]["limit"]["maximum"] == 50
+
+    search_page_query = tools_by_name["search_page"]["inputSchema"]["properties"]["query"]
+    assert f"a list of up to {MAX_QUERIES} " in search_page_query["description"]
+
+    for tool_name in (
+        "resolve_library",
+        "resolve_libraries",
+        "search_registry",
+        "read_page",
+        "read_section",
+    ):
         tool = tools_by_name[tool_name]
         assert "outputSchema" in tool, f"{tool_name} missing outputSchema"
         assert tool["outputSchema"]["type"] == "object"
 
     assert "matches" in tools_by_name["resolve_library"]["outputSchema"]["properties"]
     assert "outline" in tools_by_name["read_page"]["outputSchema"]["properties"]
+    assert "section" in tools_by_name["read_section"]["inputSchema"]["required"]
 
 
 def test_resolve_library_wire_success(subprocess_env: dict[str, str]) -> None:
@@ -0,0 +1,62 @@
+"""Page tools give identical results when their CPU-bound work is offloaded."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+import respx
+
+from procontext.config import ExecutorSettings
+from procontext.offload import Offloader
+from procontext.tools.read_outline import handle as read_outline_handle
+from procontext.tools.read_page import handle as read_page_handle
+from procontext.tools.search_page import handle as search_page_handle
+from tests.integration.tool_test_support import SAMPLE_PAGE, SAMPLE_URL
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from procontext.state import AppState
+
+_CALLS: list[Callable[[AppState], Awaitable[dict]]] = [
+    lambda state: read_page_handle(SAMPLE_URL, 3, 10, state),
+    lambda state: read_outline_handle(SAMPLE_URL, 1, 5, state),
+    lambda state: search_page_handle(SAMPLE_URL, "stream", state, max_results=2),
+    lambda state: search_page_handle(SAMPLE_URL, "stream", state, offset=5),
+]
+
+
+@pytest.mark.parametrize("call", _CALLS)
+@respx.mock
+async def test_thread_offload_matches_inline(
+    app_state: AppState, call: Callable[[AppState], Awaitable[dict]]
+) -> None:
+    respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+    await read_page_handle(SAMPLE_URL, 1, 1, app_state)  # populate the cache
+
+    inline = await call(app_state)
+    app_state.offloader = Offloader(ExecutorSettings(kind="thread", min_chars=0))
+    try:
+        offloaded = await call(app_state)
+    finally:
+        app_state.offloader.close()
+
+    assert offloaded == inline
+
+
+@respx.mock
+async def test_cache_miss_processing_offloaded(app_state: AppState) -> None:
+    respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+    app_state.offloader = Offloader(ExecutorSettings(kind="thread", min_chars=0))
+    try:
+        miss = await read_page_handle(SAMPLE_URL, 1, 500, app_state)
+        hit = await read_page_handle(SAMPLE_URL, 1, 500, app_state)
+    finally:
+        app_state.offloader.close()
+
+    assert miss["cached"] is False
+    assert hit["cached"] is True
+    assert miss["outline"] == hit["outline"]
+    assert miss["content_hash"] == hit["content_hash"]
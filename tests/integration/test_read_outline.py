@@ -94,3 +94,17 @@ class TestReadOutlineHandler:
         respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
         result = await read_outline_handle(SAMPLE_URL, 1, 5000, app_state)
         assert result["url"] == SAMPLE_URL
+
+    @respx.mock
+    async def test_entry_without_outline_index_rebuilds_it(self, app_state: AppState) -> None:
+        """Rows cached before the outline index existed still paginate correctly."""
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+        fresh = await read_outline_handle(SAMPLE_URL, 2, 3, app_state)
+
+        assert app_state.cache is not None
+        await app_state.cache._db.execute("UPDATE page_cache SET outline_index = x''")  # type: ignore[attr-defined]
+        legacy = await read_outline_handle(SAMPLE_URL, 2, 3, app_state)
+
+        assert legacy["cached"] is True
+        assert legacy["outline"] == fresh["outline"]
+        assert legacy["total_entries"] == fresh["total_entries"]
@@ -0,0 +1,129 @@
+"""Integration tests for the read_section tool handler."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+import respx
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.tools.read_outline import handle as read_outline_handle
+from procontext.tools.read_section import handle as read_section_handle
+from tests.integration.tool_test_support import SAMPLE_PAGE, SAMPLE_URL
+
+if TYPE_CHECKING:
+    from procontext.state import AppState
+
+_SAMPLE_LINES = SAMPLE_PAGE.splitlines()
+
+
+class TestReadSectionHandler:
+    """Full handler pipeline tests for read_section."""
+
+    @respx.mock
+    async def test_by_heading_path(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_section_handle(SAMPLE_URL, "Streaming > Using .stream()", app_state)
+
+        assert result["section"] == "Streaming > Streaming with Chat Models > Using .stream()"
+        assert result["heading"] == "### Using .stream()"
+        assert (result["start_line"], result["end_line"]) == (11, 14)
+        assert result["content"] == "\n".join(_SAMPLE_LINES[10:14])
+        assert result["has_more"] is False
+        assert result["next_offset"] is None
+        assert result["approx_tokens"] > 0
+        assert result["cached"] is False
+
+    @respx.mock
+    async def test_by_line_number(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_section_handle(SAMPLE_URL, 9, app_state)
+
+        assert result["heading"] == "## Streaming with Chat Models"
+        assert (result["start_line"], result["end_line"]) == (7, 18)
+        assert result["content"] == "\n".join(_SAMPLE_LINES[6:18])
+
+    @respx.mock
+    async def test_last_section_runs_to_end_of_page(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_section_handle(SAMPLE_URL, "Streaming with Chains", app_state)
+
+        assert (result["start_line"], result["end_line"]) == (19, 21)
+        assert result["content"].endswith("Chain streaming details.")
+
+    @respx.mock
+    async def test_limit_truncates_section(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_section_handle(SAMPLE_URL, "# Streaming", app_state, limit=3)
+
+        assert result["content"] == "\n".join(_SAMPLE_LINES[:3])
+        assert result["end_line"] == 21
+        assert result["has_more"] is True
+        assert result["next_offset"] == 4
+
+    @respx.mock
+    async def test_output_contains_all_fields(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_section_handle(SAMPLE_URL, 1, app_state)
+        assert set(result.keys()) == {
+            "url",
+            "section",
+            "heading",
+            "start_line",
+            "end_line",
+            "approx_tokens",
+            "content",
+            "has_more",
+            "next_offset",
+            "content_hash",
+            "cached",
+            "cached_at",
+            "stale",
+        }
+
+    @respx.mock
+    async def test_unknown_section_raises(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        with pytest.raises(ProContextError) as exc_info:
+            await read_section_handle(SAMPLE_URL, "Deployment", app_state)
+        assert exc_info.value.code == ErrorCode.SECTION_NOT_FOUND
+        assert "read_outline" in exc_info.value.suggestion
+
+    @pytest.mark.parametrize("section", [0, "", " > "])
+    async def test_invalid_section_raises(self, app_state: AppState, section: int | str) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await read_section_handle(SAMPLE_URL, section, app_state)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+
+    async def test_url_not_allowed_raises(self, app_state: AppState) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await read_section_handle("https://evil.example.com/docs.md", 1, app_state)
+        assert exc_info.value.code == ErrorCode.URL_NOT_ALLOWED
+
+
+class TestReadOutlineSectionSizes:
+    @respx.mock
+    async def test_headings_carry_sizes(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_outline_handle(SAMPLE_URL, 1, 200, app_state, section_sizes=True)
+
+        lines = result["outline"].split("\n")
+        assert lines[0].startswith("1:# Streaming [21 lines, ~")
+        assert lines[2].startswith("7:## Streaming with Chat Models [12 lines, ~")
+
+    @respx.mock
+    async def test_sizes_off_by_default(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await read_outline_handle(SAMPLE_URL, 1, 200, app_state)
+
+        assert "lines, ~" not in result["outline"]
@@ -0,0 +1,60 @@
+"""Integration tests for the resolve_libraries tool handler."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.models.tools import MAX_RESOLVE_QUERIES
+from procontext.tools.resolve_libraries import handle
+from procontext.tools.resolve_library import handle as handle_one
+
+if TYPE_CHECKING:
+    from procontext.state import AppState
+
+
+class TestResolveLibrariesHandler:
+    async def test_results_in_input_order(self, app_state: AppState) -> None:
+        queries = ["pydantic-settings>=2", "xyzzy-nonexistent", "lang-chain", "langchan"]
+        result = await handle(queries, app_state)
+
+        assert [r["query"] for r in result["results"]] == queries
+        assert [r["matches"][0]["library_id"] for r in result["results"] if r["matches"]] == [
+            "pydantic",
+            "langchain",
+            "langchain",
+        ]
+        assert result["unresolved"] == ["xyzzy-nonexistent"]
+
+    async def test_each_result_matches_resolve_library(self, app_state: AppState) -> None:
+        queries = ["langchain-openai", "Pydantic", "langchan", "lang-chain", "nope"]
+        result = await handle(queries, app_state)
+        for query, resolution in zip(queries, result["results"], strict=True):
+            assert resolution["matches"] == (await handle_one(query, app_state))["matches"]
+
+    async def test_duplicate_queries_each_get_a_result(self, app_state: AppState) -> None:
+        result = await handle(["pydantic", "pydantic==2.0", "pydantic"], app_state)
+        assert len(result["results"]) == 3
+        assert all(r["matches"][0]["library_id"] == "pydantic" for r in result["results"])
+
+    async def test_empty_list_raises_invalid_input(self, app_state: AppState) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await handle([], app_state)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+
+    async def test_blank_query_raises_invalid_input(self, app_state: AppState) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await handle(["pydantic", "  "], app_state)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+
+    async def test_too_many_queries_raises_invalid_input(self, app_state: AppState) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await handle(["pydantic"] * (MAX_RESOLVE_QUERIES + 1), app_state)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+
+    async def test_max_batch_accepted(self, app_state: AppState) -> None:
+        queries = [f"package-{i}" for i in range(MAX_RESOLVE_QUERIES)]
+        result = await handle(queries, app_state)
+        assert len(result["results"]) == MAX_RESOLVE_QUERIES
@@ -10,10 +10,12 @@ from procontext.cache import Cache
 from procontext.config import Settings
 from procontext.errors import ErrorCode, ProContextError
 from procontext.fetcher import Fetcher, build_allowlist
+from procontext.lru import LRUCache
 from procontext.models.registry import PackageEntry, RegistryEntry
 from procontext.registry import build_indexes
+from procontext.resolver import build_resolve_cache
 from procontext.state import AppState
-from procontext.tools.resolve_library import handle
+from procontext.tools.resolve_library import handle, resolve
 
 
 class TestResolveLibraryHandler:
@@ -159,3 +161,42 @@ class TestLanguageSorting:
         packages = result["matches"][0]["packages"]
         # Whitespace-only → None, original order preserved
         assert packages[0]["ecosystem"] == "npm"
+
+
+class TestResolveCache:
+    """Rendered outputs are reused per (normalised query, language, registry version)."""
+
+    async def test_repeat_query_served_from_cache(self, app_state: AppState) -> None:
+        app_state.resolve_cache = LRUCache(8)
+        first = await resolve("langchain-openai>=0.3", app_state)
+        # Same normalised query: the cached output itself comes back.
+        second = await resolve("LangChain-OpenAI", app_state)
+        assert second is first
+        assert len(app_state.resolve_cache) == 1
+
+    async def test_language_is_part_of_the_key(self, app_state: AppState) -> None:
+        app_state.resolve_cache = LRUCache(8)
+        plain = await resolve("pydantic", app_state)
+        python = await resolve("pydantic", app_state, language="python")
+        assert python is not plain
+        assert python == plain
+        assert len(app_state.resolve_cache) == 2
+
+    async def test_registry_version_change_misses(self, app_state: AppState) -> None:
+        app_state.resolve_cache = LRUCache(8)
+        first = await resolve("pydantic", app_state)
+        app_state.registry_version = "next"
+        second = await resolve("pydantic", app_state)
+        assert second is not first
+        assert second == first
+
+    async def test_cached_output_matches_uncached(self, app_state: AppState) -> None:
+        uncached = await handle("langchan", app_state)
+        app_state.resolve_cache = LRUCache(8)
+        await handle("langchan", app_state)
+        assert await handle("langchan", app_state) == uncached
+
+    def test_zero_entries_disables_cache(self) -> None:
+        settings = Settings(resolver={"result_cache_entries": 0})  # type: ignore[arg-type]
+        assert build_resolve_cache(settings.resolver) is None
+        assert build_resolve_cache(Settings().resolver) is not None
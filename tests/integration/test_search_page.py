@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING
 
 import httpx
 import pytest
 import respx
 
+from procontext.config import SearchSettings
 from procontext.errors import ErrorCode, ProContextError
+from procontext.regex_sandbox import RegexSandbox
+from procontext.search_cursor import build_cursor_cache
 from procontext.tools.read_page import handle as read_page_handle
 from procontext.tools.search_page import handle as search_page_handle
 from tests.integration.tool_test_support import SAMPLE_PAGE, SAMPLE_URL
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from procontext.state import AppState
 
 
@@ -97,7 +103,9 @@ class TestSearchPageHandler:
             "query",
             "outline",
             "matches",
+            "section_counts",
             "total_lines",
+            "total_matches",
             "has_more",
             "next_offset",
             "content_hash",
@@ -120,3 +128,263 @@ class TestSearchPageHandler:
         assert result["matches"] != ""
         outline = result["outline"]
         assert "# Streaming" in outline
+
+
+class TestSearchPageCursors:
+    """search_page with the search cursor cache enabled."""
+
+    @pytest.fixture()
+    def cursor_state(self, app_state: AppState) -> AppState:
+        app_state.search_cursors = build_cursor_cache(SearchSettings())
+        return app_state
+
+    @respx.mock
+    async def test_pagination_matches_uncached_results(
+        self, app_state: AppState, cursor_state: AppState
+    ) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        pages = []
+        offset = 1
+        while True:
+            result = await search_page_handle(
+                SAMPLE_URL, "stream", cursor_state, max_results=1, offset=offset
+            )
+            pages.append(result["matches"])
+            if not result["has_more"]:
+                break
+            assert result["total_matches"] is None
+            offset = result["next_offset"]
+
+        assert cursor_state.search_cursors is not None
+        assert len(cursor_state.search_cursors) == 1
+        assert result["total_matches"] == len(pages)
+
+        cursor_state.search_cursors = None
+        everything = await search_page_handle(SAMPLE_URL, "stream", app_state, max_results=100)
+        assert everything["matches"] == "\n".join(pages)
+        assert everything["total_matches"] == len(pages)
+
+    @respx.mock
+    async def test_repeat_query_reuses_cursor(self, cursor_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        first = await search_page_handle(SAMPLE_URL, "streaming", cursor_state)
+        second = await search_page_handle(SAMPLE_URL, "streaming", cursor_state)
+        assert first["matches"] == second["matches"]
+        assert cursor_state.search_cursors is not None
+        assert len(cursor_state.search_cursors) == 1
+
+        await search_page_handle(SAMPLE_URL, "streaming", cursor_state, whole_word=True)
+        assert len(cursor_state.search_cursors) == 2
+
+    @respx.mock
+    async def test_invalid_regex_not_cached(self, cursor_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+        with pytest.raises(ProContextError) as exc_info:
+            await search_page_handle(SAMPLE_URL, "[invalid", cursor_state, mode="regex")
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+        assert cursor_state.search_cursors is not None
+        assert len(cursor_state.search_cursors) == 0
+
+
+class TestSearchPageRegexSandbox:
+    """search_page regex searches under a time budget."""
+
+    @pytest.fixture()
+    def sandbox_state(self, app_state: AppState) -> Iterator[AppState]:
+        sandbox = RegexSandbox(SearchSettings(regex_timeout_seconds=1.0, regex_workers=1))
+        app_state.regex_sandbox = sandbox
+        yield app_state
+        sandbox.close()
+
+    @respx.mock
+    async def test_regex_results_unchanged(
+        self, app_state: AppState, sandbox_state: AppState
+    ) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        sandboxed = await search_page_handle(
+            SAMPLE_URL, r"\.a?stream\(", sandbox_state, mode="regex"
+        )
+        assert sandboxed["matches"]
+
+        sandbox_state.regex_sandbox = None
+        direct = await search_page_handle(SAMPLE_URL, r"\.a?stream\(", app_state, mode="regex")
+        for field in ("matches", "outline", "total_lines", "total_matches", "has_more"):
+            assert sandboxed[field] == direct[field]
+
+    @respx.mock
+    async def test_catastrophic_backtracking_times_out(self, sandbox_state: AppState) -> None:
+        page = SAMPLE_PAGE + "\n" + "a" * 40 + "!\n"
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=page))
+
+        with pytest.raises(ProContextError) as exc_info:
+            await search_page_handle(SAMPLE_URL, "(a+)+$", sandbox_state, mode="regex")
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+        assert "time budget" in exc_info.value.message
+
+
+class TestSearchPageContext:
+    """search_page context lines and the response budget."""
+
+    @respx.mock
+    async def test_context_lines_around_matches(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await search_page_handle(
+            SAMPLE_URL, ".astream()", app_state, context_before=2, context_after=1
+        )
+
+        assert result["matches"].splitlines() == [
+            "13-The `.stream()` method returns an iterator.",
+            "14-",
+            "15:### Using .astream()",
+            "16-",
+            "17:The `.astream()` method is async.",
+            "18-",
+        ]
+        assert result["has_more"] is False
+
+    @respx.mock
+    async def test_budget_paginates_remaining_matches(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+        app_state.settings.search.context_max_chars = 80
+
+        first = await search_page_handle(
+            SAMPLE_URL, "stream", app_state, context_before=1, context_after=1
+        )
+        assert first["has_more"] is True
+        shown = [line for line in first["matches"].splitlines() if re.match(r"\d+:", line)]
+        assert int(shown[-1].split(":")[0]) + 1 == first["next_offset"]
+
+        rest = await search_page_handle(
+            SAMPLE_URL, "stream", app_state, offset=first["next_offset"], max_results=100
+        )
+        everything = await search_page_handle(SAMPLE_URL, "stream", app_state, max_results=100)
+        assert len(shown) + len(rest["matches"].splitlines()) == len(
+            everything["matches"].splitlines()
+        )
+
+    async def test_context_out_of_range_rejected(self, app_state: AppState) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await search_page_handle(SAMPLE_URL, "stream", app_state, context_after=51)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+
+
+class TestSearchPageCountMode:
+    """search_page output_mode='count'."""
+
+    @respx.mock
+    async def test_counts_per_section_without_match_lines(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await search_page_handle(
+            SAMPLE_URL, "stream", app_state, output_mode="count", max_results=1, offset=5
+        )
+
+        assert result["matches"] == ""
+        assert result["outline"] == ""
+        assert result["section_counts"].splitlines() == [
+            "1:# Streaming (1)",
+            "3:## Overview (1)",
+            "7:## Streaming with Chat Models (1)",
+            "11:### Using .stream() (2)",
+            "15:### Using .astream() (2)",
+            "19:## Streaming with Chains (2)",
+        ]
+        assert result["total_matches"] == 9
+        assert result["has_more"] is False
+        assert result["next_offset"] is None
+
+    @respx.mock
+    async def test_same_counts_with_cursors_and_sandbox(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+        direct = await search_page_handle(
+            SAMPLE_URL, r"\.a?stream", app_state, mode="regex", output_mode="count"
+        )
+
+        app_state.search_cursors = build_cursor_cache(SearchSettings())
+        cursored = await search_page_handle(
+            SAMPLE_URL, r"\.a?stream", app_state, mode="regex", output_mode="count"
+        )
+        app_state.regex_sandbox = RegexSandbox(SearchSettings(regex_workers=1))
+        try:
+            sandboxed = await search_page_handle(
+                SAMPLE_URL, r"\.a?stream", app_state, mode="regex", output_mode="count"
+            )
+        finally:
+            app_state.regex_sandbox.close()
+
+        for field in ("section_counts", "total_matches", "total_lines"):
+            assert direct[field] == cursored[field] == sandboxed[field]
+        assert direct["total_matches"] == 4
+
+    async def test_unknown_output_mode_rejected(self, app_state: AppState) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await search_page_handle(SAMPLE_URL, "stream", app_state, output_mode="lines")
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+
+
+class TestSearchPageMultiQuery:
+    """search_page with a list of queries."""
+
+    @respx.mock
+    async def test_matches_tagged_by_query(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        result = await search_page_handle(SAMPLE_URL, [".astream()", "async", "Chains"], app_state)
+
+        assert result["query"] == [".astream()", "async", "Chains"]
+        assert result["matches"].splitlines() == [
+            "15:[1] ### Using .astream()",
+            "17:[1,2] The `.astream()` method is async.",
+            "19:[3] ## Streaming with Chains",
+        ]
+        assert result["total_matches"] == 3
+
+    @respx.mock
+    async def test_same_pages_with_cursors_and_sandbox(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+        queries = [r"\.a?stream\(", r"Chat|Chains"]
+
+        async def pages(state: AppState) -> list[str]:
+            out: list[str] = []
+            offset: int | None = 1
+            while offset is not None:
+                result = await search_page_handle(
+                    SAMPLE_URL, queries, state, mode="regex", max_results=2, offset=offset
+                )
+                out.append(result["matches"])
+                offset = result["next_offset"]
+            return out
+
+        direct = await pages(app_state)
+        app_state.search_cursors = build_cursor_cache(SearchSettings())
+        cursored = await pages(app_state)
+        app_state.regex_sandbox = RegexSandbox(SearchSettings(regex_workers=1))
+        try:
+            sandboxed = await pages(app_state)
+        finally:
+            app_state.regex_sandbox.close()
+
+        assert direct == cursored == sandboxed
+        assert "\n".join(direct).count("[") == 6
+
+    @respx.mock
+    async def test_single_item_list_is_a_plain_search(self, app_state: AppState) -> None:
+        respx.get(SAMPLE_URL).mock(return_value=httpx.Response(200, text=SAMPLE_PAGE))
+
+        listed = await search_page_handle(SAMPLE_URL, ["streaming"], app_state)
+        plain = await search_page_handle(SAMPLE_URL, "streaming", app_state)
+
+        assert listed["query"] == "streaming"
+        assert listed["matches"] == plain["matches"]
+
+    @pytest.mark.parametrize("queries", [[], ["ok", " "], [f"q{i}" for i in range(11)]])
+    async def test_invalid_query_lists_rejected(
+        self, app_state: AppState, queries: list[str]
+    ) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await search_page_handle(SAMPLE_URL, queries, app_state)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
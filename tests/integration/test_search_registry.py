@@ -0,0 +1,56 @@
+"""Integration tests for the search_registry tool handler."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from procontext.errors import ErrorCode, ProContextError
+from procontext.models.tools import MAX_SEARCH_RESULTS
+from procontext.tools.search_registry import handle
+
+if TYPE_CHECKING:
+    from procontext.state import AppState
+
+
+class TestSearchRegistryHandler:
+    async def test_finds_libraries_by_description(self, app_state: AppState) -> None:
+        result = await handle("data validation", app_state)
+        match = result["matches"][0]
+        assert match["library_id"] == "pydantic"
+        assert match["matched_via"] == "keyword"
+        assert match["index_url"] == "https://docs.pydantic.dev/llms.txt"
+        assert 0 < match["relevance"] <= 1
+
+    async def test_sorted_by_relevance(self, app_state: AppState) -> None:
+        result = await handle("llm python validation", app_state)
+        relevances = [match["relevance"] for match in result["matches"]]
+        assert len(relevances) == 2
+        assert relevances == sorted(relevances, reverse=True)
+
+    async def test_limit(self, app_state: AppState) -> None:
+        result = await handle("python", app_state, limit=1)
+        assert len(result["matches"]) == 1
+
+    async def test_filters(self, app_state: AppState) -> None:
+        assert (await handle("python", app_state, language="Python"))["matches"]
+        assert (await handle("python", app_state, ecosystem="npm"))["matches"] == []
+
+    async def test_no_match_returns_empty(self, app_state: AppState) -> None:
+        assert (await handle("xyzzy", app_state))["matches"] == []
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"query": "  "},
+            {"query": "x" * 501},
+            {"query": "http", "limit": 0},
+            {"query": "http", "limit": MAX_SEARCH_RESULTS + 1},
+            {"query": "http", "ecosystem": "cargo"},
+        ],
+    )
+    async def test_invalid_input(self, app_state: AppState, kwargs: dict) -> None:
+        with pytest.raises(ProContextError) as exc_info:
+            await handle(state=app_state, **kwargs)
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
@@ -0,0 +1,139 @@
+"""Unit tests for procontext.admission."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from procontext.admission import (
+    QUEUE_DEPTH,
+    REJECTED_TOTAL,
+    AdmissionController,
+    always_cheap,
+)
+from procontext.config import AdmissionSettings
+from procontext.errors import ErrorCode, ProContextError
+
+
+async def always_expensive() -> bool:
+    return False
+
+
+async def _hold(
+    controller: AdmissionController,
+    tool: str,
+    release: asyncio.Event,
+    admitted: list[str] | None = None,
+    name: str = "",
+    is_cheap=always_cheap,
+) -> None:
+    async with controller.admit(tool, is_cheap):
+        if admitted is not None:
+            admitted.append(name)
+        await release.wait()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_calls_within_limit_run_concurrently() -> None:
+    controller = AdmissionController(AdmissionSettings(max_concurrent=2, max_queued=0))
+    release = asyncio.Event()
+    admitted: list[str] = []
+
+    tasks = [
+        asyncio.create_task(_hold(controller, "t_concurrent", release, admitted, name))
+        for name in ("a", "b")
+    ]
+    await _settle()
+    assert admitted == ["a", "b"]
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_rejects_with_recoverable_error_when_queue_full() -> None:
+    controller = AdmissionController(AdmissionSettings(max_concurrent=1, max_queued=1))
+    release = asyncio.Event()
+    before = REJECTED_TOTAL.value(tool="t_reject")
+
+    holder = asyncio.create_task(_hold(controller, "t_reject", release))
+    waiter = asyncio.create_task(_hold(controller, "t_reject", release))
+    await _settle()
+    assert QUEUE_DEPTH.value(tool="t_reject") == 1
+
+    with pytest.raises(ProContextError) as exc_info:
+        async with controller.admit("t_reject", always_cheap):
+            pass
+    assert exc_info.value.code == ErrorCode.SERVER_OVERLOADED
+    assert exc_info.value.recoverable is True
+    assert REJECTED_TOTAL.value(tool="t_reject") == before + 1
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert QUEUE_DEPTH.value(tool="t_reject") == 0
+
+
+async def test_cheap_calls_are_admitted_before_expensive_ones() -> None:
+    controller = AdmissionController(AdmissionSettings(max_concurrent=1, max_queued=10))
+    release_holder = asyncio.Event()
+    release_rest = asyncio.Event()
+    release_rest.set()
+    admitted: list[str] = []
+
+    holder = asyncio.create_task(_hold(controller, "t_priority", release_holder))
+    await _settle()
+    waiters = [
+        asyncio.create_task(
+            _hold(controller, "t_priority", release_rest, admitted, "miss-1", always_expensive)
+        ),
+        asyncio.create_task(
+            _hold(controller, "t_priority", release_rest, admitted, "miss-2", always_expensive)
+        ),
+        asyncio.create_task(_hold(controller, "t_priority", release_rest, admitted, "hit")),
+    ]
+    await _settle()
+
+    release_holder.set()
+    await asyncio.gather(holder, *waiters)
+    assert admitted == ["hit", "miss-1", "miss-2"]
+
+
+async def test_cancelled_waiter_leaves_queue() -> None:
+    controller = AdmissionController(AdmissionSettings(max_concurrent=1, max_queued=1))
+    release = asyncio.Event()
+
+    holder = asyncio.create_task(_hold(controller, "t_cancel", release))
+    waiter = asyncio.create_task(_hold(controller, "t_cancel", release))
+    await _settle()
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert QUEUE_DEPTH.value(tool="t_cancel") == 0
+
+    # The freed queue position is usable again.
+    replacement = asyncio.create_task(_hold(controller, "t_cancel", release))
+    await _settle()
+    release.set()
+    await asyncio.gather(holder, replacement)
+
+
+async def test_per_tool_override_and_independent_gates() -> None:
+    controller = AdmissionController(
+        AdmissionSettings(max_concurrent=1, max_queued=0, tool_max_concurrent={"t_wide": 3})
+    )
+    release = asyncio.Event()
+    admitted: list[str] = []
+
+    tasks = [
+        asyncio.create_task(_hold(controller, "t_wide", release, admitted, f"wide-{i}"))
+        for i in range(3)
+    ]
+    tasks.append(asyncio.create_task(_hold(controller, "t_narrow", release, admitted, "narrow")))
+    await _settle()
+    assert len(admitted) == 4
+
+    release.set()
+    await asyncio.gather(*tasks)
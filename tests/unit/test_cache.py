@@ -3,13 +3,10 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING
 
 import aiosqlite
 
-if TYPE_CHECKING:
-    from procontext.cache import Cache
-
+from procontext.cache import Cache
 
 # ---------------------------------------------------------------------------
 # Page cache
@@ -33,10 +30,40 @@ class TestPageCache:
         assert entry.outline == "1:# Page 1"
         assert entry.stale is False
 
+    async def test_outline_index_round_trip(self, cache: Cache) -> None:
+        await cache.set_page(
+            url="https://example.com/docs/page1",
+            url_hash="abc123",
+            content="# Page 1",
+            outline="1:# Page 1",
+            outline_index=b"index-bytes",
+            ttl_hours=24,
+        )
+        entry = await cache.get_page("abc123")
+        assert entry is not None
+        assert entry.outline_index == b"index-bytes"
+
+    async def test_outline_index_defaults_to_empty(self, cache: Cache) -> None:
+        await _insert_expired_page(cache, "no-index", days_ago=0)
+        entry = await cache.get_page("no-index")
+        assert entry is not None
+        assert entry.outline_index == b""
+
     async def test_get_nonexistent_returns_none(self, cache: Cache) -> None:
         entry = await cache.get_page("nonexistent-hash")
         assert entry is None
 
+    async def test_has_page_reports_presence_without_reading_content(self, cache: Cache) -> None:
+        await cache.set_page(
+            url="https://example.com/docs/page1",
+            url_hash="abc123",
+            content="# Page 1",
+            outline="",
+            ttl_hours=0,  # stale entries are still served from cache
+        )
+        assert await cache.has_page("abc123") is True
+        assert await cache.has_page("nonexistent-hash") is False
+
     async def test_corrupted_fetched_at_returns_none(self, cache: Cache) -> None:
         """A non-ISO timestamp in fetched_at raises ValueError — must be caught, not crash."""
         future = (datetime.now(UTC) + timedelta(hours=24)).isoformat()
@@ -145,6 +172,30 @@ class TestPageCache:
         cache._db.execute = original_execute  # type: ignore[assignment]
 
 
+# ---------------------------------------------------------------------------
+# Schema migration
+# ---------------------------------------------------------------------------
+
+
+class TestSchemaMigration:
+    async def test_adds_outline_index_to_existing_table(self) -> None:
+        async with aiosqlite.connect(":memory:") as db:
+            await db.execute(
+                "CREATE TABLE page_cache (url_hash TEXT PRIMARY KEY, url TEXT NOT NULL UNIQUE, "
+                "content TEXT NOT NULL, outline TEXT NOT NULL DEFAULT '', "
+                "discovered_domains TEXT NOT NULL DEFAULT '', fetched_at TEXT NOT NULL, "
+                "expires_at TEXT NOT NULL, last_checked_at TEXT)"
+            )
+            cache = Cache(db)
+            await cache.init_db()
+            await cache.init_db()  # idempotent
+
+            await _insert_expired_page(cache, "old-row", days_ago=0)
+            entry = await cache.get_page("old-row")
+            assert entry is not None
+            assert entry.outline_index == b""
+
+
 # ---------------------------------------------------------------------------
 # cleanup_expired
 # ---------------------------------------------------------------------------
@@ -0,0 +1,227 @@
+"""Unit tests for procontext.compression."""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from procontext import compression
+from procontext.compression import CompressionMiddleware, negotiate_encoding
+from procontext.config import Settings
+from procontext.transport import run_http_server
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_LARGE = b"# Heading\n" + b"Some documentation line that repeats.\n" * 200
+
+
+def _app(body: bytes, content_type: str = "application/json") -> ASGIApp:
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def _scope(accept_encoding: str) -> Scope:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": "/mcp",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+
+
+async def _noop_receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+# ---------------------------------------------------------------------------
+# Negotiation
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("*, gzip;q=0", None),
+    ],
+)
+def test_negotiate_gzip(header: str, expected: str | None) -> None:
+    with patch.object(compression, "brotli", None):
+        assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [("gzip, br", "br"), ("gzip, br;q=0.5", "gzip"), ("br;q=0, gzip", "gzip"), ("*", "br")],
+)
+def test_negotiate_prefers_brotli_when_available(header: str, expected: str) -> None:
+    assert negotiate_encoding(header) == expected
+
+
+# ---------------------------------------------------------------------------
+# Buffered responses
+# ---------------------------------------------------------------------------
+
+
+async def test_large_response_is_gzipped() -> None:
+    app = CompressionMiddleware(_app(_LARGE), minimum_size=100)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        response = await client.post("/mcp", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) < len(_LARGE)
+    assert response.content == _LARGE  # httpx decodes transparently
+
+
+async def test_small_response_is_left_alone() -> None:
+    app = CompressionMiddleware(_app(b'{"ok": true}'), minimum_size=100)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        response = await client.post("/mcp", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == b'{"ok": true}'
+
+
+async def test_client_without_accept_encoding_gets_identity() -> None:
+    app = CompressionMiddleware(_app(_LARGE), minimum_size=100)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        response = await client.post("/mcp", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == _LARGE
+
+
+# ---------------------------------------------------------------------------
+# Event streams
+# ---------------------------------------------------------------------------
+
+
+async def test_event_stream_is_compressed_per_event_without_buffering() -> None:
+    events = [b"event: message\ndata: " + _LARGE[:50] + b"\n\n", b"data: " + _LARGE + b"\n\n"]
+    sent: list[Message] = []
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    decoded_after_each_send: list[bytes] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+        if message["type"] == "http.response.body":
+            decoded_after_each_send.append(decoder.decompress(message["body"]))
+
+    async def sse_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            }
+        )
+        # Headers must already be on the wire before the first event exists.
+        assert sent and sent[0]["type"] == "http.response.start"
+        for event in events:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    app = CompressionMiddleware(sse_app, minimum_size=10_000)
+    await app(_scope("gzip"), _noop_receive, send)
+
+    start_headers = dict(sent[0]["headers"])
+    assert start_headers[b"content-encoding"] == b"gzip"
+    # Each event is fully decodable as soon as it is sent — nothing held back.
+    assert decoded_after_each_send[:2] == events
+    assert b"".join(decoded_after_each_send) == b"".join(events)
+
+
+async def test_streamed_response_is_valid_gzip() -> None:
+    chunks = [_LARGE[:300], _LARGE[300:]]
+    body = bytearray()
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            body.extend(message["body"])
+
+    async def streaming_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    await CompressionMiddleware(streaming_app)(_scope("gzip"), _noop_receive, send)
+
+    assert gzip.decompress(bytes(body)) == _LARGE
+
+
+async def test_already_encoded_response_passes_through() -> None:
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    async def encoded_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-encoding", b"br")],
+            }
+        )
+        await send({"type": "http.response.body", "body": _LARGE})
+
+    await CompressionMiddleware(encoded_app, minimum_size=1)(_scope("gzip"), _noop_receive, send)
+
+    assert sent[1]["body"] == _LARGE
+
+
+# ---------------------------------------------------------------------------
+# Wiring
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_run_http_server_installs_compression_when_enabled(enabled: bool) -> None:
+    fake_mcp = MagicMock()
+    fake_http_app = MagicMock()
+    fake_mcp.streamable_http_app.return_value = fake_http_app
+    settings = Settings(
+        server={"transport": "http", "compression_enabled": enabled, "compression_min_bytes": 512}
+    )
+
+    with patch("procontext.transport.uvicorn.run"):
+        run_http_server(fake_mcp, settings)
+
+    if enabled:
+        fake_http_app.add_middleware.assert_called_once_with(
+            CompressionMiddleware, minimum_size=512
+        )
+    else:
+        fake_http_app.add_middleware.assert_not_called()
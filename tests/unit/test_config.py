@@ -88,3 +88,31 @@ class TestConfigValidation:
         settings = ServerSettings(auth_enabled=True, auth_key="")
         assert settings.auth_enabled is True
         assert settings.auth_key == ""
+
+    @pytest.mark.parametrize(("raw", "expected"), [("0660", 0o660), ("600", 0o600), (0o640, 0o640)])
+    def test_unix_socket_mode_strings_are_octal(self, raw: str | int, expected: int) -> None:
+        from procontext.config import ServerSettings
+
+        assert ServerSettings(unix_socket_mode=raw).unix_socket_mode == expected  # type: ignore[arg-type]
+
+    def test_invalid_unix_socket_mode_raises_validation_error(self) -> None:
+        from procontext.config import ServerSettings
+
+        with pytest.raises(ValidationError):
+            ServerSettings(unix_socket_mode="rw-rw----")  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize(
+        "admission",
+        [
+            {"max_concurrent": 0},
+            {"max_concurrent": -1},
+            {"tool_max_concurrent": {"read_page": 0}},
+            {"tool_max_concurrent": {"read_page": 4, "search_page": -2}},
+        ],
+    )
+    def test_admission_slots_below_one_raise_validation_error(self, admission: dict) -> None:
+        """No slots would make every call to the tool wait forever."""
+        from procontext.config import AdmissionSettings
+
+        with pytest.raises(ValidationError):
+            AdmissionSettings(**admission)
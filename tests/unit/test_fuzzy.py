@@ -0,0 +1,100 @@
+"""Unit tests for procontext.fuzzy."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+from rapidfuzz import fuzz, process
+
+from procontext.fuzzy import FuzzyIndex
+
+_ALPHABET = "abcdeflmnop-_0"
+
+
+def _random_corpus(rng: random.Random, size: int) -> list[tuple[str, str]]:
+    corpus = []
+    for i in range(size):
+        term = "".join(rng.choices(_ALPHABET, k=rng.randint(1, 14)))
+        corpus.append((term, f"lib{i // 3}"))
+    return corpus
+
+
+def _index(corpus: list[tuple[str, str]], previous: FuzzyIndex | None = None) -> FuzzyIndex:
+    return FuzzyIndex(
+        [term for term, _ in corpus], [library_id for _, library_id in corpus], previous=previous
+    )
+
+
+def _reference(
+    query: str, corpus: list[tuple[str, str]], limit: int, score_cutoff: float
+) -> list[tuple[str, float, str]]:
+    terms = [term for term, _ in corpus]
+    results = process.extract(
+        query, terms, scorer=fuzz.ratio, limit=limit, score_cutoff=score_cutoff
+    )
+    return [(term, score, corpus[idx][1]) for term, score, idx in results]
+
+
+class TestFuzzyIndex:
+    @pytest.mark.parametrize("score_cutoff", [0, 40, 70, 90, 100])
+    def test_matches_full_scan(self, score_cutoff: int) -> None:
+        rng = random.Random(score_cutoff)
+        corpus = _random_corpus(rng, 600)
+        index = _index(corpus)
+        queries = [term for term, _ in rng.sample(corpus, 20)]
+        queries += ["".join(rng.choices(_ALPHABET, k=rng.randint(1, 16))) for _ in range(40)]
+        for query in queries:
+            for limit in (1, 5, 50):
+                assert index.extract(query, limit=limit, score_cutoff=score_cutoff) == _reference(
+                    query, corpus, limit, score_cutoff
+                ), (query, limit)
+
+    def test_ties_keep_corpus_order(self) -> None:
+        corpus = [("abcx", "first"), ("abcdefgh", "long"), ("abcy", "second")]
+        index = _index(corpus)
+        results = index.extract("abcz", limit=2, score_cutoff=50)
+        assert [library_id for _, _, library_id in results] == ["first", "second"]
+
+    def test_repeated_characters_are_counted(self) -> None:
+        # "aaab" shares only one "a" with "abbb", so it cannot reach 75.
+        index = FuzzyIndex(["abbb", "aaab"], ["x", "y"])
+        assert [lib for _, _, lib in index.extract("abbb", limit=5, score_cutoff=75)] == ["x"]
+
+    def test_no_viable_length(self) -> None:
+        index = FuzzyIndex(["a", "ab"], ["x", "y"])
+        assert index.extract("abcdefghij", limit=5, score_cutoff=70) == []
+
+    def test_empty_index(self) -> None:
+        index = FuzzyIndex([], [])
+        assert len(index) == 0
+        assert index.extract("langchain", limit=5, score_cutoff=70) == []
+
+    def test_bytes_round_trip(self) -> None:
+        corpus = _random_corpus(random.Random(7), 300)
+        index = _index(corpus)
+        loaded = FuzzyIndex.from_bytes(index.to_bytes())
+        assert len(loaded) == len(index)
+        for query in ("abc", "langchain", corpus[0][0]):
+            assert loaded.extract(query, limit=5, score_cutoff=50) == index.extract(
+                query, limit=5, score_cutoff=50
+            )
+
+    def test_from_bytes_rejects_garbage(self) -> None:
+        with pytest.raises(ValueError, match="malformed"):
+            FuzzyIndex.from_bytes(b"\x00not an index")
+
+    def test_previous_postings_reused_for_unchanged_lengths(self) -> None:
+        corpus = _random_corpus(random.Random(11), 300)
+        previous = _index(corpus)
+        changed = [*corpus[:100], ("xyz" * 5, "new"), *corpus[101:]]
+        index = _index(changed, previous)
+
+        fresh = _index(changed)
+        assert index._postings == fresh._postings
+        shared = [a is b for a, b in zip(index._postings, previous._postings, strict=False)]
+        assert sum(shared) >= len(index._postings) - 2
+        for query in ("abc", "xyzxyz", corpus[5][0]):
+            assert index.extract(query, limit=5, score_cutoff=50) == fresh.extract(
+                query, limit=5, score_cutoff=50
+            )
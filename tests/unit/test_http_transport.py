@@ -7,11 +7,13 @@ runs if the middleware short-circuits.
 
 from __future__ import annotations
 
+import stat
 from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
+from mcp.server.transport_security import TransportSecuritySettings
 
 from procontext.config import Settings
 from procontext.transport import (
@@ -19,8 +21,11 @@ from procontext.transport import (
     MCPSecurityMiddleware,
     run_http_server,
 )
+from procontext.unix_socket import unix_sockets_supported
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from starlette.types import ASGIApp, Receive, Scope, Send
 
 
@@ -330,3 +335,64 @@ async def test_auth_checked_before_origin() -> None:
             headers={"Authorization": "Bearer wrong", "Origin": "https://evil.com"},
         )
     assert response.status_code == 401
+
+
+@pytest.mark.skipif(not unix_sockets_supported(), reason="requires AF_UNIX")
+def test_run_http_server_binds_unix_socket_with_configured_mode(tmp_path: Path) -> None:
+    fake_mcp = MagicMock()
+    fake_mcp.streamable_http_app.return_value = MagicMock()
+    fake_mcp.settings.transport_security = TransportSecuritySettings(allowed_hosts=["localhost:*"])
+    socket_path = tmp_path / "mcp.sock"
+    settings = Settings(
+        server={
+            "transport": "http",
+            "unix_socket_path": str(socket_path),
+            "unix_socket_mode": "0660",
+        }
+    )
+    observed: dict[str, object] = {}
+
+    def fake_run(app: ASGIApp, **kwargs: object) -> None:
+        observed.update(kwargs)
+        observed["mode"] = stat.S_IMODE(socket_path.stat().st_mode)
+
+    with patch("procontext.transport.uvicorn.run", side_effect=fake_run):
+        run_http_server(fake_mcp, settings)
+
+    assert isinstance(observed["fd"], int)
+    assert "host" not in observed
+    assert "port" not in observed
+    assert observed["mode"] == 0o660
+    # The socket file is removed once the server stops.
+    assert not socket_path.exists()
+    # Socket clients send a port-less Host header.
+    assert "localhost" in fake_mcp.settings.transport_security.allowed_hosts
+
+
+@pytest.mark.skipif(not unix_sockets_supported(), reason="requires AF_UNIX")
+def test_run_http_server_exits_when_unix_socket_path_is_not_a_socket(tmp_path: Path) -> None:
+    fake_mcp = MagicMock()
+    fake_mcp.streamable_http_app.return_value = MagicMock()
+    socket_path = tmp_path / "mcp.sock"
+    socket_path.write_text("not a socket")
+    settings = Settings(server={"transport": "http", "unix_socket_path": str(socket_path)})
+
+    with (
+        patch("procontext.transport.uvicorn.run") as mock_uvicorn_run,
+        pytest.raises(SystemExit),
+    ):
+        run_http_server(fake_mcp, settings)
+
+    mock_uvicorn_run.assert_not_called()
+    assert socket_path.read_text() == "not a socket"
+
+
+async def test_metrics_endpoint_serves_prometheus_text() -> None:
+    from procontext.mcp.server import mcp
+
+    async with _client(mcp.streamable_http_app()) as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE procontext_admission_rejected_total counter" in response.text
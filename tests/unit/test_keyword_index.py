@@ -0,0 +1,173 @@
+"""Unit tests for procontext.keyword_index."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from procontext.keyword_index import KeywordDocument, KeywordIndex, tokenize
+
+_WORDS = [
+    "http",
+    "client",
+    "async",
+    "server",
+    "json",
+    "schema",
+    "fast",
+    "python",
+    "vector",
+    "store",
+    "cache",
+    "queue",
+]
+
+DOCUMENTS: list[KeywordDocument] = [
+    (
+        "httpx",
+        ["httpx", "HTTPX"],
+        "A next-generation HTTP client for Python.",
+        ["python"],
+        ["pypi"],
+    ),
+    ("axios", ["axios", "Axios"], "Promise based HTTP client.", ["javascript"], ["npm"]),
+    ("tenacity", ["tenacity"], "Retrying library with retries and backoff.", ["python"], ["pypi"]),
+    ("pydantic", ["pydantic"], "Data validation using Python type hints.", ["python"], ["pypi"]),
+    (
+        "zod",
+        ["zod"],
+        "Schema validation with static type inference.",
+        ["typescript"],
+        ["npm", "jsr"],
+    ),
+]
+
+
+def _random_documents(rng: random.Random, size: int) -> list[KeywordDocument]:
+    return [
+        (
+            f"lib{i}",
+            [f"lib{i}", rng.choice(_WORDS)],
+            " ".join(rng.choices(_WORDS, k=rng.randint(0, 12))),
+            rng.sample(["python", "javascript", "rust"], rng.randint(0, 2)),
+            rng.sample(["pypi", "npm", "conda"], rng.randint(0, 2)),
+        )
+        for i in range(size)
+    ]
+
+
+def _reference(
+    index: KeywordIndex, query: str, limit: int, allowed: int | None
+) -> list[tuple[float, int]]:
+    spans = [span for term in dict.fromkeys(tokenize(query)) if (span := index._span(term))]
+    scored = [
+        (-index._score(doc, spans), doc)
+        for doc in range(len(index))
+        if allowed is None or allowed >> doc & 1
+    ]
+    return sorted(hit for hit in scored if hit[0])[:limit]
+
+
+class TestTokenize:
+    def test_lowercases_and_splits_on_punctuation(self) -> None:
+        assert tokenize("LangChain-OpenAI python_dotenv") == [
+            "langchain",
+            "openai",
+            "python",
+            "dotenv",
+        ]
+
+    def test_drops_stopwords(self) -> None:
+        assert tokenize("a client for the web") == ["client", "web"]
+
+    def test_folds_plurals(self) -> None:
+        assert tokenize("retries clients redis status classes") == [
+            "retry",
+            "client",
+            "redis",
+            "status",
+            "classe",
+        ]
+
+
+class TestKeywordIndex:
+    def test_ranks_matching_documents(self) -> None:
+        index = KeywordIndex(DOCUMENTS)
+        results = index.search("http client", limit=10)
+        assert [library_id for library_id, _ in results] == ["axios", "httpx"]
+        assert 0 < results[1][1] <= results[0][1] <= 1
+
+    def test_names_outweigh_descriptions(self) -> None:
+        index = KeywordIndex(
+            [
+                ("a", ["a"], "mentions tenacity once", [], []),
+                ("tenacity", ["tenacity"], "retrying", [], []),
+            ]
+        )
+        assert index.search("tenacity", limit=1)[0][0] == "tenacity"
+
+    def test_plural_query_matches_singular(self) -> None:
+        index = KeywordIndex(DOCUMENTS)
+        assert [library_id for library_id, _ in index.search("retry", limit=5)] == ["tenacity"]
+
+    @pytest.mark.parametrize(
+        ("language", "ecosystem", "expected"),
+        [
+            ("python", None, ["pydantic"]),
+            ("TypeScript", None, ["zod"]),
+            (None, "jsr", ["zod"]),
+            ("python", "npm", []),
+            ("go", None, []),
+        ],
+    )
+    def test_filters(
+        self, language: str | None, ecosystem: str | None, expected: list[str]
+    ) -> None:
+        index = KeywordIndex(DOCUMENTS)
+        results = index.search("validation", limit=5, language=language, ecosystem=ecosystem)
+        assert [library_id for library_id, _ in results] == expected
+
+    def test_languages_and_ecosystems_are_searchable(self) -> None:
+        index = KeywordIndex(DOCUMENTS)
+        assert {library_id for library_id, _ in index.search("jsr", limit=5)} == {"zod"}
+
+    @pytest.mark.parametrize("query", ["", "the of and", "nonexistent"])
+    def test_no_matching_terms(self, query: str) -> None:
+        assert KeywordIndex(DOCUMENTS).search(query, limit=5) == []
+
+    def test_empty_index(self) -> None:
+        index = KeywordIndex([])
+        assert len(index) == 0
+        assert index.search("http", limit=5) == []
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_exhaustive_scoring(self, seed: int) -> None:
+        rng = random.Random(seed)
+        index = KeywordIndex(_random_documents(rng, 400))
+        for _ in range(40):
+            query = " ".join(rng.sample(_WORDS, rng.randint(1, 4)))
+            language = rng.choice([None, "python", "rust"])
+            ecosystem = rng.choice([None, None, "npm"])
+            allowed = index._allowed(language, ecosystem)
+            for limit in (1, 10, 500):
+                expected = _reference(index, query, limit, allowed)
+                results = index.search(query, limit=limit, language=language, ecosystem=ecosystem)
+                assert [library_id for library_id, _ in results] == [
+                    f"lib{doc}" for _, doc in expected
+                ], (query, language, ecosystem, limit)
+
+    def test_round_trip(self) -> None:
+        rng = random.Random(0)
+        index = KeywordIndex(_random_documents(rng, 200))
+        loaded = KeywordIndex.from_bytes(index.to_bytes())
+        for query in ("fast python", "vector store cache", "json"):
+            for ecosystem in (None, "npm"):
+                assert loaded.search(query, limit=10, ecosystem=ecosystem) == index.search(
+                    query, limit=10, ecosystem=ecosystem
+                )
+
+    @pytest.mark.parametrize("data", [b"", b"junk", b"\xe9\x00\x00\x00\x00"])
+    def test_from_bytes_rejects_malformed(self, data: bytes) -> None:
+        with pytest.raises(ValueError):
+            KeywordIndex.from_bytes(data)
@@ -0,0 +1,53 @@
+"""Unit tests for procontext.lru."""
+
+from __future__ import annotations
+
+from procontext.lru import LRUCache
+
+
+class TestLRUCache:
+    def test_get_missing_returns_none(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(2)
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_weight_budget_evicts_oldest(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(10, max_weight=100)
+        cache.put("a", 1, weight=60)
+        cache.put("b", 2, weight=30)
+        cache.put("c", 3, weight=30)
+        assert cache.get("a") is None
+        assert cache.weight == 60
+        assert len(cache) == 2
+
+    def test_reput_updates_weight(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(10, max_weight=100)
+        cache.put("a", 1, weight=90)
+        cache.put("a", 1, weight=10)
+        assert cache.weight == 10
+        cache.put("b", 2, weight=80)
+        assert cache.get("a") == 1
+
+    def test_entry_heavier_than_budget_is_not_kept(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(10, max_weight=100)
+        cache.put("a", 1, weight=10)
+        cache.put("huge", 2, weight=500)
+        assert cache.get("huge") is None
+        assert len(cache) == 0
+        assert cache.weight == 0
+
+    def test_clear(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(10, max_weight=100)
+        cache.put("a", 1, weight=10)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.weight == 0
@@ -0,0 +1,190 @@
+"""Unit tests for procontext.manifests."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from procontext.manifests import find_manifests, manifest_language, read_dependencies
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestRequirementsTxt:
+    def test_names_without_versions_extras_or_markers(self, tmp_path: Path) -> None:
+        path = tmp_path / "requirements.txt"
+        path.write_text(
+            "requests>=2.31\n"
+            "langchain-openai[extras]==0.3 ; python_version >= '3.12'\n"
+            "Django~=5.0  # web\n"
+            "httpx \\\n    >=0.28\n"
+        )
+        assert read_dependencies(path) == ["requests", "langchain-openai", "Django", "httpx"]
+
+    def test_skips_options_urls_and_paths(self, tmp_path: Path) -> None:
+        path = tmp_path / "requirements-dev.txt"
+        path.write_text(
+            "# comment\n"
+            "-r requirements.txt\n"
+            "--index-url https://example.com/simple\n"
+            "-e .\n"
+            "./local-package\n"
+            "git+https://github.com/org/repo@main\n"
+            "wheel-pkg @ https://example.com/wheel-pkg-1.0.whl\n"
+        )
+        assert read_dependencies(path) == ["wheel-pkg"]
+
+    def test_duplicates_collapse_case_insensitively(self, tmp_path: Path) -> None:
+        path = tmp_path / "requirements.txt"
+        path.write_text("PyYAML\npyyaml>=6\n")
+        assert read_dependencies(path) == ["PyYAML"]
+
+
+class TestPyproject:
+    def test_project_groups_and_poetry_tables(self, tmp_path: Path) -> None:
+        path = tmp_path / "pyproject.toml"
+        path.write_text(
+            "[project]\n"
+            'dependencies = ["httpx>=0.28", "pydantic[email]"]\n'
+            "[project.optional-dependencies]\n"
+            'cli = ["rich"]\n'
+            "[dependency-groups]\n"
+            'dev = ["pytest", {include-group = "lint"}]\n'
+            'lint = ["ruff"]\n'
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.12"\n'
+            'fastapi = "^0.110"\n'
+            "[tool.poetry.group.docs.dependencies]\n"
+            'mkdocs = "*"\n'
+        )
+        assert read_dependencies(path) == [
+            "httpx",
+            "pydantic",
+            "rich",
+            "pytest",
+            "ruff",
+            "fastapi",
+            "mkdocs",
+        ]
+
+    def test_malformed_toml_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "pyproject.toml"
+        path.write_text("[project\n")
+        with pytest.raises(ValueError, match="Malformed manifest"):
+            read_dependencies(path)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '[project]\ndependencies = "requests"\n',
+            '[project]\ndependencies = ["requests", 2]\n',
+            '[project.optional-dependencies]\ncli = "rich"\n',
+            'tool = "poetry"\n',
+        ],
+    )
+    def test_wrongly_typed_fields_raise_value_error(self, tmp_path: Path, text: str) -> None:
+        path = tmp_path / "pyproject.toml"
+        path.write_text(text)
+        with pytest.raises(ValueError, match="Malformed manifest"):
+            read_dependencies(path)
+
+
+class TestNpm:
+    def test_package_json_dependency_tables(self, tmp_path: Path) -> None:
+        path = tmp_path / "package.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "name": "app",
+                    "dependencies": {"react": "^18", "@tanstack/query": "^5"},
+                    "devDependencies": {"typescript": "^5"},
+                    "peerDependencies": {"react": "^18"},
+                }
+            )
+        )
+        assert read_dependencies(path) == ["react", "@tanstack/query", "typescript"]
+        assert manifest_language(path) == "javascript"
+
+    def test_package_lock_v3_packages(self, tmp_path: Path) -> None:
+        path = tmp_path / "package-lock.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "lockfileVersion": 3,
+                    "packages": {
+                        "": {"name": "app"},
+                        "node_modules/react": {},
+                        "node_modules/@types/node": {},
+                        "node_modules/a/node_modules/b": {},
+                        "node_modules/workspace-pkg": {"link": True},
+                    },
+                }
+            )
+        )
+        assert read_dependencies(path) == ["react", "@types/node", "b"]
+
+    def test_package_lock_v1_dependencies(self, tmp_path: Path) -> None:
+        path = tmp_path / "package-lock.json"
+        path.write_text(json.dumps({"lockfileVersion": 1, "dependencies": {"lodash": {}}}))
+        assert read_dependencies(path) == ["lodash"]
+
+    def test_dependencies_list_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "package.json"
+        path.write_text(json.dumps({"dependencies": ["react"]}))
+        with pytest.raises(ValueError, match="Malformed manifest"):
+            read_dependencies(path)
+
+
+class TestPythonLockfiles:
+    def test_uv_lock_skips_the_project_itself(self, tmp_path: Path) -> None:
+        path = tmp_path / "uv.lock"
+        path.write_text(
+            "version = 1\n"
+            "[[package]]\n"
+            'name = "anyio"\n'
+            'source = { registry = "https://pypi.org/simple" }\n'
+            "[[package]]\n"
+            'name = "myapp"\n'
+            'source = { editable = "." }\n'
+        )
+        assert read_dependencies(path) == ["anyio"]
+        assert manifest_language(path) == "python"
+
+    @pytest.mark.parametrize(
+        "package",
+        ['version = "1.0"', "name = 1", 'source = "pypi"\nname = "anyio"'],
+    )
+    def test_uv_lock_malformed_package_raises_value_error(
+        self, tmp_path: Path, package: str
+    ) -> None:
+        path = tmp_path / "uv.lock"
+        path.write_text(f'version = 1\n[[package]]\nname = "ok"\n[[package]]\n{package}\n')
+        with pytest.raises(ValueError, match="Malformed manifest uv.lock"):
+            read_dependencies(path)
+
+    def test_uv_lock_package_must_be_tables(self, tmp_path: Path) -> None:
+        path = tmp_path / "uv.lock"
+        path.write_text('package = ["anyio"]\n')
+        with pytest.raises(ValueError, match="must be tables"):
+            read_dependencies(path)
+
+    def test_pipfile_lock(self, tmp_path: Path) -> None:
+        path = tmp_path / "Pipfile.lock"
+        path.write_text(json.dumps({"default": {"requests": {}}, "develop": {"pytest": {}}}))
+        assert read_dependencies(path) == ["requests", "pytest"]
+
+
+class TestDiscovery:
+    def test_find_manifests_ignores_lockfiles(self, tmp_path: Path) -> None:
+        for name in ("package.json", "uv.lock", "pyproject.toml"):
+            (tmp_path / name).write_text("")
+        assert find_manifests(tmp_path) == [tmp_path / "pyproject.toml", tmp_path / "package.json"]
+
+    def test_unsupported_file_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "Gemfile"
+        path.write_text("gem 'rails'\n")
+        with pytest.raises(ValueError, match="Unsupported manifest"):
+            read_dependencies(path)
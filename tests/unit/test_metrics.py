@@ -0,0 +1,67 @@
+"""Unit tests for procontext.metrics."""
+
+from __future__ import annotations
+
+import pytest
+
+from procontext.metrics import MetricsRegistry
+
+
+def test_render_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests served.", ("tool",))
+    depth = registry.gauge("app_queue_depth", "Calls waiting.")
+    size = registry.gauge("app_size", "Integer-valued gauge.")
+
+    requests.inc(tool="read_page")
+    requests.inc(2, tool="read_page")
+    requests.inc(tool='we"ird')
+    depth.set(1.5)
+    size.set(3)
+
+    assert registry.render() == (
+        "# HELP app_requests_total Requests served.\n"
+        "# TYPE app_requests_total counter\n"
+        'app_requests_total{tool="read_page"} 3\n'
+        'app_requests_total{tool="we\\"ird"} 1\n'
+        "# HELP app_queue_depth Calls waiting.\n"
+        "# TYPE app_queue_depth gauge\n"
+        "app_queue_depth 1.5\n"
+        "# HELP app_size Integer-valued gauge.\n"
+        "# TYPE app_size gauge\n"
+        "app_size 3\n"
+    )
+
+
+def test_label_mismatch_raises() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("app_total", "Total.", ("tool",))
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.inc(other="x")
+
+
+def test_duplicate_registration_raises() -> None:
+    registry = MetricsRegistry()
+    registry.gauge("app_gauge", "A gauge.")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("app_gauge", "A gauge.")
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    lag = registry.histogram("app_lag_seconds", "Loop lag.", buckets=(0.01, 0.1))
+
+    lag.observe(0.005)
+    lag.observe(0.01)  # bucket bounds are inclusive
+    lag.observe(0.5)
+
+    assert lag.count() == 3
+    assert registry.render() == (
+        "# HELP app_lag_seconds Loop lag.\n"
+        "# TYPE app_lag_seconds histogram\n"
+        'app_lag_seconds_bucket{le="0.01"} 2\n'
+        'app_lag_seconds_bucket{le="0.1"} 2\n'
+        'app_lag_seconds_bucket{le="+Inf"} 3\n'
+        "app_lag_seconds_sum 0.515\n"
+        "app_lag_seconds_count 3\n"
+    )
@@ -0,0 +1,47 @@
+"""Unit tests for procontext.offload."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+from procontext.config import ExecutorSettings
+from procontext.offload import Offloader
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+class TestOffloader:
+    async def test_default_runs_inline(self) -> None:
+        offloader = Offloader()
+        assert await offloader.run(10**9, _thread_name) == threading.current_thread().name
+
+    async def test_small_work_runs_inline(self) -> None:
+        offloader = Offloader(ExecutorSettings(kind="thread", min_chars=1000))
+        try:
+            assert await offloader.run(999, _thread_name) == threading.current_thread().name
+        finally:
+            offloader.close()
+
+    async def test_large_work_runs_in_thread(self) -> None:
+        offloader = Offloader(ExecutorSettings(kind="thread", min_chars=1000))
+        try:
+            assert (await offloader.run(1000, _thread_name)).startswith("procontext-offload")
+            assert (await offloader.run_pure(1000, _thread_name)).startswith("procontext-offload")
+        finally:
+            offloader.close()
+
+    async def test_inline_kind_never_offloads(self) -> None:
+        offloader = Offloader(ExecutorSettings(kind="inline", min_chars=0))
+        assert await offloader.run(10**9, _thread_name) == threading.current_thread().name
+
+    async def test_process_kind_runs_pure_work_in_another_process(self) -> None:
+        offloader = Offloader(ExecutorSettings(kind="process", max_workers=1, min_chars=0))
+        try:
+            assert await offloader.run_pure(1, os.getpid) != os.getpid()
+            # run() stays in-process even in process mode.
+            assert await offloader.run(1, os.getpid) == os.getpid()
+        finally:
+            offloader.close()
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import random
+
+import pytest
+
 from procontext.outline import (
     OutlineEntry,
+    OutlineIndex,
     build_compaction_note,
     compact_outline,
     format_outline,
@@ -11,6 +16,8 @@ from procontext.outline import (
     strip_empty_fences,
     trim_outline_to_range,
 )
+from procontext.parser import parse_outline
+from procontext.search_sections import section_headings
 
 # ---------------------------------------------------------------------------
 # parse_outline_entries
@@ -393,3 +400,155 @@ class TestBuildCompactionNote:
     def test_no_headings(self) -> None:
         note = build_compaction_note([], 100)
         assert "no headings" in note
+
+
+# ---------------------------------------------------------------------------
+# OutlineIndex
+# ---------------------------------------------------------------------------
+
+_OUTLINE_LINES = [
+    "# A",
+    "## B",
+    "### C",
+    "#### D",
+    "##### E",
+    "###### F",
+    "```",
+    "```python",
+    "~~~",
+    "````",
+    "#not a heading",
+    "  ## Indented",
+]
+
+
+def _random_page(seed: int, size: int = 3000) -> str:
+    """A Markdown page of *size* lines, about a third of them outline lines."""
+    rng = random.Random(seed)
+    lines = [
+        f"{rng.choice(_OUTLINE_LINES)} {rng.randint(0, 9)}"
+        if rng.random() < 0.35
+        else "text " * rng.randint(0, 12)
+        for _ in range(size)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _index(page: str) -> tuple[str, OutlineIndex]:
+    raw = parse_outline(page)
+    return raw, OutlineIndex.build(raw, page)
+
+
+def _expected_sections(page: str, raw: str) -> list[tuple[int, int, int]]:
+    """``(start, end_line, chars)`` per section, by brute force over the page lines."""
+    lines = page.splitlines(keepends=True)
+    headings = section_headings(parse_outline_entries(raw))
+    sections = []
+    for i, heading in enumerate(headings):
+        assert heading.depth is not None
+        end = len(lines)
+        for later in headings[i + 1 :]:
+            assert later.depth is not None
+            if later.depth <= heading.depth:
+                end = later.line_number - 1
+                break
+        chars = sum(len(line) for line in lines[heading.line_number - 1 : end])
+        sections.append((heading.line_number, end, chars))
+    return sections
+
+
+class TestOutlineIndex:
+    """The index must agree with the list-based functions on any outline."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_list_functions(self, seed: int) -> None:
+        raw, index = _index(_random_page(seed))
+        entries = strip_empty_fences(parse_outline_entries(raw))
+
+        assert list(index) == entries
+        assert index.format() == format_outline(entries)
+        assert index.headings() == section_headings(parse_outline_entries(raw))
+        for max_entries in (10, 50, 100, 1000):
+            compacted = index.compact(max_entries)
+            expected = compact_outline(entries, max_entries)
+            assert (None if compacted is None else list(compacted)) == expected
+        for first, last in ((1, 100), (500, 2500), (2900, 2900), (10**6, 10**7)):
+            assert list(index.trim(first, last)) == trim_outline_to_range(entries, first, last)
+        assert list(index.slice(5, 25)) == entries[5:25]
+
+    def test_compaction_after_trim(self) -> None:
+        raw, index = _index(_random_page(99, size=8000))
+        entries = strip_empty_fences(parse_outline_entries(raw))
+        trimmed = index.trim(2000, 6000).compact()
+        expected = compact_outline(trim_outline_to_range(entries, 2000, 6000))
+        assert (None if trimmed is None else list(trimmed)) == expected
+
+    def test_empty_outline(self) -> None:
+        index = OutlineIndex.build("", "no headings here")
+        assert len(index) == 0
+        assert index.format() == ""
+        assert index.compact() is index
+
+    def test_bytes_round_trip(self) -> None:
+        raw, index = _index(_random_page(7))
+        loaded = OutlineIndex.from_bytes(raw, index.to_bytes())
+        assert list(loaded) == list(index)
+        assert list(loaded.counts) == list(index.counts)
+        assert loaded.sections() == index.sections()
+
+    def test_from_bytes_rejects_other_outline(self) -> None:
+        data = OutlineIndex.build("1:# Title", "# Title").to_bytes()
+        with pytest.raises(ValueError):
+            OutlineIndex.from_bytes("1:# Other title", data)
+
+    @pytest.mark.parametrize("data", [b"", b"junk", b"POX1"])
+    def test_from_bytes_rejects_malformed(self, data: bytes) -> None:
+        with pytest.raises(ValueError):
+            OutlineIndex.from_bytes("1:# Title", data)
+
+    def test_from_bytes_rejects_truncated(self) -> None:
+        raw, index = _index(_random_page(3))
+        with pytest.raises(ValueError):
+            OutlineIndex.from_bytes(raw, index.to_bytes()[:-1])
+
+
+class TestOutlineIndexSections:
+    @pytest.mark.parametrize("seed", range(10))
+    @pytest.mark.parametrize("newline", ["\n", "\r\n", "\u2028"])
+    def test_matches_brute_force(self, seed: int, newline: str) -> None:
+        page = _random_page(seed, size=500).replace("\n", newline)
+        raw, index = _index(page)
+        actual = [(h.line_number, end, chars) for h, end, chars in index.sections()]
+        assert actual == _expected_sections(page, raw)
+
+    def test_nested_sections(self) -> None:
+        page = "# A\nintro\n## B\nbody\n### C\n## D\n# E\n"
+        _, index = _index(page)
+        sections = {h.text: (h.line_number, end) for h, end, _ in index.sections()}
+        assert sections == {
+            "# A": (1, 6),
+            "## B": (3, 5),
+            "### C": (5, 5),
+            "## D": (6, 6),
+            "# E": (7, 7),
+        }
+
+    def test_fenced_headings_are_not_sections(self) -> None:
+        page = "# A\n```\n# not a section\n```\ntext\n"
+        _, index = _index(page)
+        assert [(h.text, end) for h, end, _ in index.sections()] == [("# A", 5)]
+
+    def test_format_with_section_sizes(self) -> None:
+        page = "# A\n" + "x" * 395 + "\n## B\n```\n# code\n```\n"
+        _, index = _index(page)
+        assert index.format(section_sizes=True) == (
+            "1:# A [6 lines, ~105 tokens]\n3:## B [4 lines, ~5 tokens]\n4:```\n5:# code\n6:```"
+        )
+        assert index.format() == "1:# A\n3:## B\n4:```\n5:# code\n6:```"
+
+    def test_slices_keep_section_sizes(self) -> None:
+        raw, index = _index(_random_page(5))
+        sections = index.sections()
+        assert index.trim(1000, 2000).sections() == [
+            s for s in sections if 1000 <= s[0].line_number <= 2000
+        ]
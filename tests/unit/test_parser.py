@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from procontext.parser import parse_outline
+import random
+
+import pytest
+
+from procontext.parser import _parse_outline_lines, parse_outline
 
 
 class TestHeadingDetection:
@@ -486,3 +490,65 @@ class TestEdgeCases:
         result = parse_outline(content)
         assert "# Title" in result
         assert result.startswith("1:")
+
+
+_PREFIXES = ["", " ", "   ", "    ", "\t", "\xa0", "\u3000", ">", "> ", ">>", " > \t", "\x1f"]
+_BODIES = [
+    "#",
+    "# ",
+    "## Title",
+    "###### Six",
+    "####### Seven",
+    "#NoSpace",
+    "```",
+    "````python",
+    "~~~",
+    "~~ two",
+    "``",
+    "text # trailing hash",
+    "Use `code` here",
+    "plain prose line",
+    "",
+]
+_SUFFIXES = ["", " ", "\t", "  #", "\xa0"]
+
+
+_PROSE = "Ordinary documentation prose, long enough that most lines are skipped."
+
+
+def _corpus_lines(rng: random.Random, count: int, *, marked: float = 0.1) -> list[str]:
+    """Random lines, a *marked* fraction of them built from heading/fence fragments."""
+    return [
+        rng.choice(_PREFIXES) + rng.choice(_BODIES) + rng.choice(_SUFFIXES)
+        if rng.random() < marked
+        else _PROSE
+        for _ in range(count)
+    ]
+
+
+class TestWholeBufferParser:
+    """parse_outline must match the line-by-line parser on any content."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    @pytest.mark.parametrize("marked", [0.1, 0.9])
+    def test_matches_line_by_line_parser(self, seed: int, newline: str, marked: float) -> None:
+        # 10% marked lines takes the skipping path; 90% is dense enough to fall back.
+        rng = random.Random(seed)
+        content = newline.join(_corpus_lines(rng, 2_000, marked=marked))
+        if seed % 2:
+            content += newline
+        if seed % 5 == 0:
+            content = "\ufeff" + content
+        expected = _parse_outline_lines(content.removeprefix("\ufeff"))
+        assert expected  # the corpus does contain headings and fences
+        assert parse_outline(content) == expected
+
+    @pytest.mark.parametrize(
+        "separator", ["\r", "\x0b", "\x0c", "\x1c", "\x85", "\u2028", "\u2029"]
+    )
+    def test_other_line_separators_match_line_by_line_parser(self, separator: str) -> None:
+        rng = random.Random(separator)
+        lines = _corpus_lines(rng, 500)
+        content = "\n".join(lines[:250]) + separator + "\r\n".join(lines[250:])
+        assert parse_outline(content) == _parse_outline_lines(content)
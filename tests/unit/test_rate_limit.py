@@ -0,0 +1,235 @@
+"""Unit tests for procontext.rate_limit."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from procontext.config import ServerSettings, Settings
+from procontext.rate_limit import FairScheduler, RateLimiter, RateLimitMiddleware
+from procontext.transport import MCPSecurityMiddleware, run_http_server
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _ok_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _client(app: ASGIApp, remote: str = "10.0.0.1") -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, client=(remote, 5000)),
+        base_url="http://localhost",
+    )
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ---------------------------------------------------------------------------
+# Token buckets
+# ---------------------------------------------------------------------------
+
+
+def test_bucket_allows_burst_then_reports_wait() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2.0, burst=3, clock=clock)
+
+    assert [limiter.check("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.check("a") == 0.5  # one token refills in 1/rate seconds
+
+    clock.now += 0.5
+    assert limiter.check("a") == 0.0
+
+
+def test_buckets_are_per_client() -> None:
+    limiter = RateLimiter(rate=1.0, burst=1, clock=FakeClock())
+
+    assert limiter.check("a") == 0.0
+    assert limiter.check("a") > 0
+    assert limiter.check("b") == 0.0
+
+
+async def test_middleware_returns_429_with_retry_after() -> None:
+    clock = FakeClock()
+    app = RateLimitMiddleware(
+        _ok_app,
+        settings=ServerSettings(rate_limit_per_second=0.5, rate_limit_burst=1),
+        clock=clock,
+    )
+    async with _client(app) as client:
+        assert (await client.post("/mcp")).status_code == 200
+        limited = await client.post("/mcp")
+        # GET carries the SSE stream and is never limited.
+        assert (await client.get("/mcp")).status_code == 200
+
+    assert limited.status_code == 429
+    assert limited.headers["retry-after"] == "2"
+
+
+async def test_middleware_keys_by_remote_address() -> None:
+    app = RateLimitMiddleware(
+        _ok_app,
+        settings=ServerSettings(rate_limit_per_second=1, rate_limit_burst=1),
+        clock=FakeClock(),
+    )
+    async with _client(app, "10.0.0.1") as first, _client(app, "10.0.0.2") as second:
+        assert (await first.post("/mcp")).status_code == 200
+        assert (await first.post("/mcp")).status_code == 429
+        assert (await second.post("/mcp")).status_code == 200
+
+
+def _secured(settings: ServerSettings, auth_key: str = "secret") -> MCPSecurityMiddleware:
+    limited = RateLimitMiddleware(_ok_app, settings=settings, clock=FakeClock())
+    return MCPSecurityMiddleware(limited, auth_enabled=settings.auth_enabled, auth_key=auth_key)
+
+
+async def test_middleware_keys_by_verified_auth_key_when_configured() -> None:
+    app = _secured(
+        ServerSettings(
+            auth_enabled=True,
+            rate_limit_per_second=1,
+            rate_limit_burst=1,
+            rate_limit_key="auth_key",
+        )
+    )
+    valid = {"Authorization": "Bearer secret"}
+    async with _client(app, "10.0.0.1") as first, _client(app, "10.0.0.2") as second:
+        assert (await first.post("/mcp", headers=valid)).status_code == 200
+        # Same key from another address — same budget.
+        assert (await second.post("/mcp", headers=valid)).status_code == 429
+        # Rejected before the limiter, so it consumes no bucket.
+        assert (await first.post("/mcp", headers={"Authorization": "Bearer x"})).status_code == 401
+
+
+async def test_middleware_ignores_unverified_auth_headers() -> None:
+    """Without auth_enabled, any Authorization header would buy a fresh bucket."""
+    app = _secured(
+        ServerSettings(rate_limit_per_second=1, rate_limit_burst=1, rate_limit_key="auth_key")
+    )
+    async with _client(app) as client:
+        assert (await client.post("/mcp", headers={"Authorization": "a"})).status_code == 200
+        assert (await client.post("/mcp", headers={"Authorization": "b"})).status_code == 429
+
+
+def test_limiter_forgets_least_recently_seen_clients() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1.0, burst=1, clock=clock, max_clients=3)
+
+    for client in ("a", "b", "c"):
+        assert limiter.check(client) == 0.0
+    assert limiter.check("a") > 0  # "a" is now the most recently seen
+    assert limiter.check("d") == 0.0  # No bucket is full: "b" is evicted
+    assert len(limiter) == 3
+    assert limiter.check("a") > 0 and limiter.check("c") > 0
+    assert limiter.check("b") == 0.0  # Forgotten, so a fresh bucket
+
+
+# ---------------------------------------------------------------------------
+# Fair scheduling
+# ---------------------------------------------------------------------------
+
+
+async def test_fair_scheduler_serves_clients_round_robin() -> None:
+    scheduler = FairScheduler(max_in_flight=1, max_queued_per_client=10)
+    served: list[str] = []
+
+    async def request(client: str) -> None:
+        assert await scheduler.acquire(client)
+        served.append(client)
+        await asyncio.sleep(0)
+        scheduler.release()
+
+    assert await scheduler.acquire("holder")
+    # A noisy client queues a burst before a quiet client's single request.
+    tasks = [asyncio.create_task(request("noisy")) for _ in range(3)]
+    await _settle()
+    tasks.append(asyncio.create_task(request("quiet")))
+    await _settle()
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    assert served == ["noisy", "quiet", "noisy", "noisy"]
+
+
+async def test_fair_scheduler_rejects_when_client_queue_full() -> None:
+    scheduler = FairScheduler(max_in_flight=1, max_queued_per_client=1)
+    assert await scheduler.acquire("a")
+    waiter = asyncio.create_task(scheduler.acquire("a"))
+    await _settle()
+
+    assert await scheduler.acquire("a") is False
+
+    scheduler.release()
+    assert await waiter is True
+    scheduler.release()
+
+
+async def test_fair_scheduler_cancelled_waiter_leaves_queue() -> None:
+    scheduler = FairScheduler(max_in_flight=1, max_queued_per_client=1)
+    assert await scheduler.acquire("a")
+    waiter = asyncio.create_task(scheduler.acquire("b"))
+    await _settle()
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    scheduler.release()
+    # The slot is free again rather than handed to the cancelled waiter.
+    assert await asyncio.wait_for(scheduler.acquire("c"), timeout=1) is True
+
+
+async def test_middleware_returns_429_when_fair_queue_full() -> None:
+    release = asyncio.Event()
+
+    async def slow_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await release.wait()
+        await _ok_app(scope, receive, send)
+
+    app = RateLimitMiddleware(
+        slow_app,
+        settings=ServerSettings(fair_max_in_flight=1, fair_max_queued_per_client=0),
+    )
+    async with _client(app) as client:
+        first = asyncio.create_task(client.post("/mcp"))
+        await _settle()
+        rejected = await client.post("/mcp")
+        release.set()
+        assert (await first).status_code == 200
+
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "1"
+
+
+# ---------------------------------------------------------------------------
+# Wiring
+# ---------------------------------------------------------------------------
+
+
+def test_run_http_server_installs_rate_limiting_inside_security_middleware() -> None:
+    fake_mcp = MagicMock()
+    fake_http_app = MagicMock()
+    fake_mcp.streamable_http_app.return_value = fake_http_app
+    settings = Settings(server={"transport": "http", "rate_limit_per_second": 5})
+
+    with patch("procontext.transport.uvicorn.run") as mock_uvicorn_run:
+        run_http_server(fake_mcp, settings)
+
+    secured_app = mock_uvicorn_run.call_args.args[0]
+    assert isinstance(secured_app, MCPSecurityMiddleware)
+    assert isinstance(secured_app.app, RateLimitMiddleware)
+    assert secured_app.app.app is fake_http_app
@@ -0,0 +1,160 @@
+"""Unit tests for procontext.regex_sandbox."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from procontext import regex_sandbox
+from procontext.config import SearchSettings
+from procontext.errors import ErrorCode, ProContextError
+from procontext.regex_sandbox import RegexSandbox
+from procontext.search import build_matcher
+from procontext.search_cursor import SearchCursor
+from procontext.search_multi import build_multi_matcher
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_CONTENT = "\n".join(f"line {i} {'hit' if i % 3 == 0 else 'miss'}" for i in range(1, 101))
+# Exponential backtracking: each extra "a" doubles the work.
+_PATHOLOGICAL = ("(a+)+$", "a" * 40 + "!")
+
+
+@pytest.fixture()
+def sandbox() -> Iterator[RegexSandbox]:
+    sandbox = RegexSandbox(SearchSettings(regex_timeout_seconds=1.0, regex_workers=1))
+    yield sandbox
+    sandbox.close()
+
+
+def _key(query: str, content_hash: str = "hash") -> tuple[str, str, str, str, bool]:
+    return (content_hash, query, "regex", "smart", False)
+
+
+class TestRegexSandbox:
+    async def test_pages_match_in_process_cursor(self, sandbox: RegexSandbox) -> None:
+        matcher = build_matcher(r"hit|line 1\b", mode="regex")
+        cursor = SearchCursor(_CONTENT, matcher)
+        for offset, max_results in [(1, 5), (20, 5), (90, 50)]:
+            result, total_lines, total_matches = await sandbox.page(
+                _key(matcher.pattern), _CONTENT, matcher, offset=offset, max_results=max_results
+            )
+            assert result == cursor.page(offset=offset, max_results=max_results)
+            assert total_lines == cursor.total_lines
+            assert total_matches == cursor.total_matches
+
+    async def test_section_counts_match_in_process_cursor(self, sandbox: RegexSandbox) -> None:
+        matcher = build_matcher(r"hit|line 1\b", mode="regex")
+        cursor = SearchCursor(_CONTENT, matcher)
+        counts, total_lines, total_matches = await sandbox.section_counts(
+            _key(matcher.pattern), _CONTENT, matcher, [10, 50]
+        )
+        assert counts == cursor.section_counts([10, 50])
+        assert (total_lines, total_matches) == (cursor.total_lines, cursor.total_matches)
+
+    async def test_separately_scanned_queries(self, sandbox: RegexSandbox) -> None:
+        queries = [r"(h)it", r"(\d)\1"]
+        matcher, per_query = build_multi_matcher(queries, mode="regex")
+        assert matcher is None
+        cursor = SearchCursor(_CONTENT, matcher, per_query)
+        key = ("hash", tuple(queries), "regex", "smart", False)
+        result, total_lines, total_matches = await sandbox.page(
+            key, _CONTENT, matcher, offset=1, max_results=100, per_query=per_query
+        )
+        assert result == cursor.page(offset=1, max_results=100)
+        assert (total_lines, total_matches) == (cursor.total_lines, cursor.total_matches)
+        repeated = [m.line_number for m in result.matches if 2 in m.queries]
+        assert repeated == [11, 22, 33, 44, 55, 66, 77, 88, 99, 100]
+
+    async def test_pathological_pattern_times_out(self, sandbox: RegexSandbox) -> None:
+        pattern, content = _PATHOLOGICAL
+        matcher = build_matcher(pattern, mode="regex")
+        started = time.monotonic()
+        with pytest.raises(ProContextError) as exc_info:
+            await sandbox.page(_key(pattern), content, matcher, offset=1, max_results=20)
+        assert time.monotonic() - started < 10
+        assert exc_info.value.code == ErrorCode.INVALID_INPUT
+        assert "time budget" in exc_info.value.message
+
+    async def test_worker_is_replaced_after_timeout(self, sandbox: RegexSandbox) -> None:
+        pattern, content = _PATHOLOGICAL
+        with pytest.raises(ProContextError):
+            await sandbox.page(
+                _key(pattern),
+                content,
+                build_matcher(pattern, mode="regex"),
+                offset=1,
+                max_results=20,
+            )
+
+        matcher = build_matcher("hit", mode="regex")
+        result, _, total_matches = await sandbox.page(
+            _key("hit"), _CONTENT, matcher, offset=1, max_results=100
+        )
+        assert len(result.matches) == 33
+        assert total_matches == 33
+
+    async def test_timed_out_worker_is_reaped_off_the_event_loop(
+        self, sandbox: RegexSandbox, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        kill_threads: list[threading.Thread] = []
+        kill = regex_sandbox._kill  # pyright: ignore[reportPrivateUsage]
+
+        def recording_kill(process: object) -> None:
+            kill_threads.append(threading.current_thread())
+            kill(process)  # pyright: ignore[reportArgumentType]
+
+        monkeypatch.setattr(regex_sandbox, "_kill", recording_kill)
+        pattern, content = _PATHOLOGICAL
+        with pytest.raises(ProContextError):
+            await sandbox.page(
+                _key(pattern),
+                content,
+                build_matcher(pattern, mode="regex"),
+                offset=1,
+                max_results=20,
+            )
+        await asyncio.gather(*sandbox._reapers)  # pyright: ignore[reportPrivateUsage]
+        assert kill_threads
+        assert threading.main_thread() not in kill_threads
+
+    async def test_cancelled_search_discards_worker(self, sandbox: RegexSandbox) -> None:
+        pattern, content = _PATHOLOGICAL
+        worker = sandbox._workers[0]  # pyright: ignore[reportPrivateUsage]
+        task = asyncio.create_task(
+            sandbox.page(
+                _key(pattern),
+                content,
+                build_matcher(pattern, mode="regex"),
+                offset=1,
+                max_results=20,
+            )
+        )
+        await asyncio.sleep(0.3)
+        process, conn = worker._process, worker._conn  # pyright: ignore[reportPrivateUsage]
+        assert process is not None and conn is not None
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # A fresh worker serves the next search while the old one is reaped.
+        matcher = build_matcher("hit", mode="regex")
+        result, _, _ = await sandbox.page(_key("hit"), _CONTENT, matcher, offset=1, max_results=100)
+        assert len(result.matches) == 33
+
+        await asyncio.gather(*sandbox._reapers)  # pyright: ignore[reportPrivateUsage]
+        assert not process.is_alive()
+        assert conn.closed
+
+    async def test_different_content_hash_is_a_new_cursor(self, sandbox: RegexSandbox) -> None:
+        matcher = build_matcher("hit", mode="regex")
+        await sandbox.page(_key("hit", "v1"), _CONTENT, matcher, offset=1, max_results=5)
+        result, _, _ = await sandbox.page(
+            _key("hit", "v2"), "no match here", matcher, offset=1, max_results=5
+        )
+        assert result.matches == []
@@ -5,12 +5,20 @@ from __future__ import annotations
 import hashlib
 import json
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from unittest.mock import patch
 
-from procontext.registry import load_registry, save_registry_to_disk
+import pytest
+
+from procontext.models.registry import RegistryEntry
+from procontext.registry import load_registry, load_registry_snapshot, save_registry_to_disk
+from procontext.registry.entries import CompactEntries
+from procontext.registry.local import _read_state, build_snapshot
+from procontext.registry.snapshot import load_snapshot, snapshot_key, snapshot_path
 from procontext.registry.storage import (
+    MetadataValidators,
     _fsync_directory,
+    read_metadata_validators,
     registry_check_is_due,
     write_last_checked_at,
 )
@@ -197,6 +205,182 @@ def test_save_registry_to_disk_writes_registry_pair(tmp_path: Path) -> None:
     assert "last_checked_at" in state_data
 
 
+def test_save_registry_to_disk_renames_registry_file(tmp_path: Path) -> None:
+    registry_bytes = b'[{"id": "streamed", "name": "Streamed", "llms_txt_url": "https://s.dev/"}]'
+    registry_dir = tmp_path / "registry"
+    registry_dir.mkdir()
+    download = registry_dir / "known-libraries.abc.download"
+    download.write_bytes(registry_bytes)
+
+    save_registry_to_disk(
+        registry_file=download,
+        version="2026-02-26",
+        checksum=_sha256_prefixed(registry_bytes),
+        registry_path=registry_dir / "known-libraries.json",
+        state_path=registry_dir / "registry-state.json",
+    )
+
+    assert not download.exists()
+    assert (registry_dir / "known-libraries.json").read_bytes() == registry_bytes
+    assert load_registry(
+        registry_dir / "known-libraries.json", registry_dir / "registry-state.json"
+    )
+
+
+def test_save_registry_to_disk_needs_exactly_one_source(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="exactly one"):
+        save_registry_to_disk(
+            version="v1",
+            checksum="sha256:abc",
+            registry_path=tmp_path / "known-libraries.json",
+            state_path=tmp_path / "registry-state.json",
+        )
+
+
+# ---------------------------------------------------------------------------
+# load_registry_snapshot
+# ---------------------------------------------------------------------------
+
+
+_SNAPSHOT_PAYLOAD = [
+    {
+        "id": "snaplib",
+        "name": "SnapLib",
+        "packages": [{"ecosystem": "pypi", "package_names": ["snaplib-core"]}],
+        "aliases": ["snap"],
+        "llms_txt_url": "https://docs.snaplib.dev/llms.txt",
+    },
+    {
+        "id": "otherlib",
+        "name": "OtherLib",
+        "llms_txt_url": "https://other.example.com/llms.txt",
+    },
+]
+
+
+def _save_pair(
+    tmp_path: Path, payload: list[dict], version: str, **kwargs: Any
+) -> tuple[Path, Path]:
+    registry_bytes = json.dumps(payload).encode("utf-8")
+    registry_path = tmp_path / "known-libraries.json"
+    state_path = tmp_path / "registry-state.json"
+    save_registry_to_disk(
+        registry_bytes=registry_bytes,
+        version=version,
+        checksum=_sha256_prefixed(registry_bytes),
+        registry_path=registry_path,
+        state_path=state_path,
+        **kwargs,
+    )
+    return registry_path, state_path
+
+
+def test_load_registry_snapshot_writes_snapshot_on_first_load(tmp_path: Path) -> None:
+    registry_path, state_path = _save_pair(tmp_path, _SNAPSHOT_PAYLOAD, "v1")
+    assert not snapshot_path(state_path).exists()
+
+    built = load_registry_snapshot(registry_path, state_path)
+    assert built is not None
+    assert snapshot_path(state_path).is_file()
+
+    loaded = load_registry_snapshot(registry_path, state_path)
+    assert loaded is not None
+    assert isinstance(loaded.indexes.by_id, CompactEntries)
+    assert loaded.version == built.version == "v1"
+    assert loaded.domains == built.domains == {"snaplib.dev", "example.com"}
+    assert loaded.indexes.by_package == {"snaplib-core": "snaplib"}
+    assert loaded.indexes.by_alias == {"snap": "snaplib"}
+    assert sorted(loaded.indexes.by_id) == ["otherlib", "snaplib"]
+    assert loaded.indexes.by_id["snaplib"] == built.indexes.by_id["snaplib"]
+    assert loaded.indexes.fuzzy.extract("snaplb", limit=5, score_cutoff=70) == (
+        built.indexes.fuzzy.extract("snaplb", limit=5, score_cutoff=70)
+    )
+    assert loaded.indexes.keywords.search("snaplib", limit=5) == (
+        built.indexes.keywords.search("snaplib", limit=5)
+    )
+
+
+def test_load_registry_snapshot_builds_entries_on_lookup(tmp_path: Path) -> None:
+    registry_path, state_path = _save_pair(
+        tmp_path,
+        _SNAPSHOT_PAYLOAD,
+        "v1",
+        snapshot=build_snapshot([RegistryEntry(**raw) for raw in _SNAPSHOT_PAYLOAD], "v1"),
+    )
+
+    with patch("procontext.registry.local.RegistryEntry") as entry_cls:
+        loaded = load_registry_snapshot(registry_path, state_path)
+    assert loaded is not None
+    entry_cls.assert_not_called()  # The JSON was never read
+
+    by_id = loaded.indexes.by_id
+    assert "snaplib" in by_id
+    assert by_id["snaplib"] == RegistryEntry(**_SNAPSHOT_PAYLOAD[0])
+    assert by_id["snaplib"].packages[0].package_names == ["snaplib-core"]
+    # Nothing is kept: each lookup builds a fresh model from the record.
+    assert by_id["snaplib"] is not by_id["snaplib"]
+
+
+def test_load_registry_snapshot_ignores_stale_snapshot(tmp_path: Path) -> None:
+    registry_path, state_path = _save_pair(tmp_path, _SNAPSHOT_PAYLOAD, "v1")
+    assert load_registry_snapshot(registry_path, state_path) is not None
+
+    # A new registry saved without a snapshot leaves the old one behind.
+    _save_pair(tmp_path, _SNAPSHOT_PAYLOAD[1:], "v2")
+    loaded = load_registry_snapshot(registry_path, state_path)
+    assert loaded is not None
+    assert loaded.version == "v2"
+    assert list(loaded.indexes.by_id) == ["otherlib"]
+
+    reloaded = load_registry_snapshot(registry_path, state_path)
+    assert reloaded is not None
+    assert isinstance(reloaded.indexes.by_id, CompactEntries)
+    assert reloaded.version == "v2"
+
+
+def test_load_registry_snapshot_rebuilds_corrupt_snapshot(tmp_path: Path) -> None:
+    registry_path, state_path = _save_pair(tmp_path, _SNAPSHOT_PAYLOAD, "v1")
+    assert load_registry_snapshot(registry_path, state_path) is not None
+    path = snapshot_path(state_path)
+    path.write_bytes(path.read_bytes()[:-40])
+
+    loaded = load_registry_snapshot(registry_path, state_path)
+    assert loaded is not None
+    assert sorted(loaded.indexes.by_id) == ["otherlib", "snaplib"]
+    assert load_snapshot(path, snapshot_key(_read_state(state_path)[1], registry_path))
+
+
+def test_load_registry_snapshot_returns_none_without_valid_pair(tmp_path: Path) -> None:
+    registry_path, state_path = _save_pair(tmp_path, _SNAPSHOT_PAYLOAD, "v1")
+    registry_path.write_text("[]", encoding="utf-8")  # checksum no longer matches
+
+    assert load_registry_snapshot(registry_path, state_path) is None
+    assert load_registry_snapshot(None, None) is None
+    assert not snapshot_path(state_path).exists()
+
+
+def test_load_snapshot_rejects_other_python(tmp_path: Path) -> None:
+    registry_path, state_path = _save_pair(tmp_path, _SNAPSHOT_PAYLOAD, "v1")
+    assert load_registry_snapshot(registry_path, state_path) is not None
+    path = snapshot_path(state_path)
+    path.write_bytes(path.read_bytes().replace(b"cpython", b"pypy", 1))
+
+    with pytest.raises(ValueError, match="Python version"):
+        load_snapshot(path, snapshot_key(_read_state(state_path)[1], registry_path))
+
+
+def test_save_registry_to_disk_writes_snapshot(tmp_path: Path) -> None:
+    entries = [RegistryEntry(**raw) for raw in _SNAPSHOT_PAYLOAD]
+    registry_path, state_path = _save_pair(
+        tmp_path, _SNAPSHOT_PAYLOAD, "v1", snapshot=build_snapshot(entries, "v1")
+    )
+
+    key = snapshot_key(_read_state(state_path)[1], registry_path)
+    loaded = load_snapshot(snapshot_path(state_path), key)
+    assert loaded.version == "v1"
+    assert dict(loaded.indexes.by_id) == {entry.id: entry for entry in entries}
+
+
 # ---------------------------------------------------------------------------
 # registry_check_is_due
 # ---------------------------------------------------------------------------
@@ -274,6 +458,55 @@ class TestWriteLastCheckedAt:
         """A missing state file is silently ignored (non-fatal)."""
         write_last_checked_at(tmp_path / "nonexistent.json")
 
+    def test_replaces_metadata_validators_when_given(self, tmp_path: Path) -> None:
+        state_path = tmp_path / "registry-state.json"
+        state_path.write_text(
+            json.dumps({"version": "v1", "metadata_etag": '"a"', "metadata_last_modified": "x"})
+        )
+
+        write_last_checked_at(state_path)
+        assert read_metadata_validators(state_path, "v1") == MetadataValidators('"a"', "x")
+
+        write_last_checked_at(state_path, metadata_validators=MetadataValidators(etag='W/"b"'))
+        assert read_metadata_validators(state_path, "v1") == MetadataValidators(etag='W/"b"')
+
+
+# ---------------------------------------------------------------------------
+# read_metadata_validators
+# ---------------------------------------------------------------------------
+
+
+class TestMetadataValidators:
+    def test_saved_with_the_pair(self, tmp_path: Path) -> None:
+        validators = MetadataValidators(
+            etag='"abc"',
+            last_modified="Mon, 19 Oct 2026 08:00:00 GMT",
+            url="https://mirror.example/registry_metadata.json",
+        )
+        _, state_path = _save_pair(
+            tmp_path, _SNAPSHOT_PAYLOAD, "v1", metadata_validators=validators
+        )
+        assert read_metadata_validators(state_path, "v1") == validators
+        assert validators.request_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 19 Oct 2026 08:00:00 GMT",
+        }
+
+    def test_ignored_for_another_version(self, tmp_path: Path) -> None:
+        """Validators stored by another server for a newer version say nothing about ours."""
+        _, state_path = _save_pair(
+            tmp_path, _SNAPSHOT_PAYLOAD, "v2", metadata_validators=MetadataValidators(etag='"v2"')
+        )
+        assert read_metadata_validators(state_path, "v1") == MetadataValidators()
+        assert MetadataValidators().request_headers() == {}
+
+    def test_missing_or_corrupt_state_file(self, tmp_path: Path) -> None:
+        state_path = tmp_path / "registry-state.json"
+        assert read_metadata_validators(state_path, "v1") == MetadataValidators()
+        state_path.write_text("[]")
+        assert read_metadata_validators(state_path, "v1") == MetadataValidators()
+        assert read_metadata_validators(None, "v1") == MetadataValidators()
+
 
 # ---------------------------------------------------------------------------
 # _fsync_directory platform guard
@@ -0,0 +1,179 @@
+"""Tests for registry/delta.py and delta patching of the registry indexes."""
+
+from __future__ import annotations
+
+import json
+import marshal
+
+import pytest
+
+from procontext.models.registry import RegistryEntry
+from procontext.registry.delta import apply_delta, is_touched, iter_json_array, make_delta
+from procontext.registry.entries import CompactEntries
+from procontext.registry.local import build_indexes, patch_indexes
+
+
+def _entry(library_id: str, *, names: list[str] | None = None, description: str = "") -> dict:
+    return {
+        "id": library_id,
+        "name": library_id.title(),
+        "description": description,
+        "packages": [{"ecosystem": "pypi", "package_names": names or [library_id]}],
+        "aliases": [f"{library_id}-alias"],
+        "llms_txt_url": f"https://docs.{library_id}.dev/llms.txt",
+    }
+
+
+def _registry_text(entries: list[dict]) -> str:
+    return json.dumps(entries, indent=2)
+
+
+def _touched_ids(text: str, written: list[tuple[int, int]]) -> set[str]:
+    return {
+        element["id"]
+        for element, start, end in iter_json_array(text)
+        if is_touched(start, end, written)
+    }
+
+
+OLD = [_entry(name) for name in ("alpha", "bravo", "charlie", "delta", "echo")]
+
+
+class TestIterJsonArray:
+    def test_matches_json_loads(self) -> None:
+        text = ' \n[ {"a": [1, 2]} ,\n"x", 3 , null ]\n '
+        assert [element for element, _, _ in iter_json_array(text)] == json.loads(text)
+
+    def test_offsets_span_each_element(self) -> None:
+        text = '[ {"a": 1},"x" ]'
+        assert [text[start:end] for _, start, end in iter_json_array(text)] == ['{"a": 1}', '"x"']
+
+    def test_empty_array(self) -> None:
+        assert list(iter_json_array(" [ ] ")) == []
+
+    @pytest.mark.parametrize("text", ['{"a": 1}', "[1 2]", "[1,]", "[1] x", "[1"])
+    def test_rejects_invalid(self, text: str) -> None:
+        with pytest.raises(ValueError):
+            list(iter_json_array(text))
+
+
+class TestMakeAndApplyDelta:
+    @pytest.mark.parametrize(
+        "new",
+        [
+            OLD,
+            [*OLD[:2], _entry("charlie", description="changed"), *OLD[3:]],
+            [_entry("aardvark"), *OLD],
+            [*OLD, _entry("foxtrot")],
+            [OLD[0], *OLD[2:]],
+            OLD[1:-1],
+            [],
+            [OLD[4], *OLD[1:4], OLD[0]],
+        ],
+        ids=["same", "modified", "prepended", "appended", "removed", "ends", "empty", "swapped"],
+    )
+    def test_round_trip(self, new: list[dict]) -> None:
+        old_text, new_text = _registry_text(OLD), _registry_text(new)
+        delta = make_delta(old_text, new_text, from_version="v1", to_version="v2")
+        patched, _ = apply_delta(old_text, delta, from_version="v1", to_version="v2")
+        assert patched == new_text
+
+    def test_single_change_touches_little_and_costs_one_entry(self) -> None:
+        new = [*OLD[:2], _entry("charlie", description="changed"), *OLD[3:]]
+        old_text, new_text = _registry_text(OLD), _registry_text(new)
+        delta = make_delta(old_text, new_text, from_version="v1", to_version="v2")
+        _, written = apply_delta(old_text, delta, from_version="v1", to_version="v2")
+
+        assert len(delta["edits"]) == 1
+        assert len(json.dumps(delta)) < len(new_text) / 2
+        # The edited entry and, conservatively, the one right after it.
+        assert _touched_ids(new_text, written) == {"charlie", "delta"}
+
+    def test_no_edits_touch_nothing(self) -> None:
+        text = _registry_text(OLD)
+        delta = make_delta(text, text, from_version="v1", to_version="v2")
+        assert delta["edits"] == []
+        assert not _touched_ids(
+            text, apply_delta(text, delta, from_version="v1", to_version="v2")[1]
+        )
+
+    def test_rejects_other_versions(self) -> None:
+        text = _registry_text(OLD)
+        delta = make_delta(text, text, from_version="v1", to_version="v2")
+        with pytest.raises(ValueError, match="not a patch from v0 to v2"):
+            apply_delta(text, delta, from_version="v0", to_version="v2")
+
+    @pytest.mark.parametrize(
+        "edits",
+        [
+            None,
+            [[0, 1]],
+            [[2, 1, ""]],
+            [[5, 6, ""], [0, 1, ""]],
+            [["0", 1, ""]],
+            [[0, 10**9, ""]],
+        ],
+    )
+    def test_rejects_malformed_edits(self, edits: object) -> None:
+        delta = {"from_version": "v1", "to_version": "v2", "edits": edits}
+        with pytest.raises(ValueError):
+            apply_delta(_registry_text(OLD), delta, from_version="v1", to_version="v2")
+
+
+class TestIsTouched:
+    @pytest.mark.parametrize(
+        ("start", "end", "touched"),
+        [(0, 5, False), (5, 10, False), (9, 12, True), (12, 20, True), (21, 30, False)],
+    )
+    def test_overlap_and_adjacency(self, start: int, end: int, touched: bool) -> None:
+        assert is_touched(start, end, [(11, 12), (20, 20)]) is touched
+
+
+class TestPatchIndexes:
+    def _patch(self, old: list[dict], new: list[dict], compact: bool):
+        previous = build_indexes([RegistryEntry(**raw) for raw in old])
+        if not compact:
+            previous.by_id = dict(previous.by_id)
+        old_text, new_text = _registry_text(old), _registry_text(new)
+        delta = make_delta(old_text, new_text, from_version="v1", to_version="v2")
+        _, written = apply_delta(old_text, delta, from_version="v1", to_version="v2")
+        raw_entries, changed = [], {}
+        for raw, start, end in iter_json_array(new_text):
+            raw_entries.append(raw)
+            if is_touched(start, end, written):
+                changed[raw["id"]] = RegistryEntry(**raw)
+        return previous, patch_indexes(previous, raw_entries, changed)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    @pytest.mark.parametrize(
+        "new",
+        [
+            [*OLD[:2], _entry("charlie", names=["charlie", "charlie-extra"]), *OLD[3:]],
+            [_entry("aardvark"), *OLD[1:], _entry("zulu")],
+            [OLD[0], OLD[4]],
+        ],
+        ids=["modified", "added-removed", "removed"],
+    )
+    def test_matches_build_indexes(self, new: list[dict], compact: bool) -> None:
+        previous, patched = self._patch(OLD, new, compact)
+        rebuilt = build_indexes([RegistryEntry(**raw) for raw in new])
+
+        assert patched.by_package == rebuilt.by_package
+        assert patched.by_alias == rebuilt.by_alias
+        assert dict(patched.by_id) == dict(rebuilt.by_id)
+        assert list(patched.by_id) == list(rebuilt.by_id)
+        assert marshal.loads(patched.fuzzy.to_bytes()) == marshal.loads(rebuilt.fuzzy.to_bytes())
+        assert marshal.loads(patched.keywords.to_bytes()) == marshal.loads(
+            rebuilt.keywords.to_bytes()
+        )
+        assert isinstance(patched.by_id, CompactEntries)
+        # The indexes being served until the swap are left as they were.
+        assert list(previous.by_id) == [raw["id"] for raw in OLD]
+
+    def test_unchanged_entries_are_shared(self) -> None:
+        new = [*OLD[:2], _entry("charlie", description="changed"), *OLD[3:]]
+        previous, patched = self._patch(OLD, new, compact=True)
+        assert isinstance(previous.by_id, CompactEntries)
+        assert isinstance(patched.by_id, CompactEntries)
+        assert patched.by_id.blobs["alpha"] is previous.by_id.blobs["alpha"]
+        assert patched.by_id.blobs["charlie"] is not previous.by_id.blobs["charlie"]
@@ -0,0 +1,105 @@
+"""Tests for registry/entries.py, the compact store behind ``RegistryIndexes.by_id``."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from procontext.models.registry import PackageEntry, RegistryEntry
+from procontext.registry.entries import (
+    CompactEntries,
+    pack,
+    record_from_json,
+    to_entry,
+    to_record,
+)
+
+
+def _raw(i: int) -> dict:
+    return {
+        "id": f"lib{i}",
+        "name": f"Lib {i}",
+        "description": f"Library number {i}, for measuring the registry store.",
+        "packages": [
+            {
+                "ecosystem": "pypi",
+                "languages": ["python"],
+                "package_names": [f"lib{i}", f"lib{i}-core"],
+                "repo_url": f"https://github.com/example/lib{i}",
+            }
+        ],
+        "aliases": [f"lib-{i}"],
+        "llms_txt_url": f"https://lib{i}.dev/llms.txt",
+    }
+
+
+ENTRIES = [
+    RegistryEntry(**_raw(1)),
+    RegistryEntry(
+        id="bare",
+        name="Bare",
+        llms_txt_url="https://bare.dev/llms.txt",
+    ),
+    RegistryEntry(
+        id="multi",
+        name="Multi",
+        description="Two package groups.",
+        packages=[
+            PackageEntry(
+                ecosystem="npm", languages=["javascript", "typescript"], package_names=["m"]
+            ),
+            PackageEntry(ecosystem="jsr", package_names=["@m/m"], readme_url="https://m.dev/r"),
+        ],
+        llms_txt_url="https://m.dev/llms.txt",
+    ),
+]
+
+
+class TestCompactEntries:
+    def test_round_trip(self) -> None:
+        entries = CompactEntries.from_entries(ENTRIES)
+        assert list(entries) == ["lib1", "bare", "multi"]
+        assert len(entries) == 3
+        assert "multi" in entries and "missing" not in entries
+        assert dict(entries) == {entry.id: entry for entry in ENTRIES}
+        assert entries.get("missing") is None
+
+    def test_record_from_json_matches_validated_entry(self) -> None:
+        for entry in ENTRIES:
+            raw = entry.model_dump(exclude_defaults=True)
+            assert record_from_json(raw) == to_record(entry)
+            assert to_entry(record_from_json(raw)) == entry
+
+    def test_lookups_keep_nothing(self) -> None:
+        entries = CompactEntries.from_entries(ENTRIES)
+        first, second = entries["multi"], entries["multi"]
+        assert first == second and first is not second
+        assert entries.blobs["multi"] == pack(to_record(ENTRIES[2]))
+
+    def test_store_is_a_fraction_of_the_models(self) -> None:
+        """A 100,000-entry registry, measured with tracemalloc.
+
+        Built from JSON elements, as ``patch_indexes`` does, so that the test
+        need not validate 100,000 models; their size is taken from 1,000.
+        """
+        raws = [_raw(i) for i in range(100_000)]
+        gc.collect()
+        tracemalloc.start()
+        try:
+            entries = CompactEntries({raw["id"]: pack(record_from_json(raw)) for raw in raws})
+            compact = tracemalloc.get_traced_memory()[0]
+            models = [RegistryEntry(**raw) for raw in raws[:1000]]
+            models_size = (tracemalloc.get_traced_memory()[0] - compact) * 100
+
+            before_lookups = tracemalloc.get_traced_memory()[0]
+            for raw in raws[::100]:
+                assert entries[raw["id"]].id == raw["id"]
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - before_lookups
+        finally:
+            tracemalloc.stop()
+
+        assert len(entries) == len(raws) and len(models) == 1000
+        # ~240 bytes an entry, against ~2.2 KB for the validated models.
+        assert compact < models_size / 5
+        assert retained < 16 * 1024  # The 1,000 looked-up entries are not kept
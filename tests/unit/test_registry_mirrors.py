@@ -0,0 +1,69 @@
+"""Unit tests for procontext.registry.mirrors."""
+
+from __future__ import annotations
+
+import pytest
+
+from procontext.config import RegistrySettings
+from procontext.registry.mirrors import RegistryMirrors
+
+A, B, C = (f"https://{name}.example/registry_metadata.json" for name in "abc")
+
+
+class TestRegistryMirrors:
+    def test_configured_order_until_measured(self) -> None:
+        mirrors = RegistryMirrors.from_settings(
+            RegistrySettings(metadata_url=A, mirror_metadata_urls=[B, C, A])
+        )
+        assert len(mirrors) == 3
+        assert mirrors.primary == A
+        assert mirrors.ranked() == [A, B, C]
+
+    def test_ranked_by_latency_then_unmeasured_then_failing(self) -> None:
+        mirrors = RegistryMirrors([A, B, C])
+        mirrors.record_failure(A)
+        mirrors.record_success(C, 0.2)
+        assert mirrors.ranked() == [C, B, A]
+        mirrors.record_success(B, 0.1)
+        assert mirrors.ranked() == [B, C, A]
+
+    def test_success_clears_failures(self) -> None:
+        mirrors = RegistryMirrors([A, B])
+        mirrors.record_failure(A)
+        mirrors.record_failure(A)
+        mirrors.record_failure(B)
+        assert mirrors.ranked() == [B, A]
+        mirrors.record_success(A, 0.5)
+        assert mirrors.ranked() == [A, B]
+
+    def test_latency_is_smoothed(self) -> None:
+        mirrors = RegistryMirrors([A, B])
+        mirrors.record_success(A, 0.1)
+        mirrors.record_success(B, 0.2)
+        mirrors.record_success(A, 0.4)  # One slow answer does not outrank B yet
+        assert mirrors.ranked() == [A, B]
+        mirrors.record_success(A, 0.4)
+        assert mirrors.ranked() == [B, A]
+
+    def test_abandoned_mirror_is_at_least_that_slow(self) -> None:
+        mirrors = RegistryMirrors([A, B])
+        mirrors.record_success(A, 0.1)
+        mirrors.record_success(B, 0.3)
+        mirrors.record_abandoned(A, 1.0)
+        assert mirrors.ranked() == [B, A]
+        mirrors.record_abandoned(B, 0.05)  # Answers faster than that are not evidence
+        assert mirrors.ranked() == [B, A]
+
+    def test_hedge_delay(self) -> None:
+        mirrors = RegistryMirrors([A, B, C])
+        mirrors.record_success(A, 0.01)
+        mirrors.record_success(B, 0.2)
+        assert mirrors.hedge_delay(A) == 0.25
+        assert mirrors.hedge_delay(B) == pytest.approx(0.6)
+        assert mirrors.hedge_delay(C) == 1.0
+        mirrors.record_abandoned(B, 30)
+        assert mirrors.hedge_delay(B) == 2.0
+
+    def test_requires_a_url(self) -> None:
+        with pytest.raises(ValueError):
+            RegistryMirrors([])
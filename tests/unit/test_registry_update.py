@@ -4,6 +4,11 @@ from __future__ import annotations
 
 import hashlib
 import json
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
@@ -11,10 +16,22 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 import httpx
+import pytest
 
-from procontext.config import Settings
+from procontext.config import ExecutorSettings, Settings
 from procontext.fetcher import build_allowlist
-from procontext.registry import check_for_registry_update, fetch_registry_for_setup
+from procontext.lru import LRUCache
+from procontext.models.tools import ResolveLibraryOutput
+from procontext.offload import Offloader
+from procontext.registry import (
+    build_indexes,
+    check_for_registry_update,
+    fetch_registry_for_setup,
+    load_registry_snapshot,
+    save_registry_to_disk,
+)
+from procontext.registry.delta import make_delta
+from procontext.registry.entries import CompactEntries
 from procontext.state import AppState
 
 _METADATA_URL = "https://registry.example/registry_metadata.json"
@@ -94,11 +111,14 @@ async def test_check_for_registry_update_success_updates_state(
             sample_entries=sample_entries,
             registry_version="2026-02-20",
         )
+        state.resolve_cache = LRUCache(8)
+        state.resolve_cache.put(("langchain", None, "2026-02-20"), ResolveLibraryOutput(matches=[]))
         outcome = await check_for_registry_update(state)
 
     assert outcome == "success"
     assert state.registry_version == "2026-02-26"
     assert "newlib" in state.indexes.by_id
+    assert len(state.resolve_cache) == 0
     assert state.registry_path is not None and state.registry_path.is_file()
     assert state.registry_state_path is not None and state.registry_state_path.is_file()
 
@@ -166,6 +186,7 @@ async def test_check_for_registry_update_semantic_on_checksum_mismatch(
 
     assert outcome == "semantic_failure"
     assert state.registry_version == "2026-02-20"
+    assert not list((tmp_path / "registry").glob("*.download"))
 
 
 async def test_check_for_registry_update_up_to_date_writes_last_checked_at(
@@ -219,6 +240,97 @@ async def test_check_for_registry_update_up_to_date_writes_last_checked_at(
     assert state_data["last_checked_at"] != old_checked  # timestamp was refreshed
 
 
+async def test_check_for_registry_update_sends_conditional_metadata_requests(
+    tmp_path: Path,
+    indexes,
+    sample_entries,
+) -> None:
+    registry_bytes = json.dumps(
+        [{"id": "newlib", "name": "NewLib", "llms_txt_url": "https://docs.newlib.dev/llms.txt"}]
+    ).encode("utf-8")
+    metadata = {
+        "version": "v2",
+        "download_url": "https://registry.example/known-libraries.json",
+        "checksum": _sha256_prefixed(registry_bytes),
+    }
+    metadata_requests: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("registry_metadata.json"):
+            metadata_requests.append(request.headers)
+            if request.headers.get("if-none-match") == '"m2"':
+                return httpx.Response(304, headers={"ETag": '"m2"'})
+            return httpx.Response(200, json=metadata, headers={"ETag": '"m2"'})
+        return httpx.Response(200, content=registry_bytes)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        state = _build_state(
+            client=client,
+            tmp_path=tmp_path,
+            indexes=indexes,
+            sample_entries=sample_entries,
+            registry_version="v1",
+        )
+        assert await check_for_registry_update(state) == "success"
+        assert state.registry_version == "v2"
+
+        assert state.registry_state_path is not None
+        state_data = json.loads(state.registry_state_path.read_text(encoding="utf-8"))
+        state_data["last_checked_at"] = "2026-01-01T00:00:00Z"
+        state.registry_state_path.write_text(json.dumps(state_data), encoding="utf-8")
+
+        assert await check_for_registry_update(state) == "success"
+
+    assert "if-none-match" not in metadata_requests[0]
+    assert metadata_requests[1]["if-none-match"] == '"m2"'
+    assert state.registry_version == "v2"
+    state_data = json.loads(state.registry_state_path.read_text(encoding="utf-8"))
+    assert state_data["metadata_etag"] == '"m2"'
+    assert state_data["last_checked_at"] != "2026-01-01T00:00:00Z"
+
+
+async def test_check_for_registry_update_keeps_no_validators_after_failed_update(
+    tmp_path: Path,
+    indexes,
+    sample_entries,
+) -> None:
+    """A 304 must never answer for a version that was advertised but not applied."""
+    metadata_requests: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("registry_metadata.json"):
+            metadata_requests.append(request.headers)
+            return httpx.Response(
+                200,
+                json={
+                    "version": "v2",
+                    "download_url": "https://registry.example/known-libraries.json",
+                    "checksum": "sha256:" + "0" * 64,
+                },
+                headers={"ETag": '"m2"', "Last-Modified": "Mon, 19 Oct 2026 08:00:00 GMT"},
+            )
+        return httpx.Response(200, content=b"[]")
+
+    registry_dir = tmp_path / "registry"
+    registry_dir.mkdir()
+    (registry_dir / "registry-state.json").write_text(
+        json.dumps({"version": "v1", "checksum": "sha256:abc", "metadata_etag": '"m1"'})
+    )
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        state = _build_state(
+            client=client,
+            tmp_path=tmp_path,
+            indexes=indexes,
+            sample_entries=sample_entries,
+            registry_version="v1",
+        )
+        assert await check_for_registry_update(state) == "semantic_failure"
+        assert await check_for_registry_update(state) == "semantic_failure"
+
+    assert [headers.get("if-none-match") for headers in metadata_requests] == ['"m1"', '"m1"']
+    assert "if-modified-since" not in metadata_requests[1]
+
+
 async def test_check_for_registry_update_semantic_on_metadata_4xx(
     tmp_path: Path,
     indexes,
@@ -243,6 +355,577 @@ async def test_check_for_registry_update_semantic_on_metadata_4xx(
     assert state.registry_version == "unknown"  # unchanged
 
 
+def _registry_handler(registry_bytes: bytes, checksum: str):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("registry_metadata.json"):
+            return httpx.Response(
+                200,
+                json={
+                    "version": "2026-02-26",
+                    "download_url": "https://registry.example/known-libraries.json",
+                    "checksum": checksum,
+                },
+            )
+        return httpx.Response(200, stream=httpx.ByteStream(registry_bytes))
+
+    return handler
+
+
+async def test_check_for_registry_update_prepares_and_persists_off_loop(
+    tmp_path: Path,
+    indexes,
+    sample_entries,
+) -> None:
+    registry_bytes = json.dumps(
+        [{"id": "newlib", "name": "NewLib", "llms_txt_url": "https://docs.newlib.dev/llms.txt"}],
+        indent=2,
+    ).encode("utf-8")
+    handler = _registry_handler(registry_bytes, _sha256_prefixed(registry_bytes))
+    threads: list[str] = []
+
+    def recording_build_indexes(entries):
+        threads.append(threading.current_thread().name)
+        return build_indexes(entries)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        state = _build_state(
+            client=client,
+            tmp_path=tmp_path,
+            indexes=indexes,
+            sample_entries=sample_entries,
+        )
+        state.offloader = Offloader(ExecutorSettings(kind="thread", min_chars=0))
+        with patch("procontext.registry.build_indexes", recording_build_indexes):
+            outcome = await check_for_registry_update(state)
+        state.offloader.close()
+
+    assert outcome == "success"
+    assert threads and threads[0].startswith("procontext-offload")
+    assert "newlib" in state.indexes.by_id
+    assert "newlib.dev" in state.allowlist
+    registry_dir = tmp_path / "registry"
+    assert (registry_dir / "known-libraries.json").read_bytes() == registry_bytes
+    assert not list(registry_dir.glob("*.download"))
+    snapshot = load_registry_snapshot(
+        registry_dir / "known-libraries.json", registry_dir / "registry-state.json"
+    )
+    assert snapshot is not None
+    assert isinstance(snapshot.indexes.by_id, CompactEntries)
+
+
+async def test_check_for_registry_update_semantic_on_invalid_schema(
+    tmp_path: Path,
+    indexes,
+    sample_entries,
+) -> None:
+    registry_bytes = b'[{"id": "Not A Valid Id", "name": "x", "llms_txt_url": "https://x.dev"}]'
+    handler = _registry_handler(registry_bytes, _sha256_prefixed(registry_bytes))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        state = _build_state(
+            client=client,
+            tmp_path=tmp_path,
+            indexes=indexes,
+            sample_entries=sample_entries,
+            registry_version="2026-02-20",
+        )
+        outcome = await check_for_registry_update(state)
+
+    assert outcome == "semantic_failure"
+    assert state.registry_version == "2026-02-20"
+    assert not list((tmp_path / "registry").iterdir())
+
+
+async def test_check_for_registry_update_transient_on_download_error(
+    tmp_path: Path,
+    indexes,
+    sample_entries,
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("registry_metadata.json"):
+            return httpx.Response(
+                200,
+                json={
+                    "version": "2026-02-26",
+                    "download_url": "https://registry.example/known-libraries.json",
+                    "checksum": "sha256:abc123",
+                },
+            )
+        raise httpx.ReadError("connection reset", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        state = _build_state(
+            client=client,
+            tmp_path=tmp_path,
+            indexes=indexes,
+            sample_entries=sample_entries,
+        )
+        outcome = await check_for_registry_update(state)
+
+    assert outcome == "transient_failure"
+    assert not list((tmp_path / "registry").iterdir())
+
+
+# ---------------------------------------------------------------------------
+# check_for_registry_update — delta updates, against a local static server
+# ---------------------------------------------------------------------------
+
+
+def _entry_dict(library_id: str, description: str = "") -> dict:
+    return {
+        "id": library_id,
+        "name": library_id.title(),
+        "description": description,
+        "packages": [{"ecosystem": "pypi", "package_names": [library_id]}],
+        "llms_txt_url": f"https://docs.{library_id}.dev/llms.txt",
+    }
+
+
+_V1 = [_entry_dict(name) for name in ("alpha", "bravo", "charlie", "delta")]
+_V2 = [_V1[0], _entry_dict("bravo", "changed"), *_V1[2:], _entry_dict("echo")]
+
+
+@dataclass
+class _StaticSite:
+    root: Path
+    base_url: str
+    requested: list[str]
+    # path → "hang" (no answer until teardown), "slow" (answers after 0.3s)
+    # or an HTTP error status
+    faults: dict[str, str | int]
+
+
+@pytest.fixture()
+def serve_static(tmp_path: Path):
+    """Return a function serving ``tmp_path / name`` over HTTP as a ``_StaticSite``."""
+    servers: list[ThreadingHTTPServer] = []
+    release = threading.Event()
+
+    def serve(name: str) -> _StaticSite:
+        site = _StaticSite(tmp_path / name, "", [], {})
+        site.root.mkdir()
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs) -> None:
+                super().__init__(*args, directory=str(site.root), **kwargs)
+
+            def do_GET(self) -> None:
+                site.requested.append(self.path)
+                fault = site.faults.get(self.path)
+                if fault == "hang":
+                    release.wait(10)
+                elif fault == "slow":
+                    release.wait(0.3)
+                    super().do_GET()
+                elif isinstance(fault, int):
+                    self.send_error(fault)
+                else:
+                    super().do_GET()
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        servers.append(server)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        site.base_url = f"http://127.0.0.1:{server.server_port}"
+        return site
+
+    try:
+        yield serve
+    finally:
+        release.set()
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+@pytest.fixture()
+def static_server(serve_static):
+    """Serve ``tmp_path / "www"`` over HTTP; yield the root, base URL and requested paths."""
+    site = serve_static("www")
+    return site.root, site.base_url, site.requested
+
+
+def _publish(root: Path, base_url: str, *, deltas: dict[str, dict] | None = None) -> bytes:
+    """Publish _V2 with metadata advertising *deltas* (file name → patch) from v1."""
+    registry_bytes = json.dumps(_V2, indent=2).encode("utf-8")
+    (root / "known-libraries.json").write_bytes(registry_bytes)
+    advertised = []
+    for name, delta in (deltas or {}).items():
+        (root / name).write_text(json.dumps(delta))
+        advertised.append({"from_version": "v1", "url": name})
+    advertised.append({"from_version": "v0", "url": "deltas/missing.json"})
+    metadata = {
+        "version": "v2",
+        "download_url": f"{base_url}/known-libraries.json",
+        "checksum": _sha256_prefixed(registry_bytes),
+        "deltas": advertised,
+    }
+    (root / "registry_metadata.json").write_text(json.dumps(metadata))
+    return registry_bytes
+
+
+def _local_v1_state(
+    tmp_path: Path, client: httpx.AsyncClient, base_url: str, *, mirrors: list[str] | None = None
+) -> AppState:
+    registry_dir = tmp_path / "registry"
+    registry_dir.mkdir()
+    registry_path = registry_dir / "known-libraries.json"
+    state_path = registry_dir / "registry-state.json"
+    registry_bytes = json.dumps(_V1, indent=2).encode("utf-8")
+    save_registry_to_disk(
+        registry_bytes=registry_bytes,
+        version="v1",
+        checksum=_sha256_prefixed(registry_bytes),
+        registry_path=registry_path,
+        state_path=state_path,
+    )
+    snapshot = load_registry_snapshot(registry_path, state_path)
+    assert snapshot is not None
+    return AppState(
+        settings=Settings(
+            data_dir=str(tmp_path),
+            cache={"db_path": str(tmp_path / "cache.db")},
+            registry={
+                "metadata_url": f"{base_url}/registry_metadata.json",
+                "mirror_metadata_urls": [
+                    f"{mirror}/registry_metadata.json" for mirror in mirrors or []
+                ],
+            },
+        ),
+        indexes=snapshot.indexes,
+        registry_version="v1",
+        registry_path=registry_path,
+        registry_state_path=state_path,
+        http_client=client,
+        allowlist=snapshot.domains,
+    )
+
+
+def _v1_to_v2_delta(**overrides) -> dict:
+    delta = make_delta(
+        json.dumps(_V1, indent=2),
+        json.dumps(_V2, indent=2),
+        from_version="v1",
+        to_version="v2",
+    )
+    return {**delta, **overrides}
+
+
+def _assert_updated_to_v2(state: AppState, registry_bytes: bytes) -> None:
+    assert state.registry_version == "v2"
+    assert list(state.indexes.by_id) == [entry["id"] for entry in _V2]
+    assert state.indexes.by_id["bravo"].description == "changed"
+    assert state.indexes.by_package["echo"] == "echo"
+    assert "echo.dev" in state.allowlist
+    assert state.registry_path is not None and state.registry_state_path is not None
+    assert state.registry_path.read_bytes() == registry_bytes
+    reloaded = load_registry_snapshot(state.registry_path, state.registry_state_path)
+    assert reloaded is not None and reloaded.version == "v2"
+    assert dict(reloaded.indexes.by_id) == dict(state.indexes.by_id)
+
+
+async def test_check_for_registry_update_applies_advertised_delta(
+    tmp_path: Path, static_server
+) -> None:
+    root, base_url, requested = static_server
+    registry_bytes = _publish(root, base_url, deltas={"v1-v2.json": _v1_to_v2_delta()})
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, base_url)
+        state.offloader = Offloader(ExecutorSettings(kind="thread", min_chars=0))
+        outcome = await check_for_registry_update(state)
+        state.offloader.close()
+
+    assert outcome == "success"
+    assert requested == ["/registry_metadata.json", "/v1-v2.json"]
+    _assert_updated_to_v2(state, registry_bytes)
+
+
+@pytest.mark.parametrize(
+    "delta",
+    [
+        _v1_to_v2_delta(edits=[[0, 1, "[ "]]),  # applies, but checksum does not match
+        _v1_to_v2_delta(edits=[[1, 0, ""]]),  # malformed
+        _v1_to_v2_delta(from_version="v0"),  # advertised for v1, but patches v0
+    ],
+    ids=["checksum-mismatch", "malformed", "wrong-base"],
+)
+async def test_check_for_registry_update_falls_back_on_bad_delta(
+    tmp_path: Path, static_server, delta: dict
+) -> None:
+    root, base_url, requested = static_server
+    registry_bytes = _publish(root, base_url, deltas={"v1-v2.json": delta})
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, base_url)
+        outcome = await check_for_registry_update(state)
+
+    assert outcome == "success"
+    assert requested == ["/registry_metadata.json", "/v1-v2.json", "/known-libraries.json"]
+    _assert_updated_to_v2(state, registry_bytes)
+
+
+async def test_check_for_registry_update_falls_back_on_missing_delta(
+    tmp_path: Path, static_server
+) -> None:
+    root, base_url, requested = static_server
+    registry_bytes = _publish(root, base_url)
+    metadata = json.loads((root / "registry_metadata.json").read_text())
+    metadata["deltas"] = [{"from_version": "v1", "url": "deltas/v1.json"}]
+    (root / "registry_metadata.json").write_text(json.dumps(metadata))
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, base_url)
+        outcome = await check_for_registry_update(state)
+
+    assert outcome == "success"
+    assert requested == ["/registry_metadata.json", "/deltas/v1.json", "/known-libraries.json"]
+    _assert_updated_to_v2(state, registry_bytes)
+
+
+async def test_check_for_registry_update_falls_back_when_local_registry_changed(
+    tmp_path: Path, static_server
+) -> None:
+    root, base_url, requested = static_server
+    registry_bytes = _publish(root, base_url, deltas={"v1-v2.json": _v1_to_v2_delta()})
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, base_url)
+        assert state.registry_path is not None
+        state.registry_path.write_bytes(state.registry_path.read_bytes() + b"\n")
+        outcome = await check_for_registry_update(state)
+
+    assert outcome == "success"
+    assert requested[-1] == "/known-libraries.json"
+    _assert_updated_to_v2(state, registry_bytes)
+
+
+async def test_check_for_registry_update_ignores_malformed_deltas(
+    tmp_path: Path, static_server
+) -> None:
+    root, base_url, requested = static_server
+    registry_bytes = _publish(root, base_url)
+    metadata = json.loads((root / "registry_metadata.json").read_text())
+    metadata["deltas"] = {"v1": 7}
+    (root / "registry_metadata.json").write_text(json.dumps(metadata))
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, base_url)
+        outcome = await check_for_registry_update(state)
+
+    assert outcome == "success"
+    assert requested == ["/registry_metadata.json", "/known-libraries.json"]
+    _assert_updated_to_v2(state, registry_bytes)
+
+
+async def test_check_for_registry_update_not_modified_from_static_server(
+    tmp_path: Path, static_server
+) -> None:
+    """The static server honours If-Modified-Since, as GitHub Pages and most CDNs do."""
+    root, base_url, requested = static_server
+    registry_bytes = _publish(root, base_url)
+    statuses: list[int] = []
+
+    async def record(response: httpx.Response) -> None:
+        statuses.append(response.status_code)
+
+    async with httpx.AsyncClient(event_hooks={"response": [record]}) as client:
+        state = _local_v1_state(tmp_path, client, base_url)
+        assert await check_for_registry_update(state) == "success"
+        _assert_updated_to_v2(state, registry_bytes)
+        assert await check_for_registry_update(state) == "success"
+
+    assert requested == [
+        "/registry_metadata.json",
+        "/known-libraries.json",
+        "/registry_metadata.json",
+    ]
+    assert statuses == [200, 200, 304]
+    assert state.registry_version == "v2"
+
+
+# ---------------------------------------------------------------------------
+# check_for_registry_update — metadata mirrors, against local stand-in servers
+# ---------------------------------------------------------------------------
+
+
+def _unreachable_base_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"  # Nothing listens there any more
+
+
+async def _update(state: AppState) -> str:
+    state.offloader = Offloader(ExecutorSettings(kind="thread", min_chars=0))
+    try:
+        return await check_for_registry_update(state)
+    finally:
+        state.offloader.close()
+
+
+async def test_check_for_registry_update_races_past_a_hanging_mirror(
+    tmp_path: Path, serve_static, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("procontext.registry.mirrors._UNMEASURED_HEDGE_SECONDS", 0.05)
+    primary, mirror = serve_static("primary"), serve_static("mirror")
+    _publish(primary.root, primary.base_url)
+    registry_bytes = _publish(mirror.root, mirror.base_url)
+    primary.faults["/registry_metadata.json"] = "hang"
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, primary.base_url, mirrors=[mirror.base_url])
+        started = time.monotonic()
+        assert await _update(state) == "success"
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 2  # Not held up by the hanging primary
+    _assert_updated_to_v2(state, registry_bytes)
+    assert primary.requested == ["/registry_metadata.json"]
+    assert mirror.requested == ["/registry_metadata.json", "/known-libraries.json"]
+    assert state.registry_mirrors is not None
+    assert state.registry_mirrors.ranked()[0] == f"{mirror.base_url}/registry_metadata.json"
+
+
+async def test_check_for_registry_update_prefers_the_mirror_that_answered(
+    tmp_path: Path, serve_static
+) -> None:
+    """An unreachable primary is skipped at once, then ranked last; the mirror's
+    validators go only to the mirror, which answers 304."""
+    mirror = serve_static("mirror")
+    registry_bytes = _publish(mirror.root, mirror.base_url)
+    primary_url = _unreachable_base_url()
+    statuses: list[tuple[str, int]] = []
+
+    async def record(response: httpx.Response) -> None:
+        statuses.append((response.url.path, response.status_code))
+
+    async with httpx.AsyncClient(event_hooks={"response": [record]}) as client:
+        state = _local_v1_state(tmp_path, client, primary_url, mirrors=[mirror.base_url])
+        assert await _update(state) == "success"
+        _assert_updated_to_v2(state, registry_bytes)
+        assert await _update(state) == "success"
+
+    assert state.registry_mirrors is not None
+    assert state.registry_mirrors.ranked() == [
+        f"{mirror.base_url}/registry_metadata.json",
+        f"{primary_url}/registry_metadata.json",
+    ]
+    assert statuses == [
+        ("/registry_metadata.json", 200),
+        ("/known-libraries.json", 200),
+        ("/registry_metadata.json", 304),
+    ]
+
+
+@pytest.mark.parametrize("fault", [503, 404, "corrupt"])
+async def test_check_for_registry_update_downloads_from_a_healthy_mirror(
+    tmp_path: Path, serve_static, fault: str | int
+) -> None:
+    primary, mirror = serve_static("primary"), serve_static("mirror")
+    _publish(primary.root, primary.base_url)
+    registry_bytes = _publish(mirror.root, mirror.base_url)
+    if fault == "corrupt":
+        (primary.root / "known-libraries.json").write_text("[]")  # Fails the checksum
+    else:
+        primary.faults["/known-libraries.json"] = fault
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, primary.base_url, mirrors=[mirror.base_url])
+        assert await _update(state) == "success"
+
+    _assert_updated_to_v2(state, registry_bytes)
+    assert primary.requested == ["/registry_metadata.json", "/known-libraries.json"]
+    assert mirror.requested == ["/registry_metadata.json", "/known-libraries.json"]
+
+
+async def test_check_for_registry_update_skips_mirrors_with_another_registry(
+    tmp_path: Path, serve_static
+) -> None:
+    primary, stale = serve_static("primary"), serve_static("stale")
+    _publish(primary.root, primary.base_url)
+    _publish(stale.root, stale.base_url)
+    metadata = json.loads((stale.root / "registry_metadata.json").read_text())
+    (stale.root / "registry_metadata.json").write_text(
+        json.dumps({**metadata, "version": "v1.5", "checksum": "sha256:" + "0" * 64})
+    )
+    primary.faults["/known-libraries.json"] = 503
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, primary.base_url, mirrors=[stale.base_url])
+        assert await _update(state) == "transient_failure"
+
+    assert state.registry_version == "v1"
+    assert stale.requested == ["/registry_metadata.json"]  # Never downloaded from
+
+
+def _lag(site: _StaticSite, version: str) -> None:
+    """Make *site*'s metadata advertise *version*, as a mirror yet to catch up would."""
+    path = site.root / "registry_metadata.json"
+    path.write_text(json.dumps({**json.loads(path.read_text()), "version": version}))
+
+
+@pytest.mark.parametrize("lagging_version", ["v0", "v1"])
+async def test_check_for_registry_update_waits_out_a_lagging_mirror(
+    tmp_path: Path, serve_static, monkeypatch: pytest.MonkeyPatch, lagging_version: str
+) -> None:
+    """A lagging mirror that wins the race neither downgrades the registry nor
+    reports it up to date; the primary's newer version is applied."""
+    monkeypatch.setattr("procontext.registry.mirrors._UNMEASURED_HEDGE_SECONDS", 0.05)
+    primary, lagging = serve_static("primary"), serve_static("lagging")
+    registry_bytes = _publish(primary.root, primary.base_url)
+    _publish(lagging.root, lagging.base_url)
+    _lag(lagging, lagging_version)
+    primary.faults["/registry_metadata.json"] = "slow"
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, primary.base_url, mirrors=[lagging.base_url])
+        assert await _update(state) == "success"
+
+    _assert_updated_to_v2(state, registry_bytes)
+    assert lagging.requested == ["/registry_metadata.json"]
+
+
+async def test_check_for_registry_update_rejects_an_older_mirror_version(
+    tmp_path: Path, serve_static
+) -> None:
+    primary, lagging = serve_static("primary"), serve_static("lagging")
+    _publish(primary.root, primary.base_url)
+    _publish(lagging.root, lagging.base_url)
+    _lag(lagging, "v0")
+    primary.faults["/registry_metadata.json"] = 503
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, primary.base_url, mirrors=[lagging.base_url])
+        assert await _update(state) == "transient_failure"
+
+    assert state.registry_version == "v1"
+    assert lagging.requested == ["/registry_metadata.json"]
+
+
+@pytest.mark.parametrize(
+    ("faults", "expected"),
+    [((503, 404), "transient_failure"), ((404, 404), "semantic_failure")],
+)
+async def test_check_for_registry_update_fails_when_every_mirror_fails(
+    tmp_path: Path, serve_static, faults: tuple[int, int], expected: str
+) -> None:
+    sites = [serve_static("primary"), serve_static("mirror")]
+    for site, fault in zip(sites, faults, strict=True):
+        _publish(site.root, site.base_url)
+        site.faults["/registry_metadata.json"] = fault
+
+    async with httpx.AsyncClient() as client:
+        state = _local_v1_state(tmp_path, client, sites[0].base_url, mirrors=[sites[1].base_url])
+        assert await _update(state) == expected
+
+    assert state.registry_version == "v1"
+    assert [site.requested for site in sites] == [["/registry_metadata.json"]] * 2
+
+
 # ---------------------------------------------------------------------------
 # fetch_registry_for_setup
 # ---------------------------------------------------------------------------
@@ -316,6 +999,39 @@ class TestFetchRegistryForSetup:
         assert not (tmp_path / "registry" / "known-libraries.json").exists()
         assert not (tmp_path / "registry" / "registry-state.json").exists()
 
+    async def test_falls_back_to_a_mirror(self, tmp_path: Path) -> None:
+        """The primary metadata host is down → the mirror's metadata and relative download URL."""
+        entries = [{"id": "lib", "name": "Lib", "llms_txt_url": "https://docs.lib.dev/llms.txt"}]
+        registry_bytes = json.dumps(entries).encode("utf-8")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "registry.example":
+                raise httpx.ConnectError("connection refused", request=request)
+            if request.url.path == "/procontext/registry_metadata.json":
+                return httpx.Response(
+                    200,
+                    json={
+                        "version": "2026-03-01",
+                        "download_url": "known-libraries.json",
+                        "checksum": _sha256_prefixed(registry_bytes),
+                    },
+                )
+            if request.url.path == "/procontext/known-libraries.json":
+                return httpx.Response(200, content=registry_bytes)
+            return httpx.Response(404)
+
+        settings = _build_settings(tmp_path)
+        settings.registry.mirror_metadata_urls = [
+            "https://mirror.example/procontext/registry_metadata.json"
+        ]
+        with patch(
+            "procontext.registry.build_http_client",
+            return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ):
+            assert await fetch_registry_for_setup(settings) is True
+
+        assert (tmp_path / "registry" / "known-libraries.json").read_bytes() == registry_bytes
+
     async def test_checksum_mismatch_returns_false(self, tmp_path: Path) -> None:
         """Metadata checksum doesn't match registry body → returns False, no files written."""
         entries = [{"id": "lib", "name": "Lib", "llms_txt_url": "https://docs.lib.dev/llms.txt"}]
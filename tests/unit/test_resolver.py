@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING
 import pytest
 
 from procontext.models.tools import ReadPageInput, ResolveLibraryInput, SearchPageInput
-from procontext.resolver import normalise_query, resolve_library
+from procontext.resolver import normalise_query, resolve_libraries, resolve_library
 
 if TYPE_CHECKING:
     from procontext.models.registry import RegistryIndexes
@@ -158,6 +158,19 @@ class TestResolveLibraryStep5NoMatch:
         assert matches == []
 
 
+class TestResolveLibraries:
+    """Batch resolution."""
+
+    def test_matches_single_resolution_in_order(self, indexes: RegistryIndexes) -> None:
+        queries = ["langchain-openai", "pydantic", "lang-chain", "langchan", "xyzzy", "  "]
+        results = resolve_libraries(queries, indexes)
+        assert results == [resolve_library(query, indexes) for query in queries]
+
+    def test_equivalent_queries_resolved_once(self, indexes: RegistryIndexes) -> None:
+        results = resolve_libraries(["pydantic", "Pydantic>=2", "pydantic[email]"], indexes)
+        assert results[0] is results[1] is results[2]
+
+
 # ---------------------------------------------------------------------------
 # Result structure
 # ---------------------------------------------------------------------------
@@ -8,6 +8,7 @@ resulting sleep durations and loop behavior.
 from __future__ import annotations
 
 import asyncio
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -20,9 +21,11 @@ from procontext.registry import (
     REGISTRY_MAX_TRANSIENT_BACKOFF_ATTEMPTS,
 )
 from procontext.schedulers import (
+    EVENT_LOOP_LAG,
     _jittered_delay,
     run_cache_cleanup_scheduler,
     run_cache_startup_cleanup,
+    run_event_loop_lag_monitor,
     run_registry_startup_check,
     run_registry_update_scheduler,
 )
@@ -388,3 +391,15 @@ class TestJitteredDelay:
         results = {_jittered_delay(1000) for _ in range(20)}
         # With random.uniform(0.8, 1.2) the chance of all 20 values being equal is negligible
         assert len(results) > 1
+
+
+async def test_event_loop_lag_monitor_records_blocked_loop() -> None:
+    lag_before = EVENT_LOOP_LAG.value()  # histogram value is the sum of observations
+    task = asyncio.create_task(run_event_loop_lag_monitor(0.01))
+    await asyncio.sleep(0)  # let the monitor start its first sleep
+    time.sleep(0.05)  # block the loop
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert EVENT_LOOP_LAG.value() - lag_before >= 0.03
@@ -6,7 +6,14 @@ import re
 
 import pytest
 
-from procontext.search import build_matcher, search_lines
+from procontext.search import (
+    LineMatch,
+    LineReader,
+    build_matcher,
+    iter_matches,
+    search_lines,
+)
+from procontext.search_multi import build_multi_matcher
 
 # Sample content used across tests
 _CONTENT = """\
@@ -179,3 +186,125 @@ class TestSearchLinesPagination:
         first_line_numbers = {m.line_number for m in first.matches}
         second_line_numbers = {m.line_number for m in second.matches}
         assert first_line_numbers.isdisjoint(second_line_numbers)
+
+
+def _reference_matches(content: str, matcher: re.Pattern[str], offset: int = 1) -> list[LineMatch]:
+    """The original line-by-line definition of a match, for differential checks."""
+    return [
+        LineMatch(line_number=idx, content=line)
+        for idx, line in enumerate(content.splitlines(), start=1)
+        if idx >= offset and matcher.search(line)
+    ]
+
+
+_TRICKY_CONTENT = (
+    "alpha beta\r\n"
+    "Beta gamma\rdelta\n"
+    "\n"
+    "epsilon\x85zeta beta\u2028eta\x0btheta\x0c"
+    "BETA\x1ciota\x1dkappa\x1e"
+    "lambda\u2029mu \u212a kelvin stra\u00dfe STRASSE\n"
+    "a\nb a b\n"
+    "xx\n"
+    "trailing beta\n"
+)
+_NEWLINE_CONTENT = "alpha beta\nBeta gamma\n\nKELVIN \u212a beta\na\nb a b\nxx\nlast beta"
+# Exercises each way of mapping offsets to lines: mixed separators, \n, \r\n.
+_DIFFERENTIAL_CONTENTS = [
+    _TRICKY_CONTENT,
+    _NEWLINE_CONTENT,
+    _NEWLINE_CONTENT.replace("\n", "\r\n") + "\r\n",
+]
+
+
+class TestWholeBufferSearch:
+    @pytest.mark.parametrize(
+        ("query", "mode", "case_mode", "whole_word"),
+        [
+            ("beta", "literal", "smart", False),
+            ("Beta", "literal", "smart", False),
+            ("beta", "literal", "insensitive", True),
+            ("k", "literal", "insensitive", False),
+            ("stra\u00dfe", "literal", "insensitive", False),
+            ("a b", "literal", "sensitive", False),
+            ("beta", "regex", "smart", False),
+            ("^beta", "regex", "insensitive", False),
+            ("eta$", "regex", "sensitive", False),
+            ("(?<=a)\\s", "regex", "sensitive", False),
+            ("\\Bet", "regex", "sensitive", False),
+            ("a\\sb", "regex", "sensitive", False),
+            ("(?s)a.b", "regex", "sensitive", False),
+            ("x*", "regex", "sensitive", False),
+            ("[a-z]+ [a-z]+", "regex", "sensitive", True),
+            ("\\bbeta\\b", "regex", "insensitive", False),
+        ],
+    )
+    def test_matches_line_by_line_reference(
+        self, query: str, mode: str, case_mode: str, whole_word: bool
+    ) -> None:
+        matcher = build_matcher(
+            query,
+            mode=mode,  # type: ignore[arg-type]
+            case_mode=case_mode,  # type: ignore[arg-type]
+            whole_word=whole_word,
+        )
+        for content in _DIFFERENTIAL_CONTENTS:
+            for offset in (1, 2, 5, 9, 99):
+                assert list(iter_matches(content, matcher, offset=offset)) == (
+                    _reference_matches(content, matcher, offset)
+                )
+
+    @pytest.mark.parametrize(
+        "queries",
+        [
+            ["beta", "a b"],
+            ["Beta", "gamma", "xx"],
+            ["k", "stra\u00dfe"],
+            ["(beta)", "eta|"],
+            ["beta", "x\ny"],
+        ],
+    )
+    def test_multi_literal_alternation_matches_reference(self, queries: list[str]) -> None:
+        combined, _ = build_multi_matcher(queries)
+        assert combined is not None
+        for content in _DIFFERENTIAL_CONTENTS:
+            for offset in (1, 2, 5, 9, 99):
+                assert list(iter_matches(content, combined, offset=offset)) == (
+                    _reference_matches(content, combined, offset)
+                )
+
+    def test_reports_each_line_once(self) -> None:
+        matcher = build_matcher("a")
+        result = search_lines("a a a\nbab\n", matcher)
+        assert [m.line_number for m in result.matches] == [1, 2]
+
+    def test_stops_at_first_match_beyond_page(self) -> None:
+        matcher = build_matcher("line")
+        content = "\n".join(f"line {i}" for i in range(1, 101))
+        result = search_lines(content, matcher, offset=10, max_results=5)
+        assert [m.line_number for m in result.matches] == [10, 11, 12, 13, 14]
+        assert result.has_more is True
+        assert result.next_offset == 15
+
+    def test_no_more_when_page_ends_on_last_match(self) -> None:
+        matcher = build_matcher("hit")
+        result = search_lines("hit\nmiss\nhit\n", matcher, max_results=2)
+        assert len(result.matches) == 2
+        assert result.has_more is False
+        assert result.next_offset is None
+
+
+class TestLineReader:
+    @pytest.mark.parametrize("content", _DIFFERENTIAL_CONTENTS)
+    def test_ranges_match_splitlines(self, content: str) -> None:
+        lines = content.splitlines()
+        reader = LineReader(content)
+        for first, last in [(1, 1), (2, 4), (4, 5), (7, 8), (9, 40), (50, 60)]:
+            assert reader.read(first, last) == lines[first - 1 : last]
+
+    def test_skips_forward_across_blocks(self) -> None:
+        content = "\n".join(f"line {i}" for i in range(1, 50_001))
+        reader = LineReader(content)
+        assert reader.read(3, 4) == ["line 3", "line 4"]
+        assert reader.read(40_000, 40_001) == ["line 40000", "line 40001"]
+        assert reader.read(50_000, 50_010) == ["line 50000"]
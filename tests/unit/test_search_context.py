@@ -0,0 +1,75 @@
+"""Unit tests for procontext.search_context — context hunks around matches."""
+
+from __future__ import annotations
+
+from procontext.search import LineMatch, build_matcher, search_lines
+from procontext.search_context import format_hunks
+
+_CONTENT = "\n".join(f"line {i}" + (" hit" if i in (3, 5, 12, 20) else "") for i in range(1, 21))
+
+
+def _matches(max_results: int = 20) -> list[LineMatch]:
+    return search_lines(_CONTENT, build_matcher("hit"), max_results=max_results).matches
+
+
+class TestFormatHunks:
+    def test_no_context_lists_matches(self) -> None:
+        text, included = format_hunks(_CONTENT, _matches(), before=0, after=0, max_chars=0)
+        assert text.splitlines() == [
+            "3:line 3 hit",
+            "--",
+            "5:line 5 hit",
+            "--",
+            "12:line 12 hit",
+            "--",
+            "20:line 20 hit",
+        ]
+        assert included == 4
+
+    def test_overlapping_windows_merge(self) -> None:
+        text, _ = format_hunks(_CONTENT, _matches(2), before=1, after=1, max_chars=0)
+        assert text.splitlines() == [
+            "2-line 2",
+            "3:line 3 hit",
+            "4-line 4",
+            "5:line 5 hit",
+            "6-line 6",
+        ]
+
+    def test_separated_hunks_and_page_edges(self) -> None:
+        text, _ = format_hunks(_CONTENT, _matches(), before=2, after=2, max_chars=0)
+        lines = text.splitlines()
+        assert lines[0] == "1-line 1"
+        assert lines.count("--") == 2
+        assert lines[lines.index("--") + 1] == "10-line 10"
+        assert lines[-1] == "20:line 20 hit"
+
+    def test_match_inside_previous_context_is_marked(self) -> None:
+        text, included = format_hunks(_CONTENT, _matches(2), before=0, after=3, max_chars=0)
+        assert text.splitlines() == [
+            "3:line 3 hit",
+            "4-line 4",
+            "5:line 5 hit",
+            "6-line 6",
+            "7-line 7",
+            "8-line 8",
+        ]
+        assert included == 2
+
+    def test_budget_ends_output_at_a_whole_match(self) -> None:
+        full, _ = format_hunks(_CONTENT, _matches(), before=1, after=1, max_chars=0)
+        budget = len("\n".join(full.splitlines()[:6])) + 1
+        text, included = format_hunks(_CONTENT, _matches(), before=1, after=1, max_chars=budget)
+        assert included == 2
+        assert text.splitlines()[-1] == "6-line 6"
+
+    def test_first_match_always_included(self) -> None:
+        text, included = format_hunks(_CONTENT, _matches(), before=5, after=5, max_chars=1)
+        assert included == 1
+        assert "3:line 3 hit" in text.splitlines()
+
+    def test_crlf_content(self) -> None:
+        content = _CONTENT.replace("\n", "\r\n")
+        matches = search_lines(content, build_matcher("hit"), max_results=1).matches
+        text, _ = format_hunks(content, matches, before=1, after=1, max_chars=0)
+        assert text == "2-line 2\n3:line 3 hit\n4-line 4"
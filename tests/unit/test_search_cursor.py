@@ -0,0 +1,67 @@
+"""Unit tests for procontext.search_cursor."""
+
+from __future__ import annotations
+
+import pytest
+
+from procontext.config import SearchSettings
+from procontext.search import build_matcher, search_lines
+from procontext.search_cursor import SearchCursor, build_cursor_cache
+
+_CONTENT = "\n".join(f"line {i} {'hit' if i % 3 == 0 else 'miss'}" for i in range(1, 101))
+
+
+class TestSearchCursor:
+    @pytest.mark.parametrize(
+        ("offset", "max_results"), [(1, 5), (1, 100), (4, 1), (50, 10), (98, 5), (150, 5)]
+    )
+    def test_page_matches_search_lines(self, offset: int, max_results: int) -> None:
+        matcher = build_matcher("hit")
+        cursor = SearchCursor(_CONTENT, matcher)
+        assert cursor.page(offset=offset, max_results=max_results) == search_lines(
+            _CONTENT, matcher, offset=offset, max_results=max_results
+        )
+
+    def test_resumes_across_pages_in_any_order(self) -> None:
+        matcher = build_matcher("hit")
+        cursor = SearchCursor(_CONTENT, matcher)
+        for offset, max_results in [(1, 3), (10, 3), (2, 20), (90, 2), (1, 2)]:
+            assert cursor.page(offset=offset, max_results=max_results) == search_lines(
+                _CONTENT, matcher, offset=offset, max_results=max_results
+            )
+
+    def test_section_counts_scan_whole_page(self) -> None:
+        cursor = SearchCursor(_CONTENT, build_matcher("hit"))
+        cursor.page(offset=1, max_results=2)
+        # Hits are every third line: 3..9 before line 10, 12..48, then 51..99.
+        assert cursor.section_counts([10, 50]) == {0: 3, 10: 13, 50: 17}
+        assert cursor.total_matches == 33
+        assert cursor.page(offset=1, max_results=2).matches[0].line_number == 3
+
+    def test_total_matches_known_only_after_last_match(self) -> None:
+        cursor = SearchCursor(_CONTENT, build_matcher("hit"))
+        first = cursor.page(offset=1, max_results=10)
+        assert first.has_more is True
+        assert cursor.total_matches is None
+
+        assert first.next_offset is not None
+        cursor.page(offset=first.next_offset, max_results=100)
+        assert cursor.total_matches == 33
+
+    def test_releases_page_text_when_exhausted(self) -> None:
+        cursor = SearchCursor(_CONTENT, build_matcher("line 7 "))
+        assert cursor.weight >= len(_CONTENT)
+        cursor.page(offset=1, max_results=10)
+        assert cursor.weight == len("line 7 miss")
+
+    def test_total_lines(self) -> None:
+        cursor = SearchCursor("a\nb\n", build_matcher("a"))
+        assert cursor.total_lines == 2
+
+
+class TestBuildCursorCache:
+    def test_disabled_with_zero_entries(self) -> None:
+        assert build_cursor_cache(SearchSettings(cursor_cache_entries=0)) is None
+
+    def test_enabled_by_default(self) -> None:
+        assert build_cursor_cache(SearchSettings()) is not None
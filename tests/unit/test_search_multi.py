@@ -0,0 +1,93 @@
+"""Unit tests for procontext.search_multi — several queries in one scan."""
+
+from __future__ import annotations
+
+import pytest
+
+from procontext.search import LineMatch, build_matcher, format_match, iter_matches
+from procontext.search_multi import build_multi_matcher, iter_tagged_matches
+
+_CONTENT = "\n".join(
+    [
+        "Configure the client with API_KEY.",
+        "beta: the api_key option",
+        "Beta release notes",
+        "error: missing credentials",
+        "nothing here",
+        "ERROR: Api_Key rejected",
+    ]
+)
+
+
+def _reference(
+    queries: list[str], content: str = _CONTENT, offset: int = 1, **options: object
+) -> list[LineMatch]:
+    """Lines matching any query, each tagged by searching every query separately."""
+    per_query = [build_matcher(q, **options) for q in queries]  # type: ignore[arg-type]
+    by_line: dict[int, LineMatch] = {}
+    for idx, matcher in enumerate(per_query, start=1):
+        for m in iter_matches(content, matcher, offset=offset):
+            previous = by_line.get(m.line_number, m)
+            by_line[m.line_number] = LineMatch(m.line_number, m.content, (*previous.queries, idx))
+    return [by_line[n] for n in sorted(by_line)]
+
+
+class TestMultiMatcher:
+    @pytest.mark.parametrize(
+        ("queries", "options"),
+        [
+            (["api_key", "error"], {}),
+            (["API_KEY", "Beta", "error"], {}),
+            (["api_key", "beta"], {"case_mode": "sensitive"}),
+            (["key", "error"], {"whole_word": True}),
+            ([r"api_\w+", r"^error"], {"mode": "regex", "case_mode": "insensitive"}),
+        ],
+    )
+    def test_matches_each_query_run_separately(
+        self, queries: list[str], options: dict[str, object]
+    ) -> None:
+        combined, per_query = build_multi_matcher(queries, **options)  # type: ignore[arg-type]
+        found = list(iter_tagged_matches(_CONTENT, combined, per_query))
+        assert found == _reference(queries, **options)
+
+    def test_smart_case_applies_per_query(self) -> None:
+        combined, per_query = build_multi_matcher(["Beta", "api_key"])
+        found = list(iter_tagged_matches(_CONTENT, combined, per_query))
+        assert [(m.line_number, m.queries) for m in found] == [
+            (1, (2,)),
+            (2, (2,)),
+            (3, (1,)),
+            (6, (2,)),
+        ]
+
+    @pytest.mark.parametrize(
+        ("queries", "content"),
+        [
+            # The second query's \1 would refer to the first query's group.
+            (["(x)y", r"(a)\1"], "aa\nxy\nab"),
+            (["(?P<n>a)", "(?P<n>b)"], "a\nc\nb\nab"),
+            (["(?i)foo", "bar"], "FOO\nBAR\nbar foo\nfoo"),
+            (["(?P<w>o)(?P=w)", r"(\w)\1", "(x)?(?(1)y|r)"], "foo\nbar\nabba"),
+        ],
+    )
+    def test_queries_that_cannot_share_an_alternation(
+        self, queries: list[str], content: str
+    ) -> None:
+        options = {"mode": "regex", "case_mode": "sensitive"}
+        combined, per_query = build_multi_matcher(queries, **options)  # type: ignore[arg-type]
+        assert combined is None
+        for offset in (1, 2, 4):
+            found = list(iter_tagged_matches(content, combined, per_query, offset=offset))
+            assert found == _reference(queries, content, offset, **options)
+
+    def test_groups_without_backreferences_share_an_alternation(self) -> None:
+        combined, _ = build_multi_matcher(["(a)(?P<n>b)", "(c)", r"\d"], mode="regex")
+        assert combined is not None
+
+
+class TestFormatMatch:
+    def test_untagged(self) -> None:
+        assert format_match(LineMatch(4, "text")) == "4:text"
+
+    def test_tagged(self) -> None:
+        assert format_match(LineMatch(4, "text", (1, 3))) == "4:[1,3] text"
@@ -0,0 +1,50 @@
+"""Unit tests for procontext.search_sections — per-section match counts."""
+
+from __future__ import annotations
+
+from procontext.outline import parse_outline_entries
+from procontext.search_sections import count_by_section, format_section_counts, section_headings
+
+_OUTLINE = "\n".join(
+    [
+        "3:# Guide",
+        "10:## Install",
+        "20:```python",
+        "21:# not a heading",
+        "22:```",
+        "30:## Usage",
+        "40:### Streaming",
+    ]
+)
+
+
+class TestCountBySection:
+    def test_attributes_to_nearest_heading_above(self) -> None:
+        counts = count_by_section([1, 3, 9, 10, 25, 39, 40, 99], [3, 10, 30, 40])
+        assert counts == {0: 1, 3: 2, 10: 2, 30: 1, 40: 2}
+
+    def test_no_headings_counts_everything_as_preamble(self) -> None:
+        assert count_by_section([1, 2, 3], []) == {0: 3}
+
+    def test_no_matches(self) -> None:
+        assert count_by_section([], [3, 10]) == {}
+
+
+class TestSectionHeadings:
+    def test_skips_fences_and_fenced_lines(self) -> None:
+        headings = section_headings(parse_outline_entries(_OUTLINE))
+        assert [h.line_number for h in headings] == [3, 10, 30, 40]
+
+
+class TestFormatSectionCounts:
+    def test_formats_in_page_order_with_preamble_at_line_1(self) -> None:
+        headings = section_headings(parse_outline_entries(_OUTLINE))
+        text = format_section_counts({40: 2, 0: 1, 10: 5}, headings)
+        assert text.splitlines() == [
+            "1:(before first heading) (1)",
+            "10:## Install (5)",
+            "40:### Streaming (2)",
+        ]
+
+    def test_empty(self) -> None:
+        assert format_section_counts({}, []) == ""
@@ -0,0 +1,145 @@
+"""Unit tests for the section tree."""
+
+from __future__ import annotations
+
+import pytest
+
+from procontext.outline import OutlineIndex
+from procontext.parser import parse_outline
+from procontext.sections import Section, build_sections, find_section, heading_title
+
+PAGE = """\
+# Guide
+intro
+## Install
+pip install
+## Usage
+### Streaming
+stream text
+#### Callbacks
+callback text
+### Batching
+```python
+# comment, not a heading
+```
+# Reference
+## Streaming
+reference text
+"""
+
+
+def _sections(page: str = PAGE) -> list[Section]:
+    return build_sections(OutlineIndex.build(parse_outline(page), page))
+
+
+class TestHeadingTitle:
+    @pytest.mark.parametrize(
+        ("heading", "title"),
+        [
+            ("# Guide", "Guide"),
+            ("###   Spaced  out", "Spaced  out"),
+            ("## Usage ##", "Usage"),
+            ("> ## Quoted", "Quoted"),
+            ("## C#", "C#"),
+        ],
+    )
+    def test_strips_markers(self, heading: str, title: str) -> None:
+        assert heading_title(heading) == title
+
+
+class TestBuildSections:
+    def test_paths_and_extents(self) -> None:
+        sections = _sections()
+        assert [(s.path, s.line_number, s.end_line) for s in sections] == [
+            (("Guide",), 1, 13),
+            (("Guide", "Install"), 3, 4),
+            (("Guide", "Usage"), 5, 13),
+            (("Guide", "Usage", "Streaming"), 6, 9),
+            (("Guide", "Usage", "Streaming", "Callbacks"), 8, 9),
+            (("Guide", "Usage", "Batching"), 10, 13),
+            (("Reference",), 14, 16),
+            (("Reference", "Streaming"), 15, 16),
+        ]
+
+    def test_sizes(self) -> None:
+        install = _sections()[1]
+        assert install.line_count == 2
+        assert install.chars == len("## Install\npip install\n")
+        assert install.approx_tokens == 6
+
+    def test_no_headings(self) -> None:
+        assert _sections("just text\n") == []
+
+
+class TestFindSection:
+    def test_by_full_path(self) -> None:
+        section = find_section(_sections(), "Guide > Usage > Streaming")
+        assert section is not None
+        assert section.line_number == 6
+
+    def test_by_title_takes_first_in_page_order(self) -> None:
+        section = find_section(_sections(), "Streaming")
+        assert section is not None
+        assert section.path == ("Guide", "Usage", "Streaming")
+
+    def test_path_disambiguates(self) -> None:
+        section = find_section(_sections(), "Reference > Streaming")
+        assert section is not None
+        assert section.line_number == 15
+
+    def test_levels_may_be_skipped(self) -> None:
+        section = find_section(_sections(), "guide>callbacks")
+        assert section is not None
+        assert section.line_number == 8
+
+    def test_case_and_whitespace_insensitive(self) -> None:
+        section = find_section(_sections(), "  USAGE  >  streaming ")
+        assert section is not None
+        assert section.line_number == 6
+
+    def test_ancestors_must_be_in_order(self) -> None:
+        assert find_section(_sections(), "Usage > Guide > Streaming") is None
+
+    def test_unknown_title(self) -> None:
+        assert find_section(_sections(), "Deployment") is None
+
+    @pytest.mark.parametrize(
+        ("line", "start"), [(1, 1), (4, 3), (7, 6), (9, 8), (12, 10), (16, 15)]
+    )
+    def test_by_line_returns_innermost(self, line: int, start: int) -> None:
+        section = find_section(_sections(), line)
+        assert section is not None
+        assert section.line_number == start
+
+    def test_line_before_first_heading(self) -> None:
+        assert find_section(_sections("text\n# Title\n"), 1) is None
+
+    def test_line_past_end(self) -> None:
+        assert find_section(_sections(), 999) is None
+
+    def test_heading_markers_in_path_are_ignored(self) -> None:
+        section = find_section(_sections(), "# Reference > ## Streaming")
+        assert section is not None
+        assert section.line_number == 15
+
+    @pytest.mark.parametrize(
+        ("selector", "line"),
+        [
+            ("API > Result<T, E>", 3),
+            ("Result<T, E>", 3),
+            ("API > Result<T, E> > map -> Option", 5),
+            ("api>map -> option", 5),
+            ("API > Vec<u8>", 7),
+            ("<div> > a > b", 9),
+        ],
+    )
+    def test_titles_containing_angle_brackets(self, selector: str, line: int) -> None:
+        page = (
+            "# API\nintro\n## Result<T, E>\ntext\n### map -> Option\ntext\n"
+            "## Vec<u8>\ntext\n# <div> > a > b\ntext\n"
+        )
+        sections = _sections(page)
+        section = find_section(sections, selector)
+        assert section is not None
+        assert section.line_number == line
+        assert find_section(sections, " > ".join(section.path)) == section
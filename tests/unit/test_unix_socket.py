@@ -0,0 +1,60 @@
+"""Unit tests for procontext.unix_socket."""
+
+from __future__ import annotations
+
+import errno
+import socket
+import stat
+from typing import TYPE_CHECKING
+
+import pytest
+
+from procontext.unix_socket import bind_unix_socket, connect_unix_socket, unix_sockets_supported
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(not unix_sockets_supported(), reason="requires AF_UNIX")
+
+
+def test_bind_applies_requested_permissions(tmp_path: Path) -> None:
+    path = tmp_path / "s.sock"
+    with bind_unix_socket(path, mode=0o600):
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_bind_creates_missing_parent_directory(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "s.sock"
+    with bind_unix_socket(path, mode=0o600):
+        assert path.exists()
+
+
+def test_bind_replaces_stale_socket(tmp_path: Path) -> None:
+    path = tmp_path / "s.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()  # file remains, nobody listening
+
+    with bind_unix_socket(path, mode=0o600):
+        client = connect_unix_socket(path)
+        assert client is not None
+        client.close()
+
+
+def test_bind_refuses_socket_with_live_listener(tmp_path: Path) -> None:
+    path = tmp_path / "s.sock"
+    with bind_unix_socket(path, mode=0o600), pytest.raises(OSError) as exc_info:
+        bind_unix_socket(path, mode=0o600)
+    assert exc_info.value.errno == errno.EADDRINUSE
+
+
+def test_bind_refuses_to_replace_regular_file(tmp_path: Path) -> None:
+    path = tmp_path / "s.sock"
+    path.write_text("not a socket")
+    with pytest.raises(OSError):
+        bind_unix_socket(path, mode=0o600)
+    assert path.read_text() == "not a socket"
+
+
+def test_connect_returns_none_without_listener(tmp_path: Path) -> None:
+    assert connect_unix_socket(tmp_path / "missing.sock") is None